@@ -0,0 +1,249 @@
+import argparse
+import os
+import sys
+from collections import Counter
+
+from src.batch_runner import (
+    STATUS_LABELS,
+    batch_exit_code,
+    find_csv_files,
+    load_manifest,
+    run_batch,
+    write_batch_report,
+)
+from src.ddl_parser import DDLParser
+from src.schema_cache import SchemaCache
+
+
+def main():
+    """一括検証のメイン関数"""
+    parser = argparse.ArgumentParser(
+        description='複数テーブルのDDLに対して、ディレクトリ内のCSVファイルを一括で検証',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python3 batch.py --ddl schema.sql --csv-dir exports/
+  python3 batch.py --ddl schema.sql --csv-dir exports/ --workers 8 --output-dir reports/
+  python3 batch.py --ddl schema.sql --manifest manifest.json
+  python3 batch.py --ddl schema.sql --csv-dir exports/ --check-foreign-keys
+  python3 batch.py --ddl schema.sql --csv-dir exports/ --stats
+        """
+    )
+
+    parser.add_argument(
+        '--ddl',
+        required=True,
+        help='複数のCREATE TABLE文を含むDDLファイルのパス（例: mysqldump --no-data の出力）'
+    )
+
+    parser.add_argument(
+        '--csv-dir',
+        default=None,
+        help='検証するCSVファイルのディレクトリ（ファイル名からテーブルを判定: users.csv, users.csv.gz -> users）'
+    )
+
+    parser.add_argument(
+        '--manifest',
+        default=None,
+        help='CSVファイルとテーブル名の対応表（JSON: {"users_20240101.csv": "users"}）。'
+             '--csv-dir を省略した場合は対応表のファイルを検証'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        default='validation_reports',
+        help='ファイルごとのエラーレポートと集約レポートの出力先（デフォルト: validation_reports）'
+    )
+
+    parser.add_argument(
+        '--report',
+        default=None,
+        help='集約レポートのファイルパス（拡張子 .json ならJSON、デフォルト: <output-dir>/batch_report.csv）'
+    )
+
+    parser.add_argument(
+        '--report-format',
+        choices=['csv', 'jsonl'],
+        default='csv',
+        help='ファイルごとのエラーレポートの形式（デフォルト: csv）'
+    )
+
+    parser.add_argument(
+        '--encoding',
+        default='utf-8',
+        help='CSVファイルのエンコーディング（デフォルト: utf-8）'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='同時に検証するファイル数（デフォルト: CPU数）'
+    )
+
+    parser.add_argument(
+        '--engine',
+        choices=['auto', 'python', 'numpy'],
+        default='auto',
+        help='検証エンジン（デフォルト: auto）'
+    )
+
+    parser.add_argument(
+        '--reader',
+        choices=['auto', 'stream', 'mmap', 'bytes'],
+        default='auto',
+        help='CSVの読み込み方式。mmapはファイルをメモリマップして読み込む。bytesはmmapに加えてASCIIだけの部分のデコードを省略し、'
+             'デコードできないバイト列をセル単位のエラーとして報告する（デフォルト: auto = 非圧縮でUTF-8/Shift_JIS等ならmmap）'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=0,
+        help='カラムごとに検証結果をキャッシュする値の最大件数（デフォルト: 0 = キャッシュなし）'
+    )
+
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        metavar='N',
+        help='ファイルごとに、エラーがN件に達したら残りのレコードを読み込まずに検証を中断'
+    )
+
+    parser.add_argument(
+        '--max-errors-per-column',
+        type=int,
+        default=None,
+        metavar='N',
+        help='ファイルごとに、いずれかのカラムのエラーがN件に達したら検証を中断'
+    )
+
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='ファイルごとに、最初のエラーで検証を中断（--max-errors 1 と同じ）'
+    )
+
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='検証しながらカラムごとの統計を集計し、出力先ディレクトリに「CSVファイル名_stats.json」として出力'
+    )
+
+    parser.add_argument(
+        '--check-foreign-keys',
+        action='store_true',
+        help='外部キーの値が参照先テーブルのCSVファイルに存在するかを検査（参照先のCSVファイルも一括検証の対象に含めること）'
+    )
+
+    parser.add_argument(
+        '--fk-index-dir',
+        default=None,
+        help='参照先テーブルのキーの索引を作成するディレクトリ（デフォルト: システムの一時ディレクトリ。検証後に削除）'
+    )
+
+    parser.add_argument(
+        '--schema-cache-dir',
+        default=None,
+        help='DDLの解析結果のキャッシュの保存先（デフォルト: 環境変数 PRECHECKER_CACHE_DIR または ~/.cache/prechecker/schemas）'
+    )
+
+    parser.add_argument(
+        '--no-schema-cache',
+        action='store_true',
+        help='DDLの解析結果をキャッシュせず、毎回DDLを解析'
+    )
+
+    args = parser.parse_args()
+
+    if args.csv_dir is None and args.manifest is None:
+        parser.error('--csv-dir または --manifest を指定してください')
+
+    try:
+        # 全てのCREATE TABLE文を一度だけ解析し、各ワーカーに渡す
+        schema = None
+        if args.check_foreign_keys:
+            # 外部キーの検査には主キー・外部キーを含むテーブル定義を使う
+            if args.no_schema_cache:
+                schema = DDLParser(args.ddl).parse_schema()
+            else:
+                schema = SchemaCache(args.schema_cache_dir).parse_schema(args.ddl)
+            tables = {name: table.columns for name, table in schema.items()}
+        elif args.no_schema_cache:
+            tables = DDLParser(args.ddl).parse_tables()
+        else:
+            tables = SchemaCache(args.schema_cache_dir).parse_tables(args.ddl)
+
+        manifest = load_manifest(args.manifest) if args.manifest else None
+        if args.csv_dir is not None:
+            csv_files = find_csv_files(args.csv_dir)
+        else:
+            csv_files = list(manifest)
+
+        print("=" * 60)
+        print("CSVインポート事前チェックツール（一括検証）")
+        print("=" * 60)
+        print(f"DDLファイル: {args.ddl}（{len(tables)}テーブル）")
+        print(f"CSVファイル: {len(csv_files)}件")
+        print(f"ワーカー数: {args.workers}")
+        if schema is not None:
+            fk_count = sum(len(table.foreign_keys) for table in schema.values())
+            print(f"外部キー: {fk_count}制約")
+        print("=" * 60)
+        print()
+
+        options = {
+            'encoding': args.encoding,
+            'engine': args.engine,
+            'reader': args.reader,
+            'cache_size': args.cache_size,
+            'max_errors': args.max_errors,
+            'max_errors_per_column': args.max_errors_per_column,
+            'fail_fast': args.fail_fast,
+            'collect_stats': args.stats,
+        }
+        results = run_batch(
+            args.ddl, tables, csv_files, args.output_dir,
+            workers=args.workers,
+            manifest=manifest,
+            report_format=args.report_format,
+            options=options,
+            on_result=print,
+            schema=schema,
+            index_dir=args.fk_index_dir,
+        )
+
+        report_path = args.report or os.path.join(args.output_dir, 'batch_report.csv')
+        write_batch_report(results, report_path)
+
+        print()
+        print("=" * 60)
+        print("🚀 一括検証が完了しました 🚀")
+        counts = Counter(result.status for result in results)
+        for status, label in STATUS_LABELS.items():
+            if counts[status]:
+                print(f"  {label}: {counts[status]}件")
+
+        for result in results:
+            for warning in result.warnings:
+                print(f"  {os.path.basename(result.csv_file_path)}: {warning}")
+
+        matched_tables = {result.table_name for result in results}
+        missing_tables = [name for name in tables if name not in matched_tables]
+        if missing_tables:
+            print(f"  CSVファイルがないテーブル: {len(missing_tables)}件")
+
+        print()
+        print(f"集約レポートを出力しました: {report_path}")
+        print("=" * 60)
+
+        sys.exit(batch_exit_code(results))
+
+    except Exception as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+DDLパーサーのベンチマーク
+
+mysqldump --no-data 形式の大きなスキーマダンプ（デフォルト: 1,000テーブル）を生成し、
+トークナイザーによる現在のパーサー（src.ddl_parser.parse_schema）と、以前の正規表現による
+パーサー（このファイル内の LegacyDDLParser）の処理時間と、検出したカラム数を比較する。
+
+データセット:
+    simple: 1行に1カラム。以前のパーサーも全カラムを検出できる形式（処理時間の比較用）
+    mysqldump: 複数行にわたるカラム定義、文字列やコメント内の ; ( ) を含む形式
+    dash_comments: 型の後ろに - を100個並べた行コメントがあり、カンマが次の行にある形式
+                   （コメントの読み飛ばし方が曖昧な正規表現では、解析時間が - の数に対して指数的に増える）
+
+使用例:
+  python3 benchmarks/ddl_parser_benchmark.py
+  python3 benchmarks/ddl_parser_benchmark.py --tables 5000 --repeat 3 --output ddl_benchmark.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.ddl_parser import ColumnDefinition, parse_schema  # noqa: E402
+
+DEFAULT_SEED = 42
+
+# カラム定義のひな形（{name} にカラム名が入る）
+SIMPLE_COLUMNS = [
+    "`{name}` int(11) NOT NULL AUTO_INCREMENT",
+    "`{name}` bigint(20) unsigned NOT NULL DEFAULT '0'",
+    "`{name}` varchar(255) COLLATE utf8mb4_unicode_ci DEFAULT NULL",
+    "`{name}` varchar(50) NOT NULL DEFAULT '' COMMENT 'code, legacy (v1)'",
+    "`{name}` decimal(10,2) NOT NULL DEFAULT '0.00'",
+    "`{name}` tinyint(1) NOT NULL DEFAULT '1'",
+    "`{name}` text COMMENT 'free text'",
+    "`{name}` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP",
+    "`{name}` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+    "`{name}` date DEFAULT NULL",
+    "`{name}` enum('new','paid','cancelled') NOT NULL DEFAULT 'new'",
+]
+
+# 以前のパーサーが正しく扱えないカラム定義
+HARD_COLUMNS = [
+    "`{name}` varchar(100)\n      CHARACTER SET utf8mb4\n      NOT NULL DEFAULT 'a, b'",
+    "`{name}` int NOT NULL COMMENT 'see orders(id); legacy'",
+    "`{name}` text /* NOT NULL was dropped */",
+    "`{name}` decimal(12, 4)\n      DEFAULT '0.0000'",
+]
+
+# 区切り線のような行コメントの後ろで改行してから次のカラムが始まるカラム定義
+DASH_COMMENT_COLUMNS = [
+    "`{name}` int -- " + "-" * 100 + "\n ",
+    "`{name}` varchar(10) # " + "#" * 100 + "\n ",
+]
+
+# データセット名 -> カラム定義のひな形
+DATASETS = {
+    'simple': SIMPLE_COLUMNS,
+    'mysqldump': SIMPLE_COLUMNS + HARD_COLUMNS,
+    'dash_comments': SIMPLE_COLUMNS + DASH_COMMENT_COLUMNS,
+}
+
+
+def generate_dump(tables: int, columns: int, dataset: str, seed: int) -> str:
+    """mysqldump --no-data 形式のスキーマダンプを生成（dataset は DATASETS のキー）"""
+    rng = random.Random(seed)
+    templates = DATASETS[dataset]
+    parts = [
+        "-- MySQL dump 10.13  Distrib 8.0.36, for Linux (x86_64)\n",
+        "/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;\n",
+        "/*!40103 SET TIME_ZONE='+00:00' */;\n\n",
+    ]
+    for t in range(tables):
+        table = f"t{t}"
+        lines = ["  `id` int(11) NOT NULL AUTO_INCREMENT"]
+        for c in range(columns - 1):
+            lines.append("  " + rng.choice(templates).format(name=f"c{c}"))
+        lines.append("  PRIMARY KEY (`id`)")
+        lines.append("  UNIQUE KEY `uk_c0` (`c0`)")
+        lines.append("  KEY `idx_c1` (`c1`)")
+        if t > 0:
+            lines.append(f"  CONSTRAINT `fk_{table}` FOREIGN KEY (`c1`) REFERENCES `t{t - 1}` (`id`)")
+        parts.append(
+            f"--\n-- Table structure for table `{table}`\n--\n\n"
+            f"DROP TABLE IF EXISTS `{table}`;\n"
+            "/*!40101 SET @saved_cs_client     = @@character_set_client */;\n"
+            "/*!50503 SET character_set_client = utf8mb4 */;\n"
+            f"CREATE TABLE `{table}` (\n" + ",\n".join(lines) + "\n"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;\n"
+            "/*!40101 SET character_set_client = @saved_cs_client */;\n\n"
+        )
+    return ''.join(parts)
+
+
+class LegacyDDLParser:
+    """
+    以前の正規表現によるパーサー（比較用に当時の実装をそのまま残したもの）
+
+    CREATE TABLE文全体を1つの正規表現で探し、カラム定義部を改行で分割して
+    1行ごとに複数の正規表現を適用する。
+    """
+
+    CREATE_TABLE_PATTERN = re.compile(
+        r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w`".]+)\s*\((.*?)\)[^;()]*;',
+        re.IGNORECASE | re.DOTALL
+    )
+
+    TYPE_PATTERNS = [
+        r'(BIGSERIAL)', r'(SERIAL)', r'(SMALLSERIAL)',
+        r'(INT(?:EGER)?(?:\(\d+\))?(?:\s+UNSIGNED)?)',
+        r'(BIGINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
+        r'(SMALLINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
+        r'(TINYINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
+        r'(DECIMAL(?:\(\d+,\s*\d+\))?)',
+        r'(NUMERIC(?:\(\d+,\s*\d+\))?)',
+        r'(FLOAT(?:\(\d+,\s*\d+\))?)',
+        r'(DOUBLE(?:\s+PRECISION)?(?:\(\d+,\s*\d+\))?)',
+        r'(VARCHAR\(\d+\))', r'(CHAR\(\d+\))', r'(TEXT)',
+        r'(DATETIME)', r'(TIMESTAMP)', r'(DATE)', r'(TIME)',
+        r'(BOOLEAN)', r'(BOOL)', r'(BLOB)',
+    ]
+
+    def extract_tables(self, ddl_content: str) -> Dict[str, List[ColumnDefinition]]:
+        tables = {}
+        for match in self.CREATE_TABLE_PATTERN.finditer(ddl_content):
+            table_name = match.group(1).replace('`', '').replace('"', '').split('.')[-1]
+            tables[table_name] = self._parse_columns_section(match.group(2))
+        return tables
+
+    def _parse_columns_section(self, columns_section: str) -> List[ColumnDefinition]:
+        columns = []
+        for line in columns_section.split('\n'):
+            line = line.strip()
+            if not line or line.startswith(('PRIMARY KEY', 'FOREIGN KEY', 'CONSTRAINT', 'KEY', 'INDEX')):
+                continue
+            line = re.sub(r'--.*$', '', line)
+            line = line.rstrip(',').strip()
+            if not line:
+                continue
+            column = self._parse_column_definition(line)
+            if column:
+                columns.append(column)
+        return columns
+
+    def _parse_column_definition(self, line: str):
+        column_name_match = re.match(r'([`"]?\w+[`"]?)\s+(.*)', line)
+        if not column_name_match:
+            return None
+        rest = column_name_match.group(2)
+        data_type = self._extract_data_type(rest)
+        rest_upper = rest.upper()
+        auto_increment = (
+            'AUTO_INCREMENT' in rest_upper
+            or data_type in ('SERIAL', 'BIGSERIAL', 'SMALLSERIAL')
+            or ('GENERATED' in rest_upper and 'IDENTITY' in rest_upper)
+            or re.search(r'IDENTITY\s*\(', rest_upper) is not None
+        )
+        return ColumnDefinition(
+            name=column_name_match.group(1).strip('`"'),
+            data_type=data_type,
+            nullable='NOT NULL' not in rest_upper,
+            auto_increment=auto_increment,
+        )
+
+    def _extract_data_type(self, definition: str) -> str:
+        for pattern in self.TYPE_PATTERNS:
+            match = re.search(pattern, definition, re.IGNORECASE)
+            if match:
+                return match.group(1).upper()
+        words = definition.split()
+        return words[0].upper() if words else 'UNKNOWN'
+
+
+def measure(parse: Callable[[str], Dict[str, List[ColumnDefinition]]], ddl_content: str, repeat: int) -> dict:
+    """repeat 回実行し、最速の処理時間と検出したテーブル数・カラム数を返す"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tables = parse(ddl_content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'seconds': round(best, 4),
+        'tables': len(tables),
+        'columns': sum(len(columns) for columns in tables.values()),
+    }
+
+
+def run_dataset(name: str, ddl_content: str, repeat: int) -> dict:
+    legacy = LegacyDDLParser()
+    result = {
+        'dataset': name,
+        'size_mb': round(len(ddl_content.encode('utf-8')) / (1024 * 1024), 2),
+        'legacy': measure(legacy.extract_tables, ddl_content, repeat),
+        'tokenizer': measure(
+            lambda content: {name: table.columns for name, table in parse_schema(content).items()},
+            ddl_content, repeat
+        ),
+    }
+    result['speedup'] = round(result['legacy']['seconds'] / result['tokenizer']['seconds'], 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DDLパーサーのベンチマーク（以前の正規表現パーサーとの比較）')
+    parser.add_argument('--tables', type=int, default=1000, help='テーブル数（デフォルト: 1000）')
+    parser.add_argument('--columns', type=int, default=30, help='テーブルごとのカラム数（デフォルト: 30）')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'乱数シード（デフォルト: {DEFAULT_SEED}）')
+    parser.add_argument('--repeat', type=int, default=5, help='実行回数。最速の結果を採用（デフォルト: 5）')
+    parser.add_argument('--output', default=None, help='結果をJSONで出力するファイルパス')
+    args = parser.parse_args()
+
+    results = []
+    for name in DATASETS:
+        ddl_content = generate_dump(args.tables, args.columns, name, args.seed)
+        result = run_dataset(name, ddl_content, args.repeat)
+        results.append(result)
+
+        expected_columns = args.tables * args.columns
+        print(f"[{name}] {result['size_mb']}MB, {args.tables}テーブル, {expected_columns}カラム")
+        for parser_name in ('legacy', 'tokenizer'):
+            measured = result[parser_name]
+            print(f"  {parser_name:<10} {measured['seconds']:.3f}秒  "
+                  f"検出: {measured['tables']}テーブル / {measured['columns']}カラム")
+        print(f"  速度比: {result['speedup']}倍")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'tables': args.tables, 'columns': args.columns, 'seed': args.seed,
+                       'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"結果を出力しました: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+パイプライン検証（CSVChecker の threads）のスレッド数によるスケーリングのベンチマーク
+
+run_benchmarks.py と同じデータセットを、スレッド数を変えながらケースごとに別プロセスで検証し、
+処理時間、行/秒、1スレッドに対する速度比をJSONに記録する。
+スレッドが並列に動くのはGILのないPython（3.13t以降のfree-threadedビルド）のみのため、
+結果には実行したインタープリターでGILが有効だったか（gil_enabled）も記録する。
+GILのあるPythonでは、スレッドを増やしても速くならないことの確認に使える。
+
+使用例:
+  python3.13t benchmarks/pipeline_benchmark.py
+  python3.13t benchmarks/pipeline_benchmark.py --cases numeric --threads 1 2 4 8 16 --repeat 5
+  python3 benchmarks/pipeline_benchmark.py --rows 20000 --output pipeline_gil.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.run_benchmarks import CASES, DEFAULT_SEED, _run_case_in_subprocess, prepare_dataset  # noqa: E402
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+
+
+def gil_enabled() -> Optional[bool]:
+    """実行中のインタープリターでGILが有効か（判定できない3.12以前はNone）"""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled is not None else None
+
+
+def run_scaling(name: str, params: dict, thread_counts: List[int], options: dict, seed: int,
+                repeat: int, data_dir: str) -> dict:
+    """
+    1ケースをスレッド数ごとに計測
+
+    各スレッド数は repeat 回実行し、全体の処理時間が最も短かった回の結果を採用する。
+    速度比は thread_counts の最初のスレッド数（通常は1）に対する行/秒の比。
+    """
+    paths = prepare_dataset(params, seed, data_dir)
+    runs = []
+    for threads in thread_counts:
+        results = [_run_case_in_subprocess(paths, {**options, 'threads': threads}) for _ in range(repeat)]
+        best = min(results, key=lambda result: result['seconds']['total'])
+        runs.append({
+            'threads': threads,
+            'seconds': best['seconds']['total'],
+            'rows_per_sec': best['rows_per_sec'],
+            'errors': best['errors'],
+            'peak_rss_mb': best['peak_rss_mb'],
+        })
+
+    base = runs[0]['rows_per_sec']
+    for run in runs:
+        run['speedup'] = run['rows_per_sec'] / base if base else 0.0
+    return {'name': name, 'params': params, 'rows': best['rows'], 'runs': runs}
+
+
+def format_scaling(result: dict) -> str:
+    lines = [f"{result['name']} ({result['rows']:,}行):"]
+    for run in result['runs']:
+        lines.append(f"    {run['threads']:>3}スレッド: {run['seconds']:.3f}s "
+                     f"({run['rows_per_sec']:,.0f} 行/秒, x{run['speedup']:.2f}, エラー {run['errors']}件)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='パイプライン検証のスレッド数によるスケーリングのベンチマーク')
+    parser.add_argument('--cases', nargs='+', default=['mixed', 'numeric'],
+                        help=f"実行するケース（デフォルト: mixed numeric。選択肢: {' '.join(CASES)}）")
+    parser.add_argument('--threads', type=int, nargs='+', default=DEFAULT_THREADS,
+                        help=f"計測するスレッド数（デフォルト: {' '.join(map(str, DEFAULT_THREADS))}）")
+    parser.add_argument('--rows', type=int, default=None, help='全ケースの行数を上書き')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'乱数シード（デフォルト: {DEFAULT_SEED}）')
+    parser.add_argument('--repeat', type=int, default=3, help='スレッド数ごとの実行回数。最速の結果を採用（デフォルト: 3）')
+    parser.add_argument('--engine', choices=['auto', 'python', 'numpy'], default='python',
+                        help='検証エンジン（デフォルト: python）')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'prechecker_benchmarks'),
+                        help='生成したデータセットの保存先（同じパラメータ・シードなら再利用）')
+    parser.add_argument('--output', default='pipeline_benchmark.json',
+                        help='結果の出力先（デフォルト: pipeline_benchmark.json）')
+    args = parser.parse_args()
+
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        raise SystemExit(f"エラー: 未定義のケースです: {', '.join(sorted(unknown))}")
+    if min(args.threads) < 1:
+        raise SystemExit("エラー: スレッド数は1以上を指定してください")
+
+    gil = gil_enabled()
+    print(f"Python {platform.python_version()} (GIL: {'不明' if gil is None else '有効' if gil else '無効'}, "
+          f"CPU: {os.cpu_count()})")
+    if gil:
+        print("警告: GILが有効なため、スレッドを増やしても速くなりません（free-threadedビルドで実行してください）")
+
+    options = {'engine': args.engine}
+    results = []
+    for name in args.cases:
+        params = dict(CASES[name])
+        if args.rows is not None:
+            params['rows'] = args.rows
+        results.append(run_scaling(name, params, args.threads, options, args.seed, args.repeat, args.data_dir))
+        print(format_scaling(results[-1]))
+
+    output = {
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'options': options,
+        'python': platform.python_version(),
+        'gil_enabled': gil,
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cases': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\nベンチマーク結果を出力しました: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+CSVChecker の再現可能なベンチマーク
+
+generate_large_test_data.py でシードを固定したデータセットを生成し、ケースごとに
+別プロセスで CSVChecker.validate() を実行して、処理時間（全体・工程別）、
+行/秒、セル/秒、ピークメモリ使用量をJSONに記録する。
+--baseline を指定すると保存済みの結果と比較し、しきい値を超えて遅くなったケースがあれば
+終了コード1を返す。
+
+使用例:
+  python3 benchmarks/run_benchmarks.py
+  python3 benchmarks/run_benchmarks.py --cases mixed numeric --repeat 5
+  python3 benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.1
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import generate_large_test_data as dataset  # noqa: E402
+from src.byte_reader import ByteCsvReader  # noqa: E402
+from src.csv_checker import CSVChecker  # noqa: E402
+from src.ddl_parser import DDLParser  # noqa: E402
+from src.error_sink import TimedErrorSink, create_error_sink  # noqa: E402
+from src.mmap_reader import MmapCsvReader  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windowsでは取得しない
+    resource = None
+
+# ベンチマークケース（データセットのパラメータ）
+CASES = {
+    # generate_large_test_data.py のデフォルトと同じ構成
+    'mixed': {'rows': 10000, 'columns': 300, 'type_mix': None, 'error_rate': 0.01},
+    'numeric': {'rows': 50000, 'columns': 58, 'type_mix': {'int': 1, 'decimal': 1}, 'error_rate': 0.01},
+    'temporal': {'rows': 50000, 'columns': 58, 'type_mix': {'date': 1, 'datetime': 1}, 'error_rate': 0.01},
+    'text': {'rows': 50000, 'columns': 58, 'type_mix': {'varchar': 1, 'boolean': 1}, 'error_rate': 0.01},
+    # エラーレポートの書き出しが支配的になるケース
+    'error_heavy': {'rows': 5000, 'columns': 300, 'type_mix': None, 'error_rate': 1.0},
+}
+
+DEFAULT_SEED = 42
+DEFAULT_THRESHOLD = 0.1
+STAGES = ('ddl_parse', 'csv_read', 'validation', 'report_write')
+
+
+def prepare_dataset(params: dict, seed: int, data_dir: str) -> Dict[str, str]:
+    """
+    パラメータとシードに対応するデータセットを生成（生成済みなら再利用）
+
+    Returns:
+        'ddl' と 'csv' のファイルパス
+    """
+    key = json.dumps({'params': params, 'seed': seed}, sort_keys=True)
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    paths = {
+        'ddl': os.path.join(data_dir, f"{name}.sql"),
+        'csv': os.path.join(data_dir, f"{name}.csv"),
+    }
+    if not all(os.path.exists(path) for path in paths.values()):
+        os.makedirs(data_dir, exist_ok=True)
+        type_mix = dataset.resolve_type_mix(params['columns'], params['type_mix'])
+        dataset.write_dataset(paths['ddl'], paths['csv'], params['rows'], type_mix,
+                              params['error_rate'], seed)
+    return paths
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """このプロセスと終了した子プロセスのピークメモリ使用量（MB）"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOSはバイト、Linuxはキロバイト単位
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def run_case(ddl_path: str, csv_path: str, options: dict, report_path: str) -> dict:
+    """
+    1ケースを計測（ピークメモリを正しく測るため、ケースごとに新しいプロセスで呼び出す）
+
+    工程別の時間:
+        ddl_parse: DDLのパース
+        csv_read: 全レコードを読むだけの時間（--reader stream はcsv.reader、bytes はByteCsvReader、それ以外はMmapCsvReader）
+        report_write: エラーレポートの書き出し時間
+        validation: 全体から上記を差し引いた検証処理の時間
+    """
+    start = time.perf_counter()
+    DDLParser(ddl_path).parse()
+    ddl_parse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    record_count = 0
+    encoding = options.get('encoding', 'utf-8')
+    if options.get('reader', 'auto') == 'stream':
+        with open(csv_path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for row in reader:
+                if row:
+                    record_count += 1
+    else:
+        reader_class = ByteCsvReader if options.get('reader') == 'bytes' else MmapCsvReader
+        with reader_class(csv_path, encoding) as reader:
+            header = reader.read_header() or []
+            for _ in reader:
+                record_count += 1
+    csv_read = time.perf_counter() - start
+
+    sink = TimedErrorSink(create_error_sink(report_path))
+    checker = CSVChecker(ddl_path, csv_path, error_sink=sink, max_retained_errors=0, **options)
+    start = time.perf_counter()
+    checker.validate()
+    total = time.perf_counter() - start
+
+    cell_count = record_count * len(header)
+    return {
+        'rows': record_count,
+        'cells': cell_count,
+        'errors': checker.error_count,
+        'seconds': {
+            'total': total,
+            'ddl_parse': ddl_parse,
+            'csv_read': csv_read,
+            'validation': max(total - ddl_parse - csv_read - sink.seconds, 0.0),
+            'report_write': sink.seconds,
+        },
+        'rows_per_sec': record_count / total if total else 0.0,
+        'cells_per_sec': cell_count / total if total else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def _run_case_in_subprocess(paths: Dict[str, str], options: dict) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result_path = os.path.join(tmp_dir, 'result.json')
+        command = [
+            sys.executable, os.path.abspath(__file__), '--run-case',
+            json.dumps({
+                'ddl': paths['ddl'],
+                'csv': paths['csv'],
+                'options': options,
+                'report': os.path.join(tmp_dir, 'errors.csv'),
+                'result': result_path,
+            }),
+        ]
+        subprocess.run(command, check=True)
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def run_benchmarks(case_params: Dict[str, dict], options: dict, seed: int, repeat: int,
+                   data_dir: str) -> dict:
+    """
+    全ケースを計測し、結果をJSONに書き出せる辞書で返す
+
+    各ケースは repeat 回実行し、全体の処理時間が最も短かった回の結果を採用する。
+    """
+    results = []
+    for name, params in case_params.items():
+        paths = prepare_dataset(params, seed, data_dir)
+        runs = [_run_case_in_subprocess(paths, options) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['seconds']['total'])
+        best['peak_rss_mb'] = max((run['peak_rss_mb'] or 0) for run in runs) or None
+        results.append({'name': name, 'params': params, **best})
+        print(format_result(results[-1]))
+
+    return {
+        'seed': seed,
+        'repeat': repeat,
+        'options': options,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cases': results,
+    }
+
+
+def format_result(result: dict) -> str:
+    seconds = result['seconds']
+    stages = ", ".join(f"{stage} {seconds[stage]:.3f}s" for stage in STAGES)
+    rss = f"{result['peak_rss_mb']}MB" if result['peak_rss_mb'] is not None else "-"
+    return (f"{result['name']}: {seconds['total']:.3f}s "
+            f"({result['rows_per_sec']:,.0f} 行/秒, {result['cells_per_sec']:,.0f} セル/秒, "
+            f"ピークメモリ {rss}, エラー {result['errors']}件)\n    {stages}")
+
+
+def compare_with_baseline(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    ベースラインと比較し、しきい値を超えて遅くなったケースの説明を返す
+
+    Args:
+        current: run_benchmarks() の結果
+        baseline: 保存済みの結果
+        threshold: 許容する速度低下の割合（0.1なら行/秒が10%より下がると回帰とみなす）
+    """
+    baseline_cases = {case['name']: case for case in baseline.get('cases', [])}
+    regressions = []
+    print()
+    print(f"ベースラインとの比較（しきい値: {threshold:.0%}）:")
+    for case in current['cases']:
+        base = baseline_cases.get(case['name'])
+        if base is None:
+            print(f"  - {case['name']}: ベースラインなし")
+            continue
+        if base['params'] != case['params']:
+            print(f"  - {case['name']}: データセットのパラメータが異なるため比較しません")
+            continue
+
+        ratio = case['rows_per_sec'] / base['rows_per_sec'] if base['rows_per_sec'] else 1.0
+        line = f"{case['name']}: {base['rows_per_sec']:,.0f} → {case['rows_per_sec']:,.0f} 行/秒 ({ratio - 1:+.1%})"
+        if ratio < 1 - threshold:
+            regressions.append(line)
+            print(f"  ✗ {line}")
+        else:
+            print(f"  ✓ {line}")
+    return regressions
+
+
+def _parse_case_params(args) -> Dict[str, dict]:
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        raise SystemExit(f"エラー: 未定義のケースです: {', '.join(sorted(unknown))}")
+
+    case_params = {}
+    for name in args.cases:
+        params = dict(CASES[name])
+        # コマンドラインで指定したパラメータで上書き
+        for key in ('rows', 'columns', 'type_mix', 'error_rate'):
+            value = getattr(args, key)
+            if value is not None:
+                params[key] = value
+        case_params[name] = params
+    return case_params
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSVCheckerのベンチマーク')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), help=f"実行するケース（デフォルト: 全て = {' '.join(CASES)}）")
+    parser.add_argument('--rows', type=int, default=None, help='全ケースの行数を上書き')
+    parser.add_argument('--columns', type=int, default=None, help='全ケースの総カラム数を上書き')
+    parser.add_argument('--type-mix', type=dataset.parse_type_mix, default=None,
+                        help='全ケースのカラム種類の比率を上書き（例: int=50,varchar=50）')
+    parser.add_argument('--error-rate', type=float, default=None, help='全ケースのinvalidな行の割合を上書き')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'乱数シード（デフォルト: {DEFAULT_SEED}）')
+    parser.add_argument('--repeat', type=int, default=3, help='ケースごとの実行回数。最速の結果を採用（デフォルト: 3）')
+    parser.add_argument('--engine', choices=['auto', 'python', 'numpy'], default='auto', help='検証エンジン（デフォルト: auto）')
+    parser.add_argument('--reader', choices=['auto', 'stream', 'mmap', 'bytes'], default='auto',
+                        help='CSVの読み込み方式（デフォルト: auto）')
+    parser.add_argument('--workers', type=int, default=1, help='検証に使うプロセス数（デフォルト: 1）')
+    parser.add_argument('--threads', type=int, default=1, help='検証に使うスレッド数（デフォルト: 1）')
+    parser.add_argument('--cache-size', type=int, default=0, help='検証結果キャッシュの最大件数（デフォルト: 0）')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'prechecker_benchmarks'),
+                        help='生成したデータセットの保存先（同じパラメータ・シードなら再利用）')
+    parser.add_argument('--output', default='benchmark_results.json', help='結果の出力先（デフォルト: benchmark_results.json）')
+    parser.add_argument('--baseline', default=None, help='比較するベースラインの結果ファイル')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'回帰とみなす行/秒の低下率（デフォルト: {DEFAULT_THRESHOLD}）')
+    parser.add_argument('--run-case', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        # 子プロセスとして1ケースを計測
+        spec = json.loads(args.run_case)
+        result = run_case(spec['ddl'], spec['csv'], spec['options'], spec['report'])
+        with open(spec['result'], 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    options = {'engine': args.engine, 'reader': args.reader, 'workers': args.workers, 'threads': args.threads,
+               'cache_size': args.cache_size}
+    results = run_benchmarks(_parse_case_params(args), options, args.seed, args.repeat, args.data_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nベンチマーク結果を出力しました: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_with_baseline(results, baseline, args.threshold):
+            print("\n性能の回帰を検出しました")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
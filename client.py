@@ -0,0 +1,178 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from src.client import DEFAULT_SERVER_URL, ServerError, ValidationClient
+from src.error_sink import create_error_sink
+from src.errors import ValidationError
+
+# コンソールに表示するエラーの最大件数
+SUMMARY_ERROR_LIMIT = 10
+
+
+def main():
+    """検証サーバーのクライアントのメイン関数（main.py の代わりに使う）"""
+    parser = argparse.ArgumentParser(
+        description='検証サーバー（serve.py）にCSVファイルの検証を依頼するクライアント',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python3 client.py --csv users.csv
+  python3 client.py --csv users.csv --table users --output errors.jsonl
+  python3 client.py --csv users.csv --upload --server http://db-host:8765
+  python3 client.py --socket /tmp/prechecker.sock --csv users.csv
+  python3 client.py --metrics
+        """
+    )
+
+    parser.add_argument(
+        '--csv',
+        default=None,
+        help='検証するCSVファイルのパス（.gz/.bz2/.xz の圧縮ファイルも可）'
+    )
+
+    parser.add_argument(
+        '--table',
+        default=None,
+        help='検証するテーブル名（省略時はファイル名から判定: users.csv -> users）'
+    )
+
+    parser.add_argument(
+        '--server',
+        default=DEFAULT_SERVER_URL,
+        help=f'検証サーバーのURL（デフォルト: {DEFAULT_SERVER_URL}）'
+    )
+
+    parser.add_argument(
+        '--socket',
+        default=None,
+        metavar='PATH',
+        help='--server の代わりにUnixドメインソケットで接続'
+    )
+
+    parser.add_argument(
+        '--upload',
+        action='store_true',
+        help='ファイルのパスではなく内容を送信（サーバーからファイルを読めない場合）'
+    )
+
+    parser.add_argument(
+        '--output',
+        default='validation_errors.csv',
+        help='エラーレポートの出力先ファイルパス（デフォルト: validation_errors.csv）'
+    )
+
+    parser.add_argument(
+        '--report-format',
+        choices=['csv', 'jsonl'],
+        default=None,
+        help='エラーレポートの形式（省略時は --output の拡張子から判定、それ以外はcsv）'
+    )
+
+    parser.add_argument(
+        '--encoding',
+        default=None,
+        help='CSVファイルのエンコーディング（デフォルト: utf-8）'
+    )
+
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        metavar='N',
+        help='エラーがN件に達したら残りのレコードを読み込まずに検証を中断'
+    )
+
+    parser.add_argument(
+        '--max-errors-per-column',
+        type=int,
+        default=None,
+        metavar='N',
+        help='いずれかのカラムのエラーがN件に達したら検証を中断'
+    )
+
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='最初のエラーで検証を中断（--max-errors 1 と同じ）'
+    )
+
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='検証の代わりにサーバーの稼働状況（実行待ちのジョブ数・スループット等）を表示'
+    )
+
+    args = parser.parse_args()
+    client = ValidationClient(args.server, socket_path=args.socket)
+
+    if args.metrics:
+        try:
+            print(json.dumps(client.metrics(), ensure_ascii=False, indent=2))
+        except (OSError, ServerError) as e:
+            print(f"エラー: {e}", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(0)
+
+    if args.csv is None:
+        parser.error('--csv を指定してください')
+    if not Path(args.csv).exists():
+        print(f"エラー: CSVファイルが見つかりません: {args.csv}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # サーバーから届いたエラーを逐次レポートに書き出す
+        error_sink = create_error_sink(args.output, args.report_format)
+        errors = []
+        summary = None
+        try:
+            messages = client.validate(
+                args.csv, table=args.table, upload=args.upload,
+                encoding=args.encoding,
+                max_errors=args.max_errors,
+                max_errors_per_column=args.max_errors_per_column,
+                fail_fast=args.fail_fast,
+            )
+            for message in messages:
+                kind = message.pop('type')
+                if kind == 'error':
+                    error = ValidationError(**message)
+                    error_sink.write(error)
+                    if len(errors) < SUMMARY_ERROR_LIMIT:
+                        errors.append(error)
+                elif kind == 'summary':
+                    summary = message
+        finally:
+            error_sink.close()
+
+        if summary is None:
+            raise ServerError("検証結果を受け取る前にサーバーとの接続が切れました")
+
+        print(f"CSVファイル: {args.csv} -> {summary['table_name']}")
+        for warning in summary['warnings']:
+            print(warning)
+        if summary['status'] == 'failed':
+            raise ServerError(summary['message'])
+
+        print(f"検証したレコード: {summary['record_count']}件（{summary['seconds']:.2f}秒）")
+        if summary['error_count'] == 0:
+            print("全てのレコードがテーブル定義に適合しています。")
+            sys.exit(0)
+
+        print(f"検出されたエラー: {summary['error_count']}件")
+        print(f"エラーサマリー（最大{SUMMARY_ERROR_LIMIT}件表示）:")
+        for i, error in enumerate(errors, 1):
+            print(f"  {i}. {error}")
+        if summary['error_count'] > SUMMARY_ERROR_LIMIT:
+            print(f"  ... 他{summary['error_count'] - SUMMARY_ERROR_LIMIT}件のエラー")
+        print(f"エラーレポートを出力しました: {args.output}")
+        sys.exit(1)
+
+    except (OSError, ServerError, ValueError) as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
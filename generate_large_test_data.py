@@ -1,234 +1,295 @@
 #!/usr/bin/env python3
 """300カラムのDDLと50000行のテストデータを生成するスクリプト"""
+import argparse
 import random
 from datetime import datetime, timedelta
-
-def generate_ddl():
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 基本カラム（名前, 型定義）
+BASE_COLUMNS = [
+    ("id", "INT NOT NULL"),
+    ("username", "VARCHAR(50) NOT NULL"),
+    ("email", "VARCHAR(100) NOT NULL"),
+    ("age", "INT"),
+    ("balance", "DECIMAL(10,2)"),
+    ("is_active", "BOOLEAN NOT NULL"),
+    ("created_at", "DATETIME"),
+    ("birth_date", "DATE"),
+]
+
+# ダミーカラムの種類ごとの型定義
+DUMMY_COLUMN_TYPES = {
+    "varchar": "VARCHAR(100)",
+    "int": "INT",
+    "decimal": "DECIMAL(10,2)",
+    "date": "DATE",
+    "datetime": "DATETIME",
+    "boolean": "BOOLEAN",
+}
+
+# デフォルトのダミーカラム構成（基本カラムと合わせて300カラム）
+DEFAULT_TYPE_MIX = {
+    "varchar": 50,
+    "int": 50,
+    "decimal": 50,
+    "date": 50,
+    "datetime": 50,
+    "boolean": 42,
+}
+
+BOOL_VALUES = ['true', 'false', '1', '0', 'yes', 'no']
+INVALID_BOOL_VALUES = ['maybe', 'invalid', 'unknown', 'abc']
+INVALID_INT_VALUES = ['abc', 'text', 'invalid', 'NaN']
+INVALID_DECIMAL_VALUES = ['not_a_number', 'invalid', 'abc123']
+BASE_DATE = datetime(2020, 1, 1)
+
+
+def resolve_type_mix(columns: Optional[int] = None, weights: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    ダミーカラムの種類ごとの数を決める
+
+    Args:
+        columns: 基本カラムを含めた総カラム数（省略時はweightsの数をそのまま使う）
+        weights: 種類ごとの比率（省略時はDEFAULT_TYPE_MIX）
+    """
+    weights = dict(weights or DEFAULT_TYPE_MIX)
+    unknown = set(weights) - set(DUMMY_COLUMN_TYPES)
+    if unknown:
+        raise ValueError(f"未対応のカラム種類です: {unknown}")
+    if columns is None:
+        return weights
+
+    dummy_total = max(columns - len(BASE_COLUMNS), 0)
+    weight_total = sum(weights.values())
+    if weight_total <= 0:
+        raise ValueError("カラム種類の比率が指定されていません")
+
+    # 比率に応じて配分し、端数は比率の大きい種類から割り当てる
+    counts = {kind: dummy_total * weight // weight_total for kind, weight in weights.items()}
+    remainder = dummy_total - sum(counts.values())
+    for kind in sorted(weights, key=lambda k: -weights[k])[:remainder]:
+        counts[kind] += 1
+    return counts
+
+
+def dummy_columns(type_mix: Dict[str, int]) -> List[Tuple[str, str]]:
+    """ダミーカラムの (カラム名, 種類) のリスト"""
+    columns = []
+    for kind, count in type_mix.items():
+        for i in range(1, count + 1):
+            columns.append((f"dummy_{kind}_{i:03d}", kind))
+    return columns
+
+
+def generate_ddl(type_mix: Optional[Dict[str, int]] = None) -> str:
     """300カラムのDDL定義を生成"""
-    ddl = """-- ユーザーテーブルのサンプルDDL（300カラム）
-CREATE TABLE users (
-    id INT NOT NULL,
-    username VARCHAR(50) NOT NULL,
-    email VARCHAR(100) NOT NULL,
-    age INT,
-    balance DECIMAL(10,2),
-    is_active BOOLEAN NOT NULL,
-    created_at DATETIME,
-    birth_date DATE,
-"""
-
-    # VARCHAR型ダミーカラム（50個）
-    for i in range(1, 51):
-        ddl += f"    dummy_varchar_{i:03d} VARCHAR(100),\n"
-
-    # INT型ダミーカラム（50個）
-    for i in range(1, 51):
-        ddl += f"    dummy_int_{i:03d} INT,\n"
-
-    # DECIMAL型ダミーカラム（50個）
-    for i in range(1, 51):
-        ddl += f"    dummy_decimal_{i:03d} DECIMAL(10,2),\n"
-
-    # DATE型ダミーカラム（50個）
-    for i in range(1, 51):
-        ddl += f"    dummy_date_{i:03d} DATE,\n"
-
-    # DATETIME型ダミーカラム（50個）
-    for i in range(1, 51):
-        ddl += f"    dummy_datetime_{i:03d} DATETIME,\n"
-
-    # BOOLEAN型ダミーカラム（42個）
-    for i in range(1, 42):
-        ddl += f"    dummy_boolean_{i:03d} BOOLEAN,\n"
-
-    # 最後のカラム（カンマなし）
-    ddl += f"    dummy_boolean_042 BOOLEAN\n"
-    ddl += ");\n"
-
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    definitions = [f"{name} {definition}" for name, definition in BASE_COLUMNS]
+    definitions += [f"{name} {DUMMY_COLUMN_TYPES[kind]}" for name, kind in dummy_columns(type_mix)]
+
+    total = len(definitions)
+    ddl = f"-- ユーザーテーブルのサンプルDDL（{total}カラム）\nCREATE TABLE users (\n"
+    ddl += ",\n".join(f"    {definition}" for definition in definitions)
+    ddl += "\n);\n"
     return ddl
 
-def generate_csv_data(num_rows=50000):
-    """50000行のテストデータを生成（validとinvalidデータを含む）"""
 
-    # ヘッダー生成
-    headers = ["id", "username", "email", "age", "balance", "is_active", "created_at", "birth_date"]
-
-    # ダミーカラムのヘッダー追加
-    for i in range(1, 51):
-        headers.append(f"dummy_varchar_{i:03d}")
-    for i in range(1, 51):
-        headers.append(f"dummy_int_{i:03d}")
-    for i in range(1, 51):
-        headers.append(f"dummy_decimal_{i:03d}")
-    for i in range(1, 51):
-        headers.append(f"dummy_date_{i:03d}")
-    for i in range(1, 51):
-        headers.append(f"dummy_datetime_{i:03d}")
-    for i in range(1, 43):
-        headers.append(f"dummy_boolean_{i:03d}")
-
-    # CSVヘッダー
-    csv_content = ",".join(headers) + "\n"
-
-    # データ行生成
-    base_date = datetime(2020, 1, 1)
-    bool_values = ['true', 'false', '1', '0', 'yes', 'no']
-    invalid_bool_values = ['maybe', 'invalid', 'unknown', 'abc']
-    invalid_int_values = ['abc', 'text', 'invalid', 'NaN']
-    invalid_decimal_values = ['not_a_number', 'invalid', 'abc123']
+def generate_headers(type_mix: Optional[Dict[str, int]] = None) -> List[str]:
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    return [name for name, _ in BASE_COLUMNS] + [name for name, _ in dummy_columns(type_mix)]
+
+
+def _base_values(rng: random.Random, row_id: int, is_invalid_row: bool) -> List[str]:
+    row_data = [str(row_id)]
+
+    # username (NOT NULL)
+    if is_invalid_row and rng.random() < 0.1:
+        row_data.append("NULL" if rng.random() < 0.5 else "")
+    elif is_invalid_row and rng.random() < 0.1:
+        # VARCHAR(50)制約違反（長すぎる文字列）
+        row_data.append("this_is_a_very_long_username_that_exceeds_varchar_50_limit_for_sure")
+    else:
+        row_data.append(f"user{row_id}")
+
+    # email (NOT NULL)
+    if is_invalid_row and rng.random() < 0.1:
+        row_data.append("NULL" if rng.random() < 0.5 else "")
+    elif is_invalid_row and rng.random() < 0.1:
+        # VARCHAR(100)制約違反
+        row_data.append("this_is_an_extremely_long_email_address_that_definitely_exceeds_the_varchar_100_limit_set_in_ddl@example.com")
+    else:
+        row_data.append(f"user{row_id}@example.com")
+
+    # age (INT, nullable)
+    if is_invalid_row and rng.random() < 0.2:
+        row_data.append(rng.choice(INVALID_INT_VALUES))
+    elif is_invalid_row and rng.random() < 0.1:
+        row_data.append(str(rng.randint(2147483648, 3000000000)))  # INT範囲外
+    else:
+        row_data.append(str(rng.randint(18, 80)) if rng.random() > 0.1 else "")
+
+    # balance (DECIMAL(10,2), nullable)
+    if is_invalid_row and rng.random() < 0.2:
+        row_data.append(rng.choice(INVALID_DECIMAL_VALUES))
+    elif is_invalid_row and rng.random() < 0.1:
+        row_data.append("99999999999.99")  # 全体桁数超過
+    elif is_invalid_row and rng.random() < 0.1:
+        row_data.append(f"{rng.uniform(0, 10000):.4f}")  # 小数部桁数超過
+    else:
+        row_data.append(f"{rng.uniform(0, 100000):.2f}" if rng.random() > 0.1 else "")
+
+    # is_active (BOOLEAN, NOT NULL)
+    if is_invalid_row and rng.random() < 0.2:
+        row_data.append(rng.choice(INVALID_BOOL_VALUES))
+    elif is_invalid_row and rng.random() < 0.1:
+        row_data.append("NULL")
+    else:
+        row_data.append(rng.choice(BOOL_VALUES))
+
+    # created_at (DATETIME, nullable)
+    if is_invalid_row and rng.random() < 0.2:
+        row_data.append(rng.choice(['invalid_datetime', 'not_a_date', '2024-13-01 10:00:00']))
+    elif rng.random() > 0.1:
+        dt = BASE_DATE + timedelta(days=rng.randint(0, 1825))
+        row_data.append(dt.strftime("%Y-%m-%d %H:%M:%S"))
+    else:
+        row_data.append("")
+
+    # birth_date (DATE, nullable)
+    if is_invalid_row and rng.random() < 0.2:
+        row_data.append(rng.choice(['invalid_date', '2024-13-40', '1990-02-30', 'not_a_date']))
+    elif rng.random() > 0.1:
+        bd = datetime(rng.randint(1940, 2010), rng.randint(1, 12), rng.randint(1, 28))
+        row_data.append(bd.strftime("%Y-%m-%d"))
+    else:
+        row_data.append("")
+
+    return row_data
+
+
+def _invalid_dummy_value(rng: random.Random, kind: str) -> str:
+    if kind == "varchar":
+        # VARCHAR(100)制約違反
+        return "a" * 150
+    if kind == "int":
+        return rng.choice(INVALID_INT_VALUES)
+    if kind == "decimal":
+        return rng.choice(INVALID_DECIMAL_VALUES)
+    if kind == "date":
+        return rng.choice(['invalid', '2024-99-99', 'not_date'])
+    if kind == "datetime":
+        return rng.choice(['invalid', '2024-01-01 99:99:99', 'not_datetime'])
+    return rng.choice(INVALID_BOOL_VALUES)
+
+
+def _valid_dummy_value(rng: random.Random, kind: str) -> str:
+    if kind == "varchar":
+        return f"text_{rng.randint(1, 1000)}"
+    if kind == "int":
+        return str(rng.randint(1, 10000))
+    if kind == "decimal":
+        return f"{rng.uniform(0, 10000):.2f}"
+    if kind == "date":
+        d = datetime(rng.randint(2000, 2024), rng.randint(1, 12), rng.randint(1, 28))
+        return d.strftime("%Y-%m-%d")
+    if kind == "datetime":
+        dt = BASE_DATE + timedelta(days=rng.randint(0, 1825), hours=rng.randint(0, 23))
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    return rng.choice(BOOL_VALUES)
+
+
+def iter_csv_rows(num_rows: int, type_mix: Optional[Dict[str, int]] = None, error_rate: float = 0.01,
+                  rng: Optional[random.Random] = None) -> Iterator[List[str]]:
+    """
+    データ行を1行ずつ生成（validとinvalidデータを含む）
+
+    Args:
+        num_rows: 生成する行数
+        type_mix: ダミーカラムの種類ごとの数
+        error_rate: invalidなデータを含む行の割合
+        rng: 乱数生成器（シードを固定すると同じデータを再現できる）
+    """
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    rng = rng or random.Random()
+    columns = dummy_columns(type_mix)
 
     for row_id in range(1, num_rows + 1):
-        row_data = []
-
-        # 1%の確率でinvalidなデータを生成
-        is_invalid_row = random.random() < 0.01
-
-        # 基本カラム
-        row_data.append(str(row_id))
-
-        # username (NOT NULL)
-        if is_invalid_row and random.random() < 0.1:
-            row_data.append("NULL" if random.random() < 0.5 else "")
-        elif is_invalid_row and random.random() < 0.1:
-            # VARCHAR(50)制約違反（長すぎる文字列）
-            row_data.append("this_is_a_very_long_username_that_exceeds_varchar_50_limit_for_sure")
-        else:
-            row_data.append(f"user{row_id}")
-
-        # email (NOT NULL)
-        if is_invalid_row and random.random() < 0.1:
-            row_data.append("NULL" if random.random() < 0.5 else "")
-        elif is_invalid_row and random.random() < 0.1:
-            # VARCHAR(100)制約違反
-            row_data.append("this_is_an_extremely_long_email_address_that_definitely_exceeds_the_varchar_100_limit_set_in_ddl@example.com")
-        else:
-            row_data.append(f"user{row_id}@example.com")
-
-        # age (INT, nullable)
-        if is_invalid_row and random.random() < 0.2:
-            row_data.append(random.choice(invalid_int_values))
-        elif is_invalid_row and random.random() < 0.1:
-            row_data.append(str(random.randint(2147483648, 3000000000)))  # INT範囲外
-        else:
-            row_data.append(str(random.randint(18, 80)) if random.random() > 0.1 else "")
-
-        # balance (DECIMAL(10,2), nullable)
-        if is_invalid_row and random.random() < 0.2:
-            row_data.append(random.choice(invalid_decimal_values))
-        elif is_invalid_row and random.random() < 0.1:
-            row_data.append("99999999999.99")  # 全体桁数超過
-        elif is_invalid_row and random.random() < 0.1:
-            row_data.append(f"{random.uniform(0, 10000):.4f}")  # 小数部桁数超過
-        else:
-            row_data.append(f"{random.uniform(0, 100000):.2f}" if random.random() > 0.1 else "")
-
-        # is_active (BOOLEAN, NOT NULL)
-        if is_invalid_row and random.random() < 0.2:
-            row_data.append(random.choice(invalid_bool_values))
-        elif is_invalid_row and random.random() < 0.1:
-            row_data.append("NULL")
-        else:
-            row_data.append(random.choice(bool_values))
-
-        # created_at (DATETIME, nullable)
-        if is_invalid_row and random.random() < 0.2:
-            row_data.append(random.choice(['invalid_datetime', 'not_a_date', '2024-13-01 10:00:00']))
-        elif random.random() > 0.1:
-            dt = base_date + timedelta(days=random.randint(0, 1825))
-            row_data.append(dt.strftime("%Y-%m-%d %H:%M:%S"))
-        else:
-            row_data.append("")
-
-        # birth_date (DATE, nullable)
-        if is_invalid_row and random.random() < 0.2:
-            row_data.append(random.choice(['invalid_date', '2024-13-40', '1990-02-30', 'not_a_date']))
-        elif random.random() > 0.1:
-            bd = datetime(random.randint(1940, 2010), random.randint(1, 12), random.randint(1, 28))
-            row_data.append(bd.strftime("%Y-%m-%d"))
-        else:
-            row_data.append("")
-
-        # VARCHAR型ダミーカラム（50個）
-        for i in range(50):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                # VARCHAR(100)制約違反
-                row_data.append("a" * 150)
-            elif random.random() > 0.2:
-                row_data.append(f"text_{random.randint(1, 1000)}")
+        is_invalid_row = rng.random() < error_rate
+        row_data = _base_values(rng, row_id, is_invalid_row)
+
+        # 種類ごとに先頭5カラムのみinvalidなデータを入れる
+        position = {}
+        for _, kind in columns:
+            i = position.get(kind, 0)
+            position[kind] = i + 1
+            if is_invalid_row and i < 5 and rng.random() < 0.3:
+                row_data.append(_invalid_dummy_value(rng, kind))
+            elif rng.random() > 0.2:
+                row_data.append(_valid_dummy_value(rng, kind))
             else:
                 row_data.append("")
 
-        # INT型ダミーカラム（50個）
-        for i in range(50):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                row_data.append(random.choice(invalid_int_values))
-            elif random.random() > 0.2:
-                row_data.append(str(random.randint(1, 10000)))
-            else:
-                row_data.append("")
+        yield row_data
 
-        # DECIMAL型ダミーカラム（50個）
-        for i in range(50):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                row_data.append(random.choice(invalid_decimal_values))
-            elif random.random() > 0.2:
-                row_data.append(f"{random.uniform(0, 10000):.2f}")
-            else:
-                row_data.append("")
 
-        # DATE型ダミーカラム（50個）
-        for i in range(50):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                row_data.append(random.choice(['invalid', '2024-99-99', 'not_date']))
-            elif random.random() > 0.2:
-                d = datetime(random.randint(2000, 2024), random.randint(1, 12), random.randint(1, 28))
-                row_data.append(d.strftime("%Y-%m-%d"))
-            else:
-                row_data.append("")
+def generate_csv_data(num_rows=50000, type_mix=None, error_rate=0.01, rng=None):
+    """50000行のテストデータを生成（validとinvalidデータを含む）"""
+    lines = [",".join(generate_headers(type_mix))]
+    lines.extend(",".join(row) for row in iter_csv_rows(num_rows, type_mix, error_rate, rng))
+    return "\n".join(lines) + "\n"
 
-        # DATETIME型ダミーカラム（50個）
-        for i in range(50):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                row_data.append(random.choice(['invalid', '2024-01-01 99:99:99', 'not_datetime']))
-            elif random.random() > 0.2:
-                dt = base_date + timedelta(days=random.randint(0, 1825), hours=random.randint(0, 23))
-                row_data.append(dt.strftime("%Y-%m-%d %H:%M:%S"))
-            else:
-                row_data.append("")
 
-        # BOOLEAN型ダミーカラム（42個）
-        for i in range(42):
-            if is_invalid_row and i < 5 and random.random() < 0.3:
-                row_data.append(random.choice(invalid_bool_values))
-            elif random.random() > 0.2:
-                row_data.append(random.choice(bool_values))
-            else:
-                row_data.append("")
+def write_dataset(ddl_path: str, csv_path: str, num_rows: int = 50000,
+                  type_mix: Optional[Dict[str, int]] = None, error_rate: float = 0.01,
+                  seed: Optional[int] = None, progress: bool = False):
+    """DDLとCSVをファイルに書き出す（seedを指定すると同じ内容を再現できる）"""
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    rng = random.Random(seed)
 
-        csv_content += ",".join(row_data) + "\n"
+    with open(ddl_path, "w", encoding="utf-8") as f:
+        f.write(generate_ddl(type_mix))
 
-        # 進捗表示（1000行ごと）
-        if row_id % 1000 == 0:
-            print(f"生成中: {row_id}/{num_rows} 行")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(",".join(generate_headers(type_mix)) + "\n")
+        for row_id, row in enumerate(iter_csv_rows(num_rows, type_mix, error_rate, rng), start=1):
+            f.write(",".join(row) + "\n")
 
-    return csv_content
+            # 進捗表示（1000行ごと）
+            if progress and row_id % 1000 == 0:
+                print(f"生成中: {row_id}/{num_rows} 行")
 
-def main():
-    print("300カラムのDDL定義を生成中...")
-    ddl_content = generate_ddl()
 
-    with open("tests/sample_users.sql", "w", encoding="utf-8") as f:
-        f.write(ddl_content)
-    print("✓ DDLファイルを生成しました: tests/sample_users.sql")
+def parse_type_mix(text: str) -> Dict[str, int]:
+    """'int=50,varchar=50' 形式のカラム構成を解析"""
+    type_mix = {}
+    for item in text.split(','):
+        kind, _, count = item.partition('=')
+        type_mix[kind.strip()] = int(count)
+    return type_mix
 
-    print("\n50000行のテストデータを生成中...")
-    csv_content = generate_csv_data(50000)
 
-    with open("tests/sample_users_valid.csv", "w", encoding="utf-8") as f:
-        f.write(csv_content)
-    print("✓ CSVファイルを生成しました: tests/sample_users_valid.csv")
+def main():
+    parser = argparse.ArgumentParser(description='テスト用のDDLとCSVデータを生成')
+    parser.add_argument('--rows', type=int, default=50000, help='生成する行数（デフォルト: 50000）')
+    parser.add_argument('--columns', type=int, default=None, help='総カラム数（デフォルト: 300）')
+    parser.add_argument('--type-mix', type=parse_type_mix, default=None,
+                        help='ダミーカラムの種類ごとの比率（例: int=50,varchar=50,date=20）')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='invalidなデータを含む行の割合（デフォルト: 0.01）')
+    parser.add_argument('--seed', type=int, default=None, help='乱数シード（指定すると同じデータを再現）')
+    parser.add_argument('--ddl-output', default='tests/sample_users.sql', help='DDLの出力先')
+    parser.add_argument('--csv-output', default='tests/sample_users_valid.csv', help='CSVの出力先')
+    args = parser.parse_args()
+
+    type_mix = resolve_type_mix(args.columns, args.type_mix)
+    total_columns = len(BASE_COLUMNS) + sum(type_mix.values())
+
+    print(f"{total_columns}カラムのDDL定義と{args.rows}行のテストデータを生成中...")
+    write_dataset(args.ddl_output, args.csv_output, args.rows, type_mix, args.error_rate, args.seed, progress=True)
+    print(f"✓ DDLファイルを生成しました: {args.ddl_output}")
+    print(f"✓ CSVファイルを生成しました: {args.csv_output}")
 
     print("\n完了しました！")
 
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,94 @@
 import argparse
+import logging
 import sys
 from pathlib import Path
 
+from src.checkpoint import DEFAULT_CHECKPOINT_INTERVAL, CheckpointStore, default_checkpoint_path
+from src.compression import STDIN_PATH
 from src.csv_checker import CSVChecker
+from src.error_sink import create_error_sink
+from src.key_checker import DEFAULT_MAX_KEYS_IN_MEMORY
+from src.profiler import ValidationProfiler
+from src.schema_cache import SchemaCache
+
+# コンソールに表示するエラーの最大件数
+SUMMARY_ERROR_LIMIT = 10
+# エラーサマリーに表示するレコードの最大文字数
+RECORD_PREVIEW_LENGTH = 80
+
+
+def show_checker_messages():
+    """検証の経過（DDLの解析結果等）と警告をそのまま標準出力に表示"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    package_logger = logging.getLogger('src')
+    package_logger.addHandler(handler)
+    package_logger.setLevel(logging.INFO)
+
+
+def format_record(record):
+    """エラーサマリーに表示するレコード（長い場合は末尾を省略）"""
+    text = ','.join(record)
+    if len(text) > RECORD_PREVIEW_LENGTH:
+        text = text[:RECORD_PREVIEW_LENGTH] + '...'
+    return text
+
+
+def print_cache_stats(stats_list):
+    """カラムごとのキャッシュ統計を表示"""
+    stats_list = list(stats_list)
+    hits = sum(stats.hits for stats in stats_list)
+    lookups = sum(stats.lookups for stats in stats_list)
+    disabled = sum(1 for stats in stats_list if stats.disabled)
+
+    print()
+    print("キャッシュ統計:")
+    print(f"  全体: ヒット率 {hits / lookups if lookups else 0:.1%}"
+          f"（{lookups}回参照, 無効化したカラム {disabled}/{len(stats_list)}）")
+    for stats in stats_list:
+        print(f"  - {stats}")
+
+
+def print_error_groups(checker, groups):
+    """カラム×エラー内容ごとの集約結果を表示（最初の例のレコードも表示）"""
+    shown = groups[:SUMMARY_ERROR_LIMIT]
+    records = checker.read_records(group.examples[0].row_number for group in shown)
+    print(f"エラーサマリー（カラム×エラー内容ごと、最大{SUMMARY_ERROR_LIMIT}種類表示）:")
+    for i, group in enumerate(shown, 1):
+        print(f"  {i}. {group}")
+        record = records.get(group.examples[0].row_number)
+        if record is not None:
+            print(f"     レコード（行{group.examples[0].row_number}）: {format_record(record)}")
+    if len(groups) > SUMMARY_ERROR_LIMIT:
+        print(f"  ... 他{len(groups) - SUMMARY_ERROR_LIMIT}種類のエラー")
+
+
+def run_sample(args):
+    """サンプリング検証を実行し、終了コードを返す"""
+    try:
+        schema_cache = None if args.no_schema_cache else SchemaCache(args.schema_cache_dir)
+        checker = CSVChecker(
+            args.ddl, args.csv,
+            encoding=args.encoding,
+            cache_size=args.cache_size,
+            cache_min_hit_rate=args.cache_min_hit_rate,
+            schema_cache=schema_cache,
+        )
+        report = checker.validate_sample(args.sample, seed=args.sample_seed, confidence=args.confidence)
+    except Exception as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        return 2
+
+    print()
+    print("=" * 60)
+    print(report.format_report())
+    print()
+    if report.columns_to_check():
+        print("サンプルでエラーが見つかりました。全件検証で全てのエラーを確認してください。")
+    else:
+        print("サンプルではエラーは見つかりませんでした（全てのレコードの適合を保証するものではありません）。")
+    print("=" * 60)
+    return 1 if report.columns_to_check() else 0
 
 
 def main():
@@ -14,7 +100,22 @@ def main():
 使用例:
   python3 main.py --ddl users.sql --csv users.csv
   python3 main.py --ddl users.sql --csv users.csv --output errors.csv
+  python3 main.py --ddl users.sql --csv users.csv --output errors.jsonl
   python3 main.py --ddl users.sql --csv users.csv --encoding shift_jis
+  python3 main.py --ddl users.sql --csv users.csv --workers 8
+  python3.13t main.py --ddl users.sql --csv users.csv --threads 8
+  python3 main.py --ddl users.sql --csv users.csv.gz
+  zcat users.csv.gz | python3 main.py --ddl users.sql --csv -
+  python3 main.py --ddl users.sql --csv users.csv --cache-size 4096
+  python3 main.py --ddl users.sql --csv users.csv --profile --profile-output profile.json
+  python3 main.py --ddl users.sql --csv users.csv --sample 10000
+  python3 main.py --ddl users.sql --csv users.csv --fail-fast
+  python3 main.py --ddl users.sql --csv users.csv --max-errors 1000 --summary
+  python3 main.py --ddl users.sql --csv users.csv --checkpoint users.ckpt.json
+  python3 main.py --ddl users.sql --csv users.csv --checkpoint users.ckpt.json --resume
+  python3 main.py --ddl users.sql --csv users.csv --incremental
+  python3 main.py --ddl users.sql --csv users.csv --check-keys
+  python3 main.py --ddl users.sql --csv users.csv --stats users.stats.json
         """
     )
 
@@ -27,7 +128,7 @@ def main():
     parser.add_argument(
         '--csv',
         required=True,
-        help='検証するCSVファイルのパス（例: users.csv）'
+        help='検証するCSVファイルのパス（例: users.csv。.gz/.bz2/.xz の圧縮ファイルも可。"-" で標準入力から読み込む）'
     )
 
     parser.add_argument(
@@ -36,13 +137,191 @@ def main():
         help='エラーレポートの出力先ファイルパス（デフォルト: validation_errors.csv）'
     )
 
+    parser.add_argument(
+        '--report-format',
+        choices=['csv', 'jsonl'],
+        default=None,
+        help='エラーレポートの形式（デフォルト: 出力先の拡張子が .jsonl/.ndjson ならjsonl、それ以外はcsv）'
+    )
+
     parser.add_argument(
         '--encoding',
         default='utf-8',
         help='CSVファイルのエンコーディング（デフォルト: utf-8）'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='検証に使うプロセス数。2以上でファイルを分割して並列に検証（デフォルト: 1）'
+    )
+
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=1,
+        help='検証に使うスレッド数。2以上で読み込み・検証・エラーの書き出しをスレッドで並行して処理'
+             '（GILのないPython 3.13t以降で速くなる。--workers とは併用不可。デフォルト: 1）'
+    )
+
+    parser.add_argument(
+        '--engine',
+        choices=['auto', 'python', 'numpy'],
+        default='auto',
+        help='検証エンジン。numpyはNumPyで列単位に一括検証（デフォルト: auto = NumPyがあればnumpy、なければpython）'
+    )
+
+    parser.add_argument(
+        '--reader',
+        choices=['auto', 'stream', 'mmap', 'bytes'],
+        default='auto',
+        help='CSVの読み込み方式。mmapはファイルをメモリマップして読み込む。bytesはmmapに加えてASCIIだけの部分のデコードを省略し、'
+             'デコードできないバイト列をセル単位のエラーとして報告する（デフォルト: auto = 非圧縮でUTF-8/Shift_JIS等ならmmap）'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=0,
+        help='カラムごとに検証結果をキャッシュする値の最大件数。同じ値が繰り返し現れるカラムで有効（デフォルト: 0 = キャッシュなし）'
+    )
+
+    parser.add_argument(
+        '--cache-min-hit-rate',
+        type=float,
+        default=0.5,
+        help='キャッシュのヒット率がこの値を下回ったカラムはキャッシュを無効化（デフォルト: 0.5）'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='工程別・カラム別の処理時間、NULL率、検証中の例外数を表示し、進捗を標準エラー出力に表示'
+    )
+
+    parser.add_argument(
+        '--profile-output',
+        default=None,
+        help='プロファイル結果をJSONで出力するファイルパス（指定すると --profile も有効）'
+    )
+
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        metavar='N',
+        help='エラーがN件に達したら残りのレコードを読み込まずに検証を中断'
+    )
+
+    parser.add_argument(
+        '--max-errors-per-column',
+        type=int,
+        default=None,
+        metavar='N',
+        help='いずれかのカラムのエラーがN件に達したら検証を中断（区切り文字の誤りや列のずれを早期に検出）'
+    )
+
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='最初のエラーで検証を中断（--max-errors 1 と同じ）'
+    )
+
+    parser.add_argument(
+        '--summary',
+        action='store_true',
+        help='エラーを1件ずつではなく、カラム×エラー内容ごとの件数と最初の数件の例に集約して表示・出力'
+    )
+
+    parser.add_argument(
+        '--checkpoint',
+        default=None,
+        metavar='PATH',
+        help='検証の途中経過（バイト位置・行番号・エラー件数・スキーマのハッシュ）を定期的に保存するファイル'
+             '（--resume/--incremental 指定時のデフォルト: CSVファイル名.checkpoint.json）'
+    )
+
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=float,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        metavar='SEC',
+        help=f'チェックポイントを保存する間隔（秒、デフォルト: {DEFAULT_CHECKPOINT_INTERVAL:g}）'
+    )
+
+    resume_group = parser.add_mutually_exclusive_group()
+    resume_group.add_argument(
+        '--resume',
+        action='store_true',
+        help='中断した検証をチェックポイントの続きから再開（エラーレポートにはチェックポイント以降のエラーを追記）'
+    )
+    resume_group.add_argument(
+        '--incremental',
+        action='store_true',
+        help='前回の検証が完了した位置以降に追記されたレコードだけを検証'
+    )
+
+    parser.add_argument(
+        '--check-keys',
+        action='store_true',
+        help='DDLの主キー・一意キーの値がCSV内で重複していないかを検査（全レコードの検証後に報告）'
+    )
+
+    parser.add_argument(
+        '--key-memory-limit',
+        type=int,
+        default=DEFAULT_MAX_KEYS_IN_MEMORY,
+        metavar='N',
+        help='キーの重複の検査でメモリに保持するキーの最大件数。超えた分は一時ファイルに書き出して判定'
+             f'（デフォルト: {DEFAULT_MAX_KEYS_IN_MEMORY}）'
+    )
+
+    parser.add_argument(
+        '--stats',
+        default=None,
+        metavar='PATH',
+        help='検証しながらカラムごとの統計（NULLの件数・率、min/max、VARCHARの最大長、DECIMALの最大精度・スケール、'
+             '重複を除いた値の概数）を集計し、JSONで出力するファイルパス'
+    )
+
+    parser.add_argument(
+        '--sample',
+        type=int,
+        default=None,
+        metavar='N',
+        help='全件検証の代わりに、ファイル全体からランダムにN件のレコードを抽出して検証し、'
+             'カラムごとのエラー率と推定エラー総数を表示（非圧縮ファイルのみ）'
+    )
+
+    parser.add_argument(
+        '--sample-seed',
+        type=int,
+        default=None,
+        help='サンプリングの乱数シード（指定すると同じレコードを抽出する）'
+    )
+
+    parser.add_argument(
+        '--confidence',
+        type=float,
+        default=0.95,
+        help='サンプリング検証の信頼区間の信頼水準（デフォルト: 0.95）'
+    )
+
+    parser.add_argument(
+        '--schema-cache-dir',
+        default=None,
+        help='DDLの解析結果のキャッシュの保存先（デフォルト: 環境変数 PRECHECKER_CACHE_DIR または ~/.cache/prechecker/schemas）'
+    )
+
+    parser.add_argument(
+        '--no-schema-cache',
+        action='store_true',
+        help='DDLの解析結果をキャッシュせず、毎回DDLを解析'
+    )
+
     args = parser.parse_args()
+    show_checker_messages()
 
     # ファイルの存在確認
     ddl_path = Path(args.ddl)
@@ -52,7 +331,7 @@ def main():
         print(f"エラー: DDLファイルが見つかりません: {args.ddl}", file=sys.stderr)
         sys.exit(1)
 
-    if not csv_path.exists():
+    if args.csv != STDIN_PATH and not csv_path.exists():
         print(f"エラー: CSVファイルが見つかりません: {args.csv}", file=sys.stderr)
         sys.exit(1)
 
@@ -62,35 +341,105 @@ def main():
     print(f"DDLファイル: {args.ddl}")
     print(f"CSVファイル: {args.csv}")
     print(f"エンコーディング: {args.encoding}")
+    if args.workers > 1:
+        print(f"ワーカー数: {args.workers}")
+    if args.threads > 1:
+        print(f"スレッド数: {args.threads}")
     print("=" * 60)
     print()
 
+    if args.sample is not None:
+        sys.exit(run_sample(args))
+
     try:
         # CSVチェッカーを実行
-        checker = CSVChecker(args.ddl, args.csv, encoding=args.encoding)
+        # エラーは検出時にレポートへ書き出し、メモリにはサマリー表示分だけ保持する
+        error_sink = create_error_sink(args.output, args.report_format, summary=args.summary)
+        profiler = ValidationProfiler() if args.profile or args.profile_output else None
+        schema_cache = None if args.no_schema_cache else SchemaCache(args.schema_cache_dir)
+        checkpoint_path = args.checkpoint
+        if checkpoint_path is None and (args.resume or args.incremental):
+            checkpoint_path = default_checkpoint_path(args.csv)
+        checkpoint = CheckpointStore(checkpoint_path, args.checkpoint_interval) if checkpoint_path else None
+        checker = CSVChecker(
+            args.ddl, args.csv,
+            encoding=args.encoding,
+            workers=args.workers,
+            threads=args.threads,
+            error_sink=error_sink,
+            max_retained_errors=0 if args.summary else SUMMARY_ERROR_LIMIT,
+            engine=args.engine,
+            reader=args.reader,
+            cache_size=args.cache_size,
+            cache_min_hit_rate=args.cache_min_hit_rate,
+            profiler=profiler,
+            schema_cache=schema_cache,
+            max_errors=args.max_errors,
+            max_errors_per_column=args.max_errors_per_column,
+            fail_fast=args.fail_fast,
+            checkpoint=checkpoint,
+            resume=args.resume,
+            incremental=args.incremental,
+            check_keys=args.check_keys,
+            key_memory_limit=args.key_memory_limit,
+            collect_stats=args.stats is not None,
+        )
         is_valid, errors = checker.validate()
 
         print()
         print("=" * 60)
 
         print("🚀 検証が完了しました 🚀")
+        if checker.stop_reason is not None:
+            print(f"{checker.stop_reason}。行{checker.stopped_row}で検証を中断しました"
+                  f"（検証したレコード: {checker.record_count}件）")
         if is_valid:    
             print("全てのレコードがテーブル定義に適合しています。")
+        elif args.summary:
+            print(f"検出されたエラー: {checker.error_count}件")
+            print()
+            print_error_groups(checker, error_sink.groups())
+            print()
+            print(f"集約レポートを出力しました: {args.output}")
         else:
-            print(f"検出されたエラー: {len(errors)}件")
+            print(f"検出されたエラー: {checker.error_count}件")
             print()
 
             # エラーサマリーを表示（最大10件）
-            print("エラーサマリー（最大10件表示）:")
-            for i, error in enumerate(errors[:10], 1):
+            # mmapリーダーで検証した場合は、レコード境界の索引からエラーのあったレコードを読み直して表示する
+            summary_errors = errors[:SUMMARY_ERROR_LIMIT]
+            records = checker.read_records(error.row_number for error in summary_errors)
+            print(f"エラーサマリー（最大{SUMMARY_ERROR_LIMIT}件表示）:")
+            for i, error in enumerate(summary_errors, 1):
                 print(f"  {i}. {error}")
+                # 同じ行のエラーが続く場合、レコードは最初のエラーの下にだけ表示する
+                record = records.pop(error.row_number, None)
+                if record is not None:
+                    print(f"     レコード: {format_record(record)}")
+
+            if checker.error_count > SUMMARY_ERROR_LIMIT:
+                print(f"  ... 他{checker.error_count - SUMMARY_ERROR_LIMIT}件のエラー")
+
+            # エラーレポートは検証中に書き出し済み
+            print()
+            print(f"エラーレポートを出力しました: {args.output}")
+
+        if checkpoint is not None:
+            print(f"チェックポイントを保存しました: {checkpoint.path}")
 
-            if len(errors) > 10:
-                print(f"  ... 他{len(errors) - 10}件のエラー")
+        if checker.cache_stats:
+            print_cache_stats(checker.cache_stats.values())
 
-            # エラーレポートをファイルに出力
+        if profiler is not None:
             print()
-            checker.export_errors_to_file(args.output)
+            print(profiler.format_report())
+            if args.profile_output:
+                profiler.write_json(args.profile_output)
+                print(f"プロファイル結果を出力しました: {args.profile_output}")
+
+        if checker.stats is not None:
+            checker.stats.write_json(args.stats)
+            print(f"カラムの統計を出力しました: {args.stats}")
 
         print("=" * 60)
 
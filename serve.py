@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from src.client import DEFAULT_HOST, DEFAULT_PORT
+from src.ddl_parser import DDLParser
+from src.schema_cache import SchemaCache
+from src.server import DEFAULT_MAX_QUEUE, DEFAULT_MAX_UPLOAD_SIZE, ValidationServer
+
+
+def main():
+    """検証サーバーのメイン関数"""
+    parser = argparse.ArgumentParser(
+        description='DDLを一度だけ解析して常駐し、HTTPで受け付けたCSVファイルを検証するサーバー',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python3 serve.py --ddl schema.sql
+  python3 serve.py --ddl schema.sql --port 9000 --workers 8
+  python3 serve.py --ddl schema.sql --socket /tmp/prechecker.sock
+  python3 serve.py --ddl schema.sql --data-dir /data/exports
+        """
+    )
+
+    parser.add_argument(
+        '--ddl',
+        required=True,
+        help='CREATE TABLE文を含むDDLファイルのパス（複数のテーブルを定義可）'
+    )
+
+    parser.add_argument(
+        '--host',
+        default=DEFAULT_HOST,
+        help=f'待ち受けるアドレス（デフォルト: {DEFAULT_HOST}）'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=DEFAULT_PORT,
+        help=f'待ち受けるポート（デフォルト: {DEFAULT_PORT}）'
+    )
+
+    parser.add_argument(
+        '--socket',
+        default=None,
+        metavar='PATH',
+        help='TCPの代わりにUnixドメインソケットで待ち受ける'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='同時に検証するファイル数（デフォルト: CPU数）'
+    )
+
+    parser.add_argument(
+        '--max-queue',
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help=f'実行待ちのジョブの上限。超えたリクエストは503を返す（デフォルト: {DEFAULT_MAX_QUEUE}）'
+    )
+
+    parser.add_argument(
+        '--max-upload-size',
+        type=int,
+        default=DEFAULT_MAX_UPLOAD_SIZE,
+        metavar='BYTES',
+        help=f'アップロードできるCSVの最大バイト数。超えたリクエストは413を返す（デフォルト: {DEFAULT_MAX_UPLOAD_SIZE}）'
+    )
+
+    parser.add_argument(
+        '--upload-dir',
+        default=None,
+        help='アップロードされたCSVを検証中に保存するディレクトリ（デフォルト: システムの一時ディレクトリ）'
+    )
+
+    parser.add_argument(
+        '--data-dir',
+        default=None,
+        help='path= で検証できるファイルのディレクトリ（デフォルト: なし = ファイルの内容の送信のみ受け付ける）'
+    )
+
+    parser.add_argument(
+        '--engine',
+        choices=['auto', 'python', 'numpy'],
+        default='auto',
+        help='検証エンジン（デフォルト: auto）'
+    )
+
+    parser.add_argument(
+        '--reader',
+        choices=['auto', 'stream', 'mmap', 'bytes'],
+        default='auto',
+        help='CSVの読み込み方式（デフォルト: auto）'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=0,
+        help='カラムごとに検証結果をキャッシュする値の最大件数（デフォルト: 0 = キャッシュなし）'
+    )
+
+    parser.add_argument(
+        '--schema-cache-dir',
+        default=None,
+        help='DDLの解析結果のキャッシュの保存先（デフォルト: 環境変数 PRECHECKER_CACHE_DIR または ~/.cache/prechecker/schemas）'
+    )
+
+    parser.add_argument(
+        '--no-schema-cache',
+        action='store_true',
+        help='DDLの解析結果をキャッシュせず、毎回DDLを解析'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        # 全てのCREATE TABLE文を起動時に一度だけ解析し、各ワーカーに渡す
+        if args.no_schema_cache:
+            tables = DDLParser(args.ddl).parse_tables()
+        else:
+            tables = SchemaCache(args.schema_cache_dir).parse_tables(args.ddl)
+        if not tables:
+            raise ValueError("DDLにCREATE TABLE文が見つかりません")
+
+        options = {
+            'engine': args.engine,
+            'reader': args.reader,
+            'cache_size': args.cache_size,
+        }
+        server = ValidationServer(
+            args.ddl, tables,
+            workers=args.workers,
+            max_queue=args.max_queue,
+            options=options,
+            upload_dir=args.upload_dir,
+            max_upload_size=args.max_upload_size,
+            data_dir=args.data_dir,
+        )
+        address = args.socket or f"http://{args.host}:{args.port}"
+
+        def on_ready():
+            print("=" * 60)
+            print("CSVインポート事前チェックツール（検証サーバー）")
+            print("=" * 60)
+            print(f"DDLファイル: {args.ddl}（{len(tables)}テーブル: {', '.join(tables)}）")
+            print(f"ワーカー数: {args.workers}")
+            print(f"待ち受け: {address}")
+            print(f"path= で検証できるディレクトリ: {args.data_dir or 'なし（ファイルの内容の送信のみ）'}")
+            print("=" * 60, flush=True)
+
+        asyncio.run(server.serve(args.host, args.port, socket_path=args.socket, on_ready=on_ready))
+        print()
+        print("検証サーバーを停止しました")
+
+    except Exception as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,6 @@
+import logging
+
 __version__ = "0.1.0"
+
+# 検証の経過・警告はライブラリとしては表示しない（main.py は標準出力に表示する）
+logging.getLogger(__name__).addHandler(logging.NullHandler())
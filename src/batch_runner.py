@@ -0,0 +1,416 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .compression import COMPRESSED_EXTENSIONS
+from .csv_checker import CSVChecker, collect_warnings
+from .ddl_parser import ColumnDefinition, TableDefinition
+from .error_sink import create_error_sink
+from .foreign_key_checker import ForeignKeyCheck, build_key_index
+from .key_checker import column_data_types
+
+# 一括検証の対象とするファイルの拡張子（圧縮ファイル users.csv.gz 等を含む）
+CSV_EXTENSIONS = ('.csv',) + tuple(f".csv{ext}" for ext in COMPRESSED_EXTENSIONS)
+
+# ファイルごとの検証結果
+STATUS_OK = 'ok'
+STATUS_INVALID = 'invalid'
+STATUS_UNMATCHED = 'unmatched'
+STATUS_FAILED = 'failed'
+STATUS_LABELS = {
+    STATUS_OK: '適合',
+    STATUS_INVALID: 'エラーあり',
+    STATUS_UNMATCHED: 'テーブル不明',
+    STATUS_FAILED: '検証失敗',
+}
+
+
+@dataclass
+class BatchJob:
+    csv_file_path: str
+    table_name: Optional[str]
+    size: int
+
+
+@dataclass
+class KeyIndexJob:
+    """参照先テーブルのキーの索引の作成ジョブ（同じ参照先を参照する全ての子テーブルで共有する）"""
+    ref_table: str
+    ref_columns: List[str]
+    csv_file_paths: List[str]
+    index_path: str
+    key_count: int = 0
+    # 作成に失敗した場合の理由
+    message: str = ''
+    # 参照先のカラムのデータ型
+    ref_data_types: Optional[List[str]] = None
+
+
+@dataclass
+class BatchResult:
+    csv_file_path: str
+    table_name: Optional[str]
+    status: str
+    record_count: int = 0
+    error_count: int = 0
+    seconds: float = 0.0
+    error_report_path: Optional[str] = None
+    # カラムの統計のJSON（統計を集計した場合のみ）
+    stats_path: Optional[str] = None
+    message: str = ''
+    warnings: List[str] = field(default_factory=list)
+
+    def __str__(self):
+        line = f"[{STATUS_LABELS[self.status]}] {self.csv_file_path}"
+        if self.table_name:
+            line += f" -> {self.table_name}"
+        if self.status in (STATUS_OK, STATUS_INVALID):
+            line += f"（{self.record_count}行, エラー {self.error_count}件, {self.seconds:.1f}秒）"
+        if self.message:
+            line += f": {self.message}"
+        return line
+
+
+def find_csv_files(csv_dir: str) -> List[str]:
+    """ディレクトリ直下のCSVファイルをファイル名順に返す"""
+    return sorted(
+        os.path.join(csv_dir, name) for name in os.listdir(csv_dir)
+        if name.lower().endswith(CSV_EXTENSIONS) and os.path.isfile(os.path.join(csv_dir, name))
+    )
+
+
+def load_manifest(manifest_path: str) -> Dict[str, str]:
+    """
+    CSVファイルとテーブルの対応表（JSON）を読み込む
+
+    形式: {"exports/users_20240101.csv": "users", ...}
+    相対パスはマニフェストファイルのディレクトリを基準にする。
+
+    Returns:
+        CSVファイルのパス -> テーブル名 の辞書
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, dict):
+        raise ValueError(f"マニフェストの形式が正しくありません: {manifest_path}")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return {
+        os.path.normpath(os.path.join(base_dir, csv_file_path)): table_name
+        for csv_file_path, table_name in entries.items()
+    }
+
+
+def _file_stem(csv_file_path: str) -> str:
+    """拡張子を除いたファイル名（users.csv -> users, users.csv.gz -> users）"""
+    name = os.path.basename(csv_file_path)
+    for ext in CSV_EXTENSIONS:
+        if name.lower().endswith(ext):
+            return name[:-len(ext)]
+    return os.path.splitext(name)[0]
+
+
+def table_for_file(csv_file_path: str, table_names: List[str]) -> Optional[str]:
+    """
+    ファイル名からテーブル名を推定
+
+    拡張子を除いたファイル名（users.csv, users.csv.gz -> users）、またはスキーマ名付きの
+    ファイル名の最後の部分（mydb.users.csv -> users）と一致するテーブルを返す。
+    大文字・小文字は区別しない。
+    """
+    stem = _file_stem(csv_file_path)
+    lower_names = {name.lower(): name for name in table_names}
+    for candidate in (stem, stem.split('.')[-1]):
+        if candidate.lower() in lower_names:
+            return lower_names[candidate.lower()]
+    return None
+
+
+def plan_jobs(csv_files: List[str], table_names: List[str],
+              manifest: Optional[Dict[str, str]] = None) -> List[BatchJob]:
+    """
+    CSVファイルごとの検証ジョブを作成（サイズの大きいファイルから順に処理する）
+
+    マニフェストに記載されたファイルはマニフェストのテーブル名、それ以外はファイル名で対応付ける。
+    """
+    manifest = manifest or {}
+    jobs = []
+    for csv_file_path in csv_files:
+        table_name = manifest.get(os.path.normpath(os.path.abspath(csv_file_path)))
+        if table_name is None:
+            table_name = table_for_file(csv_file_path, table_names)
+        jobs.append(BatchJob(csv_file_path, table_name, os.path.getsize(csv_file_path)))
+
+    # 大きいファイルを先に投入し、最後に大きなファイルだけが残って待たされるのを防ぐ
+    jobs.sort(key=lambda job: -job.size)
+    return jobs
+
+
+def error_report_path(output_dir: str, csv_file_path: str, report_format: str) -> str:
+    stem = _file_stem(csv_file_path)
+    return os.path.join(output_dir, f"{stem}_errors.{report_format}")
+
+
+def stats_report_path(output_dir: str, csv_file_path: str) -> str:
+    stem = _file_stem(csv_file_path)
+    return os.path.join(output_dir, f"{stem}_stats.json")
+
+
+def _resolve_table(name: str, table_names: List[str]) -> Optional[str]:
+    """REFERENCES 句のテーブル名（スキーマ名付きも可）に対応するテーブル名。大文字・小文字は区別しない"""
+    lower_names = {table_name.lower(): table_name for table_name in table_names}
+    return lower_names.get(name.split('.')[-1].lower())
+
+
+def plan_foreign_keys(jobs: List[BatchJob], schema: Dict[str, TableDefinition],
+                      index_dir: str) -> Tuple[List[KeyIndexJob], Dict[str, list], Dict[str, List[str]]]:
+    """
+    子テーブルのCSVファイルごとの外部キーと、作成する参照先の索引を決める
+
+    参照先のテーブルとカラムの組み合わせごとに索引を1つだけ作り、参照する全ての子テーブルで共有する。
+    参照先のテーブルのCSVファイルが複数ある場合は、全てのファイルのキーを1つの索引にまとめる。
+
+    Returns:
+        (index_jobs, links, warnings) のタプル
+        links: 子テーブルのCSVファイルのパス -> (外部キーのカラム, カラムのデータ型, KeyIndexJob) のリスト
+        warnings: 子テーブルのCSVファイルのパス -> 検査できない外部キーの警告のリスト
+    """
+    index_jobs: Dict[Tuple[str, Tuple[str, ...]], KeyIndexJob] = {}
+    links: Dict[str, list] = {}
+    warnings: Dict[str, List[str]] = {}
+    for job in jobs:
+        for fk in schema[job.table_name].foreign_keys:
+            label = f"({', '.join(fk.columns)}) REFERENCES {fk.ref_table}"
+            ref_table = _resolve_table(fk.ref_table, list(schema))
+            if ref_table is None:
+                warnings.setdefault(job.csv_file_path, []).append(
+                    f"警告: 参照先テーブルがDDLに定義されていないため、外部キーを検査しません: {label}")
+                continue
+            # REFERENCES でカラムを省略した場合は参照先の主キー
+            ref_columns = fk.ref_columns or schema[ref_table].primary_key
+            parent_files = sorted(parent.csv_file_path for parent in jobs if parent.table_name == ref_table)
+            if not parent_files or len(ref_columns) != len(fk.columns):
+                reason = "参照先テーブルのCSVファイルがない" if not parent_files else "参照先のカラム数が一致しない"
+                warnings.setdefault(job.csv_file_path, []).append(
+                    f"警告: {reason}ため、外部キーを検査しません: {label}")
+                continue
+
+            index_key = (ref_table, tuple(ref_columns))
+            if index_key not in index_jobs:
+                index_path = os.path.join(index_dir, f"{len(index_jobs)}_{ref_table}.sqlite")
+                index_jobs[index_key] = KeyIndexJob(ref_table, list(ref_columns), parent_files, index_path,
+                                                    ref_data_types=column_data_types(schema[ref_table], ref_columns))
+            links.setdefault(job.csv_file_path, []).append(
+                (fk.columns, column_data_types(schema[job.table_name], fk.columns), index_jobs[index_key]))
+    return list(index_jobs.values()), links, warnings
+
+
+def _build_index_job(index_job: KeyIndexJob, encoding: str) -> KeyIndexJob:
+    """参照先の索引を作成（ワーカープロセスで実行）"""
+    try:
+        index_job.key_count = build_key_index(
+            index_job.index_path, index_job.csv_file_paths, index_job.ref_columns, encoding,
+            index_job.ref_data_types
+        )
+    except Exception as e:
+        index_job.message = str(e)
+    return index_job
+
+
+def _validate_job(ddl_file_path: str, job: BatchJob, columns: List[ColumnDefinition],
+                  output_dir: str, report_format: str, options: dict,
+                  foreign_keys: Optional[List[ForeignKeyCheck]] = None) -> BatchResult:
+    """1ファイルを検証（ワーカープロセスで実行）"""
+    report_path = error_report_path(output_dir, job.csv_file_path, report_format)
+    start = time.perf_counter()
+    try:
+        checker = CSVChecker(
+            ddl_file_path, job.csv_file_path,
+            error_sink=create_error_sink(report_path, report_format),
+            max_retained_errors=0,
+            foreign_keys=foreign_keys,
+            **options
+        )
+        # ファイルごとの警告は集約レポートにまとめる
+        with collect_warnings() as warnings:
+            is_valid, _ = checker.validate(columns)
+        stats_path = None
+        if checker.stats is not None:
+            stats_path = stats_report_path(output_dir, job.csv_file_path)
+            checker.stats.write_json(stats_path)
+    except Exception as e:
+        return BatchResult(job.csv_file_path, job.table_name, STATUS_FAILED,
+                           seconds=time.perf_counter() - start, message=str(e))
+
+    if checker.stop_reason is not None:
+        warnings.append(f"{checker.stop_reason}。行{checker.stopped_row}で検証を中断しました")
+    return BatchResult(
+        job.csv_file_path, job.table_name,
+        STATUS_OK if is_valid else STATUS_INVALID,
+        record_count=checker.record_count,
+        error_count=checker.error_count,
+        seconds=time.perf_counter() - start,
+        error_report_path=None if is_valid else report_path,
+        stats_path=stats_path,
+        warnings=warnings,
+    )
+
+
+def run_batch(ddl_file_path: str, tables: Dict[str, List[ColumnDefinition]], csv_files: List[str],
+              output_dir: str, workers: int = 1, manifest: Optional[Dict[str, str]] = None,
+              report_format: str = 'csv', options: Optional[dict] = None,
+              on_result=None, schema: Optional[Dict[str, TableDefinition]] = None,
+              index_dir: Optional[str] = None) -> List[BatchResult]:
+    """
+    複数のCSVファイルを、解析済みのテーブル定義に対してプロセスプールで並列に検証
+
+    Args:
+        ddl_file_path: DDLファイルのパス
+        tables: DDLParser.parse_tables() の結果
+        csv_files: 検証するCSVファイルのリスト
+        output_dir: ファイルごとのエラーレポートの出力先ディレクトリ
+        workers: 同時に検証するファイル数
+        manifest: CSVファイルのパス -> テーブル名 の対応表
+        report_format: エラーレポートの形式（'csv' または 'jsonl'）
+        options: CSVCheckerに渡す設定（encoding, engine, cache_size等）
+        on_result: ファイルの検証が終わるたびに（終わった順に）BatchResult を受け取る関数
+        schema: DDLParser.parse_schema() の結果。指定した場合は外部キーを検査する
+                （参照先テーブルのCSVファイルからキーの索引を作成し、子テーブルの検証時に照合する）
+        index_dir: 参照先の索引を作成するディレクトリ（省略時はシステムの一時ディレクトリ。検証後に削除する）
+
+    Returns:
+        csv_files と同じ順序の BatchResult のリスト
+    """
+    options = options or {}
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = plan_jobs(csv_files, list(tables), manifest)
+
+    results: Dict[str, BatchResult] = {}
+
+    def finish(result: BatchResult):
+        results[result.csv_file_path] = result
+        if on_result is not None:
+            on_result(result)
+
+    runnable = []
+    for job in jobs:
+        if job.table_name is None or job.table_name not in tables:
+            message = "対応するテーブルが見つかりません"
+            if job.table_name is not None:
+                message = f"テーブル {job.table_name} がDDLに定義されていません"
+            finish(BatchResult(job.csv_file_path, job.table_name, STATUS_UNMATCHED, message=message))
+        else:
+            runnable.append(job)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    index_root = None
+    try:
+        foreign_keys: Dict[str, List[ForeignKeyCheck]] = {}
+        warnings: Dict[str, List[str]] = {}
+        if schema is not None:
+            index_root = tempfile.mkdtemp(prefix='prechecker-fk-', dir=index_dir)
+            foreign_keys, warnings = _prepare_foreign_keys(
+                runnable, schema, index_root, options.get('encoding', 'utf-8'), executor
+            )
+
+        validations = _run_all(executor, _validate_job, [
+            (ddl_file_path, job, tables[job.table_name], output_dir, report_format, options,
+             foreign_keys.get(job.csv_file_path))
+            for job in runnable
+        ])
+        for i, result in validations:
+            result.warnings.extend(warnings.get(runnable[i].csv_file_path, []))
+            finish(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if index_root is not None:
+            shutil.rmtree(index_root, ignore_errors=True)
+
+    return [results[csv_file_path] for csv_file_path in csv_files]
+
+
+def _run_all(executor: Optional[ProcessPoolExecutor], fn, arg_lists: List[tuple]) -> Iterator[Tuple[int, object]]:
+    """
+    プロセスプール（executor がNoneの場合はこのプロセス）で実行し、(arg_lists の番号, 結果) を終わった順に返す
+
+    先に投入したファイルの検証が長くかかっても、終わったものから結果を受け取れるようにする。
+    """
+    if executor is None:
+        for i, args in enumerate(arg_lists):
+            yield i, fn(*args)
+        return
+    futures = {executor.submit(fn, *args): i for i, args in enumerate(arg_lists)}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _prepare_foreign_keys(jobs: List[BatchJob], schema: Dict[str, TableDefinition], index_dir: str,
+                          encoding: str, executor: Optional[ProcessPoolExecutor]
+                          ) -> Tuple[Dict[str, List[ForeignKeyCheck]], Dict[str, List[str]]]:
+    """
+    参照先の索引を作成し、子テーブルのCSVファイルごとに検査する外部キーを返す
+
+    Returns:
+        (foreign_keys, warnings) のタプル（いずれもCSVファイルのパスがキー）
+    """
+    index_jobs, links, warnings = plan_foreign_keys(jobs, schema, index_dir)
+    built = {
+        index_job.index_path: index_job
+        for _, index_job in _run_all(executor, _build_index_job, [(index_job, encoding) for index_job in index_jobs])
+    }
+
+    foreign_keys: Dict[str, List[ForeignKeyCheck]] = {}
+    for csv_file_path, fk_links in links.items():
+        for columns, data_types, index_job in fk_links:
+            # ワーカープロセスで作成した場合は結果のコピーを参照する
+            index_job = built[index_job.index_path]
+            if index_job.message:
+                warnings.setdefault(csv_file_path, []).append(
+                    f"警告: 参照先の索引を作成できないため、外部キーを検査しません:"
+                    f" ({', '.join(columns)}) REFERENCES {index_job.ref_table}: {index_job.message}")
+                continue
+            foreign_keys.setdefault(csv_file_path, []).append(
+                ForeignKeyCheck(columns, index_job.ref_table, index_job.ref_columns, index_job.index_path,
+                                index_job.key_count, data_types)
+            )
+    return foreign_keys, warnings
+
+
+def batch_exit_code(results: List[BatchResult]) -> int:
+    """全て適合なら0、エラーのあるファイルまたはテーブル不明のファイルがあれば1、検証に失敗したファイルがあれば2"""
+    statuses = {result.status for result in results}
+    if STATUS_FAILED in statuses:
+        return 2
+    if statuses & {STATUS_INVALID, STATUS_UNMATCHED}:
+        return 1
+    return 0
+
+
+def write_batch_report(results: List[BatchResult], output_file_path: str):
+    """ファイルごとの検証結果をまとめたレポートを出力（拡張子 .json ならJSON、それ以外はCSV）"""
+    if output_file_path.lower().endswith('.json'):
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'exit_code': batch_exit_code(results),
+                'files': [asdict(result) for result in results],
+            }, f, ensure_ascii=False, indent=2)
+        return
+
+    with open(output_file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ファイル', 'テーブル', 'ステータス', 'レコード数', 'エラー件数',
+                         '処理時間（秒）', 'エラーレポート', 'メッセージ'])
+        for result in results:
+            message = result.message or " / ".join(result.warnings)
+            writer.writerow([
+                result.csv_file_path, result.table_name or '', STATUS_LABELS[result.status],
+                result.record_count, result.error_count, f"{result.seconds:.3f}",
+                result.error_report_path or '', message,
+            ])
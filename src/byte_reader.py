@@ -0,0 +1,146 @@
+import io
+from itertools import chain
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .mmap_reader import READ_CHUNK_SIZE, MmapCsvReader, RecordIndex, iter_record_boundaries, parse_chunk
+
+# デコードできないフィールドを (レコード番号, 列番号, ファイル先頭からのバイト位置, フィールドのバイト列) で受け取る関数
+DecodeErrorHandler = Callable[[int, int, Optional[int], bytes], None]
+
+
+def decodes_ascii_as_is(encoding: str) -> bool:
+    """
+    ASCIIの各バイトを同じ文字としてデコードするエンコーディングかを判定
+
+    UTF-8, Shift_JIS, EUC-JP等が該当する。エスケープシーケンスで文字集合を切り替える
+    ISO-2022-JPや、ASCIIを2バイト以上で表現するUTF-16等は該当しない。
+    """
+    try:
+        return all(bytes([byte]).decode(encoding) == chr(byte) for byte in range(128))
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
+class ByteCsvReader(MmapCsvReader):
+    """
+    レコードをバイト列のまま分割し、ASCIIだけのチャンクはエンコーディングのデコードを省略するリーダー
+
+    チャンクをlatin-1（バイトと文字が1対1に対応する）で文字列にしてから分割するため、
+    区切り文字・改行・ダブルクォートの位置はバイト列と変わらない。ASCIIだけのチャンクは
+    そのまま検証に使い、ASCII以外のバイトを含むチャンクだけを指定のエンコーディングでデコードする。
+    デコードできないバイト列を含むチャンクは、フィールドごとにデコードして不正なバイトを
+    置換文字に置き換え、on_decode_error でレコード・列・バイト位置を通知する（読み込みは中断しない）。
+
+    ASCIIの各バイトを同じ文字としてデコードするエンコーディング（decodes_ascii_as_is()）のみ対応。
+
+    使用例:
+        def on_decode_error(record_number, column_index, offset, raw):
+            ...
+
+        with ByteCsvReader('users.csv', 'shift_jis', on_decode_error=on_decode_error) as reader:
+            headers = reader.read_header()
+            for row in reader:
+                ...
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', start: int = 0, end: Optional[int] = None,
+                 chunk_size: int = READ_CHUNK_SIZE, index: Optional[RecordIndex] = None,
+                 on_decode_error: Optional[DecodeErrorHandler] = None):
+        """
+        Args:
+            on_decode_error: デコードできないフィールドを通知する関数（省略時は置換文字に置き換えるだけ）。
+                             レコード番号は読み込み範囲のデータ行の先頭を0とし、空行は数えない
+        """
+        super().__init__(file_path, encoding, start, end, chunk_size, index)
+        self.on_decode_error = on_decode_error
+
+    def _parse_range(self, start: int, end: int, first_record: Optional[int] = None) -> Iterator[List[str]]:
+        text = str(self._view[start:end], 'latin-1')
+        if text.isascii():
+            return parse_chunk(text)
+        try:
+            # フィールドごとにデコードするより、チャンク全体をまとめてデコードする方が速い
+            return parse_chunk(self._decode(start, end))
+        except UnicodeDecodeError:
+            return self._decode_fields(start, end, parse_chunk(text), first_record)
+
+    def _decode_fields(self, start: int, end: int, rows: Iterator[List[str]],
+                       first_record: Optional[int]) -> Iterator[List[str]]:
+        """デコードできないバイト列を含むチャンクのレコードを、フィールドごとにデコードする"""
+        encoding = self.encoding
+        record_ranges = None
+        for number, row in enumerate(rows):
+            if all(field.isascii() for field in row):
+                yield row
+                continue
+            decoded = []
+            for column_index, field in enumerate(row):
+                if field.isascii():
+                    decoded.append(field)
+                    continue
+                raw = field.encode('latin-1')
+                try:
+                    decoded.append(raw.decode(encoding))
+                except UnicodeDecodeError as e:
+                    decoded.append(raw.decode(encoding, 'replace'))
+                    if self.on_decode_error is None or first_record is None:
+                        continue
+                    if record_ranges is None:
+                        record_ranges = self._record_ranges(start, end)
+                    offset = None
+                    if number < len(record_ranges):
+                        offset = self._byte_offset(*record_ranges[number], column_index, raw, e.start)
+                    self.on_decode_error(first_record + number, column_index, offset, raw)
+            yield decoded
+
+    def _record_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """[start, end) の空行を除いたレコードのバイト範囲"""
+        # mmapの読み込み位置はチャンクの境界の走査中のため、チャンクのコピーを走査する
+        chunk = bytes(self._view[start:end])
+        ranges = []
+        record_start = 0
+        for boundary in chain(iter_record_boundaries(io.BytesIO(chunk), 0, 1), [len(chunk)]):
+            if chunk[record_start:boundary].rstrip(b'\r\n'):
+                ranges.append((start + record_start, start + boundary))
+            if boundary >= len(chunk):
+                break
+            record_start = boundary
+        return ranges
+
+    def _byte_offset(self, record_start: int, record_end: int, column_index: int,
+                     raw: bytes, position: int) -> Optional[int]:
+        """レコードの column_index 番目のフィールドの、値の position バイト目のファイル先頭からの位置"""
+        record = bytes(self._view[record_start:record_end])
+        field = _field_start(record, column_index)
+        if field is None:
+            return None
+        field_start, quoted = field
+        if quoted:
+            # クォートされたフィールドの "" はファイル上では2バイト
+            position += raw.count(b'"', 0, position)
+        return record_start + field_start + position
+
+
+def _field_start(record: bytes, column_index: int) -> Optional[Tuple[int, bool]]:
+    """レコードの column_index 番目のフィールドの値の先頭位置と、クォートされているか（見つからない場合None）"""
+    position = 0
+    for _ in range(column_index):
+        if record.startswith(b'"', position):
+            position = _closing_quote(record, position + 1) + 1
+        position = record.find(b',', position)
+        if position < 0:
+            return None
+        position += 1
+    quoted = record.startswith(b'"', position)
+    return position + quoted, quoted
+
+
+def _closing_quote(record: bytes, position: int) -> int:
+    """クォートされたフィールドの閉じクォートの位置（エスケープされた "" は読み飛ばす）"""
+    while True:
+        quote = record.find(b'"', position)
+        if quote < 0:
+            return len(record)
+        if not record.startswith(b'"', quote + 1):
+            return quote
+        position = quote + 2
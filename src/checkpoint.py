@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from . import __version__
+from .ddl_parser import ColumnDefinition
+
+# チェックポイントファイルの形式（項目が変わる場合に更新する）
+CHECKPOINT_FORMAT = 1
+# チェックポイントを書き出す間隔のデフォルト（秒）
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+# ファイルが置き換えられていないかを確認するため、ハッシュを取る先頭と検証済みの末尾のバイト数
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def default_checkpoint_path(csv_file_path: str) -> str:
+    """チェックポイントファイルのデフォルトのパス（CSVファイルと同じディレクトリ）"""
+    return csv_file_path + '.checkpoint.json'
+
+
+def schema_hash(columns: List[ColumnDefinition]) -> str:
+    """検証に使うカラム定義とツールのバージョンのハッシュ（DDLの書式だけの変更では変わらない）"""
+    digest = hashlib.sha256(f"{__version__}\0".encode('utf-8'))
+    digest.update(json.dumps([asdict(col) for col in columns], ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_fingerprint(csv_file_path: str, offset: int) -> str:
+    """
+    ファイルの先頭と、offsetの直前のそれぞれ FINGERPRINT_BYTES バイトのハッシュ
+
+    追記されただけのファイルでは変わらず、ファイルの置き換えや検証済みの範囲の書き換えを検出できる。
+    """
+    digest = hashlib.sha256()
+    with open(csv_file_path, 'rb') as f:
+        digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+        tail_start = max(FINGERPRINT_BYTES, offset - FINGERPRINT_BYTES)
+        if tail_start < offset:
+            f.seek(tail_start)
+            digest.update(f.read(offset - tail_start))
+    return digest.hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    """
+    検証の途中経過（レコード境界のバイト位置と、その位置までの行番号・エラー件数）
+    """
+    csv_file_path: str
+    encoding: str
+    schema_hash: str
+    fingerprint: str
+    byte_offset: int   # 次に検証するレコードの先頭バイト位置
+    row_number: int    # 次に検証するレコードの行番号
+    error_count: int
+    column_error_counts: Dict[str, int] = field(default_factory=dict)
+    report_path: Optional[str] = None
+    report_size: Optional[int] = None  # byte_offset までのエラーを書き出したレポートのバイト数
+    complete: bool = False  # ファイルの終端（書き込み途中の最後のレコードを除く）まで検証したか
+    updated_at: str = ''
+
+    @property
+    def record_count(self) -> int:
+        """byte_offset までに検証したレコード数（ヘッダーの次のレコードが行番号2）"""
+        return self.row_number - 2
+
+    def matches(self, csv_file_path: str, encoding: str, schema: str) -> Optional[str]:
+        """
+        CSVファイルとスキーマが記録時と同じか確認
+
+        Returns:
+            続きから検証できない理由（続きから検証できる場合はNone）
+        """
+        if os.path.abspath(csv_file_path) != self.csv_file_path:
+            return "CSVファイルが異なります"
+        if encoding != self.encoding:
+            return "エンコーディングが異なります"
+        if schema != self.schema_hash:
+            return "テーブル定義が変更されています"
+        try:
+            if os.path.getsize(csv_file_path) < self.byte_offset:
+                return "CSVファイルが前回の検証時より小さくなっています"
+            if file_fingerprint(csv_file_path, self.byte_offset) != self.fingerprint:
+                return "CSVファイルの検証済みの範囲が変更されています"
+        except OSError as e:
+            return f"CSVファイルを読み込めません: {e}"
+        return None
+
+
+class CheckpointStore:
+    """
+    チェックポイントをJSONファイルに保存・読み込みする
+
+    一時ファイルに書いてから置き換えるため、書き込み中に異常終了しても前回のチェックポイントが残る。
+    """
+
+    def __init__(self, path: str, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Args:
+            path: チェックポイントファイルのパス
+            interval: 検証中にチェックポイントを書き出す間隔（秒）
+        """
+        self.path = path
+        self.interval = interval
+        self._last_saved = time.monotonic()
+
+    def load(self) -> Optional[Checkpoint]:
+        """保存されたチェックポイント（ない場合、形式が異なる・壊れている場合はNone）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.pop('format', None) != CHECKPOINT_FORMAT:
+                return None
+            return Checkpoint(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def due(self) -> bool:
+        """前回の書き出しから interval 秒以上経過したか"""
+        return time.monotonic() - self._last_saved >= self.interval
+
+    def save(self, checkpoint: Checkpoint):
+        checkpoint.updated_at = datetime.now().isoformat(timespec='seconds')
+        data = {'format': CHECKPOINT_FORMAT, **asdict(checkpoint)}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._last_saved = time.monotonic()
@@ -0,0 +1,124 @@
+import http.client
+import json
+import os
+import socket
+from typing import Iterator, Optional
+from urllib.parse import urlencode, urlsplit
+
+# 起動の速さを保つため、クライアントは検証処理のモジュールを読み込まない
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_SERVER_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+
+class ServerError(Exception):
+    """検証サーバーがエラーを返した場合の例外"""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """Unixドメインソケットで接続するHTTPConnection"""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ValidationClient:
+    """
+    検証サーバー（ValidationServer）のクライアント
+
+    サーバーから読めるファイルはパスを送って検証し、読めないファイルは内容をアップロードして検証する。
+    """
+
+    def __init__(self, url: str = DEFAULT_SERVER_URL, socket_path: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            url: サーバーのURL（例: http://127.0.0.1:8765）
+            socket_path: 指定した場合はURLの代わりにUnixドメインソケットで接続する
+            timeout: 通信のタイムアウト（秒、省略時は無制限）
+        """
+        self.url = url
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def validate(self, csv_file_path: str, table: Optional[str] = None, upload: bool = False,
+                 encoding: Optional[str] = None, max_errors: Optional[int] = None,
+                 max_errors_per_column: Optional[int] = None, fail_fast: bool = False) -> Iterator[dict]:
+        """
+        CSVファイルを検証し、サーバーから届いたメッセージを順に返す
+
+        Args:
+            csv_file_path: CSVファイルのパス
+            table: テーブル名（省略時はサーバーがファイル名から判定）
+            upload: Trueの場合はファイルの内容を送信する（Falseの場合は絶対パスを送信）
+            encoding, max_errors, max_errors_per_column, fail_fast: CSVCheckerと同じ（省略時はサーバーの設定）
+
+        Returns:
+            {"type": "error", ...}（ValidationErrorの項目）を検出順に、
+            最後に {"type": "summary", ...}（BatchResultの項目）を返すイテレータ
+        """
+        params = {'filename': os.path.basename(csv_file_path)}
+        if table is not None:
+            params['table'] = table
+        if encoding is not None:
+            params['encoding'] = encoding
+        if max_errors is not None:
+            params['max_errors'] = max_errors
+        if max_errors_per_column is not None:
+            params['max_errors_per_column'] = max_errors_per_column
+        if fail_fast:
+            params['fail_fast'] = 'true'
+
+        connection = self._connect()
+        try:
+            if upload:
+                with open(csv_file_path, 'rb') as f:
+                    try:
+                        connection.request('POST', '/validate?' + urlencode(params), body=f,
+                                           headers={'Content-Length': str(os.fstat(f.fileno()).st_size)})
+                    except (BrokenPipeError, ConnectionResetError):
+                        # サーバーがボディを読まずに応答した場合（413・503）も、その応答を読み込む
+                        pass
+            else:
+                params['path'] = os.path.abspath(csv_file_path)
+                connection.request('POST', '/validate?' + urlencode(params))
+            response = connection.getresponse()
+            if response.status != 200:
+                raise ServerError(_error_message(response))
+            for line in response:
+                yield json.loads(line)
+        finally:
+            connection.close()
+
+    def metrics(self) -> dict:
+        """サーバーの稼働状況（実行待ちのジョブ数・スループット等）"""
+        connection = self._connect()
+        try:
+            connection.request('GET', '/metrics')
+            response = connection.getresponse()
+            if response.status != 200:
+                raise ServerError(_error_message(response))
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.socket_path is not None:
+            return _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        url = urlsplit(self.url)
+        return http.client.HTTPConnection(url.hostname, url.port or DEFAULT_PORT, timeout=self.timeout)
+
+
+def _error_message(response: http.client.HTTPResponse) -> str:
+    body = response.read()
+    try:
+        return json.loads(body)['error']
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {response.status} {response.reason}"
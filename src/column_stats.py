@@ -0,0 +1,523 @@
+import json
+import math
+import re
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import compress, repeat
+from operator import add, and_, gt, itemgetter, lt, methodcaller, or_, sub
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .column_validator import (
+    BooleanColumnValidator,
+    DateColumnValidator,
+    DateTimeColumnValidator,
+    DecimalColumnValidator,
+    FloatColumnValidator,
+    IntegerColumnValidator,
+    StringColumnValidator,
+    TimeColumnValidator,
+    UnsupportedColumnValidator,
+    compile_column,
+)
+from .ddl_parser import ColumnDefinition
+from .validator import (
+    DATE_FORMATS,
+    DATETIME_FORMATS,
+    NULL_VALUES,
+    TIME_FORMATS,
+    _match_date,
+    _match_datetime,
+    _match_time,
+)
+
+# HyperLogLogのレジスタ数は 2 ** HLL_PRECISION（標準誤差は約 1.04 / √4096 = 1.6%）
+HLL_PRECISION = 12
+# 重複を除いた値がこの件数以下の間は、値のハッシュを保持して正確に数える
+EXACT_DISTINCT_LIMIT = 256
+# カラムの統計にまとめて加えるレコード数
+STATS_BATCH_SIZE = 1000
+# 型として解釈できない値を含むまとまりを分割する最小の件数（これ以下は1件ずつ処理する）
+MIN_SPLIT_SIZE = 16
+
+# 統計の対象とする値の種類（min/max の比較方法が変わる）
+KIND_INTEGER = 'integer'
+KIND_DECIMAL = 'decimal'
+KIND_FLOAT = 'float'
+KIND_DATE = 'date'
+KIND_DATETIME = 'datetime'
+KIND_TIME = 'time'
+KIND_STRING = 'string'
+# ブール型・未対応の型は min/max を集計しない
+KIND_OTHER = 'other'
+
+
+def _hash32(values: Iterable[str]) -> Iterator[int]:
+    """
+    値の32ビットのハッシュ
+
+    文字列の hash() はプロセスごとに変わるため、CRC32（並列検証の各ワーカーで同じ値）を使う。
+    CRC32は似た値（連番のID等）で上位ビットが偏るため、整数のタプルの hash()（xxHashの攪拌処理。
+    整数のハッシュはプロセスによらず同じ）で攪拌する。値ごとの処理は全てC実装の関数で行う。
+    """
+    values = list(values)
+    try:
+        encoded = list(map(str.encode, values))
+    except UnicodeEncodeError:
+        # デコードできなかったバイト列のサロゲート文字を含む値
+        encoded = list(map(methodcaller('encode', 'utf-8', 'surrogatepass'), values))
+    return map(and_, map(hash, zip(map(zlib.crc32, encoded))), repeat(0xFFFFFFFF))
+
+
+class DistinctCounter:
+    """
+    重複を除いた値の件数を数える（HyperLogLog）
+
+    件数が EXACT_DISTINCT_LIMIT 以下の間は値のハッシュの集合で正確に数え、超えたら
+    2 ** precision 個のレジスタに切り替えて推定する。メモリ使用量は値の件数によらず
+    2 ** precision バイト程度。レジスタごとの最大値を取るだけで、別々に数えた結果をまとめられる。
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self._hashes: Optional[Set[int]] = set()
+        self._registers: Optional[bytearray] = None
+
+    @property
+    def exact(self) -> bool:
+        """count() が推定値ではなく正確な件数か"""
+        return self._registers is None
+
+    def add(self, values: Iterable[str]):
+        """値を追加（重複を除いてから渡すと速い）"""
+        hashes = _hash32(values)
+        if self._registers is not None:
+            self._add_hashes(hashes)
+            return
+        self._hashes.update(hashes)
+        if len(self._hashes) > EXACT_DISTINCT_LIMIT:
+            self._switch_to_registers()
+
+    def merge(self, other: 'DistinctCounter'):
+        if other._registers is None:
+            if self._registers is None:
+                self._hashes |= other._hashes
+                if len(self._hashes) > EXACT_DISTINCT_LIMIT:
+                    self._switch_to_registers()
+            else:
+                self._add_hashes(other._hashes)
+            return
+        if self._registers is None:
+            self._switch_to_registers()
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def count(self) -> int:
+        registers = self._registers
+        if registers is None:
+            return len(self._hashes)
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        # 値ごとではなく、レジスタの値ごとの件数から調和平均を求める
+        harmonic = sum(registers.count(rank) * 2.0 ** -rank for rank in range(max(registers) + 1))
+        estimate = alpha * m * m / harmonic
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # 件数が少ない範囲は空のレジスタの数から推定する（Linear Counting）
+            estimate = m * math.log(m / zeros)
+        elif estimate > 2 ** 32 / 30:
+            # 32ビットのハッシュの衝突を補正する
+            estimate = -2 ** 32 * math.log(1 - estimate / 2 ** 32)
+        return round(estimate)
+
+    def _switch_to_registers(self):
+        self._registers = bytearray(1 << self.precision)
+        self._add_hashes(self._hashes)
+        self._hashes = None
+
+    def _add_hashes(self, hashes: Iterable[int]):
+        registers = self._registers
+        # 上位 precision ビットでレジスタを選び、残りのビットの先頭の0の数 + 1 を記録する
+        rest_bits = 32 - self.precision
+        rest_mask = (1 << rest_bits) - 1
+        for h in hashes:
+            index = h >> rest_bits
+            rank = rest_bits - (h & rest_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+
+# 定型の日付・日時・時刻（_match_date() 等が例外なしで判定する形）
+# （改行で連結した値の各行に一致させる）
+_TEMPORAL_PATTERNS = {
+    KIND_DATE: re.compile(r'^(?:\d{4}([-/])\d\d\1\d\d|\d{8})$', re.ASCII | re.MULTILINE),
+    KIND_DATETIME: re.compile(
+        r'^(?:\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d{1,6})?|\d{4}/\d\d/\d\d \d\d:\d\d:\d\d|\d{14})$',
+        re.ASCII | re.MULTILINE),
+    KIND_TIME: re.compile(r'^\d\d:\d\d(?::\d\d)?$', re.ASCII | re.MULTILINE),
+}
+# 区切り文字のない定型（YYYYMMDD, YYYYMMDDHHMMSS）の長さ
+_COMPACT_LENGTHS = {KIND_DATE: 8, KIND_DATETIME: 14}
+
+
+def _temporal_key(value: str, formats: List[str], key_format: str) -> Optional[str]:
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).strftime(key_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _date_key(value: str) -> Optional[str]:
+    """日付の大小比較のキー（YYYYMMDD）"""
+    is_valid = _match_date(value)
+    if is_valid is None:
+        return _temporal_key(value, DATE_FORMATS, '%Y%m%d')
+    if not is_valid:
+        return None
+    return value if len(value) == 8 else value[0:4] + value[5:7] + value[8:10]
+
+
+def _datetime_key(value: str) -> Optional[str]:
+    """日時の大小比較のキー（YYYYMMDDHHMMSSffffff）"""
+    is_valid = _match_datetime(value)
+    if is_valid is None:
+        return _temporal_key(value, DATETIME_FORMATS, '%Y%m%d%H%M%S%f')
+    if not is_valid:
+        return None
+    if len(value) == 14:
+        return value + '000000'
+    return (value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+            + value[20:].ljust(6, '0'))
+
+
+def _time_key(value: str) -> Optional[str]:
+    """時刻の大小比較のキー（HHMMSS）"""
+    is_valid = _match_time(value)
+    if is_valid is None:
+        return _temporal_key(value, TIME_FORMATS, '%H%M%S')
+    if not is_valid:
+        return None
+    return value[0:2] + value[3:5] + (value[6:8] if len(value) == 8 else '00')
+
+
+def _integer_key(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _decimal_key(value: str) -> Optional[Decimal]:
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return None
+    # NaN・Infinityは大小を比較できないため除く
+    return number if number.is_finite() else None
+
+
+def _float_key(value: str) -> Optional[float]:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return None if math.isnan(number) else number
+
+
+# 値の種類ごとの、大小比較のキーを返す関数（型に合わない値はNone）
+_ORDER_KEYS = {
+    KIND_INTEGER: _integer_key,
+    KIND_DECIMAL: _decimal_key,
+    KIND_FLOAT: _float_key,
+    KIND_DATE: _date_key,
+    KIND_DATETIME: _datetime_key,
+    KIND_TIME: _time_key,
+    KIND_STRING: str,
+}
+
+
+def _batch_keys(kind: str, values: List[str]) -> Optional[list]:
+    """
+    値の大小比較のキーをまとめて求める（値ごとの処理は全てC実装の関数で行う）
+
+    型として解釈できない値や定型外の日付等を1つでも含む場合はNone（_ORDER_KEYS で1件ずつ求める）。
+    定型の日付・日時・時刻は文字列の順が時系列と一致するため値をそのままキーにする
+    （存在しない日付（2月30日等）のキーも返す）。
+    """
+    try:
+        if kind == KIND_INTEGER:
+            return list(map(int, values))
+        if kind == KIND_DECIMAL:
+            keys = list(map(Decimal, values))
+            return keys if all(map(Decimal.is_finite, keys)) else None
+        if kind == KIND_FLOAT:
+            keys = list(map(float, values))
+            return None if any(map(math.isnan, keys)) else keys
+    except (ValueError, InvalidOperation):
+        return None
+    joined = '\n'.join(values)
+    if joined.count('\n') != len(values) - 1 or len(_TEMPORAL_PATTERNS[kind].findall(joined)) != len(values):
+        return None
+    lengths = set(map(len, values))
+    if len(lengths) > 1 and min(lengths) == _COMPACT_LENGTHS.get(kind):
+        # 区切り文字のない形とある形が混在する場合は、文字列の順が時系列と一致しない
+        return None
+    if '/' in joined:
+        return list(map(methodcaller('replace', '/', '-'), values))
+    return list(values)
+
+
+def _pick_valid(keys: list, values: List[str], pick, order_key) -> Optional[str]:
+    """
+    keys の中で pick（min/max）で選んだキーの値のうち、型として解釈できる最初の値
+
+    型として解釈できない値は keys, values から取り除く。
+    """
+    while keys:
+        key = pick(keys)
+        if keys.count(key) == 1:
+            value = values[keys.index(key)]
+        else:
+            # 同じ大きさの値（1.0 と 1.00 等）は文字列の順で決める
+            value = pick(value for other, value in zip(keys, values) if other == key)
+        if order_key(value) is not None:
+            return value
+        index = values.index(value)
+        del keys[index]
+        del values[index]
+    return None
+
+
+@dataclass
+class ColumnStats:
+    """
+    1カラムの統計
+
+    min/max は型として解釈できる値（整数型の abc 等を除く。範囲外の値は含む）の最小・最大を
+    CSVの値のまま保持する。数値は数値として、日付・日時・時刻は時系列で、文字列はコードポイント順で比較する。
+    """
+    name: str
+    data_type: str
+    kind: str
+    # NULL以外の値の件数
+    count: int = 0
+    null_count: int = 0
+    min_value: Optional[str] = None
+    max_value: Optional[str] = None
+    # 文字列型の最大の文字数と、DDLで宣言された長さ（VARCHAR(50) なら50）
+    max_length: Optional[int] = None
+    declared_length: Optional[int] = None
+    # DECIMAL型で使われた全体・小数部の最大桁数と、DDLで宣言された精度・スケール
+    max_precision: Optional[int] = None
+    max_scale: Optional[int] = None
+    declared_precision: Optional[int] = None
+    declared_scale: Optional[int] = None
+    distinct: DistinctCounter = field(default_factory=DistinctCounter)
+
+    @classmethod
+    def for_column(cls, column: ColumnDefinition) -> 'ColumnStats':
+        validator = compile_column(column)
+        stats = cls(column.name, column.data_type, _kind(validator))
+        if stats.kind == KIND_STRING:
+            stats.max_length = 0
+            if isinstance(validator, StringColumnValidator):
+                stats.declared_length = validator.max_length
+        elif stats.kind == KIND_DECIMAL:
+            stats.max_precision = 0
+            stats.max_scale = 0
+            stats.declared_precision = validator.precision
+            stats.declared_scale = validator.scale
+        return stats
+
+    @property
+    def null_rate(self) -> float:
+        total = self.count + self.null_count
+        return self.null_count / total if total else 0.0
+
+    def add_values(self, values: List[str]):
+        """
+        カラムの値をまとめて追加
+
+        値の種類ごとの処理は重複を除いた値に対して、できるだけC実装の関数でまとめて行う。
+        """
+        distinct = set(values)
+        nulls = distinct & NULL_VALUES
+        null_count = 0
+        if nulls:
+            null_count = sum(map(values.count, nulls))
+            distinct -= nulls
+        self.null_count += null_count
+        self.count += len(values) - null_count
+        if not distinct:
+            return
+
+        distinct = list(distinct)
+        self.distinct.add(distinct)
+        if self.kind == KIND_STRING:
+            self.max_length = max(self.max_length, max(map(len, distinct)))
+            self._update_range(min(distinct), max(distinct))
+        elif self.kind != KIND_OTHER:
+            self._add_ordered(distinct)
+
+    def _add_ordered(self, values: List[str]):
+        """数値・日付等の値の min/max（DECIMAL型は桁数も）を更新"""
+        order_key = _ORDER_KEYS[self.kind]
+        keys = _batch_keys(self.kind, values)
+        if keys is None and len(values) > MIN_SPLIT_SIZE:
+            # 型として解釈できない値を含む場合は半分ずつに分け、残りの値はまとめて処理する
+            middle = len(values) // 2
+            self._add_ordered(values[:middle])
+            self._add_ordered(values[middle:])
+            return
+        if keys is None:
+            keyed = [(key, value) for key, value in zip(map(order_key, values), values) if key is not None]
+            if not keyed:
+                return
+            keys, values = map(list, zip(*keyed))
+        if self.kind == KIND_DECIMAL:
+            self._add_digits(values)
+        # まとめて求めたキーでは存在しない日付も比較するため、最小・最大の値だけを1件ずつ判定し直す
+        low = _pick_valid(keys, values, min, order_key)
+        if low is not None:
+            self._update_range(low, _pick_valid(keys, values, max, order_key))
+
+    def _update_range(self, low: str, high: str):
+        if self.min_value is not None:
+            order_key = _ORDER_KEYS[self.kind]
+            low = min((order_key(low), low), (order_key(self.min_value), self.min_value))[1]
+            high = max((order_key(high), high), (order_key(self.max_value), self.max_value))[1]
+        self.min_value = low
+        self.max_value = high
+
+    def _add_digits(self, values: List[str]):
+        """DECIMAL型の値で使われた全体・小数部の最大桁数を更新"""
+        if 'e' not in ''.join(values).lower():
+            # 指数表記でなければ、全体の桁数は値の文字数（整数部が空の .5 等を除き小数点を引く）以下、
+            # 小数部の桁数は小数点より後の文字数以下のため、最大桁数を超えうる値だけを調べる
+            lengths = list(map(len, values))
+            points = list(map(methodcaller('find', '.'), values))
+            longer = map(gt, map(add, lengths, map(lt, points, repeat(1))), repeat(self.max_precision + 1))
+            more_scale = map(gt, map(sub, lengths, points), repeat(self.max_scale + 1))
+            values = list(compress(values, map(or_, longer, more_scale)))
+        for value in values:
+            _, digits, exponent = Decimal(value).as_tuple()
+            # 検証と同じく整数部の 0 も1桁と数える（0.50 は全体3桁・小数部2桁、1E3 は全体4桁）
+            scale = max(-exponent, 0)
+            self.max_precision = max(self.max_precision, max(len(digits) + exponent, 1) + scale)
+            self.max_scale = max(self.max_scale, scale)
+
+    def merge(self, other: 'ColumnStats'):
+        self.count += other.count
+        self.null_count += other.null_count
+        if other.min_value is not None:
+            self._update_range(other.min_value, other.max_value)
+        if self.max_length is not None:
+            self.max_length = max(self.max_length, other.max_length)
+        if self.max_precision is not None:
+            self.max_precision = max(self.max_precision, other.max_precision)
+            self.max_scale = max(self.max_scale, other.max_scale)
+        self.distinct.merge(other.distinct)
+
+    def to_dict(self) -> dict:
+        result = {
+            'data_type': self.data_type,
+            'count': self.count,
+            'null_count': self.null_count,
+            'null_rate': self.null_rate,
+            'distinct': self.distinct.count(),
+            'distinct_exact': self.distinct.exact,
+        }
+        if self.kind != KIND_OTHER:
+            result['min'] = self.min_value
+            result['max'] = self.max_value
+        if self.max_length is not None:
+            result['max_length'] = self.max_length
+            result['declared_length'] = self.declared_length
+        if self.max_precision is not None:
+            result['max_precision'] = self.max_precision
+            result['max_scale'] = self.max_scale
+            result['declared_precision'] = self.declared_precision
+            result['declared_scale'] = self.declared_scale
+        return result
+
+
+def _kind(validator) -> str:
+    if isinstance(validator, IntegerColumnValidator):
+        return KIND_INTEGER
+    if isinstance(validator, DecimalColumnValidator):
+        return KIND_DECIMAL
+    if isinstance(validator, FloatColumnValidator):
+        return KIND_FLOAT
+    if isinstance(validator, DateColumnValidator):
+        return KIND_DATE
+    if isinstance(validator, DateTimeColumnValidator):
+        return KIND_DATETIME
+    if isinstance(validator, TimeColumnValidator):
+        return KIND_TIME
+    if isinstance(validator, (BooleanColumnValidator, UnsupportedColumnValidator)):
+        return KIND_OTHER
+    # VARCHAR/CHAR/TEXT
+    return KIND_STRING
+
+
+class TableStats:
+    """
+    検証するレコードから集計するカラムごとの統計（--stats）
+
+    NULLの件数、min/max、文字列の最大長、DECIMALの最大桁数、重複を除いた値の概数を
+    カラムごとに固定サイズのメモリで集計する。レコードは STATS_BATCH_SIZE 件ずつまとめて
+    カラム単位に加えるため、同じバッチ内で重複する値は一度だけ処理する。
+
+    使用例:
+        stats = TableStats(columns, headers)
+        stats.add_rows(rows)
+        stats.write_json('users.stats.json')
+    """
+
+    def __init__(self, columns: List[ColumnDefinition], headers: List[str]):
+        """
+        Args:
+            columns: DDLのカラム定義
+            headers: CSVのヘッダー（CSVに存在しないカラムは集計しない）
+        """
+        # 同名のヘッダーがある場合は後ろの列を使う（CSVChecker._resolve_columns() と同じ）
+        header_index = {name: i for i, name in enumerate(headers)}
+        self.record_count = 0
+        self.columns: Dict[str, ColumnStats] = {}
+        self._indices: List[int] = []
+        for column in columns:
+            index = header_index.get(column.name)
+            if index is not None:
+                self.columns[column.name] = ColumnStats.for_column(column)
+                self._indices.append(index)
+
+    def add_rows(self, rows: List[List[str]]):
+        """空行を除いたレコードを追加（フィールドが不足しているレコードは、存在するカラムだけを集計する）"""
+        if not rows:
+            return
+        self.record_count += len(rows)
+        shortest = min(map(len, rows))
+        for index, stats in zip(self._indices, self.columns.values()):
+            if index < shortest:
+                values = list(map(itemgetter(index), rows))
+            else:
+                values = [row[index] for row in rows if len(row) > index]
+            stats.add_values(values)
+
+    def merge(self, other: 'TableStats'):
+        """別の範囲の統計をまとめる（並列検証で各ワーカーが集計した範囲の統計）"""
+        self.record_count += other.record_count
+        for name, stats in other.columns.items():
+            self.columns[name].merge(stats)
+
+    def to_dict(self) -> dict:
+        return {
+            'record_count': self.record_count,
+            'columns': {name: stats.to_dict() for name, stats in self.columns.items()},
+        }
+
+    def write_json(self, output_file_path: str):
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Tuple
+
+from .ddl_parser import ColumnDefinition
+from .validator import BOOLEAN_VALUES, NULL_VALUES, DataTypeValidator
+
+
+class ColumnValidator:
+    """
+    DDLのカラム定義から検証ルールを事前に解決したバリデータ
+
+    DataTypeValidator.validate() はセルごとにデータ型文字列を大文字化・判定し、
+    VARCHARの長さやDECIMALの精度を正規表現で取り出し直す。
+    ColumnValidator はDDL解析後に一度だけそれらを解決しておき、
+    セルの検証時には値そのもののチェックだけを行う。
+    """
+
+    def __init__(self, column_def: ColumnDefinition):
+        self.name = column_def.name
+        self.data_type = column_def.data_type
+        self.nullable = column_def.nullable
+        self.auto_increment = column_def.auto_increment
+
+    def validate(self, value: str) -> Tuple[bool, str]:
+        """
+        セルの値を検証
+
+        Returns:
+            (is_valid, error_message) のタプル（メッセージはDataTypeValidatorと同一）
+        """
+        # NULL値の判定（空文字列、None、または"NULL"/"null"文字列）
+        if value is None or value in NULL_VALUES:
+            # AUTO_INCREMENTカラムの場合、空値を許可
+            if self.nullable or self.auto_increment:
+                return True, ""
+            return False, "NOT NULL制約違反"
+
+        return self._validate_value(value)
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return True, ""
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name} {self.data_type})"
+
+
+class IntegerColumnValidator(ColumnValidator):
+
+    def __init__(self, column_def: ColumnDefinition, data_type: str):
+        super().__init__(column_def)
+        self.unsigned = 'UNSIGNED' in data_type
+        self.min_val, self.max_val = DataTypeValidator._integer_bounds(data_type)
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._check_integer(value, self.unsigned, self.min_val, self.max_val)
+
+
+class DecimalColumnValidator(ColumnValidator):
+
+    def __init__(self, column_def: ColumnDefinition, data_type: str):
+        super().__init__(column_def)
+        self.precision: Optional[int] = None
+        self.scale: Optional[int] = None
+        precision_scale = DataTypeValidator._decimal_precision(data_type)
+        if precision_scale is not None:
+            self.precision, self.scale = precision_scale
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._check_decimal(value, self.precision, self.scale)
+
+
+class FloatColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._validate_float(value)
+
+
+class StringColumnValidator(ColumnValidator):
+
+    def __init__(self, column_def: ColumnDefinition, data_type: str):
+        super().__init__(column_def)
+        self.max_length = DataTypeValidator._string_length(data_type)
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        if self.max_length is not None and len(value) > self.max_length:
+            return DataTypeValidator._check_string(value, self.max_length)
+        return True, ""
+
+
+class DateColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._validate_date(value)
+
+
+class DateTimeColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._validate_datetime(value)
+
+
+class TimeColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return DataTypeValidator._validate_time(value)
+
+
+class BooleanColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        if value.lower() in BOOLEAN_VALUES:
+            return True, ""
+        return DataTypeValidator._validate_boolean(value)
+
+
+class UnsupportedColumnValidator(ColumnValidator):
+
+    def _validate_value(self, value: str) -> Tuple[bool, str]:
+        return True, f"未対応のデータ型: {self.data_type}"
+
+
+def compile_column(column_def: ColumnDefinition) -> ColumnValidator:
+    """
+    カラム定義をデータ型に応じたColumnValidatorに変換
+
+    判定順序は DataTypeValidator.validate() と同じ。
+    """
+    data_type_upper = column_def.data_type.upper()
+
+    # 整数型
+    if data_type_upper.startswith(('INT', 'BIGINT', 'SMALLINT', 'TINYINT', 'MEDIUMINT')):
+        return IntegerColumnValidator(column_def, data_type_upper)
+
+    # 小数型
+    if data_type_upper.startswith(('DECIMAL', 'NUMERIC')):
+        return DecimalColumnValidator(column_def, data_type_upper)
+
+    # 浮動小数点型
+    if data_type_upper.startswith(('FLOAT', 'DOUBLE')):
+        return FloatColumnValidator(column_def)
+
+    # 文字列型
+    if data_type_upper.startswith(('VARCHAR', 'CHAR')):
+        return StringColumnValidator(column_def, data_type_upper)
+
+    # テキスト型
+    if data_type_upper == 'TEXT':
+        return ColumnValidator(column_def)
+
+    # 日付型
+    if data_type_upper == 'DATE':
+        return DateColumnValidator(column_def)
+
+    # 日時型
+    if data_type_upper in ('DATETIME', 'TIMESTAMP'):
+        return DateTimeColumnValidator(column_def)
+
+    # 時刻型
+    if data_type_upper == 'TIME':
+        return TimeColumnValidator(column_def)
+
+    # ブール型
+    if data_type_upper in ('BOOLEAN', 'BOOL'):
+        return BooleanColumnValidator(column_def)
+
+    # 未対応のデータ型
+    return UnsupportedColumnValidator(column_def)
+
+
+def compile_columns(columns: List[ColumnDefinition]) -> Dict[str, ColumnValidator]:
+    """DDLの全カラムをColumnValidatorに変換（カラム名 -> バリデータ）"""
+    return {col.name: compile_column(col) for col in columns}
@@ -0,0 +1,129 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import sys
+from typing import BinaryIO, Optional
+
+# 圧縮形式 -> (拡張子, ファイル先頭のマジックバイト)
+COMPRESSION_FORMATS = {
+    'gzip': ('.gz', b'\x1f\x8b'),
+    'bz2': ('.bz2', b'BZh'),
+    'xz': ('.xz', b'\xfd7zXZ\x00'),
+}
+
+COMPRESSED_EXTENSIONS = tuple(ext for ext, _ in COMPRESSION_FORMATS.values())
+# マジックバイトの判定に読み込むバイト数
+MAGIC_BYTES = 8
+# 標準入力から読み込む場合に指定するファイルパス
+STDIN_PATH = '-'
+
+# 逐次展開するファイルオブジェクト（元のファイルを読み進めながら展開する）
+_DECOMPRESSORS = {
+    'gzip': lambda f: gzip.GzipFile(fileobj=f, mode='rb'),
+    'bz2': lambda f: bz2.BZ2File(f, mode='rb'),
+    'xz': lambda f: lzma.LZMAFile(f, mode='rb'),
+}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    ファイルの圧縮形式を判定
+
+    拡張子（.gz/.bz2/.xz）で判定し、該当しない場合はファイル先頭のマジックバイトで判定する。
+
+    Returns:
+        'gzip', 'bz2', 'xz' のいずれか（圧縮されていない場合はNone）
+    """
+    lower_path = file_path.lower()
+    for name, (ext, _) in COMPRESSION_FORMATS.items():
+        if lower_path.endswith(ext):
+            return name
+
+    with open(file_path, 'rb') as f:
+        return _compression_from_magic(f.read(MAGIC_BYTES))
+
+
+def detect_stream_compression(stream: BinaryIO) -> Optional[str]:
+    """
+    バイナリストリームの先頭のマジックバイトから圧縮形式を判定
+
+    peek() で確認するため、ストリームは読み進めない（peek() のないストリームは非圧縮として扱う）。
+    """
+    peek = getattr(stream, 'peek', None)
+    if peek is None:
+        return None
+    return _compression_from_magic(peek(MAGIC_BYTES)[:MAGIC_BYTES])
+
+
+def _compression_from_magic(head: bytes) -> Optional[str]:
+    for name, (_, magic) in COMPRESSION_FORMATS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_text_stream(stream: BinaryIO, encoding: str = 'utf-8', compression: Optional[str] = None) -> io.TextIOWrapper:
+    """
+    バイナリストリームをcsvモジュールで読み込めるテキストストリームにする（圧縮データは展開しながら読む）
+
+    Args:
+        compression: 圧縮形式（省略時は detect_stream_compression() で判定）
+    """
+    if compression is None:
+        compression = detect_stream_compression(stream)
+    if compression is not None:
+        stream = _DECOMPRESSORS[compression](stream)
+    return io.TextIOWrapper(stream, encoding=encoding, newline='')
+
+
+class CsvInput:
+    """
+    CSVファイルをテキストとして読み込む（圧縮ファイルは展開しながら読む）
+
+    展開したデータをディスクに書き出さないため、圧縮ファイルのサイズ分の読み込みだけで検証できる。
+    ファイルパスに '-' を指定した場合は標準入力から読み込む（圧縮形式はマジックバイトで判定）。
+
+    使用例:
+        with CsvInput('users.csv.gz', 'utf-8') as source:
+            for row in csv.reader(source.text):
+                ...
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8'):
+        self.file_path = file_path
+        if file_path == STDIN_PATH:
+            # 閉じても標準入力のファイル記述子は閉じない
+            self._raw = open(sys.stdin.fileno(), 'rb', closefd=False)
+            self.compression = detect_stream_compression(self._raw)
+        else:
+            self.compression = detect_compression(file_path)
+            self._raw = open(file_path, 'rb')
+        # パイプはシークできないため、読み込んだバイト数を取得できない
+        self._seekable = self._raw.seekable()
+        try:
+            self.text = open_text_stream(self._raw, encoding, self.compression)
+        except BaseException:
+            self._raw.close()
+            raise
+
+    @property
+    def total_bytes(self) -> int:
+        """ファイルサイズ（圧縮ファイルは圧縮後のサイズ）"""
+        return os.fstat(self._raw.fileno()).st_size
+
+    def bytes_read(self) -> int:
+        """読み込んだバイト数（圧縮ファイルは圧縮後のバイト数。進捗表示に使う。パイプの場合は0）"""
+        return self._raw.tell() if self._seekable else 0
+
+    def close(self):
+        # GzipFile等は渡したファイルオブジェクトを閉じないため、元のファイルも閉じる
+        self.text.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
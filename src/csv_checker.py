@@ -1,76 +1,849 @@
 import csv
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
+import logging
+import os
+import random
+from contextlib import closing, contextmanager, nullcontext
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 
+from .byte_reader import ByteCsvReader, decodes_ascii_as_is
+from .checkpoint import Checkpoint, CheckpointStore, file_fingerprint, schema_hash
+from .column_stats import STATS_BATCH_SIZE, TableStats
+from .column_validator import ColumnValidator, compile_columns
+from .compression import STDIN_PATH, CsvInput, detect_compression
 from .ddl_parser import DDLParser, ColumnDefinition
-from .validator import DataTypeValidator
+from .error_sink import ErrorSink
+from .errors import ErrorLimitReached, ValidationError, decode_error, field_count_error, missing_column_error
+from .foreign_key_checker import PROBE_BATCH_SIZE, ForeignKeyCheck, ForeignKeyProbe
+from .key_checker import DEFAULT_MAX_KEYS_IN_MEMORY, DuplicateKeyDetector, KeyConstraint, KeyExtractor, key_constraints
+from .mmap_reader import MmapCsvReader, RecordIndex
+from .numpy_engine import ColumnarBatchValidator, is_available as numpy_available
+from .parallel import (
+    read_header,
+    split_byte_ranges,
+    split_partial_record,
+    supports_byte_ranges,
+    validate_in_processes,
+)
+from .pipeline import PIPELINE_BLOCK_SIZE, validate_in_threads
+from .sampling import DEFAULT_CONFIDENCE, RecordSampler, SampleReport, sample_file
+from .schema_cache import SchemaCache
+from .profiler import ColumnProfile, ProfilingColumnValidator, ValidationProfiler, wrap_with_profiler
+from .value_cache import DEFAULT_MIN_HIT_RATE, CachedColumnValidator, ColumnCacheStats, wrap_with_cache
 
+ENGINES = ('auto', 'python', 'numpy')
+READERS = ('auto', 'stream', 'mmap', 'bytes')
 
-@dataclass
-class ValidationError:
-    row_number: int
-    column_name: str
-    value: str
-    error_message: str
+# 検証の経過と警告（"警告: " で始まるメッセージはWARNING）の出力先。main.py は標準出力に表示し、
+# ライブラリとして使う場合は呼び出し側がハンドラーを設定しない限り表示しない
+logger = logging.getLogger(__name__)
 
-    def __str__(self):
-        return f"行{self.row_number}, カラム'{self.column_name}': {self.error_message} (値: '{self.value}')"
+
+class _WarningCollector(logging.Handler):
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+
+@contextmanager
+def collect_warnings() -> Iterator[List[str]]:
+    """with の中で検証中に出力された警告のメッセージを集める（一括検証・検証サーバーで結果にまとめる）"""
+    collector = _WarningCollector()
+    logger.addHandler(collector)
+    try:
+        yield collector.messages
+    finally:
+        logger.removeHandler(collector)
 
 
 class CSVChecker:
-    def __init__(self, ddl_file_path: str, csv_file_path: str, encoding: str = 'utf-8'):
+    def __init__(self, ddl_file_path: Optional[str], csv_file_path: Optional[str], encoding: str = 'utf-8',
+                 workers: int = 1, error_sink: Optional[ErrorSink] = None,
+                 max_retained_errors: Optional[int] = None, engine: str = 'auto',
+                 cache_size: int = 0, cache_min_hit_rate: float = DEFAULT_MIN_HIT_RATE,
+                 profiler: Optional[ValidationProfiler] = None,
+                 schema_cache: Optional[SchemaCache] = None, reader: str = 'auto',
+                 max_errors: Optional[int] = None, max_errors_per_column: Optional[int] = None,
+                 fail_fast: bool = False, checkpoint: Optional[CheckpointStore] = None,
+                 resume: bool = False, incremental: bool = False, check_keys: bool = False,
+                 key_memory_limit: int = DEFAULT_MAX_KEYS_IN_MEMORY,
+                 foreign_keys: Optional[List[ForeignKeyCheck]] = None, collect_stats: bool = False,
+                 threads: int = 1):
         """
         Args:
-            ddl_file_path: DDLファイルのパス
-            csv_file_path: CSVファイルのパス
+            ddl_file_path: DDLファイルのパス（from_columns() で作る場合はNone）
+            csv_file_path: CSVファイルのパス（.gz/.bz2/.xz の圧縮ファイルは展開しながら検証。"-" は標準入力。
+                           from_columns() で作る場合はNone）
             encoding: CSVファイルのエンコーディング（デフォルト: utf-8）
+            workers: 検証に使うプロセス数（2以上でファイルを分割して並列検証）
+            error_sink: 検出したエラーを逐次書き出す出力先（省略時は書き出さない）
+            max_retained_errors: メモリに保持するエラーの最大件数（省略時は全件保持）
+            engine: 検証エンジン（'python': 1セルずつ検証, 'numpy': NumPyで列単位に一括検証,
+                    'auto': NumPyがあればnumpy、なければpython）
+            cache_size: カラムごとの検証結果キャッシュの最大件数（0でキャッシュなし）
+            cache_min_hit_rate: このヒット率を下回ったカラムはキャッシュを無効化する
+            profiler: 工程別・カラム別の処理時間を集計するプロファイラ（省略時は計測しない）
+            schema_cache: DDLの解析結果のキャッシュ（省略時は毎回DDLを解析する）
+            reader: CSVの読み込み方式（'stream': テキストストリームをcsvモジュールで読み込む,
+                    'mmap': メモリマップしてレコード境界の索引を作りながら読み込む,
+                    'bytes': mmapと同様に読み込み、ASCIIだけのチャンクはデコードを省略する。
+                    デコードできないバイト列はセル単位のエラーとして報告し、検証を続ける,
+                    'auto': 非圧縮でmmapに対応するエンコーディングならmmap、それ以外はstream）
+            max_errors: エラーの総数がこの件数に達したら検証を中断する（省略時は中断しない）
+            max_errors_per_column: いずれかのカラムのエラーがこの件数に達したら検証を中断する
+                                   （行単位のエラーはまとめて1カラムとして数える）
+            fail_fast: 最初のエラーで検証を中断する（max_errors=1 と同じ）
+            checkpoint: 検証の途中経過を定期的に保存する先（非圧縮でmmapに対応するエンコーディングのみ。
+                        チェックポイントを使う場合はmmapリーダー（reader='bytes' の場合はバイト列リーダー）で読み込む）
+            resume: 中断した検証をチェックポイントの続きから再開する
+            incremental: 前回の検証が完了した位置以降に追記されたレコードだけを検証する
+                         （改行で終わらない・クォートの中の改行で終わる書き込み途中の最後のレコードは次回に検証する）
+            check_keys: DDLの主キー・一意キーの重複を検査する（全レコードの検証後にまとめて報告）
+            key_memory_limit: 重複の検査でメモリに保持するキーの最大件数（超えた分はディスクに書き出す）
+            foreign_keys: 検査する外部キー制約と参照先のキーの索引（foreign_key_checker.build_key_index() で作成）
+            collect_stats: 検証しながらカラムごとの統計（NULLの件数、min/max、最大長、重複を除いた値の概数等）を集計する
+            threads: 検証に使うスレッド数（2以上で読み込み・検証・エラーの書き出しをスレッドのパイプラインで並行して処理。
+                     GILのないPythonで速くなる）
         """
+        if engine not in ENGINES:
+            raise ValueError(f"未対応の検証エンジンです: {engine}")
+        if reader not in READERS:
+            raise ValueError(f"未対応の読み込み方式です: {reader}")
+        for name, limit in (('max_errors', max_errors), ('max_errors_per_column', max_errors_per_column)):
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} は1以上を指定してください")
+        if resume and incremental:
+            raise ValueError("resume と incremental は同時に指定できません")
+        if (resume or incremental) and checkpoint is None:
+            raise ValueError("resume または incremental にはチェックポイントの保存先が必要です")
+        if key_memory_limit < 1:
+            raise ValueError("key_memory_limit は1以上を指定してください")
+        if threads < 1:
+            raise ValueError("threads は1以上を指定してください")
+        if workers > 1 and threads > 1:
+            raise ValueError("workers と threads は同時に指定できません")
+        if engine == 'numpy' and not numpy_available():
+            raise ValueError("NumPyがインストールされていないため numpy エンジンは使用できません")
+
         self.ddl_file_path = ddl_file_path
         self.csv_file_path = csv_file_path
         self.encoding = encoding
+        self.workers = workers
+        self.threads = threads
+        self.profiler = profiler
+        self.schema_cache = schema_cache
+        # プロファイル時はレポートの書き出し時間も計測する
+        if profiler is not None and error_sink is not None:
+            error_sink = profiler.wrap_sink(error_sink)
+        self.error_sink = error_sink
+        self.max_retained_errors = max_retained_errors
+        self.max_errors = 1 if fail_fast else max_errors
+        self.max_errors_per_column = max_errors_per_column
+        # エラー件数の上限に達して検証を中断した理由と行番号（中断しなかった場合はNone）
+        self.stop_reason: Optional[str] = None
+        self.stopped_row: Optional[int] = None
+        # カラムごとのエラー件数（max_errors_per_column指定時のみ集計）
+        self._column_error_counts: Dict[str, int] = {}
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.incremental = incremental
+        # 検証を開始したチェックポイント（最初から検証した場合はNone）
+        self.resumed_from: Optional[Checkpoint] = None
+        self._schema_hash = ''
+        self.engine = engine
+        self.reader = reader
+        self.cache_size = cache_size
+        self.cache_min_hit_rate = cache_min_hit_rate
+        # カラムごとのキャッシュ統計（cache_size指定時のみ）
+        self.cache_stats: Dict[str, ColumnCacheStats] = {}
+        # 保持しているエラー（max_retained_errors指定時は先頭の一部のみ）
         self.errors: List[ValidationError] = []
+        # 検出したエラーの総数
+        self.error_count = 0
+        # 検証したレコード数
+        self.record_count = 0
         self.columns: Dict[str, ColumnDefinition] = {}
+        self.validators: Dict[str, ColumnValidator] = {}
+        self._cached_validators: List[CachedColumnValidator] = []
+        # CSVのヘッダーから解決した (列番号, バリデータ) のリスト（DDLのカラム順）
+        # CSVに存在しないNOT NULLカラムは列番号がNone、存在しないNULL許可カラムは含まない
+        self.column_plan: List[Tuple[Optional[int], ColumnValidator]] = []
+        self.header_count = 0
+        # CSVのヘッダー（デコードできないバイト列のエラーのカラム名に使う）
+        self.csv_headers: List[str] = []
+        # mmapリーダーで読み込んだレコード境界の索引（read_records() でレコードを読み直すのに使う）
+        self.record_index: Optional[RecordIndex] = None
+        # 索引の先頭のレコードの行番号（チェックポイントから再開した場合は再開した行）
+        self.record_index_row = 2
+        # numpyエンジンの一括検証器（カラムの解決ごとに作り直す）
+        self._batch_validator: Optional[ColumnarBatchValidator] = None
+        self.check_keys = check_keys
+        self.key_memory_limit = key_memory_limit
+        # 検査する主キー・一意キー制約（check_keys指定時のみ）
+        self.key_constraints: List[KeyConstraint] = []
+        # 重複の検出器と、レコードからキーを取り出す KeyExtractor（キーを検査しない場合はNone）
+        self._key_detector: Optional[DuplicateKeyDetector] = None
+        self._key_extractor: Optional[KeyExtractor] = None
+        # 取り出したキーを (行番号, キー) で受け取る関数（並列検証のワーカーでは範囲ごとに集めて親プロセスに返す）
+        self._add_keys: Optional[Callable] = None
+        self.foreign_keys = foreign_keys or []
+        # 外部キーの照合（外部キーを検査しない場合はNone）
+        self._foreign_key_probe: Optional[ForeignKeyProbe] = None
+        self.collect_stats = collect_stats
+        # カラムごとの統計（collect_stats指定時のみ）と、統計にまだ加えていないレコード
+        self.stats: Optional[TableStats] = None
+        self._stats_rows: List[List[str]] = []
 
-    def validate(self) -> Tuple[bool, List[ValidationError]]:
+    def validate(self, columns: Optional[List[ColumnDefinition]] = None,
+                 keys: Optional[List[KeyConstraint]] = None) -> Tuple[bool, List[ValidationError]]:
         """
         CSVファイルを検証
 
+        Args:
+            columns: 解析済みのカラム定義（省略時はDDLファイルを解析する。
+                     一括検証などで同じDDLの解析結果を使い回す場合に指定）
+            keys: 検査する主キー・一意キー制約（check_keys指定時のみ使用。省略時はDDLファイルから取得）
+
         Returns:
             (is_valid, errors) のタプル
             is_valid: 全てのレコードが有効な場合True
-            errors: ValidationErrorのリスト
+            errors: ValidationErrorのリスト（max_retained_errors指定時は先頭の一部のみ）
         """
         # DDLをパース
-        parser = DDLParser(self.ddl_file_path)
-        columns = parser.parse()
-        self.columns = parser.get_column_map()
-
-        print(f"DDLファイルを解析しました: {len(self.columns)}カラム")
-        for col in columns:
-            print(f"  - {col}")
+        with self._profile_stage('ddl_parse'):
+            self._parse_ddl(columns)
+            if self.check_keys:
+                self._parse_keys(keys)
 
         # CSVファイルを検証
         self.errors = []
-        self._validate_csv()
+        self.error_count = 0
+        self.record_count = 0
+        self.cache_stats = {}
+        self.record_index = None
+        self.stop_reason = None
+        self.stopped_row = None
+        self._column_error_counts = {}
+        self.resumed_from = None
+        self.record_index_row = 2
+        self.stats = None
+        if self.checkpoint is not None:
+            self._schema_hash = schema_hash(list(self.columns.values()))
+        try:
+            self._validate_csv()
+            if self._key_detector is not None:
+                self._report_duplicate_keys()
+        finally:
+            if self._key_detector is not None:
+                self._key_detector.close()
+                self._key_detector = None
+            self._close_foreign_key_probe()
+            if self.error_sink is not None:
+                self.error_sink.close()
+
+        if self.profiler is not None:
+            self.profiler.finish(self.record_count)
+
+        return self.error_count == 0, self.errors
+
+    def validate_sample(self, sample_size: int, seed: Optional[int] = None,
+                        confidence: float = DEFAULT_CONFIDENCE,
+                        columns: Optional[List[ColumnDefinition]] = None) -> SampleReport:
+        """
+        ファイル全体からランダムに抽出したレコードだけを検証し、エラー率を推定
+
+        巨大なファイルを全件検証する前に、エラーの多いカラムを短時間で把握するために使う。
+        検出したエラーは error_sink に書き出さない。
+
+        Args:
+            sample_size: 抽出するレコード数
+            seed: 乱数のシード（同じシードなら同じレコードを抽出する）
+            confidence: 信頼区間の信頼水準
+            columns: 解析済みのカラム定義（省略時はDDLファイルを解析する）
+
+        Returns:
+            SampleReport
+        """
+        if sample_size <= 0:
+            raise ValueError("抽出するレコード数は1以上を指定してください")
+        if not 0 < confidence < 1:
+            raise ValueError("信頼水準は0より大きく1未満の値を指定してください")
+        if self.csv_file_path == STDIN_PATH:
+            raise ValueError("標準入力はサンプリング検証に対応していません")
+        if self._is_compressed():
+            raise ValueError("圧縮ファイルはサンプリング検証に対応していません")
+        if not supports_byte_ranges(self.encoding):
+            raise ValueError(f"エンコーディング {self.encoding} はサンプリング検証に対応していません")
+
+        self._parse_ddl(columns)
+
+        headers, data_start = read_header(self.csv_file_path, self.encoding)
+        if not headers:
+            raise ValueError("CSVファイルにヘッダーが見つかりません")
+        self._validate_headers(headers)
+
+        column_names = [validator.name for _, validator in self.column_plan]
+        with RecordSampler(self.csv_file_path, self.encoding, data_start, self.header_count,
+                           random.Random(seed)) as sampler:
+            # サンプルのレコードは行番号が分からないため、行番号0として検証する
+            return sample_file(
+                sampler, sample_size,
+                lambda row, add_error: self._validate_row(0, row, add_error),
+                column_names, confidence,
+            )
+
+    @classmethod
+    def from_columns(cls, columns: List[ColumnDefinition], headers: List[str], **options) -> 'CSVChecker':
+        """
+        解析済みのカラム定義とヘッダーから、validate_row() でレコードを1件ずつ検証するCSVCheckerを作る
+
+        DDLファイル・CSVファイルは読み込まない（src.streaming のように、ファイル以外から届くレコードを検証する場合に使う）。
+
+        Args:
+            columns: 解析済みのカラム定義
+            headers: レコードの各値のカラム名
+            options: コンストラクタと同じ設定（cache_size、profiler 等）
+        """
+        checker = cls(None, None, **options)
+        checker._load_columns(columns)
+        checker._resolve_columns(headers)
+        return checker
+
+    def validate_row(self, row_number: int, row: List[str]) -> List[ValidationError]:
+        """
+        1レコードを検証し、検出したエラーのリストを返す
+
+        エラーは error_sink・保持するエラー・エラー件数の上限には加えない。
+        from_columns() で作ったCSVChecker、または validate() でヘッダーを解決した後に呼び出す。
+
+        Args:
+            row_number: エラーの行番号
+            row: ヘッダーの順に並んだ値のリスト（NULLは空文字）
+        """
+        errors: List[ValidationError] = []
+        self._validate_row(row_number, row, errors.append)
+        return errors
+
+    def _parse_ddl(self, columns: Optional[List[ColumnDefinition]]):
+        from_cache = False
+        if columns is None:
+            if self.schema_cache is not None:
+                columns = self.schema_cache.parse(self.ddl_file_path)
+                from_cache = self.schema_cache.last_hit
+            else:
+                parser = DDLParser(self.ddl_file_path)
+                columns = parser.parse()
+        self._load_columns(columns)
+
+        logger.info(f"DDLファイルを解析しました: {len(self.columns)}カラム{'（キャッシュを使用）' if from_cache else ''}")
+        for col in columns:
+            logger.info(f"  - {col}")
+
+    def _parse_keys(self, keys: Optional[List[KeyConstraint]]):
+        if keys is None:
+            if self.schema_cache is not None:
+                tables = self.schema_cache.parse_schema(self.ddl_file_path)
+            else:
+                tables = DDLParser(self.ddl_file_path).parse_schema()
+            # parse() と同じく最初のCREATE TABLE文の制約を使う
+            keys = key_constraints(next(iter(tables.values())))
+        self.key_constraints = keys
+
+        if not keys:
+            logger.warning("警告: DDLに主キー・一意キーが定義されていないため、キーの重複は検査しません")
+            return
+        logger.info(f"キーの重複を検査します: {len(keys)}制約")
+        for constraint in keys:
+            logger.info(f"  - {constraint}")
+
+    def _load_columns(self, columns: List[ColumnDefinition]):
+        self.columns = {col.name: col for col in columns}
+        # カラムごとの検証ルールを事前に解決
+        self.validators = compile_columns(columns)
+        if self.cache_size > 0:
+            self.validators = wrap_with_cache(self.validators, self.cache_size, self.cache_min_hit_rate)
+        self._cached_validators = [
+            validator for validator in self.validators.values() if isinstance(validator, CachedColumnValidator)
+        ]
+        if self.profiler is not None:
+            self.validators = wrap_with_profiler(self.validators)
 
-        return len(self.errors) == 0, self.errors
+    def _profile_stage(self, name: str):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name)
+
+    def _measure_records(self):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure_records()
+
+    def _start_profile(self):
+        if self.profiler is not None:
+            # 圧縮ファイルは圧縮後のサイズと読み込んだバイト数で進捗を表示する
+            # 標準入力はサイズが分からないため、残り時間を表示しない
+            stdin = self.csv_file_path == STDIN_PATH
+            self.profiler.start(0 if stdin else os.path.getsize(self.csv_file_path))
 
     def _validate_csv(self):
+        stdin = self.csv_file_path == STDIN_PATH
+        if stdin:
+            self._warn_stdin_options()
+        compressed = not stdin and self._is_compressed()
+        if self.reader == 'bytes' and not stdin and not compressed:
+            self._warn_byte_reader()
+        checkpointed = not stdin and self.checkpoint is not None and self._supports_checkpoint(compressed)
+        if self.workers > 1 and not stdin:
+            if compressed:
+                logger.warning("警告: 圧縮ファイルは並列検証に対応していないため、1プロセスで検証します")
+            elif supports_byte_ranges(self.encoding):
+                self._validate_csv_parallel(checkpointed)
+                return
+            else:
+                logger.warning(f"警告: エンコーディング {self.encoding} は並列検証に対応していないため、1プロセスで検証します")
+        if self.threads > 1 and not stdin:
+            if compressed:
+                logger.warning("警告: 圧縮ファイルはパイプライン検証に対応していないため、1スレッドで検証します")
+            elif supports_byte_ranges(self.encoding):
+                self._validate_csv_pipeline(checkpointed)
+                return
+            else:
+                logger.warning(f"警告: エンコーディング {self.encoding} はパイプライン検証に対応していないため、1スレッドで検証します")
+
         try:
-            with open(self.csv_file_path, 'r', encoding=self.encoding, newline='') as csvfile:
-                # CSVリーダーを作成（ヘッダー行を読み込む）
-                csv_reader = csv.DictReader(csvfile)
+            if checkpointed:
+                self._validate_csv_checkpointed()
+                return
 
+            use_mmap = not stdin and self._use_mmap_reader(compressed)
+            with self._open_csv(use_mmap) as (csv_headers, rows, bytes_read):
                 # ヘッダー検証
-                csv_headers = csv_reader.fieldnames
                 if not csv_headers:
                     raise ValueError("CSVファイルにヘッダーが見つかりません")
 
                 self._validate_headers(csv_headers)
 
-                # データ行を検証
-                for row_idx, row in enumerate(csv_reader, start=2):  # ヘッダーの次の行から開始なので2
-                    self._validate_row(row_idx, row)
+                # データ行を検証（ヘッダーの次の行から開始なので2）
+                self._start_profile()
+                with self._measure_records():
+                    self.record_count = self._validate_records(rows, start_row=2, bytes_read=bytes_read)
+                self._merge_cache_stats(self._take_cache_stats())
+                if self.profiler is not None:
+                    self.profiler.merge_columns(self._take_column_profiles())
+
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {self.csv_file_path}")
+        except Exception as e:
+            raise Exception(f"CSVファイルの読み込み中にエラーが発生しました: {e}")
+
+    def _warn_stdin_options(self):
+        """標準入力はシークできないため、1プロセスのストリームで先頭から読み込む"""
+        if self.workers > 1:
+            logger.warning("警告: 標準入力は並列検証に対応していないため、1プロセスで検証します")
+        if self.threads > 1:
+            logger.warning("警告: 標準入力はパイプライン検証に対応していないため、1スレッドで検証します")
+        if self.reader in ('mmap', 'bytes'):
+            logger.warning(f"警告: 標準入力は{self._reader_label()}に対応していないため、ストリームで読み込みます")
+        if self.checkpoint is not None:
+            logger.warning("警告: 標準入力はチェックポイントに対応していないため、最初から全件を検証します")
+
+    def _supports_checkpoint(self, compressed: bool) -> bool:
+        if compressed:
+            logger.warning("警告: 圧縮ファイルはチェックポイントに対応していないため、最初から全件を検証します")
+            return False
+        if not supports_byte_ranges(self.encoding):
+            logger.warning(f"警告: エンコーディング {self.encoding} はチェックポイントに対応していないため、最初から全件を検証します")
+            return False
+        return True
+
+    def _validate_csv_checkpointed(self):
+        """チェックポイントを保存しながら1プロセスで検証（チェックポイントがあればその続きから）"""
+        headers, data_start = read_header(self.csv_file_path, self.encoding)
+        if not headers:
+            raise ValueError("CSVファイルにヘッダーが見つかりません")
+
+        self._validate_headers(headers)
+
+        start, first_row = self._start_from_checkpoint(data_start)
+        self._start_profile()
+        with self._open_mmap_reader(start, start_row=first_row) as source:
+            with self._measure_records():
+                row_number = self._validate_chunks(source, first_row)
+            self.record_index = source.loaded_index()
+        self.record_index_row = first_row
+        self.record_count += row_number - first_row
+        self._merge_cache_stats(self._take_cache_stats())
+        if self.profiler is not None:
+            self.profiler.merge_columns(self._take_column_profiles())
+
+    def _validate_chunks(self, source: MmapCsvReader, row_number: int) -> int:
+        """
+        レコード境界で区切ったチャンクごとに検証し、チャンクの境界でチェックポイントを保存する
+
+        Returns:
+            最後に検証したレコードの次の行番号
+        """
+        completed = False
+        for chunk_start, chunk_end, rows in source.iter_chunks():
+            if chunk_start == source.partial_start:
+                # 書き込み途中の可能性がある最後のレコードの手前までを、検証が完了した範囲とする
+                self._save_checkpoint(chunk_start, row_number, complete=True)
+                completed = True
+                if self.incremental:
+                    break
+            elif self.checkpoint.due():
+                self._save_checkpoint(chunk_start, row_number)
+
+            row_number += self._validate_records(rows, row_number, source.bytes_read)
+            if self.stop_reason is not None:
+                return row_number
+
+        if not completed:
+            self._save_checkpoint(source.end, row_number, complete=True)
+        return row_number
+
+    def _start_from_checkpoint(self, data_start: int) -> Tuple[int, int]:
+        """
+        保存されたチェックポイントから検証を開始する位置を決め、中断した検証の続きならエラー件数を引き継ぐ
+
+        Returns:
+            (開始するバイト位置, その位置のレコードの行番号) のタプル
+        """
+        if not (self.resume or self.incremental):
+            return data_start, 2
+
+        checkpoint = self.checkpoint.load()
+        if checkpoint is None:
+            logger.info("チェックポイントがないため、最初から検証します")
+            return data_start, 2
+
+        reason = checkpoint.matches(self.csv_file_path, self.encoding, self._schema_hash)
+        if reason is None and checkpoint.complete and not self.incremental:
+            reason = "前回の検証は完了しています"
+        if reason is None and not checkpoint.complete:
+            reason = self._resume_report(checkpoint)
+        if reason is not None:
+            logger.info(f"{reason}。最初から検証します")
+            return data_start, 2
+
+        self.resumed_from = checkpoint
+        if self._key_detector is not None:
+            logger.warning("警告: チェックポイントより前のレコードのキーは保存されていないため、"
+                           "検証するレコードの中でだけキーの重複を検査します")
+        if self.stats is not None:
+            logger.warning("警告: カラムの統計は、チェックポイント以降に検証するレコードだけを集計します")
+        if checkpoint.complete:
+            logger.info(f"前回の検証以降に追記されたレコードを検証します（行{checkpoint.row_number}以降,"
+                        f" {checkpoint.byte_offset}バイト目から）")
+        else:
+            # 中断した検証の続きでは、エラー件数と検証したレコード数を引き継ぐ
+            self.error_count = checkpoint.error_count
+            self._column_error_counts = dict(checkpoint.column_error_counts)
+            self.record_count = checkpoint.record_count
+            logger.info(f"チェックポイントから検証を再開します（行{checkpoint.row_number}以降,"
+                        f" {checkpoint.byte_offset}バイト目から, これまでのエラー {checkpoint.error_count}件）")
+        return checkpoint.byte_offset, checkpoint.row_number
+
+    def _resume_report(self, checkpoint: Checkpoint) -> Optional[str]:
+        """エラーレポートをチェックポイントの時点から書き出せるようにする（できない場合はその理由を返す）"""
+        if self.error_sink is None:
+            return None
+        if self.error_sink.output_file_path != checkpoint.report_path:
+            return "エラーレポートの出力先が前回と異なります"
+        try:
+            self.error_sink.resume(checkpoint.report_size)
+        except (OSError, ValueError) as e:
+            return str(e)
+        return None
+
+    def _checkpoint_ranges(self, start: int, start_row: int, chunk_size: Optional[int] = None):
+        """
+        並列検証で検証するバイト範囲と、範囲を検証し終えるたびにチェックポイントを保存する関数を返す
+
+        Args:
+            chunk_size: 範囲の目安のバイト数（省略時はワーカー数から決める）
+
+        Returns:
+            (byte_ranges, on_range) のタプル
+        """
+        byte_ranges = split_byte_ranges(self.csv_file_path, start, self.workers, chunk_size)
+        byte_ranges, partial_start = split_partial_record(self.csv_file_path, byte_ranges)
+        if partial_start is not None and self.incremental:
+            # 書き込み途中の可能性がある最後のレコードは次回に検証する
+            byte_ranges = byte_ranges[:-1]
+        complete_at = partial_start if partial_start is not None else os.path.getsize(self.csv_file_path)
+        if not byte_ranges or complete_at == start:
+            self._save_checkpoint(start, start_row, complete=True)
+
+        def on_range(end: int, row_number: int):
+            if end == complete_at:
+                self._save_checkpoint(end, row_number, complete=True)
+            elif self.checkpoint.due():
+                self._save_checkpoint(end, row_number)
+
+        return byte_ranges, on_range
+
+    def _save_checkpoint(self, offset: int, row_number: int, complete: bool = False):
+        sink = self.error_sink
+        self.checkpoint.save(Checkpoint(
+            csv_file_path=os.path.abspath(self.csv_file_path),
+            encoding=self.encoding,
+            schema_hash=self._schema_hash,
+            fingerprint=file_fingerprint(self.csv_file_path, offset),
+            byte_offset=offset,
+            row_number=row_number,
+            error_count=self.error_count,
+            column_error_counts=dict(self._column_error_counts),
+            report_path=sink.output_file_path if sink is not None else None,
+            report_size=sink.report_size() if sink is not None else None,
+            complete=complete,
+        ))
+
+    def _use_mmap_reader(self, compressed: bool) -> bool:
+        if self.reader == 'stream':
+            return False
+        if compressed:
+            if self.reader != 'auto':
+                logger.warning(f"警告: 圧縮ファイルは{self._reader_label()}に対応していないため、ストリームで読み込みます")
+            return False
+        if not supports_byte_ranges(self.encoding):
+            if self.reader != 'auto':
+                logger.warning(f"警告: エンコーディング {self.encoding} は{self._reader_label()}に対応していないため、"
+                               "ストリームで読み込みます")
+            return False
+        return True
+
+    def _reader_label(self) -> str:
+        return 'バイト列リーダー' if self.reader == 'bytes' else 'mmapリーダー'
+
+    def _uses_byte_reader(self) -> bool:
+        return self.reader == 'bytes' and decodes_ascii_as_is(self.encoding)
+
+    def _warn_byte_reader(self):
+        if supports_byte_ranges(self.encoding) and not decodes_ascii_as_is(self.encoding):
+            logger.warning(f"警告: エンコーディング {self.encoding} はバイト列リーダーに対応していないため、mmapリーダーで読み込みます")
+
+    def _open_mmap_reader(self, start: int = 0, end: Optional[int] = None, start_row: int = 2) -> MmapCsvReader:
+        """
+        検証用のmmapリーダー（reader='bytes' の場合はバイト列リーダー）を開く
+
+        Args:
+            start: 読み込みを開始するバイト位置
+            end: 読み込みを終了するバイト位置（省略時はファイル終端）
+            start_row: start のレコードの行番号（デコードできないバイト列のエラーの行番号に使う）
+        """
+        if not self._uses_byte_reader():
+            return MmapCsvReader(self.csv_file_path, self.encoding, start, end)
+
+        def on_decode_error(record_number: int, column_index: int, offset: Optional[int], raw: bytes):
+            headers = self.csv_headers
+            column_name = headers[column_index] if column_index < len(headers) else f"{column_index + 1}列目"
+            self._add_error(decode_error(start_row + record_number, column_name, raw, self.encoding, offset))
+
+        return ByteCsvReader(self.csv_file_path, self.encoding, start, end, on_decode_error=on_decode_error)
+
+    @contextmanager
+    def _open_csv(self, use_mmap: bool):
+        """
+        CSVファイルを開いてヘッダー行を読み込む
+
+        Returns:
+            (ヘッダー, データ行のイテレーター, 読み込んだバイト数を返す関数) のタプル
+        """
+        if use_mmap:
+            with self._open_mmap_reader() as source:
+                headers = source.read_header()
+                yield headers, source, source.bytes_read
+                self.record_index = source.loaded_index()
+        else:
+            with CsvInput(self.csv_file_path, self.encoding) as source:
+                csv_reader = csv.reader(source.text)
+                yield next(csv_reader, None), csv_reader, source.bytes_read
+
+    def _use_numpy_engine(self) -> bool:
+        # プロファイル時は全セルをカラム単位で計測できるように、autoではpythonエンジンを使う
+        return self.engine == 'numpy' or (self.engine == 'auto' and numpy_available() and self.profiler is None)
+
+    def _is_compressed(self) -> bool:
+        try:
+            return detect_compression(self.csv_file_path) is not None
+        except OSError:
+            # ファイルが開けない場合は読み込み時に報告する
+            return False
+
+    def _validate_records(self, csv_reader: Iterable[List[str]], start_row: int, bytes_read=None) -> int:
+        """
+        ヘッダー以降のレコードを検証（事前に _resolve_columns() でカラムを解決しておくこと）
+
+        Args:
+            csv_reader: ヘッダー行を読み込んだ後のcsv.reader、またはMmapCsvReader
+            start_row: 最初のレコードの行番号
+            bytes_read: 読み込んだバイト数を返す関数（進捗表示用）
+
+        Returns:
+            検証したレコード数（空行は数えない）
+        """
+        if self.profiler is not None:
+            csv_reader = self.profiler.track_reader(csv_reader, bytes_read)
+        if self._key_extractor is not None:
+            csv_reader = self._track_keys(csv_reader, start_row)
+        if self._foreign_key_probe is not None:
+            csv_reader = self._probe_foreign_keys(csv_reader, start_row)
+        if self.stats is not None:
+            csv_reader = self._collect_stats(csv_reader)
+
+        try:
+            if self._use_numpy_engine():
+                if self._batch_validator is None:
+                    self._batch_validator = ColumnarBatchValidator(self.column_plan, self.header_count)
+                return self._batch_validator.validate_records(csv_reader, start_row, self._add_error)
+
+            record_count = 0
+            row_number = start_row
+            for row in csv_reader:
+                # 空行は読み飛ばし、行番号にも数えない
+                if not row:
+                    continue
+                self._validate_row(row_number, row)
+                row_number += 1
+                record_count += 1
+            return record_count
+        except ErrorLimitReached as limit:
+            # 上限に達した行までを検証したレコードとして数え、残りは読み込まない
+            self._stop(limit)
+            return limit.error.row_number - start_row + 1
+        finally:
+            if self._stats_rows:
+                self.stats.add_rows(self._stats_rows)
+                self._stats_rows = []
+
+    def _track_keys(self, csv_reader: Iterable[List[str]], start_row: int) -> Iterable[List[str]]:
+        """レコードを順に返しながら主キー・一意キーを取り出す（行番号は _validate_records() と同じ数え方）"""
+        keys = self._key_extractor.keys
+        add_keys = self._add_keys
+        row_number = start_row
+        for row in csv_reader:
+            if row:
+                add_keys(row_number, keys(row))
+                row_number += 1
+            yield row
+
+    def _probe_foreign_keys(self, csv_reader: Iterable[List[str]], start_row: int) -> Iterable[List[str]]:
+        """
+        レコードを順に返しながら外部キーを参照先の索引で照合し、参照先がないキーのエラーを報告する
+
+        照合は PROBE_BATCH_SIZE 件ずつまとめて行うため、外部キーのエラーはそのレコードの検証後に出力される。
+        """
+        probe = self._foreign_key_probe
+        rows = []
+        row_number = start_row
+        for row in csv_reader:
+            yield row
+            if row:
+                rows.append(row)
+                if len(rows) >= PROBE_BATCH_SIZE:
+                    for error in probe.check(row_number, rows):
+                        self._add_error(error)
+                    row_number += len(rows)
+                    rows = []
+        if rows:
+            for error in probe.check(row_number, rows):
+                self._add_error(error)
+
+    def _collect_stats(self, csv_reader: Iterable[List[str]]) -> Iterable[List[str]]:
+        """
+        レコードを順に返しながらカラムの統計を集計する
+
+        統計は STATS_BATCH_SIZE 件ずつまとめてカラム単位に加え、残りは _validate_records() の終了時に加える。
+        """
+        stats = self.stats
+        self._stats_rows = []
+        for row in csv_reader:
+            yield row
+            if row:
+                self._stats_rows.append(row)
+                if len(self._stats_rows) >= STATS_BATCH_SIZE:
+                    stats.add_rows(self._stats_rows)
+                    self._stats_rows = []
+
+    def _report_duplicate_keys(self):
+        """全レコードの検証後に、重複したキーのエラーを行番号の順に報告する"""
+        if self.stop_reason is not None:
+            # 途中で打ち切った場合は、読み込んでいないレコードとの重複が分からないため報告しない
+            return
+        if self._key_detector.spilled:
+            logger.info("キーがメモリの上限を超えたため、ディスクに書き出して重複を判定します")
+        try:
+            for error in self._key_detector.duplicates():
+                self._add_error(error)
+        except ErrorLimitReached as limit:
+            self._stop(limit)
+
+    def _start_byte_ranges(self, checkpointed: bool, chunk_size: Optional[int] = None):
+        """
+        ヘッダーを読み込んで検証し、データ部分を範囲ごとに検証する準備をする
+
+        Returns:
+            (headers, start, start_row, byte_ranges, on_range) のタプル
+            byte_ranges, on_range はチェックポイントを使う場合のみ、それ以外はNone
+        """
+        headers, data_start = read_header(self.csv_file_path, self.encoding)
+        if not headers:
+            raise ValueError("CSVファイルにヘッダーが見つかりません")
+
+        self._validate_headers(headers)
+
+        start, start_row = data_start, 2
+        byte_ranges = on_range = None
+        if checkpointed:
+            start, start_row = self._start_from_checkpoint(data_start)
+            byte_ranges, on_range = self._checkpoint_ranges(start, start_row, chunk_size)
+        return headers, start, start_row, byte_ranges, on_range
+
+    def _validate_csv_parallel(self, checkpointed: bool = False):
+        try:
+            headers, start, start_row, byte_ranges, on_range = self._start_byte_ranges(checkpointed)
+            base_count = self.record_count
+
+            # データ部分をレコード境界で分割し、プロセスプールで検証
+            self._start_profile()
+            with closing(validate_in_processes(self, headers, start, self.workers, start_row=start_row,
+                                               byte_ranges=byte_ranges, on_range=on_range)) as errors:
+                try:
+                    for error in errors:
+                        self._add_error(error)
+                except ErrorLimitReached as limit:
+                    # 未処理の範囲は検証せずに打ち切る
+                    self._stop(limit)
+                    self.record_count = base_count + limit.error.row_number - start_row + 1
+            self.record_index_row = start_row
+
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {self.csv_file_path}")
+        except Exception as e:
+            raise Exception(f"CSVファイルの読み込み中にエラーが発生しました: {e}")
+
+    def _validate_csv_pipeline(self, checkpointed: bool = False):
+        if self.reader == 'bytes':
+            logger.warning("警告: パイプライン検証はブロック単位でデコードするため、バイト列リーダーを使用しません")
+        try:
+            headers, start, start_row, byte_ranges, on_range = self._start_byte_ranges(
+                checkpointed, PIPELINE_BLOCK_SIZE)
+            base_count = self.record_count
+
+            # 読み込み・検証・エラーの書き出しをスレッドのパイプラインで並行して処理
+            self._start_profile()
+            try:
+                validate_in_threads(self, headers, start, self.threads, self._add_error, start_row=start_row,
+                                    byte_ranges=byte_ranges, on_range=on_range)
+            except ErrorLimitReached as limit:
+                # 読み込み済みのブロックは破棄して打ち切る
+                self._stop(limit)
+                self.record_count = base_count + limit.error.row_number - start_row + 1
+            self.record_index_row = start_row
 
         except FileNotFoundError:
             raise FileNotFoundError(f"CSVファイルが見つかりません: {self.csv_file_path}")
@@ -84,61 +857,185 @@ class CSVChecker:
         # 不足しているカラム
         missing_columns = ddl_columns - csv_columns
         if missing_columns:
-            print(f"警告: DDLに定義されているが、CSVに存在しないカラム: {missing_columns}")
+            logger.warning(f"警告: DDLに定義されているが、CSVに存在しないカラム: {missing_columns}")
 
         # 余分なカラム
         extra_columns = csv_columns - ddl_columns
         if extra_columns:
-            print(f"警告: CSVに存在するが、DDLに定義されていないカラム: {extra_columns}")
+            logger.warning(f"警告: CSVに存在するが、DDLに定義されていないカラム: {extra_columns}")
 
-    def _validate_row(self, row_number: int, row: Dict[str, str]):
-        # 全カラムを検証
-        for column_name, column_def in self.columns.items():
-            # CSVにカラムが存在しない場合
-            if column_name not in row:
-                if not column_def.nullable:
-                    self.errors.append(
-                        ValidationError(
-                            row_number=row_number,
-                            column_name=column_name,
-                            value="",
-                            error_message="カラムが存在しません（NOT NULL制約違反）"
-                        )
-                    )
+        self._resolve_columns(csv_headers)
+        self._start_key_check(csv_headers)
+        self._start_foreign_key_check(csv_headers)
+        self._start_stats()
+
+    def _start_stats(self):
+        """カラムの統計を集計し直す（_resolve_columns() の後に呼ぶこと）"""
+        self.stats = TableStats(list(self.columns.values()), self.csv_headers) if self.collect_stats else None
+
+    def _start_foreign_key_check(self, csv_headers: List[str]):
+        self._close_foreign_key_probe()
+        if not self.foreign_keys:
+            return
+        probe = ForeignKeyProbe(self.foreign_keys, csv_headers)
+        for check in probe.skipped:
+            logger.warning(f"警告: CSVに存在しないカラムを含むため、外部キーを検査しません: {check}")
+        if not probe.checks:
+            probe.close()
+            return
+        logger.info(f"外部キーを検査します: {len(probe.checks)}制約")
+        for check in probe.checks:
+            logger.info(f"  - {check}")
+        self._foreign_key_probe = probe
+
+    def _close_foreign_key_probe(self):
+        if self._foreign_key_probe is not None:
+            self._foreign_key_probe.close()
+            self._foreign_key_probe = None
+
+    def _start_key_check(self, csv_headers: List[str]):
+        self._key_detector = self._key_extractor = self._add_keys = None
+        if not self.key_constraints:
+            return
+        detector = DuplicateKeyDetector(self.key_constraints, csv_headers, self.key_memory_limit)
+        for constraint in detector.extractor.skipped:
+            logger.warning(f"警告: CSVに存在しないカラムを含むため、キーの重複を検査しません: {constraint}")
+        if not detector.constraints:
+            return
+        self._key_detector = detector
+        self._key_extractor = detector.extractor
+        self._add_keys = detector.add_keys
+
+    def _resolve_columns(self, csv_headers: List[str]):
+        """DDLの各カラムをCSVの列番号に対応付ける（行ごとのカラム名の参照をなくすため）"""
+        # 同名のヘッダーがある場合は後ろの列を使う
+        header_index = {name: i for i, name in enumerate(csv_headers)}
+        self.csv_headers = csv_headers
+        self.header_count = len(csv_headers)
+        self._batch_validator = None
+        self.column_plan = []
+        for column_name, validator in self.validators.items():
+            index = header_index.get(column_name)
+            # CSVに存在しないNULL許可カラムは検証不要
+            if index is None and validator.nullable:
                 continue
+            self.column_plan.append((index, validator))
 
-            value = row[column_name]
+    def _validate_row(self, row_number: int, row: List[str],
+                      add_error: Optional[Callable[[ValidationError], None]] = None):
+        if add_error is None:
+            add_error = self._add_error
+        field_count = len(row)
+        column_plan = self.column_plan
+        if field_count != self.header_count:
+            add_error(field_count_error(row_number, self.header_count, field_count))
+            if field_count < self.header_count:
+                # フィールドが不足しているカラムは行単位のエラーとして報告済み
+                column_plan = [
+                    (index, validator) for index, validator in column_plan
+                    if index is None or index < field_count
+                ]
 
-            # AUTO_INCREMENTカラムの場合、空値を許可
-            if column_def.auto_increment and (value == '' or value.upper() == 'NULL'):
+        # 全カラムを検証
+        for index, validator in column_plan:
+            # CSVにカラムが存在しない場合（NOT NULLカラムのみ）
+            if index is None:
+                add_error(missing_column_error(row_number, validator.name))
                 continue
 
-            # データ型検証
-            is_valid, error_message = DataTypeValidator.validate(
-                value, column_def.data_type, column_def.nullable
-            )
+            value = row[index]
+
+            # データ型検証（AUTO_INCREMENTカラムの空値はバリデータ側で許可）
+            is_valid, error_message = validator.validate(value)
 
             if not is_valid:
-                self.errors.append(
+                add_error(
                     ValidationError(
                         row_number=row_number,
-                        column_name=column_name,
+                        column_name=validator.name,
                         value=value,
                         error_message=error_message
                     )
                 )
 
+    def _take_cache_stats(self) -> List[ColumnCacheStats]:
+        """キャッシュ付きバリデータから前回以降の統計を取り出す"""
+        return [validator.take_stats() for validator in self._cached_validators]
+
+    def _merge_cache_stats(self, stats_list: List[ColumnCacheStats]):
+        for stats in stats_list:
+            if stats.column_name in self.cache_stats:
+                self.cache_stats[stats.column_name].merge(stats)
+            else:
+                self.cache_stats[stats.column_name] = stats
+
+    def _take_column_profiles(self) -> List[ColumnProfile]:
+        """プロファイル用のラッパーから前回以降のカラム別の集計を取り出す"""
+        return [
+            validator.take_profile() for validator in self.validators.values()
+            if isinstance(validator, ProfilingColumnValidator)
+        ]
+
+    def _add_error(self, error: ValidationError):
+        self.error_count += 1
+        if self.max_retained_errors is None or len(self.errors) < self.max_retained_errors:
+            self.errors.append(error)
+        if self.error_sink is not None:
+            self.error_sink.write(error)
+
+        if self.max_errors is not None and self.error_count >= self.max_errors:
+            raise ErrorLimitReached(f"エラーが上限の{self.max_errors}件に達しました", error)
+        if self.max_errors_per_column is not None:
+            count = self._column_error_counts.get(error.column_name, 0) + 1
+            self._column_error_counts[error.column_name] = count
+            if count >= self.max_errors_per_column:
+                label = f"カラム'{error.column_name}'" if error.column_name else "行単位"
+                raise ErrorLimitReached(f"{label}のエラーが上限の{self.max_errors_per_column}件に達しました", error)
+
+    def _stop(self, limit: ErrorLimitReached):
+        self.stop_reason = limit.reason
+        self.stopped_row = limit.error.row_number
+
+    def read_records(self, row_numbers: Iterable[int]) -> Dict[int, List[str]]:
+        """
+        検証時に作成したレコード境界の索引を使い、行番号のレコードを読み直す（エラー箇所の表示用）
+
+        Args:
+            row_numbers: ValidationErrorの行番号
+
+        Returns:
+            行番号 -> フィールドのリスト の辞書（mmapリーダーで検証していない場合は空）
+        """
+        if self.record_index is None:
+            return {}
+
+        records = {}
+        # バイト列リーダーで検証した場合は、デコードできないバイトを置換文字に置き換えて読み直す
+        reader_class = ByteCsvReader if self._uses_byte_reader() else MmapCsvReader
+        with reader_class(self.csv_file_path, self.encoding, index=self.record_index) as source:
+            for row_number in sorted(set(row_numbers)):
+                # データ行の先頭（行番号2）がレコード番号0
+                record = source.record(row_number - self.record_index_row)
+                if record is not None:
+                    records[row_number] = record
+        return records
+
     def get_error_summary(self) -> str:
-        if not self.errors:
+        if not self.error_count:
             return "エラーはありません。"
 
-        summary = f"検出されたエラー: {len(self.errors)}件\n\n"
+        summary = f"検出されたエラー: {self.error_count}件\n\n"
         for error in self.errors:
             summary += f"{error}\n"
 
         return summary
 
     def export_errors_to_file(self, output_file_path: str):
+        """
+        保持しているエラーをまとめてCSVファイルに出力
+
+        error_sink を指定した場合はエラーが検出時に書き出されるため、この呼び出しは不要。
+        """
         with open(output_file_path, 'w', encoding='utf-8') as f:
             if not self.errors:
                 f.write("エラーはありません。\n")
@@ -154,4 +1051,4 @@ class CSVChecker:
                 escaped_message = error.error_message.replace('"', '""')
                 f.write(f'{error.row_number},"{error.column_name}","{escaped_value}","{escaped_message}"\n')
 
-        print(f"エラーレポートを出力しました: {output_file_path}")
+        logger.info(f"エラーレポートを出力しました: {output_file_path}")
@@ -1,6 +1,6 @@
 import re
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -9,6 +9,8 @@ class ColumnDefinition:
     data_type: str
     nullable: bool = True
     auto_increment: bool = False
+    # DEFAULT句の式（指定なしはNone）
+    default: Optional[str] = None
 
     def __repr__(self):
         null_str = "NULL" if self.nullable else "NOT NULL"
@@ -16,6 +18,365 @@ class ColumnDefinition:
         return f"{self.name} {self.data_type} {null_str}{auto_str}"
 
 
+@dataclass
+class ForeignKeyDefinition:
+    columns: List[str]
+    ref_table: str
+    ref_columns: List[str]
+    name: Optional[str] = None
+
+
+@dataclass
+class TableDefinition:
+    name: str
+    columns: List[ColumnDefinition] = field(default_factory=list)
+    primary_key: List[str] = field(default_factory=list)
+    unique_keys: List[List[str]] = field(default_factory=list)
+    foreign_keys: List[ForeignKeyDefinition] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TableDefinition':
+        """dataclasses.asdict() の結果から復元"""
+        return cls(
+            name=data['name'],
+            columns=[ColumnDefinition(**col) for col in data['columns']],
+            primary_key=list(data['primary_key']),
+            unique_keys=[list(key) for key in data['unique_keys']],
+            foreign_keys=[ForeignKeyDefinition(**fk) for fk in data['foreign_keys']],
+        )
+
+
+# 文字列・引用符付き識別子（MySQL: `a`、標準SQL: "a"、SQL Server: [a]）
+_QUOTED = r"""'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'|`[^`]*(?:``[^`]*)*`|"[^"]*(?:""[^"]*)*"|\[[^\]]*\]"""
+# コメント（閉じていない /* は末尾まで）。どの位置からも一致の仕方が1通りのため、バックトラックしない
+_COMMENT = r"--[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z)"
+# 引用符なしの識別子は数字で始まってもよい（MySQLの 2024_sales 等）
+_IDENTIFIER = r"""(?:[\w$]+|`[^`]*(?:``[^`]*)*`|"[^"]*(?:""[^"]*)*"|\[[^\]]*\])"""
+# 入れ子のない括弧（型の引数 (10,2)、ENUM('a','b')、now() 等）
+_FLAT_GROUP = rf"""\((?:[^()'"`;]|{_QUOTED})*\)"""
+# 2段までの入れ子の括弧（DEFAULT (now())、CHECK ((a > 0)) 等）
+_GROUP = rf"""\((?:[^()'"`;]|{_QUOTED}|{_FLAT_GROUP})*\)"""
+
+# コメント以外の部分（文字列・引用符付き識別子を含む）と、コメント
+# コメント以外の部分はコメントの開始位置まで1回で一致させ、後ろに何も続かないため途中でバックトラックしない
+_COMMENT_PATTERN = re.compile(rf"""((?:[^-#/'"`\[]+|{_QUOTED}|-(?!-)|/(?!\*))+)|{_COMMENT}""", re.DOTALL)
+
+# DDLのトークン（前後の空白は読み飛ばす。コメントは _COMMENT_PATTERN で取り除いておくこと）
+# 括弧・カンマ・セミコロン以外の連続した部分を1トークンにまとめるため、入れ子の括弧を含まない
+# カラム定義（`name` varchar(50) NOT NULL DEFAULT '' COMMENT 'a, b'）は1トークンになる
+_TOKEN_PATTERN = re.compile(rf"""
+    \s*
+    (
+        [(),;]
+      | (?:{_QUOTED}|{_FLAT_GROUP}|[^\s(),;'"`\[])
+        (?:{_QUOTED}|{_FLAT_GROUP}|[^(),;'"`\[]+)*
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# PostgreSQLのドル記号で囲まれた文字列（関数本体等。中の ; で文が終わらないように先に取り除く）
+_DOLLAR_QUOTED_PATTERN = re.compile(r'\$((?:[^\W\d]\w*)?)\$.*?\$\1\$', re.DOTALL)
+
+_CREATE_TABLE_PATTERN = re.compile(rf"""
+    CREATE\s+
+    (?:(?:OR\s+REPLACE|TEMPORARY|TEMP|GLOBAL|LOCAL|UNLOGGED)\s+)*
+    TABLE\s+
+    (?:IF\s+NOT\s+EXISTS\s+)?
+    # スキーマ名付き（mydb.users）の場合はテーブル名のみ
+    (?:{_IDENTIFIER}\s*\.\s*)*(?P<name>{_IDENTIFIER})\s*
+    (?P<body>{_FLAT_GROUP})?
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+_WORD_PATTERN = re.compile(r'[^\W\d][\w$]*')
+
+_COLUMN_PATTERN = re.compile(rf"""
+    (?P<name>{_IDENTIFIER})
+    (?:
+        \s*(?P<type>[^\W\d]\w*)
+        (?:\s*(?P<type2>PRECISION|VARYING)\b)?
+        \s*(?P<args>{_FLAT_GROUP})?
+    )?
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+# 型の後ろの属性（文字列・括弧の中は読み飛ばす）
+# findall() で (キーワード, DEFAULTの式) のタプルのリストになる
+_ATTRIBUTE_PATTERN = re.compile(rf"""
+    {_QUOTED}|{_GROUP}
+  | \b(?:
+        (NOT\s+NULL|UNSIGNED|AUTO_INCREMENT|AUTOINCREMENT|IDENTITY|PRIMARY|UNIQUE|REFERENCES)
+      | DEFAULT\s+(
+            [-+]?(?:{_QUOTED}|{_GROUP}|[\w.$]+(?:\s*{_GROUP})?)
+            # PostgreSQLの型キャスト 'abc'::character varying 等
+            (?:\s*::\s*[^\W\d]\w*
+                (?:\s+(?:VARYING|PRECISION|(?:WITH|WITHOUT)\s+TIME\s+ZONE)\b)?(?:\s*{_FLAT_GROUP})?)*
+        )
+    )(?![\w$])
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+_REFERENCES_PATTERN = re.compile(rf"""
+    {_QUOTED}
+  | \bREFERENCES\s+
+    (?:{_IDENTIFIER}\s*\.\s*)*(?P<table>{_IDENTIFIER})
+    (?:\s*(?P<columns>{_FLAT_GROUP}))?
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+_KEY_PATTERN = re.compile(rf"""
+    (?:CONSTRAINT(?:\s+(?!(?:PRIMARY|UNIQUE|FOREIGN|CHECK)\b)(?P<name>{_IDENTIFIER}))?\s+)?
+    (?P<kind>PRIMARY|UNIQUE|FOREIGN)\b
+    (?:\s+(?:KEY|INDEX)\b)?
+    (?:\s*(?!USING\b)(?P<index_name>{_IDENTIFIER}))?
+    (?:\s+USING\s+\w+)?
+    \s*(?P<columns>{_GROUP})
+""", re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+# キーのカラム一覧の各カラム名（MySQLのプレフィックス長 (a(10)) や ASC/DESC は除く）
+_KEY_COLUMN_PATTERN = re.compile(rf"(?:^|,)\s*({_IDENTIFIER})")
+
+# テーブル制約（カラム定義ではない項目）の先頭キーワード
+_TABLE_CONSTRAINT_KEYWORDS = frozenset([
+    'CONSTRAINT', 'PRIMARY', 'UNIQUE', 'FOREIGN', 'KEY', 'INDEX', 'FULLTEXT', 'SPATIAL',
+    'CHECK', 'EXCLUDE', 'LIKE',
+])
+
+# 2語で1つの型になるもの（1語目 -> {2語目: 型名}）
+_MULTIWORD_TYPES = {
+    'DOUBLE': {'PRECISION': 'DOUBLE PRECISION'},
+    'CHARACTER': {'VARYING': 'VARCHAR'},
+    'CHAR': {'VARYING': 'VARCHAR'},
+}
+
+# バリデータが判定に使う型名に揃える別名
+_TYPE_ALIASES = {
+    'CHARACTER': 'CHAR',
+    'NCHAR': 'CHAR',
+    'NVARCHAR': 'VARCHAR',
+    'TINYTEXT': 'TEXT',
+    'MEDIUMTEXT': 'TEXT',
+    'LONGTEXT': 'TEXT',
+    'NTEXT': 'TEXT',
+    'INT2': 'SMALLINT',
+    'INT4': 'INT',
+    'INT8': 'BIGINT',
+    'DATETIME2': 'DATETIME',
+    'SMALLDATETIME': 'DATETIME',
+    'TIMESTAMPTZ': 'TIMESTAMP',
+    'TIMETZ': 'TIME',
+}
+
+# 秒の小数部の桁数 TIMESTAMP(6) 等は検証に影響しないため型名に含めない
+_TEMPORAL_TYPES = frozenset(['DATE', 'DATETIME', 'TIMESTAMP', 'TIME'])
+
+# AUTO_INCREMENT相当の型（PostgreSQL）
+_SERIAL_TYPES = frozenset(['SERIAL', 'BIGSERIAL', 'SMALLSERIAL'])
+
+# AUTO_INCREMENT相当の属性（GENERATED ... AS IDENTITY、IDENTITY(1,1) を含む）
+_AUTO_INCREMENT_KEYWORDS = frozenset(['AUTO_INCREMENT', 'AUTOINCREMENT', 'IDENTITY'])
+
+# 末尾が ; で終わっていない場合などに、先読みで範囲外を参照しないための番兵
+_SENTINEL = [';'] * 4
+
+
+def tokenize(ddl_content: str) -> List[str]:
+    """DDLを括弧・カンマ・セミコロンと、その間の部分に分割（前後の空白・コメントは除く）"""
+    if '$' in ddl_content:
+        ddl_content = _DOLLAR_QUOTED_PATTERN.sub("''", ddl_content)
+    if '--' in ddl_content or '#' in ddl_content or '/*' in ddl_content:
+        # コメントはトークンに分割する前に取り除き、カラム定義等の解析ではコメントを考慮しない
+        ddl_content = _COMMENT_PATTERN.sub(_strip_comment, ddl_content)
+    return _TOKEN_PATTERN.findall(ddl_content)
+
+
+def _strip_comment(match: re.Match) -> str:
+    # コメントは前後のトークンがつながらないよう空白にする
+    return match.group(1) or ' '
+
+
+def _unquote(identifier: str) -> str:
+    first = identifier[0]
+    if first == '`':
+        return identifier[1:-1].replace('``', '`')
+    if first == '"':
+        return identifier[1:-1].replace('""', '"')
+    if first == '[':
+        return identifier[1:-1]
+    return identifier
+
+
+def _key_columns(group: str) -> List[str]:
+    return [_unquote(name) for name in _KEY_COLUMN_PATTERN.findall(group[1:-1])]
+
+
+def _parse_references(item: str) -> Tuple[Optional[str], List[str]]:
+    """REFERENCES 句の参照先テーブルとカラム一覧を返す"""
+    for ref_table, ref_columns in _REFERENCES_PATTERN.findall(item):
+        if ref_table:
+            return _unquote(ref_table), _key_columns(ref_columns) if ref_columns else []
+    return None, []
+
+
+def _parse_column(item: str, table: TableDefinition):
+    match = _COLUMN_PATTERN.match(item)
+    if match is None:
+        # カラム名として解釈できない項目（@a、閉じていない引用符等）は読み飛ばす
+        return
+    name = _unquote(match.group('name'))
+    type_name = match.group('type')
+    if type_name is None:
+        # 型の指定がないカラム（SQLite等）
+        table.columns.append(ColumnDefinition(name=name, data_type='UNKNOWN'))
+        return
+
+    type_name = type_name.upper()
+    type2 = match.group('type2')
+    if type2 is not None:
+        second_words = _MULTIWORD_TYPES.get(type_name)
+        if second_words is not None and type2.upper() in second_words:
+            type_name = second_words[type2.upper()]
+    type_name = _TYPE_ALIASES.get(type_name, type_name)
+
+    data_type = type_name
+    args = match.group('args')
+    if args is not None and type_name not in _TEMPORAL_TYPES:
+        if ' ' in args or '\n' in args:
+            args = f"({','.join(arg.strip() for arg in args[1:-1].split(','))})"
+        data_type += args
+
+    column = ColumnDefinition(name=name, data_type=data_type, auto_increment=type_name in _SERIAL_TYPES)
+    for keyword, default in _ATTRIBUTE_PATTERN.findall(item[match.end():]):
+        if default:
+            if column.default is None:
+                column.default = default
+            continue
+        if not keyword:
+            continue
+        keyword = keyword.upper()
+        if keyword in _AUTO_INCREMENT_KEYWORDS:
+            column.auto_increment = True
+        elif keyword == 'UNSIGNED':
+            column.data_type += ' UNSIGNED'
+        elif keyword == 'PRIMARY':
+            table.primary_key = [name]
+        elif keyword == 'UNIQUE':
+            table.unique_keys.append([name])
+        elif keyword == 'REFERENCES':
+            ref_table, ref_columns = _parse_references(item[match.end():])
+            if ref_table is not None:
+                table.foreign_keys.append(ForeignKeyDefinition([name], ref_table, ref_columns))
+        else:
+            # NOT NULL
+            column.nullable = False
+
+    table.columns.append(column)
+
+
+def _parse_table_constraint(item: str, table: TableDefinition):
+    """主キー・一意キー・外部キーを解析（INDEX、CHECK等は読み飛ばす）"""
+    match = _KEY_PATTERN.match(item)
+    if match is None:
+        return
+
+    columns = _key_columns(match.group('columns'))
+    kind = match.group('kind').upper()
+    if kind == 'PRIMARY':
+        table.primary_key = columns
+    elif kind == 'UNIQUE':
+        table.unique_keys.append(columns)
+    else:
+        ref_table, ref_columns = _parse_references(item[match.end():])
+        if ref_table is not None:
+            name = match.group('name') or match.group('index_name')
+            table.foreign_keys.append(ForeignKeyDefinition(
+                columns, ref_table, ref_columns, _unquote(name) if name else None
+            ))
+
+
+def _parse_item(item: str, table: TableDefinition):
+    """CREATE TABLE の括弧の中の1項目（カラム定義またはテーブル制約）を解析"""
+    if item[0] not in '`"[':
+        word = _WORD_PATTERN.match(item)
+        if word is not None and word.group().upper() in _TABLE_CONSTRAINT_KEYWORDS:
+            _parse_table_constraint(item, table)
+            return
+    _parse_column(item, table)
+
+
+def _parse_table_body(tokens: List[str], i: int, table: TableDefinition) -> int:
+    """CREATE TABLE の括弧の中（tokens[i] が最初の項目）を解析し、閉じ括弧の次の位置を返す"""
+    while True:
+        token = tokens[i]
+        if token == ')':
+            # 空のテーブル、または末尾のカンマ
+            return i + 1
+        if token == ';':
+            # 閉じ括弧がないまま文が終わっている
+            return i
+        if token == ',':
+            i += 1
+            continue
+
+        following = tokens[i + 1]
+        if following == ',' or following == ')':
+            # 入れ子の括弧を含まない項目は1トークン
+            _parse_item(token, table)
+            i += 1
+        else:
+            # 入れ子の括弧を含む項目は、次の , または閉じ括弧までをつなげる
+            start = i
+            depth = 0
+            while True:
+                token = tokens[i]
+                if token == '(':
+                    depth += 1
+                elif token == ')':
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif token == ';' or (token == ',' and depth == 0):
+                    break
+                i += 1
+            if tokens[start] != '(':
+                _parse_item(' '.join(tokens[start:i]), table)
+
+        if tokens[i] == ')':
+            return i + 1
+
+
+def parse_schema(ddl_content: str) -> Dict[str, TableDefinition]:
+    """
+    DDL全体を1回の走査で解析し、全てのCREATE TABLE文のテーブル定義を返す
+
+    トークンに分割してから文ごとに読み進めるため、複数行にわたるカラム定義、
+    文字列やコメント内の括弧・カンマ・セミコロンも正しく扱える。
+
+    Returns:
+        テーブル名 -> TableDefinition の辞書（DDL内の出現順）
+        テーブル名はクォートとスキーマ名を除いたもの
+    """
+    tokens = tokenize(ddl_content)
+    n = len(tokens)
+    tokens.extend(_SENTINEL)
+
+    tables = {}
+    i = 0
+    while i < n:
+        token = tokens[i]
+        if token[:6].upper() == 'CREATE':
+            match = _CREATE_TABLE_PATTERN.match(token)
+            if match is not None:
+                table = TableDefinition(name=_unquote(match.group('name')))
+                body = match.group('body')
+                if body is not None:
+                    # 入れ子の括弧を含まないテーブル定義は CREATE TABLE と同じトークンになっている
+                    _parse_table_body(tokenize(body[1:-1]) + [')'] + _SENTINEL, 0, table)
+                    tables[table.name] = table
+                elif tokens[i + 1] == '(':
+                    i = _parse_table_body(tokens, i + 2, table)
+                    tables[table.name] = table
+                # それ以外は CREATE TABLE ... AS SELECT 等
+        # 次の文へ
+        i = tokens.index(';', i) + 1
+    return tables
+
+
 class DDLParser:
 
     def __init__(self, ddl_file_path: str):
@@ -29,126 +390,40 @@ class DDLParser:
         self.columns = self._extract_columns(ddl_content)
         return self.columns
 
-    def _extract_columns(self, ddl_content: str) -> List[ColumnDefinition]:
-        # CREATE TABLE文を探す
-        create_table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[\w`.]+\s*\((.*?)\);'
-        match = re.search(create_table_pattern, ddl_content, re.IGNORECASE | re.DOTALL)
-
-        if not match:
-            raise ValueError("CREATE TABLE文が見つかりません")
-
-        columns_section = match.group(1)
-        columns = []
-
-        # カラム定義を1行ずつ処理
-        for line in columns_section.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('PRIMARY KEY') or line.startswith('FOREIGN KEY') or line.startswith('CONSTRAINT') or line.startswith('KEY') or line.startswith('INDEX'):
-                continue
-
-            # コメントを除去
-            line = re.sub(r'--.*$', '', line)
-            line = line.rstrip(',').strip()
-
-            if not line:
-                continue
-
-            column = self._parse_column_definition(line)
-            if column:
-                columns.append(column)
-
-        return columns
-
-    def _parse_column_definition(self, line: str) -> ColumnDefinition:
-        # カラム名を抽出（バッククォートやダブルクォートで囲まれている可能性あり）
-        column_name_match = re.match(r'([`"]?\w+[`"]?)\s+(.*)', line)
-        if not column_name_match:
-            return None
+    def parse_tables(self) -> Dict[str, List[ColumnDefinition]]:
+        """
+        DDLファイル内の全てのCREATE TABLE文を解析
 
-        column_name = column_name_match.group(1).strip('`"')
-        rest = column_name_match.group(2)
+        Returns:
+            テーブル名 -> カラム定義リスト の辞書（DDL内の出現順）
+            テーブル名はクォートとスキーマ名を除いたもの
+        """
+        return {name: table.columns for name, table in self.parse_schema().items()}
 
-        # データ型を抽出
-        data_type = self._extract_data_type(rest)
+    def parse_schema(self) -> Dict[str, TableDefinition]:
+        """
+        DDLファイル内の全てのCREATE TABLE文を、主キー・一意キー・外部キーを含めて解析
 
-        # NULL制約をチェック
-        nullable = 'NOT NULL' not in rest.upper()
+        Returns:
+            テーブル名 -> TableDefinition の辞書（DDL内の出現順）
+        """
+        with open(self.ddl_file_path, 'r', encoding='utf-8') as f:
+            ddl_content = f.read()
 
-        # AUTO_INCREMENT/SERIAL検出
-        auto_increment = self._is_auto_increment(rest, data_type)
+        return self._extract_schema(ddl_content)
 
-        return ColumnDefinition(
-            name=column_name,
-            data_type=data_type,
-            nullable=nullable,
-            auto_increment=auto_increment
-        )
+    def _extract_schema(self, ddl_content: str) -> Dict[str, TableDefinition]:
+        tables = parse_schema(ddl_content)
+        if not tables:
+            raise ValueError("CREATE TABLE文が見つかりません")
+        return tables
 
-    def _is_auto_increment(self, definition: str, data_type: str) -> bool:
-        """
-        AUTO_INCREMENT/SERIAL属性を検出
+    def _extract_tables(self, ddl_content: str) -> Dict[str, List[ColumnDefinition]]:
+        return {name: table.columns for name, table in self._extract_schema(ddl_content).items()}
 
-        対応パターン:
-        - MySQL: AUTO_INCREMENT
-        - PostgreSQL: SERIAL, BIGSERIAL, SMALLSERIAL
-        - PostgreSQL: GENERATED ... AS IDENTITY
-        - SQL Server: IDENTITY
-        """
-        definition_upper = definition.upper()
-
-        # AUTO_INCREMENTキーワード
-        if 'AUTO_INCREMENT' in definition_upper:
-            return True
-
-        # PostgreSQL SERIAL型
-        if data_type.upper() in ('SERIAL', 'BIGSERIAL', 'SMALLSERIAL'):
-            return True
-
-        # GENERATED ... AS IDENTITY
-        if 'GENERATED' in definition_upper and 'IDENTITY' in definition_upper:
-            return True
-
-        # SQL Server IDENTITY
-        if re.search(r'IDENTITY\s*\(', definition_upper):
-            return True
-
-        return False
-
-    def _extract_data_type(self, definition: str) -> str:
-        type_patterns = [
-            # PostgreSQL SERIAL型を追加
-            r'(BIGSERIAL)',
-            r'(SERIAL)',
-            r'(SMALLSERIAL)',
-            # 既存の型
-            r'(INT(?:EGER)?(?:\(\d+\))?(?:\s+UNSIGNED)?)',
-            r'(BIGINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
-            r'(SMALLINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
-            r'(TINYINT(?:\(\d+\))?(?:\s+UNSIGNED)?)',
-            r'(DECIMAL(?:\(\d+,\s*\d+\))?)',
-            r'(NUMERIC(?:\(\d+,\s*\d+\))?)',
-            r'(FLOAT(?:\(\d+,\s*\d+\))?)',
-            r'(DOUBLE(?:\s+PRECISION)?(?:\(\d+,\s*\d+\))?)',
-            r'(VARCHAR\(\d+\))',
-            r'(CHAR\(\d+\))',
-            r'(TEXT)',
-            r'(DATETIME)',
-            r'(TIMESTAMP)',
-            r'(DATE)',
-            r'(TIME)',
-            r'(BOOLEAN)',
-            r'(BOOL)',
-            r'(BLOB)',
-        ]
-
-        for pattern in type_patterns:
-            match = re.search(pattern, definition, re.IGNORECASE)
-            if match:
-                return match.group(1).upper()
-
-        # マッチしない場合は最初の単語を返す
-        first_word = definition.split()[0] if definition.split() else 'UNKNOWN'
-        return first_word.upper()
+    def _extract_columns(self, ddl_content: str) -> List[ColumnDefinition]:
+        # 最初のCREATE TABLE文のカラム
+        return next(iter(self._extract_schema(ddl_content).values())).columns
 
     def get_column_names(self) -> List[str]:
         return [col.name for col in self.columns]
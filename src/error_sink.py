@@ -0,0 +1,252 @@
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .errors import ValidationError
+
+# レポート書き込み時のバッファサイズ（バイト）
+WRITE_BUFFER_SIZE = 1024 * 1024
+# 集約レポートに残すエラーの例の件数（カラム×エラー内容ごと）
+SUMMARY_EXAMPLE_LIMIT = 3
+# エラー内容のうち値ごとに変わる部分（文字列長の実際の長さ、重複したキーの最初の行、デコードできないバイトの位置）。集約時は取り除く
+_VARYING_PART_PATTERN = re.compile(r'（実際: \d+）$|（行\d+と同じ値）$|（\d+バイト目）$')
+# 集約結果の表示で、例の値を省略せずに表示する最大文字数
+EXAMPLE_PREVIEW_LENGTH = 20
+
+
+class ErrorSink:
+    """
+    検出したValidationErrorを逐次受け取る出力先の基底クラス
+
+    CSVCheckerはエラーを検出するたびに write() を呼び出し、検証終了時に close() を呼び出す。
+    エラーをメモリに溜めずにレポートへ書き出すことで、エラー件数に関わらずメモリ使用量を一定に保つ。
+    """
+
+    # 書き出し先のファイルパス（ファイルに書き出さない場合はNone）
+    output_file_path = None
+
+    def write(self, error):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def report_size(self) -> Optional[int]:
+        """
+        書き出したエラーをファイルに反映し、レポートのバイト数を返す（チェックポイント用）
+
+        Returns:
+            レポートのバイト数（続きから書き出せない出力先はNone）
+        """
+        return None
+
+    def resume(self, report_size: int):
+        """チェックポイント時点のバイト数までレポートを切り詰め、続きから書き出す"""
+        raise ValueError("このエラーレポートは続きから書き出せません")
+
+
+class _FileErrorSink(ErrorSink):
+    """最初のエラーを受け取った時点でファイルを開くバッファ付きの出力先"""
+
+    def __init__(self, output_file_path: str):
+        self.output_file_path = output_file_path
+        self._file = None
+
+    def write(self, error):
+        if self._file is None:
+            self._file = open(self.output_file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+            self._write_header()
+        self._write_error(error)
+
+    def report_size(self) -> Optional[int]:
+        if self._file is None:
+            return 0
+        self._file.flush()
+        return self._file.tell()
+
+    def resume(self, report_size: int):
+        if report_size == 0:
+            # エラーを書き出す前のチェックポイントは、最初のエラーで新しく作成する
+            return
+        if os.path.getsize(self.output_file_path) < report_size:
+            raise ValueError(f"エラーレポートがチェックポイントの時点より小さくなっています: {self.output_file_path}")
+        self._file = open(self.output_file_path, 'r+', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self._file.seek(report_size)
+        self._file.truncate()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_header(self):
+        pass
+
+    def _write_error(self, error):
+        raise NotImplementedError
+
+
+class CsvErrorSink(_FileErrorSink):
+    """export_errors_to_file() と同じ形式のCSVレポートに書き出す"""
+
+    def _write_header(self):
+        self._file.write("行番号,カラム名,値,エラー内容\n")
+
+    def _write_error(self, error):
+        # CSVとして出力（値にカンマが含まれる可能性を考慮）
+        escaped_value = error.value.replace('"', '""')
+        escaped_message = error.error_message.replace('"', '""')
+        self._file.write(f'{error.row_number},"{error.column_name}","{escaped_value}","{escaped_message}"\n')
+
+
+class JsonlErrorSink(_FileErrorSink):
+    """1行1エラーのJSON Lines形式で書き出す"""
+
+    def _write_error(self, error):
+        record = {
+            'row_number': error.row_number,
+            'column_name': error.column_name,
+            'value': error.value,
+            'error_message': error.error_message,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class TimedErrorSink(ErrorSink):
+    """書き出しに掛かった累計時間（秒）を seconds に記録するErrorSinkのラッパー"""
+
+    def __init__(self, sink: ErrorSink):
+        self.sink = sink
+        self.seconds = 0.0
+
+    def write(self, error):
+        start = time.perf_counter()
+        self.sink.write(error)
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        start = time.perf_counter()
+        self.sink.close()
+        self.seconds += time.perf_counter() - start
+
+    @property
+    def output_file_path(self):
+        return self.sink.output_file_path
+
+    def report_size(self) -> Optional[int]:
+        return self.sink.report_size()
+
+    def resume(self, report_size: int):
+        self.sink.resume(report_size)
+
+
+def summary_message(error_message: str) -> str:
+    """集約に使うエラー内容（値ごとに変わる部分を取り除く）"""
+    return _VARYING_PART_PATTERN.sub('', error_message)
+
+
+def _preview(value: str) -> str:
+    if len(value) > EXAMPLE_PREVIEW_LENGTH:
+        return value[:EXAMPLE_PREVIEW_LENGTH] + '...'
+    return value
+
+
+@dataclass
+class ErrorGroup:
+    column_name: str
+    error_message: str
+    count: int = 0
+    # 最初に検出した数件のエラー
+    examples: List[ValidationError] = field(default_factory=list)
+
+    def __str__(self):
+        target = f"カラム'{self.column_name}'" if self.column_name else "行単位"
+        examples = ", ".join(
+            f"行{error.row_number}" + (f" '{_preview(error.value)}'" if self.column_name else "")
+            for error in self.examples
+        )
+        return f"{target}: {self.error_message} {self.count:,}件（例: {examples}）"
+
+
+class ErrorSummary(ErrorSink):
+    """
+    エラーを1件ずつ書き出す代わりに、カラム×エラー内容ごとの件数と最初の数件の例に集約する
+
+    全てのセルがエラーになるファイルでも、集約結果はカラム数×エラーの種類の件数に収まる。
+    output_file_path を指定した場合は close() 時に集約レポートを書き出す。
+    """
+
+    def __init__(self, output_file_path: Optional[str] = None, report_format: str = 'csv',
+                 example_limit: int = SUMMARY_EXAMPLE_LIMIT):
+        if report_format not in ('csv', 'jsonl'):
+            raise ValueError(f"未対応のレポート形式です: {report_format}")
+        self.output_file_path = output_file_path
+        self.report_format = report_format
+        self.example_limit = example_limit
+        self._groups: Dict[Tuple[str, str], ErrorGroup] = {}
+
+    def write(self, error):
+        key = (error.column_name, summary_message(error.error_message))
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = ErrorGroup(*key)
+        group.count += 1
+        if len(group.examples) < self.example_limit:
+            group.examples.append(error)
+
+    def groups(self) -> List[ErrorGroup]:
+        """件数の多い順（同数は最初に検出した順）の集約結果"""
+        return sorted(self._groups.values(), key=lambda group: -group.count)
+
+    def close(self):
+        if self.output_file_path is None or not self._groups:
+            return
+        with open(self.output_file_path, 'w', encoding='utf-8') as f:
+            if self.report_format == 'jsonl':
+                for group in self.groups():
+                    record = {
+                        'column_name': group.column_name,
+                        'error_message': group.error_message,
+                        'count': group.count,
+                        'examples': [{'row_number': e.row_number, 'value': e.value} for e in group.examples],
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                return
+
+            f.write("カラム名,エラー内容,件数,例の行番号,例の値\n")
+            for group in self.groups():
+                escaped_message = group.error_message.replace('"', '""')
+                rows = ";".join(str(e.row_number) for e in group.examples)
+                values = " | ".join(e.value for e in group.examples).replace('"', '""')
+                f.write(f'"{group.column_name}","{escaped_message}",{group.count},"{rows}","{values}"\n')
+
+
+def _report_format(output_file_path: str, report_format: Optional[str]) -> str:
+    if report_format is None:
+        _, ext = os.path.splitext(output_file_path)
+        report_format = 'jsonl' if ext.lower() in ('.jsonl', '.ndjson') else 'csv'
+    return report_format
+
+
+def create_error_sink(output_file_path: str, report_format: Optional[str] = None,
+                      summary: bool = False) -> ErrorSink:
+    """
+    出力先ファイルに応じたErrorSinkを生成
+
+    Args:
+        output_file_path: エラーレポートの出力先ファイルパス
+        report_format: 'csv' または 'jsonl'（省略時は拡張子から判定）
+        summary: Trueの場合、カラム×エラー内容ごとの集約レポートを出力する ErrorSummary を返す
+    """
+    report_format = _report_format(output_file_path, report_format)
+    if summary:
+        return ErrorSummary(output_file_path, report_format)
+
+    if report_format == 'csv':
+        return CsvErrorSink(output_file_path)
+    if report_format == 'jsonl':
+        return JsonlErrorSink(output_file_path)
+    raise ValueError(f"未対応のレポート形式です: {report_format}")
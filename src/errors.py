@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class ValidationError:
+    row_number: int
+    column_name: str
+    value: str
+    error_message: str
+
+    def __str__(self):
+        # 行全体に対するエラーはカラム名なし
+        if not self.column_name:
+            return f"行{self.row_number}: {self.error_message}"
+        return f"行{self.row_number}, カラム'{self.column_name}': {self.error_message} (値: '{self.value}')"
+
+
+def missing_column_error(row_number: int, column_name: str) -> ValidationError:
+    """NOT NULLのカラムがCSVに存在しない場合のエラー"""
+    return ValidationError(
+        row_number=row_number,
+        column_name=column_name,
+        value="",
+        error_message="カラムが存在しません（NOT NULL制約違反）"
+    )
+
+
+def field_count_error(row_number: int, header_count: int, field_count: int) -> ValidationError:
+    """レコードのフィールド数がヘッダーと一致しない場合の行単位のエラー"""
+    return ValidationError(
+        row_number=row_number,
+        column_name="",
+        value="",
+        error_message=f"フィールド数がヘッダーと一致しません（ヘッダー: {header_count}, 実際: {field_count}）"
+    )
+
+
+def duplicate_key_error(row_number: int, first_row: int, kind: str,
+                        columns: List[str], key: Tuple[str, ...]) -> ValidationError:
+    """主キー・一意キーの値が、先に出現したレコードと重複している場合のエラー"""
+    label = "主キー" if kind == 'PRIMARY KEY' else "一意キー"
+    return ValidationError(
+        row_number=row_number,
+        column_name=",".join(columns),
+        value=",".join(key),
+        error_message=f"{label}が重複しています（行{first_row}と同じ値）"
+    )
+
+
+def foreign_key_error(row_number: int, columns: List[str], ref_table: str,
+                      ref_columns: List[str], key: Tuple[str, ...]) -> ValidationError:
+    """外部キーの値が、参照先テーブルのCSVに存在しない場合のエラー"""
+    return ValidationError(
+        row_number=row_number,
+        column_name=",".join(columns),
+        value=",".join(key),
+        error_message=f"外部キーの参照先がありません（{ref_table}.{','.join(ref_columns)}）"
+    )
+
+
+def decode_error(row_number: int, column_name: str, raw: bytes, encoding: str,
+                 offset: Optional[int]) -> ValidationError:
+    """フィールドのバイト列を、CSVファイルのエンコーディングでデコードできない場合のエラー"""
+    position = f"（{offset}バイト目）" if offset is not None else ""
+    return ValidationError(
+        row_number=row_number,
+        column_name=column_name,
+        # デコードできないバイトは \x.. で表す
+        value=raw.decode(encoding, 'backslashreplace'),
+        error_message=f"{encoding}としてデコードできないバイト列が含まれています{position}"
+    )
+
+
+class ErrorLimitReached(Exception):
+    """エラー件数が上限に達し、検証を中断する場合に送出される"""
+
+    def __init__(self, reason: str, error: ValidationError):
+        super().__init__(reason)
+        self.reason = reason
+        # 上限に達したエラー
+        self.error = error
@@ -0,0 +1,209 @@
+import csv
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from .compression import CsvInput
+from .errors import ValidationError, foreign_key_error
+from .key_checker import KeyConstraint, KeyExtractor
+
+FOREIGN_KEY = 'FOREIGN KEY'
+
+# 参照先の索引でまとめて照合するレコード数
+PROBE_BATCH_SIZE = 1000
+# SQLiteの IN (...) に渡すパラメーターの最大数（SQLITE_MAX_VARIABLE_NUMBER の下限999未満）
+PROBE_QUERY_SIZE = 900
+# 索引の作成・照合でSQLiteが使うページキャッシュ（KB）。キーの件数によらずメモリ使用量はこの程度に収まる
+INDEX_CACHE_KB = 64 * 1024
+# キーがこの件数以下の索引は照合の開始時にメモリに読み込み、SQLiteに問い合わせずに照合する
+MAX_KEYS_IN_MEMORY = 1_000_000
+
+
+@dataclass
+class ForeignKeyCheck:
+    """外部キー制約と、参照先のキーの索引ファイル"""
+    columns: List[str]
+    ref_table: str
+    ref_columns: List[str]
+    index_path: str
+    # 索引のキーの件数（build_key_index() の結果）
+    key_count: int = 0
+    # 外部キーのカラムのデータ型（整数型・小数型のカラムは、索引と同じく値の表記を揃えて照合する）
+    data_types: Optional[List[str]] = None
+
+    def __str__(self):
+        return f"({', '.join(self.columns)}) REFERENCES {self.ref_table} ({', '.join(self.ref_columns)})"
+
+
+def _key_columns(size: int) -> str:
+    """索引のテーブルのカラム（複合キーはカラムごとに格納する）"""
+    return ", ".join(f"k{i}" for i in range(size))
+
+
+def _connect(index_path: str, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    else:
+        connection = sqlite3.connect(index_path)
+        # 作り直せる一時的な索引のため、ジャーナルとディスクへの同期を省略する
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+    connection.execute(f"PRAGMA cache_size = -{INDEX_CACHE_KB}")
+    return connection
+
+
+def build_key_index(index_path: str, csv_file_paths: List[str], columns: List[str],
+                    encoding: str = 'utf-8', data_types: Optional[List[str]] = None) -> int:
+    """
+    参照先テーブルのCSVファイルから、キーの索引（SQLiteのB-tree）を作成
+
+    キーは読み込んだ順にテーブルへ追加し、最後にまとめてソートして索引を作成する。
+    NULL（空文字と、大文字・小文字を問わない "NULL"）を含むキーは追加せず、整数型・小数型のカラムの値は
+    表記を揃えて追加する（KeyExtractor.keys() と同じ）。
+    SQLiteはページキャッシュに収まらない分を一時ファイルでソートするため、
+    キーが数億件でもメモリ使用量は INDEX_CACHE_KB 程度に収まる。
+
+    Args:
+        index_path: 作成する索引ファイルのパス
+        csv_file_paths: 参照先テーブルのCSVファイル（複数ファイルに分割されている場合は全て）
+        columns: 参照先のカラム
+        encoding: CSVファイルのエンコーディング
+        data_types: 参照先のカラムのデータ型（省略時は値の文字列のまま追加する）
+
+    Returns:
+        索引に追加したキーの件数（NULLを含むキーは除く）
+    """
+    connection = _connect(index_path)
+    try:
+        key_columns = _key_columns(len(columns))
+        connection.execute(f"CREATE TABLE keys ({key_columns})")
+        insert = f"INSERT INTO keys VALUES ({', '.join('?' * len(columns))})"
+        key_count = 0
+        for csv_file_path in csv_file_paths:
+            with CsvInput(csv_file_path, encoding) as source:
+                reader = csv.reader(source.text)
+                headers = next(reader, None) or []
+                extractor = KeyExtractor([KeyConstraint(FOREIGN_KEY, columns, data_types)], headers)
+                if extractor.skipped:
+                    raise ValueError(f"{csv_file_path} に参照先のカラムがありません: {', '.join(columns)}")
+                keys = extractor.keys
+                before = connection.total_changes
+                connection.executemany(insert, (
+                    key for row in reader if row for key in keys(row) if key is not None
+                ))
+                key_count += connection.total_changes - before
+        connection.execute(f"CREATE INDEX keys_key ON keys ({key_columns})")
+        connection.commit()
+        return key_count
+    finally:
+        connection.close()
+
+
+class ForeignKeyProbe:
+    """
+    子テーブルのレコードの外部キーを、参照先の索引で照合する
+
+    レコードはまとめて照合し、重複を除いたキーだけを索引に問い合わせる。
+    キーが MAX_KEYS_IN_MEMORY 件以下の索引はメモリに読み込んで照合する。
+
+    使用例:
+        probe = ForeignKeyProbe(checks, headers)
+        for error in probe.check(first_row_number, rows):
+            ...
+        probe.close()
+    """
+
+    def __init__(self, checks: List[ForeignKeyCheck], headers: List[str]):
+        """
+        Args:
+            checks: 検査する外部キー制約
+            headers: 子テーブルのCSVのヘッダー
+        """
+        header_set = set(headers)
+        self.checks: List[ForeignKeyCheck] = []
+        # CSVに存在しないカラムを含むため検査しない制約
+        self.skipped: List[ForeignKeyCheck] = []
+        for check in checks:
+            (self.checks if header_set.issuperset(check.columns) else self.skipped).append(check)
+        self._extractor = KeyExtractor(
+            [KeyConstraint(FOREIGN_KEY, check.columns, check.data_types) for check in self.checks], headers)
+        # 同じ参照先の制約は接続（またはメモリに読み込んだキー）を共有する
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        self._loaded_keys: Dict[str, Set[Tuple[str, ...]]] = {}
+        for check in self.checks:
+            if check.index_path in self._connections or check.index_path in self._loaded_keys:
+                continue
+            connection = _connect(check.index_path, read_only=True)
+            if check.key_count <= MAX_KEYS_IN_MEMORY:
+                with closing(connection):
+                    self._loaded_keys[check.index_path] = set(connection.execute("SELECT * FROM keys"))
+            else:
+                self._connections[check.index_path] = connection
+
+    def check(self, first_row_number: int, rows: List[List[str]]) -> List[ValidationError]:
+        """
+        連続するレコードの外部キーを照合
+
+        Args:
+            first_row_number: rows の最初のレコードの行番号
+            rows: 空行を除いたレコードのリスト
+
+        Returns:
+            参照先が存在しないキーのエラー（行番号の順。NULLを含むキーは照合しない）
+        """
+        extractor = self._extractor
+        if min(map(len, rows)) <= extractor.max_index:
+            # フィールドが不足しているレコードは行単位のエラーとして報告済みのため照合しない
+            rows = [row if len(row) > extractor.max_index else None for row in rows]
+        found = []
+        for check_index, (check, getter) in enumerate(zip(self.checks, extractor.getters)):
+            keys = [getter(row) if row is not None else None for row in rows] if None in rows else list(map(getter, rows))
+            distinct = set(keys)
+            distinct.discard(None)
+            if not distinct:
+                continue
+            missing = distinct - self._existing_keys(check.index_path, distinct)
+            if missing:
+                found.extend(
+                    (first_row_number + offset, check_index, key)
+                    for offset, key in enumerate(keys) if key in missing
+                )
+
+        found.sort(key=lambda item: item[:2])
+        errors = []
+        for row_number, check_index, key in found:
+            check = self.checks[check_index]
+            errors.append(foreign_key_error(row_number, check.columns, check.ref_table, check.ref_columns, key))
+        return errors
+
+    def close(self):
+        for connection in self._connections.values():
+            connection.close()
+        self._connections = {}
+        self._loaded_keys = {}
+
+    def _existing_keys(self, index_path: str, keys: Set[Tuple[str, ...]]) -> Set[Tuple[str, ...]]:
+        """keys のうち索引に存在するキー"""
+        loaded_keys = self._loaded_keys.get(index_path)
+        if loaded_keys is not None:
+            return keys & loaded_keys
+        connection = self._connections[index_path]
+        keys = list(keys)
+        size = len(keys[0])
+        key_columns = _key_columns(size)
+        # 1回の問い合わせのキーの件数（パラメーターの数が上限を超えないようにする）
+        batch_size = PROBE_QUERY_SIZE // size
+        existing = set()
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            if size == 1:
+                query = f"SELECT k0 FROM keys WHERE k0 IN ({','.join('?' * len(batch))})"
+                params = [key for key, in batch]
+            else:
+                # 複合キーは行値で照合する
+                row = f"({','.join('?' * size)})"
+                query = f"SELECT {key_columns} FROM keys WHERE ({key_columns}) IN (VALUES {','.join([row] * len(batch))})"
+                params = [value for key in batch for value in key]
+            existing.update(connection.execute(query, params))
+        return existing
@@ -0,0 +1,298 @@
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+import zlib
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ddl_parser import TableDefinition
+from .errors import ValidationError, duplicate_key_error
+from .validator import NULL_VALUES
+
+PRIMARY_KEY = 'PRIMARY KEY'
+UNIQUE = 'UNIQUE'
+
+# メモリ上で重複を判定するキーの最大件数（全ての制約の合計。超えるとディスクに書き出す）
+DEFAULT_MAX_KEYS_IN_MEMORY = 1_000_000
+# ディスクに書き出す場合の分割数（1つの分割をメモリに読み込んで重複を判定する）
+DEFAULT_PARTITIONS = 64
+# 分割ファイルにまとめて書き出すキーの件数
+SPILL_BATCH_SIZE = 1000
+
+# 行番号と、制約ごとのキー（NULLを含むキーはNone）
+RowKeys = Tuple[int, List[Optional[Tuple[str, ...]]]]
+
+
+@dataclass
+class KeyConstraint:
+    """主キー・一意キー制約"""
+    kind: str
+    columns: List[str]
+    # カラムごとのデータ型（整数型・小数型のカラムは値の表記を揃えて比較する。省略時は文字列のまま比較）
+    data_types: Optional[List[str]] = None
+
+    def __str__(self):
+        return f"{self.kind} ({', '.join(self.columns)})"
+
+
+def column_data_types(table: TableDefinition, columns: List[str]) -> List[str]:
+    """カラムごとのデータ型（テーブル定義にないカラムは空文字）"""
+    data_types = {column.name: column.data_type for column in table.columns}
+    return [data_types.get(name, '') for name in columns]
+
+
+def key_constraints(table: TableDefinition) -> List[KeyConstraint]:
+    """テーブル定義の主キー・一意キー（同じカラムの組み合わせの制約は1つにまとめる）"""
+    constraints = []
+    seen = set()
+    keys = [(PRIMARY_KEY, table.primary_key)] + [(UNIQUE, columns) for columns in table.unique_keys]
+    for kind, columns in keys:
+        if columns and tuple(columns) not in seen:
+            seen.add(tuple(columns))
+            constraints.append(KeyConstraint(kind, list(columns), column_data_types(table, columns)))
+    return constraints
+
+
+def _canonical_integer(value: str) -> str:
+    """整数の値をDBに格納される表記に揃える（"02" -> "2"。整数でない値はそのまま）"""
+    try:
+        return str(int(value))
+    except ValueError:
+        return value
+
+
+def _canonical_decimal(value: str) -> str:
+    """小数の値をDBに格納される値が等しければ同じになる表記に揃える（"02.50" -> "2.5"。数値でない値はそのまま）"""
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return value
+    if not number.is_finite():
+        return value
+    # -0 と 0 も同じ値として扱う
+    return format(number.normalize(), 'f') if number else '0'
+
+
+def canonicalizer(data_type: str) -> Optional[Callable[[str], str]]:
+    """キーの値の表記を揃える関数（値をそのまま比較するデータ型はNone。型の判定は compile_column() と同じ）"""
+    data_type_upper = data_type.upper()
+    if data_type_upper.startswith(('INT', 'BIGINT', 'SMALLINT', 'TINYINT', 'MEDIUMINT')):
+        return _canonical_integer
+    if data_type_upper.startswith(('DECIMAL', 'NUMERIC')):
+        return _canonical_decimal
+    return None
+
+
+class KeyExtractor:
+    """レコードから各制約のキーの値を取り出す"""
+
+    def __init__(self, constraints: List[KeyConstraint], headers: List[str]):
+        # 同名のヘッダーがある場合は後ろの列を使う（CSVChecker._resolve_columns() と同じ）
+        header_index = {name: i for i, name in enumerate(headers)}
+        self.constraints: List[KeyConstraint] = []
+        # CSVに存在しないカラムを含むため検査しない制約
+        self.skipped: List[KeyConstraint] = []
+        self._indices: List[List[int]] = []
+        for constraint in constraints:
+            indices = [header_index.get(name) for name in constraint.columns]
+            if None in indices:
+                self.skipped.append(constraint)
+                continue
+            self.constraints.append(constraint)
+            self._indices.append(indices)
+        # キーに使う最大の列番号（これより短いレコードからはキーを取り出さない）
+        self.max_index = max((max(indices) for indices in self._indices), default=-1)
+        # 制約ごとに、レコードからキーのタプルを取り出す関数（NULLを含むキーはNone。keys() を参照）
+        self.getters = [
+            _key_getter(itemgetter(*indices) if len(indices) > 1 else _single_key_getter(indices[0]),
+                        constraint.data_types)
+            for constraint, indices in zip(self.constraints, self._indices)
+        ]
+
+    def keys(self, row: List[str]) -> List[Optional[Tuple[str, ...]]]:
+        """
+        制約ごとのキー
+
+        NULL（空文字と、大文字・小文字を問わない "NULL"）を含むキーは一意性の対象外（SQLのUNIQUEと同じ）のためNone。
+        整数型・小数型のカラムの値は、DBに格納される値が等しければ同じになる表記に揃える（"02" と "2" は同じキー）。
+        フィールドが不足しているレコードは行単位のエラーとして報告済みのため、全てNone。
+        """
+        if len(row) <= self.max_index:
+            return [None] * len(self._indices)
+        return [getter(row) for getter in self.getters]
+
+
+def _single_key_getter(index: int):
+    # itemgetter は1つのインデックスではタプルを返さないため
+    return lambda row: (row[index],)
+
+
+def _key_getter(getter: Callable[[List[str]], Tuple[str, ...]],
+                data_types: Optional[List[str]]) -> Callable[[List[str]], Optional[Tuple[str, ...]]]:
+    """getter で取り出した値から、NULLを含むキーをNoneにし、数値型のカラムの値の表記を揃える関数"""
+    functions = [canonicalizer(data_type) for data_type in data_types or []]
+    has_no_null = NULL_VALUES.isdisjoint
+
+    if not any(functions):
+        def key(row):
+            values = getter(row)
+            return values if has_no_null(values) else None
+        return key
+
+    def canonical_key(row):
+        values = getter(row)
+        if not has_no_null(values):
+            return None
+        return tuple(value if function is None else function(value) for function, value in zip(functions, values))
+    return canonical_key
+
+
+class DuplicateKeyDetector:
+    """
+    主キー・一意キーの重複を検出する
+
+    キーが max_keys_in_memory 件以下のうちはメモリ上の辞書で判定し、超えた場合はキーのハッシュで
+    分割したファイルに書き出す。検証の終了後に分割ごとにメモリに読み込んで判定するため、
+    メモリ使用量はキーの件数 / partitions 程度に収まる。
+
+    使用例:
+        detector = DuplicateKeyDetector(constraints, headers)
+        for row_number, row in records:
+            detector.add(row_number, row)
+        for error in detector.duplicates():
+            ...
+        detector.close()
+    """
+
+    def __init__(self, constraints: List[KeyConstraint], headers: List[str],
+                 max_keys_in_memory: int = DEFAULT_MAX_KEYS_IN_MEMORY,
+                 partitions: int = DEFAULT_PARTITIONS, temp_dir: Optional[str] = None):
+        """
+        Args:
+            constraints: 検査する制約
+            headers: CSVのヘッダー
+            max_keys_in_memory: メモリ上で判定するキーの最大件数
+            partitions: ディスクに書き出す場合の分割数
+            temp_dir: 分割ファイルを作成するディレクトリ（省略時はシステムの一時ディレクトリ）
+        """
+        self.extractor = KeyExtractor(constraints, headers)
+        self.max_keys_in_memory = max_keys_in_memory
+        self.partitions = partitions
+        self.temp_dir = temp_dir
+        # 制約ごとの キー -> 最初に出現した行番号（ディスクに書き出した後は使わない）
+        self._first_rows: List[Dict[Tuple[str, ...], int]] = [{} for _ in self.extractor.constraints]
+        self._key_count = 0
+        # 検出した重複 (行番号, 制約の番号, 最初に出現した行番号, キー)
+        self._duplicates: List[Tuple[int, int, int, Tuple[str, ...]]] = []
+        self._spill_dir: Optional[str] = None
+        self._spill_buffers: List[List[list]] = []
+
+    @property
+    def constraints(self) -> List[KeyConstraint]:
+        return self.extractor.constraints
+
+    @property
+    def spilled(self) -> bool:
+        """キーをディスクに書き出したか"""
+        return self._spill_dir is not None
+
+    def add(self, row_number: int, row: List[str]):
+        self.add_keys(row_number, self.extractor.keys(row))
+
+    def add_keys(self, row_number: int, keys: List[Optional[Tuple[str, ...]]]):
+        """KeyExtractor.keys() で取り出したキーを追加（行番号の昇順に追加すること）"""
+        for constraint_index, key in enumerate(keys):
+            if key is None:
+                continue
+            if self._spill_dir is not None:
+                self._spill(constraint_index, row_number, key)
+                continue
+            first_rows = self._first_rows[constraint_index]
+            first_row = first_rows.setdefault(key, row_number)
+            if first_row != row_number:
+                self._duplicates.append((row_number, constraint_index, first_row, key))
+                continue
+            self._key_count += 1
+            if self._key_count > self.max_keys_in_memory:
+                self._start_spill()
+
+    def duplicates(self) -> Iterator[ValidationError]:
+        """重複したキーのエラー（2件目以降の行ごとに、行番号の順に返す）"""
+        found: Iterable = sorted(self._duplicates)
+        if self._spill_dir is not None:
+            found = heapq.merge(found, *self._find_spilled_duplicates())
+        for row_number, constraint_index, first_row, key in found:
+            constraint = self.constraints[constraint_index]
+            yield duplicate_key_error(row_number, first_row, constraint.kind, constraint.columns, key)
+
+    def close(self):
+        """分割ファイルを削除"""
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _start_spill(self):
+        """メモリ上のキー（それぞれ最初に出現した行）を分割ファイルに書き出し、以降のキーもファイルに書き出す"""
+        self._spill_dir = tempfile.mkdtemp(prefix='prechecker-keys-', dir=self.temp_dir)
+        self._spill_buffers = [[[] for _ in range(self.partitions)] for _ in self.constraints]
+        for constraint_index, first_rows in enumerate(self._first_rows):
+            for key, row_number in first_rows.items():
+                self._spill(constraint_index, row_number, key)
+        self._first_rows = [{} for _ in self.constraints]
+
+    def _spill(self, constraint_index: int, row_number: int, key: Tuple[str, ...]):
+        # プロセスごとに変わる hash() ではなく、キーの内容から分割先を決める
+        partition = zlib.crc32('\0'.join(key).encode('utf-8', 'surrogatepass')) % self.partitions
+        buffer = self._spill_buffers[constraint_index][partition]
+        buffer.append((row_number, key))
+        if len(buffer) >= SPILL_BATCH_SIZE:
+            self._flush(constraint_index, partition)
+
+    def _flush(self, constraint_index: int, partition: int):
+        buffer = self._spill_buffers[constraint_index][partition]
+        if buffer:
+            with open(self._partition_path(constraint_index, partition), 'ab') as f:
+                pickle.dump(buffer, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spill_buffers[constraint_index][partition] = []
+
+    def _partition_path(self, constraint_index: int, partition: int, suffix: str = 'keys') -> str:
+        return os.path.join(self._spill_dir, f"{constraint_index}_{partition}.{suffix}")
+
+    def _find_spilled_duplicates(self) -> List[Iterator[Tuple[int, int, int, Tuple[str, ...]]]]:
+        """分割ごとに重複を判定し、行番号順に並べた結果をファイルに書き出して、読み出すイテレーターを返す"""
+        results = []
+        for constraint_index in range(len(self.constraints)):
+            for partition in range(self.partitions):
+                self._flush(constraint_index, partition)
+                path = self._partition_path(constraint_index, partition)
+                if not os.path.exists(path):
+                    continue
+                first_rows: Dict[Tuple[str, ...], int] = {}
+                found = []
+                for row_number, key in _load_batches(path):
+                    first_row = first_rows.setdefault(key, row_number)
+                    if first_row != row_number:
+                        found.append((row_number, constraint_index, first_row, key))
+                os.unlink(path)
+                if found:
+                    # 行番号の順に書き出したキーは、分割ファイル内でも行番号の順に並んでいる
+                    result_path = self._partition_path(constraint_index, partition, 'duplicates')
+                    with open(result_path, 'wb') as f:
+                        for start in range(0, len(found), SPILL_BATCH_SIZE):
+                            pickle.dump(found[start:start + SPILL_BATCH_SIZE], f, protocol=pickle.HIGHEST_PROTOCOL)
+                    results.append(_load_batches(result_path))
+        return results
+
+
+def _load_batches(path: str) -> Iterator[tuple]:
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
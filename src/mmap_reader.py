@@ -0,0 +1,430 @@
+import csv
+import io
+import mmap
+from array import array
+from bisect import bisect_right
+from itertools import chain, compress, count, islice, repeat
+from typing import Iterator, List, Optional, Tuple
+
+# 境界探索時に一度に読み込むバイト数
+SCAN_BLOCK_SIZE = 1024 * 1024
+# mmapリーダーが一度にデコード・分割するチャンクの目安のバイト数
+READ_CHUNK_SIZE = 256 * 1024
+
+# str.splitlines() が改行として扱い、open(newline='') は改行として扱わない文字
+_EXTRA_LINE_BREAKS = ('\v', '\f', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+
+
+def iter_record_boundaries(f, start: int, chunk_size: int) -> Iterator[int]:
+    """
+    クォートを考慮したレコード境界（改行の直後のバイト位置）を返す
+
+    startから数えてchunk_sizeバイト以上進んだ位置にある、クォートの外側の
+    最初の改行を境界とする。クォートの内側に埋め込まれた改行では分割しない。
+    エスケープされたダブルクォート（""）は2文字として数えるため、クォートの内外は変わらない。
+
+    Args:
+        f: seek()/read() ができるバイナリストリーム（ファイル、mmap）
+    """
+    f.seek(start)
+    block_start = start
+    next_target = start + chunk_size
+    in_quotes = False
+
+    while True:
+        block = f.read(SCAN_BLOCK_SIZE)
+        if not block:
+            return
+
+        i = 0
+        while True:
+            # 境界となる改行の位置はnext_target - 1以降
+            target_rel = next_target - 1 - block_start
+            if target_rel >= len(block):
+                in_quotes ^= bool(block.count(b'"', i) & 1)
+                break
+            if target_rel > i:
+                in_quotes ^= bool(block.count(b'"', i, target_rel) & 1)
+                i = target_rel
+
+            newline = block.find(b'\n', i)
+            if newline < 0:
+                in_quotes ^= bool(block.count(b'"', i) & 1)
+                break
+
+            in_quotes ^= bool(block.count(b'"', i, newline) & 1)
+            i = newline + 1
+            if not in_quotes:
+                yield block_start + i
+                next_target = block_start + i + chunk_size
+
+        block_start += len(block)
+
+
+def partial_record_start(f, start: int, end: int) -> int:
+    """
+    [start, end) がレコード境界で終わらない場合、最後のレコード（追記中のファイルでは書き込み途中の可能性がある）の
+    先頭位置を返す。レコード境界で終わる場合はendを返す
+
+    改行で終わらない場合に加え、クォートの中の改行で終わる場合（値の途中まで書き込まれたレコード）も
+    レコード境界で終わらないものとする。
+
+    Args:
+        f: seek()/read() ができるバイナリストリーム（ファイル、mmap）
+        start: レコードの先頭のバイト位置（endの近くから探すほど速い）
+        end: 範囲の終端（ファイル終端であること）
+    """
+    if end <= start:
+        return end
+    last = start
+    for boundary in iter_record_boundaries(f, start, 1):
+        if boundary >= end:
+            return end
+        last = boundary
+    return last
+
+
+class RecordIndex:
+    """
+    CSVファイルのレコード境界の索引
+
+    レコードごとではなく、クォートの外側の改行で区切ったチャンク（chunk_sizeバイト程度）ごとに
+    先頭のバイト位置を保持する。読み込んだチャンクについては先頭のレコード番号も記録し、
+    レコード番号からチャンクを二分探索して該当レコードへ移動できる。
+    1GBのファイルでもチャンクサイズ256KBなら索引は数千件（数十KB）に収まる。
+    """
+
+    def __init__(self, offsets: array, end: int):
+        """
+        Args:
+            offsets: 各チャンクの先頭のバイト位置（昇順）
+            end: 最後のチャンクの終端のバイト位置
+        """
+        self.offsets = offsets
+        self.end = end
+        # 各チャンクの先頭のレコード番号（先頭から読み込んだチャンクの分のみ。空行は数えない）
+        self.first_records = array('Q')
+
+    @classmethod
+    def build(cls, f, start: int, end: int, chunk_size: int = READ_CHUNK_SIZE) -> 'RecordIndex':
+        """
+        [start, end) を1回走査してチャンクの境界を求める
+
+        Args:
+            f: seek()/read() ができるバイナリストリーム（ファイル、mmap）
+            start: 走査を開始するバイト位置（レコードの先頭であること）
+            end: 走査を終了するバイト位置（レコード境界またはファイル終端）
+            chunk_size: チャンクの最小バイト数
+        """
+        offsets = array('Q')
+        if start < end:
+            offsets.append(start)
+            for boundary in iter_record_boundaries(f, start, chunk_size):
+                if boundary >= end:
+                    break
+                offsets.append(boundary)
+        return cls(offsets, end)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def chunk_range(self, chunk: int) -> Tuple[int, int]:
+        """チャンクのバイト範囲 [start, end)"""
+        end = self.offsets[chunk + 1] if chunk + 1 < len(self.offsets) else self.end
+        return self.offsets[chunk], end
+
+    def byte_ranges(self) -> List[Tuple[int, int]]:
+        """全チャンクのバイト範囲 [start, end) のリスト（並列検証の分割に使う）"""
+        return [self.chunk_range(chunk) for chunk in range(len(self.offsets))]
+
+    def extend(self, other: 'RecordIndex', record_offset: int):
+        """
+        後続の範囲の索引を連結（並列検証で各ワーカーが作成した索引をまとめる）
+
+        Args:
+            other: この索引の終端から始まる範囲の、先頭から読み込み済みの索引
+            record_offset: other の先頭のレコード番号
+        """
+        self.offsets.extend(other.offsets)
+        self.first_records.extend(record + record_offset for record in other.first_records)
+        self.end = other.end
+
+    def find_chunk(self, record_number: int) -> int:
+        """レコード番号を含むチャンクの番号（先頭のレコード番号を記録済みのチャンクから探す）"""
+        return bisect_right(self.first_records, record_number) - 1
+
+
+def parse_chunk(text: str) -> Iterator[List[str]]:
+    """
+    レコード境界で区切ったテキストのレコードを順に返す（空行は除く）
+
+    ダブルクォートを含まないチャンクはstr.split()だけで分割し、
+    含むチャンクはcsvモジュールで解析する（結果はどちらもcsv.readerと同じ）。
+    """
+    if '"' not in text:
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+        # 改行コードが \r のみの行はcsvモジュールに任せる
+        if '\r' not in text:
+            return map(str.split, filter(None, text.split('\n')), repeat(','))
+    # str.splitlines() は open(newline='') より多くの文字で改行するため、該当する文字がある場合はStringIOで分割する
+    if any(line_break in text for line_break in _EXTRA_LINE_BREAKS):
+        lines = io.StringIO(text, newline='')
+    else:
+        lines = text.splitlines(True)
+    return filter(None, csv.reader(lines))
+
+
+def _can_advise(mapped) -> bool:
+    # madvise() はUnix系のみ（空のファイルはmmapではなくbytes）
+    return isinstance(mapped, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED')
+
+
+class MmapCsvReader:
+    """
+    CSVファイルをメモリマップして読み込むリーダー
+
+    ファイルをテキストストリームとして読み込む代わりに、レコード境界で区切ったチャンクを
+    mmap上のメモリビューから直接デコードし（中間のbytesを作らない）、フィールドに分割する。
+    読み込みと同時にチャンク単位の RecordIndex を作成するため、検証後にレコード番号を指定して
+    レコードを読み直せる（エラー箇所の表示用）。
+
+    改行とダブルクォートが1バイトで表現されるエンコーディング（UTF-8, Shift_JIS等）のみ対応。
+
+    使用例:
+        with MmapCsvReader('users.csv', 'utf-8') as reader:
+            headers = reader.read_header()
+            for row in reader:
+                ...
+            row = reader.record(99)  # 100件目のデータ行
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', start: int = 0, end: Optional[int] = None,
+                 chunk_size: int = READ_CHUNK_SIZE, index: Optional[RecordIndex] = None):
+        """
+        Args:
+            file_path: CSVファイルのパス
+            encoding: CSVファイルのエンコーディング
+            start: 読み込みを開始するバイト位置（レコードの先頭であること）
+            end: 読み込みを終了するバイト位置（省略時はファイル終端）
+            chunk_size: 一度にデコード・分割するチャンクの最小バイト数
+            index: 以前に作成した同じファイルの索引（指定時は start/end の代わりに索引の範囲を読み込む）
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self._file = open(file_path, 'rb')
+        try:
+            # 空のファイルはメモリマップできない
+            size = self.total_bytes
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        except BaseException:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        if index is not None:
+            start = index.offsets[0] if len(index) else index.end
+            end = index.end
+        self.start = start
+        self.end = size if end is None else min(end, size)
+        self.index = index
+        self._index_complete = index is not None
+        self._position = start
+        self._counter = count(1)
+        # iter_chunks() で単独のチャンクに分けた、書き込み途中の可能性がある最後のレコードの先頭位置
+        self.partial_start: Optional[int] = None
+        if _can_advise(self._map):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._file.seek(0, io.SEEK_END)
+
+    def bytes_read(self) -> int:
+        """読み込んだバイト数（進捗表示用）"""
+        return self._position
+
+    def read_header(self) -> Optional[List[str]]:
+        """
+        先頭のレコードをヘッダーとして読み込み、データ行の先頭へ移動する
+
+        Returns:
+            ヘッダーのカラム名リスト（空ファイルの場合None）
+        """
+        data_start = next(iter_record_boundaries(self._map_stream(), self.start, 1), None)
+        if data_start is None or data_start > self.end:
+            data_start = self.end
+        text = self._decode(self.start, data_start)
+        lines = io.StringIO(text, newline='').readlines()
+        reader = csv.reader(lines)
+        headers = next(reader, None)
+        # 改行コードが \r のみの場合は、同じ範囲に続くデータ行を読み込み範囲に残す
+        header_length = sum(len(line) for line in lines[:reader.line_num])
+        if header_length < len(text):
+            data_start = self.start + len(text[:header_length].encode(self.encoding))
+        self.start = self._position = data_start
+        self.index = None
+        self._index_complete = False
+        return headers
+
+    def build_index(self) -> RecordIndex:
+        """読み込み範囲のチャンクの索引を作成（作成済みならそれを返す）"""
+        if self.index is None or not self._index_complete:
+            self.index = RecordIndex.build(self._map_stream(), self.start, self.end, self.chunk_size)
+            self._index_complete = True
+            # 境界の走査で読み込んだページを解放
+            self._release_pages(self.start, self.end)
+        return self.index
+
+    def loaded_index(self) -> Optional[RecordIndex]:
+        """
+        読み込んだチャンクまでの索引（途中で読み込みを止めた場合も、読み込んだ範囲のレコードを読み直せる）
+        """
+        index = self.index
+        if index is None or self._index_complete:
+            return index
+        chunks = len(index.first_records)
+        end = index.chunk_range(chunks - 1)[1] if chunks else self.start
+        loaded = RecordIndex(index.offsets[:chunks], end)
+        loaded.first_records = index.first_records[:]
+        return loaded
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """データ行を先頭から順に返す（空行は除く）"""
+        if self.index is None or not self._index_complete:
+            # レコード境界の走査とチャンクの読み込みを交互に行い、1回の走査で索引を作る
+            self.index = RecordIndex(array('Q'), self.end)
+            chunks = self._scan_chunks()
+        else:
+            chunks = range(len(self.index))
+        # 1レコードごとにPythonのジェネレーターを経由しないよう、チャンク単位のイテレーターを連結する
+        return chain.from_iterable(map(self._read_chunk, chunks))
+
+    def iter_chunks(self) -> Iterator[Tuple[int, int, Iterator[List[str]]]]:
+        """
+        __iter__() と同じデータ行を、チャンクごとに (開始位置, 終了位置, データ行のイテレーター) として返す
+
+        チャンクの境界はレコード境界のため、チャンクを読み終えた時点の行番号とエラー件数を
+        チェックポイントにできる。読み込み範囲がレコード境界で終わらない場合、最後のレコードは
+        書き込み途中の可能性があるため単独のチャンクとして返し、その開始位置を partial_start に設定する。
+        """
+        if self.index is None or not self._index_complete:
+            self.index = RecordIndex(array('Q'), self.end)
+            chunks = self._scan_chunks()
+        else:
+            chunks = range(len(self.index))
+        for chunk in chunks:
+            start, end = self.index.chunk_range(chunk)
+            partial = partial_record_start(self._map_stream(), start, end) if end == self.end else end
+            if partial == end:
+                yield start, end, self._read_chunk(chunk)
+                continue
+            # 最後のチャンクを分割した場合、そのチャンクのレコード数は索引に記録しない（record() で数え直す）
+            first_records = self.index.first_records
+            if chunk < len(first_records):
+                first_record = first_records[chunk]
+            else:
+                first_record = first_records[-1] + next(self._counter) - 1 if chunk else 0
+            self._position = end
+            self.partial_start = partial
+            if partial > start:
+                self._counter = count(1)
+                yield start, partial, compress(self._parse_range(start, partial, first_record), self._counter)
+                first_record += next(self._counter) - 1
+            yield partial, end, self._parse_range(partial, end, first_record)
+
+    def _scan_chunks(self) -> Iterator[int]:
+        """チャンクの境界を探しながら索引に追加し、境界が確定したチャンクの番号を返す"""
+        offsets = self.index.offsets
+        if self.start < self.end:
+            offsets.append(self.start)
+            for boundary in iter_record_boundaries(self._map_stream(), self.start, self.chunk_size):
+                if boundary >= self.end:
+                    break
+                offsets.append(boundary)
+                yield len(offsets) - 2
+            yield len(offsets) - 1
+        self._index_complete = True
+
+    def _read_chunk(self, chunk: int) -> Iterator[List[str]]:
+        first_records = self.index.first_records
+        if chunk == len(first_records):
+            # 直前のチャンクのレコード数は、読み終えた時点のカウンターの値 - 1
+            first_records.append(first_records[-1] + next(self._counter) - 1 if chunk else 0)
+        start, end = self.index.chunk_range(chunk)
+        if chunk:
+            # 読み終えた直前のチャンクのページを解放
+            self._release_pages(self.index.offsets[chunk - 1], start)
+        self._position = end
+        # compress() はレコードを1件取り出すごとにカウンターを1つ進め、レコードが尽きると進めない
+        self._counter = count(1)
+        return compress(self._parse_range(start, end, first_records[chunk]), self._counter)
+
+    def record(self, record_number: int) -> Optional[List[str]]:
+        """
+        レコード番号（データ行の先頭を0とし、空行は数えない）のレコードを読み込む
+
+        索引で該当するチャンクへ移動し、そのチャンクだけを解析する。
+        先頭から読み込んでいないチャンクは、レコード数を数えながら索引に記録する。
+
+        Returns:
+            フィールドのリスト（レコード番号が範囲外の場合None）
+        """
+        index = self.build_index()
+        first_records = index.first_records
+        if record_number < 0 or not len(index):
+            return None
+        if not first_records:
+            first_records.append(0)
+        # 次のチャンクの先頭レコード番号が分かるまで、未記録のチャンクのレコード数を数えて索引を延ばす
+        while len(first_records) < len(index) and first_records[-1] <= record_number:
+            start, end = index.chunk_range(len(first_records) - 1)
+            first_records.append(first_records[-1] + sum(1 for _ in self._parse_range(start, end)))
+
+        chunk = index.find_chunk(record_number)
+        start, end = index.chunk_range(chunk)
+        rows = self._parse_range(start, end)
+        return next(islice(rows, record_number - first_records[chunk], None), None)
+
+    def _release_pages(self, start: int, end: int):
+        """
+        [start, end) の読み終えたページをプロセスのメモリから外す
+
+        ファイルをマップしたページは読み込むたびに常駐メモリに加算されるため、
+        解放しないと大きなファイルではファイルサイズ分まで増える（ページキャッシュには残る）。
+        """
+        start -= start % mmap.PAGESIZE
+        end -= end % mmap.PAGESIZE
+        if end > start and _can_advise(self._map):
+            self._map.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    def _parse_range(self, start: int, end: int, first_record: Optional[int] = None) -> Iterator[List[str]]:
+        """
+        [start, end)（レコード境界で区切った範囲）のデータ行を返す
+
+        Args:
+            first_record: 範囲の先頭のレコード番号（検証のために先頭から読み込む場合のみ。読み直す場合はNone）
+        """
+        return parse_chunk(self._decode(start, end))
+
+    def _decode(self, start: int, end: int) -> str:
+        # メモリビューから直接デコードする（bytesへのコピーを作らない）
+        return str(self._view[start:end], self.encoding)
+
+    def _map_stream(self):
+        if isinstance(self._map, mmap.mmap):
+            return self._map
+        return io.BytesIO(self._map)
+
+    def close(self):
+        # メモリビューを解放してからmmapを閉じる
+        self._view.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,386 @@
+import csv
+import io
+import os
+import pickle
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .ddl_parser import ColumnDefinition
+from .error_sink import ErrorSink
+from .errors import ValidationError
+from .foreign_key_checker import ForeignKeyProbe
+from .key_checker import KeyConstraint, KeyExtractor, _load_batches
+from .mmap_reader import (
+    SCAN_BLOCK_SIZE,
+    RecordIndex,
+    iter_record_boundaries,
+    partial_record_start,
+)
+from .profiler import ValidationProfiler
+
+# チャンクサイズの下限・上限（バイト）
+MIN_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# 範囲内のエラーを一時ファイルに書き出す単位の件数（これ未満のエラーはメモリに保持したまま親に返す）
+ERROR_SPILL_BATCH_SIZE = 1000
+# 検証を依頼して、まだ親でまとめていない範囲の最大数（ワーカーあたり）
+PENDING_RANGES_PER_WORKER = 2
+
+# ワーカープロセスごとに保持する検証用のCSVChecker
+_worker_checker = None
+
+
+def supports_byte_ranges(encoding: str) -> bool:
+    """
+    バイト単位の分割が可能なエンコーディングかを判定
+
+    改行とダブルクォートが1バイトのASCIIとして符号化され、
+    マルチバイト文字の一部として現れないエンコーディング（UTF-8, Shift_JIS等）のみ対応。
+    """
+    try:
+        return '\n"'.encode(encoding) == b'\n"'
+    except LookupError:
+        return False
+
+
+def read_header(csv_file_path: str, encoding: str) -> Tuple[Optional[List[str]], int]:
+    """
+    ヘッダーレコードを読み込む
+
+    Returns:
+        (headers, data_start) のタプル
+        headers: ヘッダーのカラム名リスト（空ファイルの場合None）
+        data_start: データ行の先頭バイト位置
+    """
+    with open(csv_file_path, 'rb') as f:
+        data_start = next(iter_record_boundaries(f, 0, 1), None)
+        if data_start is None:
+            data_start = os.fstat(f.fileno()).st_size
+        f.seek(0)
+        header_bytes = f.read(data_start)
+
+    header_reader = csv.reader(io.StringIO(header_bytes.decode(encoding), newline=''))
+    return next(header_reader, None), data_start
+
+
+def split_byte_ranges(csv_file_path: str, data_start: int, workers: int,
+                      chunk_size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """データ部分をレコード境界で分割したバイト範囲 [start, end) のリストを返す"""
+    file_size = os.path.getsize(csv_file_path)
+    if chunk_size is None:
+        # ワーカー数より多めに分割し、処理時間のばらつきを吸収する
+        chunk_size = (file_size - data_start) // (workers * 4) + 1
+        chunk_size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, chunk_size))
+
+    with open(csv_file_path, 'rb') as f:
+        return RecordIndex.build(f, data_start, file_size, chunk_size).byte_ranges()
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """ファイルの指定バイト範囲だけを読み込むリーダー"""
+
+    def __init__(self, path: str, start: int, end: int):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._remaining <= 0:
+            return 0
+        size = min(len(buffer), self._remaining)
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_byte_range(csv_file_path: str, start: int, end: int, encoding: str):
+    """バイト範囲をテキストストリームとして開く"""
+    raw = _ByteRangeReader(csv_file_path, start, end)
+    return io.TextIOWrapper(io.BufferedReader(raw, SCAN_BLOCK_SIZE), encoding=encoding, newline='')
+
+
+def worker_options(checker) -> dict:
+    """ワーカー側のCSVCheckerに引き継ぐ設定"""
+    probe = checker._foreign_key_probe
+    return {
+        'encoding': checker.encoding,
+        'engine': checker.engine,
+        'reader': checker.reader,
+        'cache_size': checker.cache_size,
+        'cache_min_hit_rate': checker.cache_min_hit_rate,
+        # 範囲内で上限に達したワーカーは残りを読み込まない（その範囲の結果で親も上限に達する）
+        'max_errors': checker.max_errors,
+        'max_errors_per_column': checker.max_errors_per_column,
+        # エラーは validate_part() で ErrorSpill に書き出し、CSVCheckerには保持しない
+        'max_retained_errors': 0,
+        'foreign_keys': probe.checks if probe is not None else None,
+        'collect_stats': checker.stats is not None,
+        # ワーカーでは進捗を表示せず、集計結果だけを返す
+        'profiler': ValidationProfiler(progress=False) if checker.profiler is not None else None,
+    }
+
+
+def create_worker_checker(ddl_file_path: str, csv_file_path: str, options: dict,
+                          columns: List[ColumnDefinition], headers: List[str],
+                          key_constraints: List[KeyConstraint]):
+    """範囲ごとの検証に使うCSVChecker（カラムの解決まで済ませる）"""
+    from .csv_checker import CSVChecker
+
+    checker = CSVChecker(ddl_file_path, csv_file_path, **options)
+    checker._load_columns(columns)
+    checker._resolve_columns(headers)
+    if key_constraints:
+        # キーの重複は親でファイル全体について判定するため、ワーカーはキーを取り出すだけ
+        checker._key_extractor = KeyExtractor(key_constraints, headers)
+    if checker.foreign_keys:
+        # 外部キーはワーカーごとに参照先の索引を開いて照合する
+        checker._foreign_key_probe = ForeignKeyProbe(checker.foreign_keys, headers)
+    return checker
+
+
+def _init_worker(ddl_file_path: str, csv_file_path: str, options: dict,
+                 columns: List[ColumnDefinition], headers: List[str], key_constraints: List[KeyConstraint]):
+    global _worker_checker
+    _worker_checker = create_worker_checker(ddl_file_path, csv_file_path, options, columns, headers, key_constraints)
+
+
+class ErrorSpill(ErrorSink):
+    """
+    範囲内で検出したエラーの書き出し先
+
+    ERROR_SPILL_BATCH_SIZE 件ごとに一時ファイルへ書き出し、親には一時ファイルのパスと書き出していない
+    残りのエラーだけを返す。範囲内のエラーの件数に関わらず、ワーカーと親が保持するエラーの件数を一定に保つ。
+    """
+
+    def __init__(self):
+        # 書き出した一時ファイルのパス（ERROR_SPILL_BATCH_SIZE 件に達していない場合はNone）
+        self.path: Optional[str] = None
+        # 一時ファイルに書き出していないエラー
+        self.errors: List[ValidationError] = []
+        self._file = None
+
+    def write(self, error):
+        self.errors.append(error)
+        if len(self.errors) >= ERROR_SPILL_BATCH_SIZE:
+            if self._file is None:
+                fd, self.path = tempfile.mkstemp(prefix='prechecker-errors-', suffix='.pickle')
+                self._file = os.fdopen(fd, 'wb')
+            pickle.dump(self.errors, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.errors = []
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self) -> Iterator[ValidationError]:
+        """検出した順にエラーを返す"""
+        if self.path is not None:
+            yield from _load_batches(self.path)
+        yield from self.errors
+
+    def discard(self):
+        """一時ファイルを削除"""
+        self.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+def validate_part(checker, validate: Callable[[], Tuple[int, Optional[RecordIndex]]]):
+    """
+    ワーカーのCSVCheckerで範囲内のレコードを検証し、親に返す結果をまとめる
+
+    Args:
+        validate: 範囲内のレコードを行番号0から検証し、(record_count, index) を返す関数
+
+    Returns:
+        (record_count, errors, cache_stats, profile, index, row_keys, stats) のタプル
+        errors は範囲内のエラーを書き出した ErrorSpill（row_number は範囲内のレコード番号で0始まり）
+        profile はプロファイル時のみ (工程別の時間, カラム別の集計)、それ以外はNone
+        index は範囲内の RecordIndex（レコードを読み直せない読み込み方式ではNone）
+        row_keys はキーの重複を検査する場合の (範囲内のレコード番号, 制約ごとのキー) のリスト
+        stats は統計を集計する場合の範囲内のレコードの TableStats、それ以外はNone
+    """
+    errors = checker.error_sink = ErrorSpill()
+    row_keys = []
+    checker._add_keys = lambda row_number, keys: row_keys.append((row_number, keys))
+    # エラー件数の上限は範囲ごとに数える
+    checker.error_count = 0
+    checker._column_error_counts = {}
+    checker._start_stats()
+
+    try:
+        with checker._measure_records():
+            record_count, index = validate()
+    except BaseException:
+        errors.discard()
+        raise
+    finally:
+        errors.close()
+        checker.error_sink = None
+
+    profile = None
+    if checker.profiler is not None:
+        profile = checker.profiler.take_stages(), checker._take_column_profiles()
+    return record_count, errors, checker._take_cache_stats(), profile, index, row_keys, checker.stats
+
+
+def _validate_range(byte_range: Tuple[int, int]):
+    """バイト範囲内のレコードを検証（戻り値は validate_part() と同じ）"""
+    checker = _worker_checker
+
+    def validate():
+        if checker.reader == 'stream':
+            with open_byte_range(checker.csv_file_path, *byte_range, checker.encoding) as text:
+                return checker._validate_records(csv.reader(text), start_row=0), None
+        # 範囲内のレコード番号（0始まり）で報告する
+        with checker._open_mmap_reader(*byte_range, start_row=0) as source:
+            return checker._validate_records(source, start_row=0), source.loaded_index()
+
+    return validate_part(checker, validate)
+
+
+def merge_part(checker, result: tuple, end: int, row_offset: int, start_row: int,
+               on_range: Optional[Callable[[int, int], None]] = None) -> Iterator[ValidationError]:
+    """
+    範囲の検証結果（validate_part() の戻り値）を親のCSVCheckerにまとめ、行番号を補正したエラーを順に返す
+
+    エラーを全て返し終えてから、キー・レコード数・キャッシュ統計・カラムの統計・プロファイルをまとめる
+    （呼び出し側がエラーの途中で打ち切った場合、その範囲のレコードは数えない）。
+    エラーの一時ファイルは、打ち切った場合も含めて返し終えた時点で削除する。
+
+    Args:
+        end: 範囲の終端のバイト位置
+        row_offset: 範囲の先頭のレコードの行番号
+        start_row: 検証を開始したレコードの行番号
+        on_range: 範囲のエラーを全て返し終えたら (範囲の終端のバイト位置, 次の行番号) で呼び出す関数
+    """
+    record_count, errors, cache_stats, profile, index, row_keys, stats = result
+    # エラーの途中で打ち切られた場合もその範囲のレコードを読み直せるよう、先に索引を連結する
+    if index is not None:
+        # レコード番号はデータ行の先頭から数える
+        checker.record_index.extend(index, row_offset - start_row)
+    try:
+        for error in errors:
+            error.row_number += row_offset
+            yield error
+    finally:
+        errors.discard()
+    # ワーカーが取り出したキーを、範囲の順（行番号の昇順）に重複の検出器へ渡す
+    for row_number, keys in row_keys:
+        checker._key_detector.add_keys(row_number + row_offset, keys)
+    checker.record_count += record_count
+    if on_range is not None:
+        on_range(end, row_offset + record_count)
+    checker._merge_cache_stats(cache_stats)
+    if stats is not None:
+        checker.stats.merge(stats)
+    if profile is not None:
+        stages, column_profiles = profile
+        checker.profiler.merge_stages(stages)
+        checker.profiler.merge_columns(column_profiles)
+        checker.profiler.update_progress(checker.record_count, end)
+
+
+def split_partial_record(csv_file_path: str,
+                         byte_ranges: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """
+    ファイルがレコード境界で終わらない場合（partial_record_start()）、最後のレコード（書き込み途中の可能性がある）を単独の範囲に分ける
+
+    Returns:
+        (byte_ranges, partial_start) のタプル
+        partial_start: 最後のレコードの先頭バイト位置（ファイルがレコード境界で終わる場合はNone）
+    """
+    if not byte_ranges:
+        return byte_ranges, None
+    start, end = byte_ranges[-1]
+    with open(csv_file_path, 'rb') as f:
+        partial = partial_record_start(f, start, end)
+    if partial == end:
+        return byte_ranges, None
+    ranges = byte_ranges[:-1]
+    if partial > start:
+        ranges.append((start, partial))
+    ranges.append((partial, end))
+    return ranges, partial
+
+
+def validate_in_processes(checker, headers: List[str], data_start: int, workers: int,
+                          chunk_size: Optional[int] = None, start_row: int = 2,
+                          byte_ranges: Optional[List[Tuple[int, int]]] = None,
+                          on_range: Optional[Callable[[int, int], None]] = None):
+    """
+    データ部分をプロセスプールで並列に検証
+
+    各チャンクの結果をファイル内の順序で受け取り、行番号をシングルプロセスと
+    同じ値（ヘッダーの次のレコードが2）に補正したValidationErrorを順に返す。
+    ワーカーは範囲内のエラーを一時ファイルに書き出し（ErrorSpill）、親は同時に検証を依頼する範囲を
+    ワーカーあたり PENDING_RANGES_PER_WORKER 個までに制限するため、エラーの件数が多くても
+    メモリ使用量は範囲の数に比例して増えない。
+
+    Args:
+        start_row: data_start のレコードの行番号（チェックポイントから再開する場合に指定）
+        byte_ranges: 検証するバイト範囲のリスト（省略時は data_start 以降を分割する）
+        on_range: 範囲のエラーを全て返し終えるたびに (範囲の終端のバイト位置, 次の行番号) で呼び出す関数
+    """
+    if byte_ranges is None:
+        byte_ranges = split_byte_ranges(checker.csv_file_path, data_start, workers, chunk_size)
+    columns = list(checker.columns.values())
+    detector = checker._key_detector
+    key_constraints = detector.constraints if detector is not None else []
+
+    row_offset = start_row
+    # 各範囲の索引を連結したファイル全体の索引（mmapリーダーの場合のみ）
+    checker.record_index = None if checker.reader == 'stream' else RecordIndex(array('Q'), data_start)
+    remaining = iter(byte_ranges)
+    # 検証を依頼した範囲の (終端のバイト位置, Future)。親が範囲をまとめるたびに次の範囲を依頼し、
+    # 受け取ったままの結果（キー等）がメモリに溜まらないよう件数を制限する
+    pending = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(checker.ddl_file_path, checker.csv_file_path, worker_options(checker), columns, headers,
+                  key_constraints),
+    ) as executor:
+        try:
+            while True:
+                for byte_range in islice(remaining, workers * PENDING_RANGES_PER_WORKER - len(pending)):
+                    pending.append((byte_range[1], executor.submit(_validate_range, byte_range)))
+                if not pending:
+                    break
+                end, future = pending[0]
+                result = future.result()
+                pending.popleft()
+                yield from merge_part(checker, result, end, row_offset, start_row, on_range)
+                row_offset += result[0]
+        finally:
+            # 呼び出し側が打ち切った場合は、開始していない範囲の検証を取り消し、検証済みの範囲のエラーを削除する
+            _discard_pending(pending)
+
+
+def _discard_pending(pending: deque):
+    for _, future in pending:
+        future.cancel()
+    for _, future in pending:
+        if future.cancelled():
+            continue
+        try:
+            future.result()[1].discard()
+        except Exception:
+            pass
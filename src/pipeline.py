@@ -0,0 +1,254 @@
+import os
+import queue
+import threading
+import time
+from array import array
+from contextlib import closing
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .errors import ValidationError
+from .mmap_reader import RecordIndex, iter_record_boundaries, parse_chunk
+from .parallel import create_worker_checker, merge_part, validate_part, worker_options
+
+# 読み込みスレッドが一度に読み込んでデコードするブロックの目安のバイト数
+PIPELINE_BLOCK_SIZE = 1024 * 1024
+# デコード済みで検証を待つブロックの最大数（検証スレッドあたり）
+QUEUED_BLOCKS_PER_THREAD = 2
+# 読み込んでからエラーを書き出し終えるまでのブロックの最大数（検証スレッドあたり）
+IN_FLIGHT_BLOCKS_PER_THREAD = 4
+# キューの待機中に、他の段の中断を確認する間隔（秒）
+POLL_INTERVAL = 0.1
+
+# 段の終わりを次の段に伝える目印
+_DONE = object()
+
+
+def validate_in_threads(checker, headers: List[str], data_start: int, threads: int,
+                        write: Callable[[ValidationError], None], start_row: int = 2,
+                        byte_ranges: Optional[List[Tuple[int, int]]] = None,
+                        on_range: Optional[Callable[[int, int], None]] = None,
+                        block_size: int = PIPELINE_BLOCK_SIZE):
+    """
+    データ部分を読み込み→解析・検証→エラーの書き出しのスレッドのパイプラインで検証
+
+    行番号をシングルスレッドと同じ値に補正したValidationErrorを、ファイル内の順に書き出しスレッドで
+    write に渡す。write が例外（ErrorLimitReached等）を送出した場合や、いずれかのスレッドで
+    例外が発生した場合は全てのスレッドを止め、その例外を呼び出し元で送出する。
+
+    Args:
+        threads: 検証スレッドの数
+        write: エラーを受け取る関数（書き出しスレッドから呼び出す）
+        start_row: data_start のレコードの行番号（チェックポイントから再開する場合に指定）
+        byte_ranges: 検証するバイト範囲のリスト（省略時は data_start 以降を block_size ごとに区切る）
+        on_range: 範囲のエラーを全て書き出し終えるたびに (範囲の終端のバイト位置, 次の行番号) で呼び出す関数
+        block_size: 1ブロックの目安のバイト数
+    """
+    _ThreadPipeline(checker, headers, data_start, threads, write, start_row, byte_ranges,
+                    on_range, block_size).run()
+
+
+class _ThreadPipeline:
+    """
+    読み込み・検証・書き出しの各スレッドと、スレッドをつなぐキュー
+
+    読み込みスレッドがレコード境界で区切ったブロックを読み込んでデコードし、検証スレッドが
+    ブロックをレコードに分割して検証する。書き出しスレッドはブロックの結果をファイル内の順に
+    並べ直してから書き出す。段の間のキューには長さの上限があり、読み込んでから書き出し終えるまでの
+    ブロックの数も制限するため、遅い段があると前の段が待つ。ブロックのエラーは validate_part() が
+    ERROR_SPILL_BATCH_SIZE 件ごとに一時ファイルへ書き出すため、メモリ上のエラーはブロックあたり
+    その件数未満に収まり、メモリ使用量はエラーの件数によらずブロック数分になる。
+
+    検証スレッドはそれぞれ専用のCSVChecker（検証結果キャッシュや外部キーの索引の接続を含む）を
+    持つため、スレッド間で共有する状態はキューだけになる。GILのあるPythonでも同じ結果になるが、
+    並列に動くのはI/Oとデコードの一部だけのため速くはならない。
+    """
+
+    def __init__(self, checker, headers: List[str], data_start: int, threads: int,
+                 write: Callable[[ValidationError], None], start_row: int,
+                 byte_ranges: Optional[List[Tuple[int, int]]],
+                 on_range: Optional[Callable[[int, int], None]], block_size: int):
+        self.checker = checker
+        self.data_start = data_start
+        self.threads = threads
+        self.write = write
+        self.start_row = start_row
+        self.byte_ranges = byte_ranges
+        self.on_range = on_range
+        self.block_size = block_size
+        self.headers = headers
+        detector = checker._key_detector
+        self._key_constraints = detector.constraints if detector is not None else []
+        # (ブロック番号, 開始位置, 終了位置, デコードしたテキスト)
+        self._blocks = queue.Queue(threads * QUEUED_BLOCKS_PER_THREAD)
+        # (ブロック番号, 終了位置, validate_part() の戻り値)。検証スレッドの終わりの目印の分も空けておく
+        in_flight = threads * IN_FLIGHT_BLOCKS_PER_THREAD
+        self._results = queue.Queue(in_flight + threads)
+        self._in_flight = threading.Semaphore(in_flight)
+        self._stopping = threading.Event()
+        self._failures: List[BaseException] = []
+        self._lock = threading.Lock()
+        # 読み込みスレッドがファイルの読み込みとデコードにかけた時間（プロファイル時の「CSV読み込み」）
+        self.read_seconds = 0.0
+
+    def run(self):
+        checker = self.checker
+        # 各ブロックの索引を連結したファイル全体の索引
+        checker.record_index = RecordIndex(array('Q'), self.data_start)
+        stages = [('reader', self._read)]
+        stages += [(f'validator-{number}', self._validate) for number in range(self.threads)]
+        stages.append(('writer', self._write))
+        threads = [
+            threading.Thread(target=self._run_stage, args=(target,), name=f'prechecker-{name}', daemon=True)
+            for name, target in stages
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            # Ctrl+C 等で待機を中断した場合も、他のスレッドを止めてから戻る
+            self._stopping.set()
+            for thread in threads:
+                thread.join()
+            self._discard_results()
+
+        if checker.profiler is not None:
+            checker.profiler.merge_stages({'csv_read': self.read_seconds})
+        if self._failures:
+            raise self._failures[0]
+
+    def _run_stage(self, target: Callable[[], None]):
+        try:
+            target()
+        except BaseException as e:
+            with self._lock:
+                self._failures.append(e)
+            self._stopping.set()
+
+    def _read(self):
+        """読み込みスレッド: ブロックを読み込んでデコードし、検証スレッドに渡す"""
+        encoding = self.checker.encoding
+        with open(self.checker.csv_file_path, 'rb') as f:
+            ranges = self.byte_ranges if self.byte_ranges is not None else self._scan_ranges()
+            for number, (start, end) in enumerate(ranges):
+                if not self._acquire_block():
+                    return
+                started = time.perf_counter()
+                f.seek(start)
+                text = f.read(end - start).decode(encoding)
+                self.read_seconds += time.perf_counter() - started
+                if not self._put(self._blocks, (number, start, end, text)):
+                    return
+        for _ in range(self.threads):
+            if not self._put(self._blocks, _DONE):
+                return
+
+    def _scan_ranges(self) -> Iterator[Tuple[int, int]]:
+        """data_start 以降をクォートを考慮したレコード境界で block_size ごとに区切る"""
+        with open(self.checker.csv_file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start = self.data_start
+            for boundary in iter_record_boundaries(f, start, self.block_size):
+                if boundary >= size:
+                    break
+                yield start, boundary
+                start = boundary
+            if start < size:
+                yield start, size
+
+    def _validate(self):
+        """検証スレッド: ブロックをレコードに分割して検証し、結果を書き出しスレッドに渡す"""
+        # 外部キーの索引の接続は作成したスレッドでしか使えないため、CSVCheckerはスレッド内で作る
+        # （プロファイラー等も共有しないよう、設定はスレッドごとに作り直す）
+        parent = self.checker
+        checker = create_worker_checker(parent.ddl_file_path, parent.csv_file_path, worker_options(parent),
+                                        list(parent.columns.values()), self.headers, self._key_constraints)
+        try:
+            while True:
+                block = self._get(self._blocks)
+                if block is None or block is _DONE:
+                    break
+                number, start, end, text = block
+                result = validate_part(checker, lambda: _validate_block(checker, start, end, text))
+                if not self._put(self._results, (number, end, result)):
+                    result[1].discard()
+                    return
+            self._put(self._results, _DONE)
+        finally:
+            checker._close_foreign_key_probe()
+
+    def _write(self):
+        """書き出しスレッド: ブロックの結果をファイル内の順に並べ直し、行番号を補正したエラーを書き出す"""
+        checker = self.checker
+        # 先に届いた後ろのブロックの結果（ブロック番号 -> (終了位置, 結果)）
+        pending = {}
+        next_number = 0
+        row_offset = self.start_row
+        finished = 0
+        try:
+            while finished < self.threads:
+                item = self._get(self._results)
+                if item is None:
+                    return
+                if item is _DONE:
+                    finished += 1
+                    continue
+                number, end, result = item
+                pending[number] = end, result
+                while next_number in pending:
+                    end, result = pending.pop(next_number)
+                    # 書き出しを打ち切った場合も、ブロックのエラーの一時ファイルはその場で削除する
+                    with closing(merge_part(checker, result, end, row_offset, self.start_row,
+                                            self.on_range)) as errors:
+                        for error in errors:
+                            self.write(error)
+                    row_offset += result[0]
+                    next_number += 1
+                    self._in_flight.release()
+        finally:
+            for _, result in pending.values():
+                result[1].discard()
+
+    def _discard_results(self):
+        """中断した場合に、書き出さずにキューに残ったブロックのエラーの一時ファイルを削除"""
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _DONE:
+                item[2][1].discard()
+
+    def _acquire_block(self) -> bool:
+        """読み込んでから書き出し終えるまでのブロックの枠を確保（中断した場合False）"""
+        while not self._stopping.is_set():
+            if self._in_flight.acquire(timeout=POLL_INTERVAL):
+                return True
+        return False
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """キューに空きができるまで待って追加（中断した場合False）"""
+        while not self._stopping.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue):
+        """キューから取り出す（中断した場合None）"""
+        while not self._stopping.is_set():
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+
+
+def _validate_block(checker, start: int, end: int, text: str) -> Tuple[int, RecordIndex]:
+    """デコードしたブロックを行番号0から検証し、(record_count, ブロックの索引) を返す"""
+    index = RecordIndex(array('Q', [start]), end)
+    index.first_records.append(0)
+    return checker._validate_records(parse_chunk(text), start_row=0), index
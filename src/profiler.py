@@ -0,0 +1,339 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .column_validator import (
+    BooleanColumnValidator,
+    ColumnValidator,
+    DateColumnValidator,
+    DateTimeColumnValidator,
+    DecimalColumnValidator,
+    FloatColumnValidator,
+    IntegerColumnValidator,
+    StringColumnValidator,
+    TimeColumnValidator,
+    UnsupportedColumnValidator,
+)
+from .error_sink import ErrorSink, TimedErrorSink
+from .validator import caught_exception_count
+from .value_cache import unwrap_validator
+
+# 工程（表示順）
+STAGES = ('ddl_parse', 'csv_read', 'validation', 'report_write')
+STAGE_LABELS = {
+    'ddl_parse': 'DDLパース',
+    'csv_read': 'CSV読み込み',
+    'validation': '検証',
+    'report_write': 'レポート書き出し',
+}
+
+# 進捗表示の間隔（秒）と、経過時間を確認する間隔（行数）
+PROGRESS_INTERVAL = 0.5
+PROGRESS_CHECK_ROWS = 1000
+
+# バリデータの種類ごとの型ファミリー名
+_TYPE_FAMILIES = (
+    (IntegerColumnValidator, 'integer'),
+    (DecimalColumnValidator, 'decimal'),
+    (FloatColumnValidator, 'float'),
+    (StringColumnValidator, 'string'),
+    (DateColumnValidator, 'date'),
+    (DateTimeColumnValidator, 'datetime'),
+    (TimeColumnValidator, 'time'),
+    (BooleanColumnValidator, 'boolean'),
+    (UnsupportedColumnValidator, 'unsupported'),
+)
+
+
+def type_family(validator: ColumnValidator) -> str:
+    """バリデータの型ファミリー名（TEXTは'text'）"""
+    validator = unwrap_validator(validator)
+    for validator_class, family in _TYPE_FAMILIES:
+        if isinstance(validator, validator_class):
+            return family
+    return 'text'
+
+
+@dataclass
+class ColumnProfile:
+    column_name: str
+    type_family: str
+    # 検証したセル数
+    cells: int = 0
+    # NULL値として型チェックを省略したセル数
+    nulls: int = 0
+    # AUTO_INCREMENTカラムの空値として許可したセル数
+    auto_increment_skips: int = 0
+    # 検証処理の内部で捕捉した例外の数
+    exceptions: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.cells if self.cells else 0.0
+
+    def merge(self, other: 'ColumnProfile'):
+        self.cells += other.cells
+        self.nulls += other.nulls
+        self.auto_increment_skips += other.auto_increment_skips
+        self.exceptions += other.exceptions
+        self.errors += other.errors
+        self.seconds += other.seconds
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), 'null_rate': self.null_rate}
+
+
+class ProfilingColumnValidator:
+    """ColumnValidatorの呼び出しごとに処理時間・NULL・例外・エラーの件数を記録するラッパー"""
+
+    def __init__(self, validator: ColumnValidator):
+        self.validator = validator
+        self.name = validator.name
+        self.data_type = validator.data_type
+        self.nullable = validator.nullable
+        self.auto_increment = validator.auto_increment
+        self.profile = ColumnProfile(validator.name, type_family(validator))
+
+    def validate(self, value: str) -> Tuple[bool, str]:
+        profile = self.profile
+        exceptions = caught_exception_count()
+        start = time.perf_counter()
+        result = self.validator.validate(value)
+        profile.seconds += time.perf_counter() - start
+
+        profile.cells += 1
+        profile.exceptions += caught_exception_count() - exceptions
+        if value == '' or value is None or (len(value) == 4 and value.upper() == 'NULL'):
+            profile.nulls += 1
+            if self.auto_increment and not self.nullable:
+                profile.auto_increment_skips += 1
+        if not result[0]:
+            profile.errors += 1
+        return result
+
+    def take_profile(self) -> ColumnProfile:
+        """前回の呼び出し以降の集計を返し、リセット"""
+        profile = self.profile
+        self.profile = ColumnProfile(profile.column_name, profile.type_family)
+        return profile
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.validator!r})"
+
+
+def wrap_with_profiler(validators: Dict[str, ColumnValidator]) -> Dict[str, ProfilingColumnValidator]:
+    return {name: ProfilingColumnValidator(validator) for name, validator in validators.items()}
+
+
+class ValidationProfiler:
+    """
+    検証の工程別・カラム別の処理時間と件数を集計する
+
+    CSVCheckerに渡すと、バリデータを ProfilingColumnValidator でラップし、
+    CSVの読み込み時間とレポートの書き出し時間を計測する。
+    progress=True の場合は処理速度と残り時間の目安を標準エラー出力に表示する。
+    並列検証ではワーカーごとの集計を合算する（工程別の時間はワーカーの合計）。
+    """
+
+    def __init__(self, progress: bool = True):
+        self.progress = progress
+        self.stages: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.columns: Dict[str, ColumnProfile] = {}
+        self.rows = 0
+        self.total_bytes = 0
+        self.elapsed = 0.0
+        self._sink: Optional[TimedErrorSink] = None
+        self._started = None
+        self._last_progress = 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        """with文の中の処理時間を工程 name に加算"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    @contextmanager
+    def measure_records(self):
+        """
+        レコード検証の処理時間から、CSV読み込みとレポート書き出しを除いた時間を検証時間として加算
+        """
+        before = self.stages['csv_read'] + self._report_seconds()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            other = self.stages['csv_read'] + self._report_seconds() - before
+            self.stages['validation'] += max(elapsed - other, 0.0)
+
+    def wrap_sink(self, sink: ErrorSink) -> TimedErrorSink:
+        self._sink = TimedErrorSink(sink)
+        return self._sink
+
+    def _report_seconds(self) -> float:
+        return self._sink.seconds if self._sink is not None else 0.0
+
+    def track_reader(self, csv_reader: Iterable[List[str]],
+                     bytes_read: Optional[Callable[[], int]] = None) -> Iterator[List[str]]:
+        """
+        csv.readerの読み込み時間を計測しながらレコードを返す
+
+        Args:
+            csv_reader: csv.reader
+            bytes_read: 読み込んだバイト数を返す関数（進捗表示に使う。圧縮ファイルは圧縮後のバイト数）
+        """
+        perf_counter = time.perf_counter
+        stages = self.stages
+        if not self.progress:
+            bytes_read = None
+        row_count = 0
+        iterator = iter(csv_reader)
+        while True:
+            start = perf_counter()
+            row = next(iterator, None)
+            stages['csv_read'] += perf_counter() - start
+            if row is None:
+                return
+            row_count += 1
+            if bytes_read is not None and row_count % PROGRESS_CHECK_ROWS == 0:
+                self.update_progress(row_count, bytes_read())
+            yield row
+
+    def start(self, total_bytes: int):
+        """検証の開始（進捗表示のETAはファイルサイズに対する読み込み済みバイト数で推定）"""
+        self.total_bytes = total_bytes
+        self._started = time.perf_counter()
+        self._last_progress = self._started
+
+    def update_progress(self, rows: int, bytes_read: int):
+        if not self.progress or self._started is None:
+            return
+        now = time.perf_counter()
+        if now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+
+        elapsed = now - self._started
+        rate = rows / elapsed if elapsed else 0.0
+        line = f"\r処理中: {rows:,}行 ({rate:,.0f} 行/秒)"
+        if self.total_bytes and bytes_read:
+            ratio = min(bytes_read / self.total_bytes, 1.0)
+            remaining = elapsed * (1 - ratio) / ratio if ratio else 0.0
+            line += f" {ratio:.1%} 残り約{_format_duration(remaining)}"
+        sys.stderr.write(line + "  ")
+        sys.stderr.flush()
+
+    def finish(self, rows: int):
+        """検証の終了（進捗表示の行を確定させる）"""
+        self.rows = rows
+        if self._started is not None:
+            self.elapsed = time.perf_counter() - self._started
+            if self.progress:
+                rate = rows / self.elapsed if self.elapsed else 0.0
+                sys.stderr.write(f"\r処理完了: {rows:,}行 ({rate:,.0f} 行/秒, {self.elapsed:.1f}秒)  \n")
+                sys.stderr.flush()
+        self.stages['report_write'] = self._report_seconds()
+
+    def merge_columns(self, profiles: List[ColumnProfile]):
+        for profile in profiles:
+            if profile.column_name in self.columns:
+                self.columns[profile.column_name].merge(profile)
+            else:
+                self.columns[profile.column_name] = profile
+
+    def merge_stages(self, stages: Dict[str, float]):
+        for name, seconds in stages.items():
+            self.stages[name] += seconds
+
+    def take_stages(self) -> Dict[str, float]:
+        """前回の呼び出し以降の工程別の時間を返し、リセット（並列検証のワーカー用）"""
+        stages = self.stages
+        self.stages = {stage: 0.0 for stage in STAGES}
+        return stages
+
+    def type_families(self) -> Dict[str, ColumnProfile]:
+        """型ファミリーごとに集計したプロファイル"""
+        families: Dict[str, ColumnProfile] = {}
+        for profile in self.columns.values():
+            family = families.setdefault(profile.type_family, ColumnProfile(profile.type_family, profile.type_family))
+            family.merge(profile)
+        return families
+
+    def totals(self) -> ColumnProfile:
+        total = ColumnProfile('*', '*')
+        for profile in self.columns.values():
+            total.merge(profile)
+        return total
+
+    def to_dict(self) -> dict:
+        """監視システム向けのJSONに変換できる辞書"""
+        totals = self.totals()
+        return {
+            'rows': self.rows,
+            'bytes': self.total_bytes,
+            'elapsed_seconds': self.elapsed,
+            'rows_per_sec': self.rows / self.elapsed if self.elapsed else 0.0,
+            'stages': dict(self.stages),
+            'cells': totals.cells,
+            'nulls': totals.nulls,
+            'null_rate': totals.null_rate,
+            'auto_increment_skips': totals.auto_increment_skips,
+            'exceptions': totals.exceptions,
+            'errors': totals.errors,
+            'type_families': {name: _profile_dict(p) for name, p in self.type_families().items()},
+            'columns': [profile.to_dict() for profile in self.columns.values()],
+        }
+
+    def write_json(self, output_file_path: str):
+        with open(output_file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format_report(self, top_columns: int = 10) -> str:
+        """コンソール表示用のプロファイル結果"""
+        totals = self.totals()
+        lines = ["プロファイル:"]
+        lines.append("  工程別の処理時間:")
+        for stage in STAGES:
+            lines.append(f"    {STAGE_LABELS[stage]}: {self.stages[stage]:.3f}秒")
+        lines.append(f"  検証したセル: {totals.cells:,}件"
+                     f"（NULLで省略 {totals.nulls:,}件 = {totals.null_rate:.1%},"
+                     f" AUTO_INCREMENTの空値 {totals.auto_increment_skips:,}件,"
+                     f" 検証中の例外 {totals.exceptions:,}件）")
+
+        lines.append("  型ごとの処理時間:")
+        families = sorted(self.type_families().values(), key=lambda p: -p.seconds)
+        for profile in families:
+            lines.append(f"    {_format_profile(profile)}")
+
+        lines.append(f"  処理時間の長いカラム（上位{top_columns}件）:")
+        columns = sorted(self.columns.values(), key=lambda p: -p.seconds)[:top_columns]
+        for profile in columns:
+            lines.append(f"    {_format_profile(profile)}")
+        return "\n".join(lines)
+
+
+def _profile_dict(profile: ColumnProfile) -> dict:
+    data = profile.to_dict()
+    del data['column_name'], data['type_family']
+    return data
+
+
+def _format_profile(profile: ColumnProfile) -> str:
+    per_cell = profile.seconds / profile.cells * 1e6 if profile.cells else 0.0
+    return (f"{profile.column_name}: {profile.seconds:.3f}秒"
+            f"（{profile.cells:,}セル, {per_cell:.2f}µs/セル, NULL {profile.null_rate:.1%},"
+            f" 例外 {profile.exceptions:,}件, エラー {profile.errors:,}件）")
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
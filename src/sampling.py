@@ -0,0 +1,366 @@
+import csv
+import io
+import math
+import mmap
+import random
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from statistics import NormalDist
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .errors import ValidationError
+from .mmap_reader import _can_advise
+
+# 信頼区間の信頼水準のデフォルト
+DEFAULT_CONFIDENCE = 0.95
+# 再同期時にクォートの内外を判定するため、候補の位置から読み込むバイト数とレコード数
+RESYNC_WINDOW = 64 * 1024
+RESYNC_RECORDS = 8
+# 抽出回数に対する試行回数の上限の倍率（空行ばかりのファイルなどで打ち切る）
+MAX_ATTEMPTS_PER_SAMPLE = 4
+# 行単位のエラー（フィールド数の不一致）を集計するカラム名
+ROW_LEVEL_COLUMN = ''
+
+
+@dataclass
+class SampledRecord:
+    offset: int   # レコードの先頭バイト位置
+    length: int   # レコードのバイト数（改行を含む）
+    weight: float  # 抽出確率の偏りを補正する重み
+    row: List[str]
+
+
+def _next_boundary(data: bytes, pos: int, in_quotes: bool) -> Optional[int]:
+    """pos以降で、クォートの外側にある最初の改行の直後の位置（見つからなければNone）"""
+    while True:
+        newline = data.find(b'\n', pos)
+        if newline < 0:
+            return None
+        in_quotes ^= bool(data.count(b'"', pos, newline) & 1)
+        pos = newline + 1
+        if not in_quotes:
+            return pos
+
+
+def _parse_record(data: bytes, encoding: str, errors: str = 'strict') -> List[str]:
+    text = data.decode(encoding, errors)
+    return next(csv.reader(io.StringIO(text, newline='')), [])
+
+
+class RecordSampler:
+    """
+    ファイル内のランダムなバイト位置からレコードを抽出する
+
+    選んだバイト位置の次の改行をレコードの先頭とみなす（ファイル末尾の行を選んだ場合は
+    先頭のデータ行に戻る）。ランダムな位置ではクォートの内側かどうかが分からないため、
+    「クォートの外側」「クォートの内側」の両方を仮定して後続のレコードを読み、
+    フィールド数がヘッダーと一致するレコードの多い方を採用する。
+
+    長い行の直後のレコードほど選ばれやすいため、選んだ位置を含む行の長さの逆数を重みとし、
+    推定時に偏りを補正する。
+    """
+
+    def __init__(self, file_path: str, encoding: str, data_start: int, header_count: int,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            file_path: CSVファイルのパス
+            encoding: CSVファイルのエンコーディング（バイト単位の分割に対応するもの）
+            data_start: データ行の先頭バイト位置
+            header_count: ヘッダーのフィールド数
+            rng: 乱数生成器（省略時はシードなし）
+        """
+        self.encoding = encoding
+        self.data_start = data_start
+        self.header_count = header_count
+        self.rng = rng or random.Random()
+        self._file = open(file_path, 'rb')
+        try:
+            size = self._file.seek(0, io.SEEK_END)
+            # 空のファイルはメモリマップできない
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        except BaseException:
+            self._file.close()
+            raise
+        self.end = size
+        if _can_advise(self._map):
+            self._map.madvise(mmap.MADV_RANDOM)
+
+    @property
+    def data_bytes(self) -> int:
+        """データ部分のバイト数"""
+        return max(0, self.end - self.data_start)
+
+    def sample(self) -> Optional[SampledRecord]:
+        """
+        ランダムな位置のレコードを1件抽出
+
+        Returns:
+            抽出したレコード（データ行がない場合、空行を選んだ場合はNone）
+        """
+        if self.end <= self.data_start:
+            return None
+        mapped = self._map
+        offset = self.rng.randrange(self.data_start, self.end)
+        # 選んだ位置を含む行の範囲（長い行ほど選ばれやすい）
+        line_start = mapped.rfind(b'\n', self.data_start, offset) + 1 or self.data_start
+        newline = mapped.find(b'\n', offset, self.end)
+        line_end = self.end if newline < 0 else newline + 1
+        start = self.data_start if line_end >= self.end else line_end
+        weight = 1.0 / (line_end - line_start)
+
+        start, end = self._resync(start)
+        row = _parse_record(mapped[start:end], self.encoding)
+        if not row:
+            return None
+        return SampledRecord(offset=start, length=end - start, weight=weight, row=row)
+
+    def _resync(self, start: int) -> Tuple[int, int]:
+        """レコードの先頭の候補から、クォートを考慮したレコードの範囲 [start, end) を決める"""
+        window_size = RESYNC_WINDOW
+        while True:
+            window = self._map[start:start + window_size]
+            at_eof = start + len(window) >= self.end
+            best = 0
+            if b'"' in window:
+                # まず候補の位置がクォートの外側だと仮定し、後続のレコードが全てヘッダーと
+                # 一致すればそのまま採用する（クォートの内側と仮定しても一致数は増えない）
+                score = self._score(window, 0, at_eof)
+                if score < RESYNC_RECORDS:
+                    # 候補の位置がクォートの内側だった場合のレコードの先頭
+                    inside = _next_boundary(window, 0, True)
+                    if inside is not None and self._score(window, inside, at_eof) > score:
+                        best = inside
+            end = _next_boundary(window, best, False)
+            if end is None and at_eof:
+                end = len(window)
+            if end is not None:
+                return start + best, start + end
+            # レコードが読み込み範囲に収まらない場合は範囲を広げる
+            window_size *= 2
+
+    def _score(self, window: bytes, pos: int, at_eof: bool) -> int:
+        """posから始まるレコード（最大 RESYNC_RECORDS 件）のうち、フィールド数がヘッダーと一致する数"""
+        end = pos
+        for _ in range(RESYNC_RECORDS):
+            boundary = _next_boundary(window, end, False)
+            if boundary is None:
+                # ファイル末尾の改行のないレコードも数える
+                if at_eof:
+                    end = len(window)
+                break
+            end = boundary
+        # 読み込み範囲の末尾で分断された文字は判定に影響しないため置換する
+        text = window[pos:end].decode(self.encoding, 'replace')
+        rows = islice(csv.reader(io.StringIO(text, newline='')), RESYNC_RECORDS)
+        return sum(1 for row in rows if len(row) == self.header_count)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def wilson_interval(rate: float, n: float, z: float) -> Tuple[float, float]:
+    """割合の信頼区間（Wilsonのスコア区間。エラー率が0%付近でも区間が負にならない）"""
+    if n <= 0:
+        return 0.0, 1.0
+    z2 = z * z
+    denominator = 1 + z2 / n
+    center = (rate + z2 / (2 * n)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / n + z2 / (4 * n * n)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+@dataclass
+class ColumnEstimate:
+    column_name: str
+    sampled_errors: int  # エラーのあったサンプルのレコード数
+    error_rate: float
+    lower: float
+    upper: float
+    estimated_errors: int
+    estimated_lower: int
+    estimated_upper: int
+    example: Optional[Tuple[int, ValidationError]] = None  # (レコードの先頭バイト位置, エラー)
+
+    @property
+    def label(self) -> str:
+        return self.column_name or '（フィールド数）'
+
+    def __str__(self):
+        text = (f"{self.label}: エラー率 {self.error_rate:.2%}（{self.lower:.2%}〜{self.upper:.2%}）,"
+                f" 推定エラー数 約{self.estimated_errors:,}件（{self.estimated_lower:,}〜{self.estimated_upper:,}件）")
+        if self.example is not None:
+            offset, error = self.example
+            text += f"\n      例: 位置{offset:,}バイトのレコード: {error.error_message}"
+            if error.column_name:
+                text += f" (値: '{error.value}')"
+        return text
+
+
+@dataclass
+class SampleReport:
+    sample_size: int         # 抽出したレコード数
+    unique_records: int      # 重複を除いたレコード数
+    data_bytes: int          # データ部分のバイト数
+    estimated_records: int   # 推定総レコード数
+    confidence: float
+    seconds: float
+    estimated_errors: int = 0  # 推定エラー総数
+    estimated_errors_range: Tuple[int, int] = (0, 0)
+    columns: List[ColumnEstimate] = field(default_factory=list)
+
+    def columns_to_check(self) -> List[ColumnEstimate]:
+        """サンプルでエラーが見つかり、全件検証が必要なカラム"""
+        return [column for column in self.columns if column.sampled_errors]
+
+    def format_report(self) -> str:
+        """コンソール表示用のサンプリング検証の結果"""
+        lines = [f"サンプリング検証: {self.sample_size:,}レコードを抽出"
+                 f"（重複を除き {self.unique_records:,}件, {self.seconds:.2f}秒）",
+                 f"  推定総レコード数: 約{self.estimated_records:,}件"]
+        if not self.sample_size:
+            lines.append("  データ行がないため推定できません")
+            return "\n".join(lines)
+
+        to_check = self.columns_to_check()
+        lower, upper = self.estimated_errors_range
+        lines.append(f"  推定エラー総数: 約{self.estimated_errors:,}件（{lower:,}〜{upper:,}件,"
+                     f" 信頼水準 {self.confidence:.0%}）")
+        if to_check:
+            lines.append("  全件検証が必要なカラム（推定エラー数の多い順）:")
+            for column in sorted(to_check, key=lambda c: -c.error_rate):
+                lines.append(f"    - {column}")
+
+        clean = [column for column in self.columns if not column.sampled_errors]
+        if clean:
+            max_upper = max(column.upper for column in clean)
+            lines.append(f"  サンプルでエラーのなかったカラム: {len(clean)}件"
+                         f"（エラー率の上限 {max_upper:.2%}）")
+        return "\n".join(lines)
+
+
+class SampleEstimator:
+    """抽出したレコードの検証結果から、カラムごとのエラー率と総エラー数を推定する"""
+
+    def __init__(self, column_names: List[str], confidence: float = DEFAULT_CONFIDENCE):
+        self.column_names = [ROW_LEVEL_COLUMN] + column_names
+        self.confidence = confidence
+        self.sample_size = 0
+        self.weight_sum = 0.0
+        self.weight_square_sum = 0.0
+        self.length_sum = 0.0
+        # レコードごとのエラー数 y の重み付き和（推定エラー総数の分散の計算用）
+        self.error_sum = 0.0
+        self.square_weighted_error_sum = 0.0
+        self.square_weighted_error_square_sum = 0.0
+        self.error_weights: Dict[str, float] = {name: 0.0 for name in self.column_names}
+        self.error_counts: Dict[str, int] = {name: 0 for name in self.column_names}
+        self.examples: Dict[str, Tuple[int, ValidationError]] = {}
+
+    def add(self, record: SampledRecord, errors: List[ValidationError]):
+        weight = record.weight
+        self.sample_size += 1
+        self.weight_sum += weight
+        self.weight_square_sum += weight * weight
+        self.length_sum += weight * record.length
+        self.error_sum += weight * len(errors)
+        self.square_weighted_error_sum += weight * weight * len(errors)
+        self.square_weighted_error_square_sum += weight * weight * len(errors) ** 2
+        # 1レコードで同じカラムのエラーは1件まで
+        for column_name in {error.column_name for error in errors}:
+            self.error_weights[column_name] += weight
+            self.error_counts[column_name] += 1
+        for error in errors:
+            self.examples.setdefault(error.column_name, (record.offset, error))
+
+    def report(self, unique_records: int, data_bytes: int, seconds: float) -> SampleReport:
+        estimated_records = 0
+        if self.weight_sum:
+            estimated_records = round(data_bytes / (self.length_sum / self.weight_sum))
+        report = SampleReport(
+            sample_size=self.sample_size,
+            unique_records=unique_records,
+            data_bytes=data_bytes,
+            estimated_records=estimated_records,
+            confidence=self.confidence,
+            seconds=seconds,
+        )
+        if not self.sample_size:
+            return report
+
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        # 重みのばらつきを考慮した実効サンプルサイズ
+        effective_size = self.weight_sum ** 2 / self.weight_square_sum
+
+        # 1レコードあたりのエラー数の重み付き平均と、その分散（比推定量の線形近似）
+        mean = self.error_sum / self.weight_sum
+        variance = (self.square_weighted_error_square_sum
+                    - 2 * mean * self.square_weighted_error_sum
+                    + mean * mean * self.weight_square_sum) / self.weight_sum ** 2
+        half_width = z * math.sqrt(max(0.0, variance))
+        report.estimated_errors = round(mean * estimated_records)
+        lower = math.floor(max(0.0, mean - half_width) * estimated_records)
+        upper = math.ceil((mean + half_width) * estimated_records)
+
+        for column_name in self.column_names:
+            rate = self.error_weights[column_name] / self.weight_sum
+            rate_lower, rate_upper = wilson_interval(rate, effective_size, z)
+            report.columns.append(ColumnEstimate(
+                column_name=column_name,
+                sampled_errors=self.error_counts[column_name],
+                error_rate=rate,
+                lower=rate_lower,
+                upper=rate_upper,
+                estimated_errors=round(rate * estimated_records),
+                estimated_lower=math.floor(rate_lower * estimated_records),
+                estimated_upper=math.ceil(rate_upper * estimated_records),
+                example=self.examples.get(column_name),
+            ))
+        # エラーが少なく分散が0に近い場合も、カラムごとの上限を下回らないようにする
+        upper = max([upper] + [column.estimated_upper for column in report.columns])
+        report.estimated_errors_range = (lower, upper)
+        return report
+
+
+def sample_file(sampler: RecordSampler, sample_size: int,
+                validate_row: Callable[[List[str], Callable[[ValidationError], None]], None],
+                column_names: List[str], confidence: float = DEFAULT_CONFIDENCE) -> SampleReport:
+    """
+    ランダムに抽出したレコードを検証し、エラー率を推定
+
+    同じレコードが複数回選ばれた場合は、検証結果を再利用して重複も推定に含める（復元抽出）。
+
+    Args:
+        sampler: レコードを抽出するRecordSampler
+        sample_size: 抽出するレコード数
+        validate_row: (フィールドのリスト, エラーを受け取る関数) でレコードを検証する関数
+        column_names: 検証するカラム名（DDLのカラム順）
+        confidence: 信頼区間の信頼水準
+
+    Returns:
+        SampleReport
+    """
+    started = time.perf_counter()
+    estimator = SampleEstimator(column_names, confidence)
+    results: Dict[int, List[ValidationError]] = {}
+    attempts = 0
+    while estimator.sample_size < sample_size and attempts < sample_size * MAX_ATTEMPTS_PER_SAMPLE:
+        attempts += 1
+        record = sampler.sample()
+        if record is None:
+            continue
+        errors = results.get(record.offset)
+        if errors is None:
+            errors = results[record.offset] = []
+            validate_row(record.row, errors.append)
+        estimator.add(record, errors)
+    return estimator.report(len(results), sampler.data_bytes, time.perf_counter() - started)
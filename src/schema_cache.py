@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+from . import __version__
+from .ddl_parser import ColumnDefinition, DDLParser, TableDefinition
+
+# キャッシュファイルの形式（ColumnDefinitionの項目やDDLの解析結果が変わる場合に更新する）
+CACHE_FORMAT = 3
+
+
+def default_cache_dir() -> str:
+    """
+    キャッシュの保存先
+
+    環境変数 PRECHECKER_CACHE_DIR、XDG_CACHE_HOME の順に参照し、
+    どちらもなければ ~/.cache/prechecker/schemas を使う。
+    """
+    cache_dir = os.environ.get('PRECHECKER_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'prechecker', 'schemas')
+
+
+class SchemaCache:
+    """
+    DDLの解析結果（カラム定義・テーブル定義）をディスクに保存するキャッシュ
+
+    DDLファイルの内容のハッシュとツールのバージョンをキーにするため、DDLファイルを
+    編集した場合やツールを更新した場合は自動的に解析し直す。
+    同じスキーマファイルに対する2回目以降の実行ではDDLの解析を省略できる。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        # 直前の parse()/parse_tables()/parse_schema() がキャッシュから読み込んだか
+        self.last_hit = False
+
+    def parse(self, ddl_file_path: str) -> List[ColumnDefinition]:
+        """DDLParser.parse() と同じ結果（最初のCREATE TABLE文のカラム定義）を返す"""
+        data = self._load(ddl_file_path, 'columns', lambda parser, content: {
+            'columns': [asdict(col) for col in parser._extract_columns(content)],
+        })
+        return [ColumnDefinition(**col) for col in data['columns']]
+
+    def parse_tables(self, ddl_file_path: str) -> Dict[str, List[ColumnDefinition]]:
+        """DDLParser.parse_tables() と同じ結果（全テーブルのカラム定義）を返す"""
+        data = self._load(ddl_file_path, 'tables', lambda parser, content: {
+            'tables': {
+                name: [asdict(col) for col in columns]
+                for name, columns in parser._extract_tables(content).items()
+            },
+        })
+        return {
+            name: [ColumnDefinition(**col) for col in columns]
+            for name, columns in data['tables'].items()
+        }
+
+    def parse_schema(self, ddl_file_path: str) -> Dict[str, TableDefinition]:
+        """DDLParser.parse_schema() と同じ結果（主キー・一意キー・外部キーを含むテーブル定義）を返す"""
+        data = self._load(ddl_file_path, 'schema', lambda parser, content: {
+            'tables': [asdict(table) for table in parser._extract_schema(content).values()],
+        })
+        tables = [TableDefinition.from_dict(table) for table in data['tables']]
+        return {table.name: table for table in tables}
+
+    def cache_path(self, ddl_bytes: bytes, kind: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}\0{CACHE_FORMAT}\0{kind}\0".encode('utf-8'))
+        digest.update(ddl_bytes)
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.json")
+
+    def _load(self, ddl_file_path: str, kind: str, build: Callable[[DDLParser, str], dict]) -> dict:
+        with open(ddl_file_path, 'rb') as f:
+            ddl_bytes = f.read()
+
+        path = self.cache_path(ddl_bytes, kind)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.last_hit = True
+            return data
+        except (OSError, ValueError):
+            # キャッシュがない、または壊れている場合は解析し直す
+            pass
+
+        # DDLParserと同じくテキストモード（改行コードを統一）で読んだ内容を解析
+        content = ddl_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        data = build(DDLParser(ddl_file_path), content)
+        self.last_hit = False
+        self._store(path, data)
+        return data
+
+    def _store(self, path: str, data: dict):
+        """一時ファイルに書いてから置き換え、並行して実行されるプロセスが書きかけのファイルを読まないようにする"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # 書き込めない場合（読み取り専用の環境等）はキャッシュせずに続行
+            pass
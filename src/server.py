@@ -0,0 +1,598 @@
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from queue import Empty
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .batch_runner import STATUS_FAILED, STATUS_INVALID, STATUS_OK, BatchResult, table_for_file
+from .client import DEFAULT_HOST, DEFAULT_PORT
+from .ddl_parser import ColumnDefinition
+from .error_sink import ErrorSink
+
+# 実行待ちのジョブの上限（超えた場合は 503 を返す）
+DEFAULT_MAX_QUEUE = 64
+# アップロードできるリクエストボディの上限（バイト。超えた場合は 413 を返す）
+DEFAULT_MAX_UPLOAD_SIZE = 1024 * 1024 * 1024
+# ワーカーからまとめて送るエラーの件数
+ERROR_BATCH_SIZE = 1000
+# ワーカーの異常終了を確認する間隔（秒）
+QUEUE_POLL_INTERVAL = 0.5
+# アップロードされたCSVを一時ファイルに書き出す単位（バイト）
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# リクエストヘッダーの最大サイズ（バイト）
+MAX_HEADER_SIZE = 64 * 1024
+# エラーを返した後、クライアントが送信中のボディを読み捨てて切断を待つ最大の時間（秒）
+LINGER_SECONDS = 2.0
+
+# ジョブごとに指定できるCSVCheckerの設定（クエリパラメータ名 -> 型）
+JOB_OPTIONS = {
+    'encoding': str,
+    'max_errors': int,
+    'max_errors_per_column': int,
+    'fail_fast': bool,
+}
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+# ワーカープロセスごとに保持する解析済みのテーブル定義
+_worker_ddl_file_path = None
+_worker_tables: Dict[str, List[ColumnDefinition]] = {}
+_worker_options: dict = {}
+
+
+class HttpError(Exception):
+    """HTTPのエラーレスポンスとして返す例外"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ServerMetrics:
+    """サーバーの稼働状況（/metrics で返す）"""
+    started_at: float
+    workers: int
+    max_queue: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    records: int = 0
+    bytes: int = 0
+    errors: int = 0
+    job_seconds: float = 0.0
+
+    def finish(self, result: BatchResult, size: int):
+        if result.status == STATUS_FAILED:
+            self.failed += 1
+            return
+        self.completed += 1
+        self.records += result.record_count
+        self.bytes += size
+        self.errors += result.error_count
+        self.job_seconds += result.seconds
+
+    def to_dict(self) -> dict:
+        uptime = time.monotonic() - self.started_at
+        jobs = self.completed
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'workers': self.workers,
+            'queue_depth': self.queued,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'jobs_completed': self.completed,
+            'jobs_failed': self.failed,
+            'jobs_rejected': self.rejected,
+            'records_validated': self.records,
+            'bytes_validated': self.bytes,
+            'errors_found': self.errors,
+            # 稼働時間あたりのスループット
+            'records_per_second': round(self.records / uptime, 1) if uptime > 0 else 0.0,
+            'bytes_per_second': round(self.bytes / uptime, 1) if uptime > 0 else 0.0,
+            # ジョブの検証時間あたりのスループット（ワーカー1つあたりの処理速度）
+            'job_records_per_second': round(self.records / self.job_seconds, 1) if self.job_seconds > 0 else 0.0,
+            'average_job_seconds': round(self.job_seconds / jobs, 3) if jobs else 0.0,
+        }
+
+
+class _QueueErrorSink(ErrorSink):
+    """検出したエラーをまとめてプロセス間のキューに送る出力先（ワーカープロセスで使う）"""
+
+    def __init__(self, queue, batch_size: int = ERROR_BATCH_SIZE):
+        self.queue = queue
+        self.batch_size = batch_size
+        self._batch = []
+
+    def write(self, error):
+        self._batch.append(asdict(error))
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.queue.put(self._batch)
+            self._batch = []
+
+
+def _init_worker(ddl_file_path: str, tables: Dict[str, List[ColumnDefinition]], options: dict):
+    global _worker_ddl_file_path, _worker_tables, _worker_options
+    _worker_ddl_file_path = ddl_file_path
+    _worker_tables = tables
+    _worker_options = options
+
+
+def _run_job(table_name: str, csv_file_path: str, job_options: dict, queue) -> BatchResult:
+    """
+    1ファイルを検証し、エラーをキューに送る（ワーカープロセスで実行）
+
+    エラーを送り終えるとキューに None を送る。
+    """
+    from .csv_checker import CSVChecker, collect_warnings
+
+    start = time.perf_counter()
+    try:
+        checker = CSVChecker(
+            _worker_ddl_file_path, csv_file_path,
+            error_sink=_QueueErrorSink(queue),
+            max_retained_errors=0,
+            **_worker_options,
+            **job_options
+        )
+        # 警告は検証結果の warnings にまとめる
+        with collect_warnings() as warnings:
+            is_valid, _ = checker.validate(_worker_tables[table_name])
+    except Exception as e:
+        return BatchResult(csv_file_path, table_name, STATUS_FAILED,
+                           seconds=time.perf_counter() - start, message=str(e))
+    finally:
+        queue.put(None)
+
+    if checker.stop_reason is not None:
+        warnings.append(f"{checker.stop_reason}。行{checker.stopped_row}で検証を中断しました")
+    return BatchResult(
+        csv_file_path, table_name,
+        STATUS_OK if is_valid else STATUS_INVALID,
+        record_count=checker.record_count,
+        error_count=checker.error_count,
+        seconds=time.perf_counter() - start,
+        warnings=warnings,
+    )
+
+
+class ValidationServer:
+    """
+    解析済みのテーブル定義を保持し、HTTPで受け付けた検証ジョブをプロセスプールで実行するサーバー
+
+    エンドポイント:
+        POST /validate?table=users&path=/data/users.csv  data_dir の中のファイルを検証
+        POST /validate?table=users&filename=users.csv     リクエストボディのCSVを検証
+        GET  /metrics                                     実行待ちのジョブ数・スループット等
+
+    /validate は検出したエラーを1行1件のJSON（{"type": "error", ...}）で逐次返し、
+    最後に検証結果（{"type": "summary", ...}）を返す。ステータス200のヘッダーは最初のエラーか検証結果を
+    返す時点で送るため、それより前にワーカープロセスが異常終了したジョブには500を返す。
+    異常終了で使えなくなったプロセスプールは作り直し、以降のジョブは新しいワーカーで実行する。
+    """
+
+    def __init__(self, ddl_file_path: str, tables: Dict[str, List[ColumnDefinition]],
+                 workers: int = 1, max_queue: int = DEFAULT_MAX_QUEUE,
+                 options: Optional[dict] = None, upload_dir: Optional[str] = None,
+                 max_upload_size: int = DEFAULT_MAX_UPLOAD_SIZE, data_dir: Optional[str] = None):
+        """
+        Args:
+            ddl_file_path: DDLファイルのパス
+            tables: DDLParser.parse_tables() の結果（ワーカーの起動時に一度だけ渡す）
+            workers: 同時に検証するジョブ数（ワーカープロセス数）
+            max_queue: 実行待ちのジョブの上限
+            options: 全てのジョブでCSVCheckerに渡す設定（engine, reader, cache_size等）
+            upload_dir: アップロードされたCSVを一時的に保存するディレクトリ（省略時はシステムの一時ディレクトリ）
+            max_upload_size: アップロードできるリクエストボディの上限（バイト）
+            data_dir: path= で検証できるファイルのディレクトリ（省略時は path= を受け付けず、アップロードのみ）
+        """
+        self.ddl_file_path = ddl_file_path
+        self.tables = tables
+        self.workers = workers
+        self.max_queue = max_queue
+        self.options = options or {}
+        self.upload_dir = upload_dir
+        self.max_upload_size = max_upload_size
+        self.data_dir = os.path.realpath(data_dir) if data_dir is not None else None
+        self.metrics = ServerMetrics(time.monotonic(), workers, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # ワーカーから届くエラーを待ち受けるスレッド（実行中のジョブごとに1つ）
+        self._receivers: Optional[ThreadPoolExecutor] = None
+        self._manager = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    socket_path: Optional[str] = None, on_ready=None):
+        """
+        サーバーを起動し、SIGINT/SIGTERMを受け取るまでリクエストを受け付ける
+
+        Args:
+            socket_path: 指定した場合はTCPの代わりにUnixドメインソケットで待ち受ける
+            on_ready: 待ち受けを開始した時点で呼び出す関数
+        """
+        self._slots = asyncio.Semaphore(self.workers)
+        self._manager = multiprocessing.Manager()
+        self._executor = self._create_executor()
+        self._receivers = ThreadPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopped.set)
+        try:
+            if socket_path is not None:
+                server = await asyncio.start_unix_server(self._handle, path=socket_path)
+            else:
+                server = await asyncio.start_server(self._handle, host, port)
+            async with server:
+                if on_ready is not None:
+                    on_ready()
+                await stopped.wait()
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._receivers.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(signum)
+            if socket_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(socket_path)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.ddl_file_path, self.tables, self.options),
+        )
+
+    def _replace_broken_executor(self, executor: ProcessPoolExecutor):
+        """ワーカーの異常終了で使えなくなったプロセスプールを作り直す（同時に失敗した他のジョブが作り直し済みなら何もしない）"""
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, target, headers = await _read_request_head(reader)
+            url = urlsplit(target)
+            if url.path == '/metrics':
+                if method != 'GET':
+                    raise HttpError(405, "GETで呼び出してください")
+                await _send_json(writer, 200, self.metrics.to_dict())
+            elif url.path == '/validate':
+                if method != 'POST':
+                    raise HttpError(405, "POSTで呼び出してください")
+                await self._validate(reader, writer, parse_qs(url.query), headers)
+            else:
+                raise HttpError(404, f"エンドポイントが見つかりません: {url.path}")
+        except HttpError as e:
+            with contextlib.suppress(ConnectionError):
+                await _send_json(writer, e.status, {'error': str(e)})
+                await _linger(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _validate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        query: Dict[str, List[str]], headers: Dict[str, str]):
+        params = {name: values[-1] for name, values in query.items()}
+        job_options = _job_options(params)
+        path = params.get('path')
+        if path is not None:
+            path = self._resolve_data_path(path)
+        table_name = self._resolve_table(params.get('table'), params.get('filename') or params.get('path'))
+        # 拒否するリクエストのボディは読み込まない
+        if self._slots.locked() and self.metrics.queued >= self.max_queue:
+            self.metrics.rejected += 1
+            raise HttpError(503, f"実行待ちのジョブが上限（{self.max_queue}件）に達しています")
+
+        upload_path = None
+        try:
+            if path is None:
+                # 受信中のジョブも実行待ちとして数え、上限を超えてアップロードを受け付けないようにする
+                self.metrics.queued += 1
+                try:
+                    upload_path = await self._receive_upload(reader, headers, params.get('filename', ''))
+                finally:
+                    self.metrics.queued -= 1
+                csv_file_path = upload_path
+            else:
+                csv_file_path = path
+
+            size = os.path.getsize(csv_file_path)
+            response = _NdjsonResponse(writer)
+            try:
+                result = await self._run(table_name, csv_file_path, job_options, response)
+            except ConnectionError:
+                raise
+            except Exception as e:
+                message = str(e) or type(e).__name__
+                if isinstance(e, BrokenProcessPool) and not response.started:
+                    # エラーを返し始める前にワーカーが異常終了した場合は、このジョブに500を返す
+                    self.metrics.failed += 1
+                    raise HttpError(500, f"ワーカープロセスが異常終了しました: {message}")
+                result = BatchResult(csv_file_path, table_name, STATUS_FAILED, message=message)
+            self.metrics.finish(result, size)
+            if upload_path is not None:
+                result.csv_file_path = params.get('filename', '')
+            await response.send(_json_line({'type': 'summary', **asdict(result)}))
+            await response.send(b'')
+        finally:
+            if upload_path is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(upload_path)
+
+    async def _run(self, table_name: str, csv_file_path: str, job_options: dict,
+                   response: '_NdjsonResponse') -> BatchResult:
+        """
+        空いたワーカーでジョブを実行し、ワーカーから届いたエラーを順にクライアントへ返す
+
+        ワーカーが異常終了した場合はプロセスプールを作り直してから BrokenProcessPool を送出する。
+        """
+        loop = asyncio.get_running_loop()
+        self.metrics.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.metrics.queued -= 1
+
+        self.metrics.running += 1
+        executor = self._executor
+        try:
+            # マネージャーへのプロセス間通信で待たないよう、キューはスレッドで作る
+            queue = await loop.run_in_executor(self._receivers, self._manager.Queue)
+            future = executor.submit(_run_job, table_name, csv_file_path, job_options, queue)
+            connected = True
+            while True:
+                batch = await loop.run_in_executor(self._receivers, _next_batch, queue, future)
+                if batch is None:
+                    break
+                if not connected:
+                    # クライアントが切断した場合も、ワーカーが検証を終えるまでエラーを受け取る
+                    continue
+                try:
+                    await response.send(b''.join(_json_line({'type': 'error', **error}) for error in batch))
+                except ConnectionError:
+                    connected = False
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._replace_broken_executor(executor)
+            raise
+        finally:
+            self.metrics.running -= 1
+            self._slots.release()
+
+    async def _receive_upload(self, reader: asyncio.StreamReader, headers: Dict[str, str], filename: str) -> str:
+        """
+        リクエストボディのCSVを一時ファイルに書き出す（圧縮ファイルは filename の拡張子で判定）
+
+        ボディが max_upload_size を超える場合は、Content-Length で分かれば読み込む前に、
+        chunked の場合は上限を超えた時点で 413 を返す。
+        """
+        content_length = headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) > self.max_upload_size:
+            raise HttpError(413, f"リクエストボディが上限（{self.max_upload_size}バイト）を超えています")
+        suffix = ''.join(_upload_suffixes(filename))
+        fd, upload_path = tempfile.mkstemp(suffix=suffix, prefix='prechecker-', dir=self.upload_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                size = 0
+                async for chunk in _iter_body(reader, headers):
+                    size += len(chunk)
+                    if size > self.max_upload_size:
+                        raise HttpError(413, f"リクエストボディが上限（{self.max_upload_size}バイト）を超えています")
+                    f.write(chunk)
+        except BaseException:
+            os.unlink(upload_path)
+            raise
+        return upload_path
+
+    def _resolve_data_path(self, path: str) -> str:
+        """
+        path= で指定されたファイルの実際のパスを返す
+
+        相対パスは data_dir を起点に解決する。シンボリックリンクや .. を解決した結果が
+        data_dir の外になるファイルは、サーバーから読めても検証しない。
+        """
+        if self.data_dir is None:
+            raise HttpError(403, "path= によるファイルの指定は許可されていません（ファイルの内容を送信してください）")
+        real_path = os.path.realpath(os.path.join(self.data_dir, path))
+        if os.path.commonpath([self.data_dir, real_path]) != self.data_dir:
+            raise HttpError(403, f"許可されたディレクトリの外のファイルは検証できません: {path}")
+        if not os.path.isfile(real_path):
+            raise HttpError(400, f"CSVファイルが見つかりません: {path}")
+        return real_path
+
+    def _resolve_table(self, table_name: Optional[str], csv_file_path: Optional[str]) -> str:
+        """ジョブのテーブルを決める（指定がなければファイル名から推定し、テーブルが1つならそのテーブル）"""
+        if table_name is not None:
+            if table_name not in self.tables:
+                raise HttpError(400, f"テーブル {table_name} がDDLに定義されていません")
+            return table_name
+        if csv_file_path:
+            table_name = table_for_file(csv_file_path, list(self.tables))
+            if table_name is not None:
+                return table_name
+        if len(self.tables) == 1:
+            return next(iter(self.tables))
+        raise HttpError(400, "テーブルを判定できません。table を指定してください")
+
+
+class _NdjsonResponse:
+    """/validate のレスポンス（最初に送信する時点で、ステータス200と chunked のヘッダーを送る）"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.started = False
+
+    async def send(self, data: bytes):
+        """chunked 形式で送信（空のデータは終端）"""
+        if not self.started:
+            self.started = True
+            await _send_head(self.writer, 200, 'application/x-ndjson', chunked=True)
+        await _send_chunk(self.writer, data)
+
+
+def _next_batch(queue, future: Future) -> Optional[list]:
+    """ワーカーから次のエラーを受け取る（全て受け取った場合、ワーカーが異常終了した場合はNone）"""
+    while True:
+        try:
+            return queue.get(timeout=QUEUE_POLL_INTERVAL)
+        except Empty:
+            if future.done():
+                return None
+
+
+def _job_options(params: Dict[str, str]) -> dict:
+    options = {}
+    for name, kind in JOB_OPTIONS.items():
+        if name not in params:
+            continue
+        value = params[name]
+        if kind is bool:
+            options[name] = value.lower() in ('1', 'true', 'yes')
+        elif kind is int:
+            try:
+                options[name] = int(value)
+            except ValueError:
+                raise HttpError(400, f"{name} は整数で指定してください: {value}")
+        else:
+            options[name] = value
+    return options
+
+
+def _upload_suffixes(filename: str) -> List[str]:
+    """アップロードされたファイル名の拡張子（users.csv.gz -> ['.csv', '.gz']）"""
+    name = os.path.basename(filename)
+    suffixes = []
+    for _ in range(2):
+        name, ext = os.path.splitext(name)
+        if not ext or not ext[1:].isalnum():
+            break
+        suffixes.insert(0, ext)
+    return suffixes
+
+
+async def _read_request_head(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+    """リクエスト行とヘッダーを読み込む"""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.LimitOverrunError:
+        raise HttpError(413, "リクエストヘッダーが大きすぎます")
+    if len(head) > MAX_HEADER_SIZE:
+        raise HttpError(413, "リクエストヘッダーが大きすぎます")
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, _ = lines[0].split(' ', 2)
+    except ValueError:
+        raise HttpError(400, "リクエスト行が正しくありません")
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+async def _iter_body(reader: asyncio.StreamReader, headers: Dict[str, str]):
+    """リクエストボディを読み込む（Content-Length と chunked に対応）"""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            try:
+                size = int(size_line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise HttpError(400, "チャンクのサイズが正しくありません")
+            if size == 0:
+                # トレーラーを読み飛ばす
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return
+            while size > 0:
+                chunk = await reader.readexactly(min(size, UPLOAD_CHUNK_SIZE))
+                size -= len(chunk)
+                yield chunk
+            await reader.readexactly(2)
+    else:
+        try:
+            remaining = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HttpError(400, "Content-Length が正しくありません")
+        while remaining > 0:
+            chunk = await reader.readexactly(min(remaining, UPLOAD_CHUNK_SIZE))
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _linger(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """
+    エラーを返した後、未読のボディを LINGER_SECONDS の間だけ読み捨ててから切断する
+
+    ボディを読まずにすぐ切断すると、送信中のクライアントには応答より先に接続のリセットが届くため。
+    読み捨てたボディは保存しない。
+    """
+    if writer.can_write_eof():
+        writer.write_eof()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LINGER_SECONDS
+    with contextlib.suppress(asyncio.TimeoutError):
+        while await asyncio.wait_for(reader.read(UPLOAD_CHUNK_SIZE), deadline - loop.time()):
+            pass
+
+
+def _json_line(data: dict) -> bytes:
+    return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+async def _send_head(writer: asyncio.StreamWriter, status: int, content_type: str,
+                     chunked: bool = False, content_length: int = 0):
+    lines = [
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}",
+        f"Content-Type: {content_type}",
+        "Connection: close",
+        "Transfer-Encoding: chunked" if chunked else f"Content-Length: {content_length}",
+    ]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+
+async def _send_chunk(writer: asyncio.StreamWriter, data: bytes):
+    """chunked 形式で送信（空のデータは終端）"""
+    writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n')
+    await writer.drain()
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, data: dict):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await _send_head(writer, status, 'application/json; charset=utf-8', content_length=len(body))
+    writer.write(body)
+    await writer.drain()
@@ -0,0 +1,110 @@
+import csv
+import io
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Union
+
+from .compression import open_text_stream
+from .csv_checker import CSVChecker
+from .ddl_parser import ColumnDefinition
+from .errors import ValidationError
+
+Row = Union[Sequence[Any], Mapping[str, Any]]
+
+
+def validate_rows(columns: List[ColumnDefinition], rows: Iterable[Row],
+                  headers: Optional[List[str]] = None, start_row: int = 2) -> Iterator[ValidationError]:
+    """
+    レコードを1件ずつ検証し、検出したエラーを順に返す（コンソールには何も表示しない）
+
+    使用例:
+        columns = DDLParser('users.sql').parse()
+        for error in validate_rows(columns, [{'id': 1, 'name': 'alice'}, ...]):
+            ...
+
+    Args:
+        columns: 解析済みのカラム定義（DDLParser.parse() や SchemaCache.parse() の結果）
+        rows: レコードのイテラブル。リストの場合は headers の順に値が並んだレコード（headers を省略した場合は
+              最初の要素をヘッダーとして扱う）、辞書の場合はカラム名 -> 値（headers を省略した場合は
+              最初のレコードのキーをヘッダーとして扱う）。値がNoneの場合はNULL（空文字）、
+              文字列以外の値は str() で文字列にしてから検証する
+        headers: ヘッダー（カラム名のリスト）
+        start_row: 最初のレコードの行番号（エラーの row_number。CSVファイルと同じくヘッダーの次を2とする）
+
+    Returns:
+        ValidationErrorのジェネレーター（レコードを読み進めながら検証するため、途中で止めると残りは読まない）
+    """
+    iterator = iter(rows)
+    if headers is None:
+        first = next(iterator, None)
+        if first is None:
+            return
+        if isinstance(first, Mapping):
+            headers = list(first)
+            iterator = _prepend(_as_values(first, headers), iterator)
+        else:
+            headers = [_as_text(value) for value in first]
+    records = (
+        _as_values(row, headers) if isinstance(row, Mapping) else _as_texts(row)
+        for row in iterator
+    )
+    yield from _validate_records(columns, headers, records, start_row)
+
+
+def validate_stream(columns: List[ColumnDefinition], stream: Union[TextIO, io.BufferedIOBase],
+                    encoding: str = 'utf-8') -> Iterator[ValidationError]:
+    """
+    CSVのストリーム（最初の行がヘッダー）を読み込みながら検証し、検出したエラーを順に返す
+
+    Args:
+        columns: 解析済みのカラム定義
+        stream: テキストストリーム、またはバイナリストリーム（sys.stdin.buffer、open(path, 'rb') 等）。
+                バイナリストリームが peek() に対応している場合、gzip/bzip2/xz の圧縮データは展開しながら読む
+        encoding: バイナリストリームのエンコーディング
+
+    Returns:
+        ValidationErrorのジェネレーター（ストリームは閉じない）
+    """
+    text = stream if isinstance(stream, io.TextIOBase) else open_text_stream(stream, encoding)
+    try:
+        reader = csv.reader(text)
+        headers = next(reader, None)
+        if headers is None:
+            raise ValueError("CSVにヘッダーが見つかりません")
+        yield from _validate_records(columns, headers, reader, start_row=2)
+    finally:
+        if text is not stream:
+            # 閉じると渡されたストリームも閉じるため、切り離すだけにする
+            text.detach()
+
+
+def _validate_records(columns: List[ColumnDefinition], headers: List[str],
+                      records: Iterable[List[str]], start_row: int) -> Iterator[ValidationError]:
+    # CSVCheckerのレコード単位の検証をそのまま使う（DDLの解析・ファイルの読み込みは行わない）
+    validate_row = CSVChecker.from_columns(columns, headers).validate_row
+    row_number = start_row
+    for row in records:
+        # 空行は読み飛ばし、行番号にも数えない（CSVCheckerと同じ）
+        if not row:
+            continue
+        yield from validate_row(row_number, row)
+        row_number += 1
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+def _as_texts(row: Sequence[Any]) -> List[str]:
+    if all(type(value) is str for value in row):
+        return row
+    return [_as_text(value) for value in row]
+
+
+def _as_values(row: Mapping[str, Any], headers: List[str]) -> List[str]:
+    return [_as_text(row.get(name)) for name in headers]
+
+
+def _prepend(first, iterator):
+    yield first
+    yield from iterator
@@ -1,7 +1,242 @@
 import re
+import sys
+import threading
 from datetime import datetime
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation
-from typing import Tuple
+from itertools import product
+from typing import Optional, Tuple
+
+
+# 整数型ごとの範囲 ((符号付きmin, max), (UNSIGNED min, max))
+INTEGER_RANGES = {
+    'TINYINT': ((-128, 127), (0, 255)),
+    'SMALLINT': ((-32768, 32767), (0, 65535)),
+    'MEDIUMINT': ((-8388608, 8388607), (0, 16777215)),
+    'INT': ((-2147483648, 2147483647), (0, 4294967295)),
+    'BIGINT': ((-9223372036854775808, 9223372036854775807), (0, 18446744073709551615)),
+}
+
+BOOLEAN_VALUES = frozenset(['true', 'false', '1', '0', 't', 'f', 'yes', 'no', 'y', 'n'])
+
+# NULLとして扱う値（空文字と、大文字・小文字を問わない "NULL"）。検証・統計・キーの検査で共通に使う
+NULL_VALUES = frozenset([''] + [''.join(letters) for letters in product(*zip('null', 'NULL'))])
+
+# 対応している日付・日時・時刻のフォーマット（strptime形式）
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%Y%m%d']
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y%m%d%H%M%S',
+]
+TIME_FORMATS = ['%H:%M:%S', '%H:%M']
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# 整数型の範囲の境界値（絶対値）-> 桁数。これより桁数の少ない値は int() で変換しなくても範囲内と分かる
+_BOUND_DIGITS = {
+    abs(bound): len(str(abs(bound)))
+    for ranges in INTEGER_RANGES.values() for bounds in ranges for bound in bounds
+}
+# INTEGER_RANGES の境界値の最大の桁数（先頭の0を除いてこれより桁数の多い値はどの整数型でも範囲外）
+_MAX_BOUND_DIGITS = max(_BOUND_DIGITS.values())
+# int() が値の前後から取り除く空白（str.strip() と異なり \x1c〜\x1f は含まない）
+_INT_WHITESPACE = ' \t\n\r\x0b\x0c'
+# Decimal() が受け付ける可能性のあるASCII文字（指数表記、Infinity、NaN、桁区切りの _ 等）
+_DECIMAL_CHARS = '0123456789.+-_eEiInNfFtTyYaAsS'
+
+# 検証処理の内部で捕捉した例外の累計（--profile で検証コストの内訳として表示）。
+# パイプライン検証では複数のスレッドが同時に検証するため、スレッドごとに数える
+_caught_exceptions = threading.local()
+
+
+def _count_exception():
+    _caught_exceptions.count = getattr(_caught_exceptions, 'count', 0) + 1
+
+
+def caught_exception_count() -> int:
+    """int()/Decimal()/strptime() 等が送出し、このスレッドの検証処理の内部で捕捉した例外の累計"""
+    return getattr(_caught_exceptions, 'count', 0)
+
+
+def _strptime_any(value: str, formats) -> bool:
+    """いずれかのフォーマットでstrptimeできればTrue"""
+    for fmt in formats:
+        try:
+            datetime.strptime(value, fmt)
+            return True
+        except ValueError:
+            _count_exception()
+            continue
+    return False
+
+
+def _is_valid_ymd(ymd: int) -> bool:
+    """8桁のASCII数字 YYYYMMDD を整数にした値が存在する日付か（うるう年を考慮）"""
+    year, month_day = divmod(ymd, 10000)
+    month, day = divmod(month_day, 100)
+    if year < 1 or not 1 <= month <= 12 or day < 1:
+        return False
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return day <= 29
+    return day <= _DAYS_IN_MONTH[month]
+
+
+def _is_valid_hms(hms: int) -> bool:
+    """6桁のASCII数字 HHMMSS を整数にした値が有効な時刻か"""
+    hour, minute_second = divmod(hms, 10000)
+    return hour <= 23 and minute_second // 100 <= 59 and minute_second % 100 <= 59
+
+
+def _match_date(value: str) -> Optional[bool]:
+    """
+    定型の日付（YYYY-MM-DD, YYYY/MM/DD, YYYYMMDD）を例外なしで判定
+
+    各要素が固定桁のASCII数字である値は strptime と同じ結果を返す。
+    それ以外の形（1桁の月日や全角数字等）はNoneを返し、strptimeでの判定に委ねる。
+    """
+    if not value.isascii():
+        return None
+
+    length = len(value)
+    if length == 10 and value[4] == value[7] and value[4] in '-/':
+        digits = value[0:4] + value[5:7] + value[8:10]
+    elif length == 8:
+        digits = value
+    else:
+        return None
+
+    if not digits.isdigit():
+        return None
+    return _is_valid_ymd(int(digits))
+
+
+def _match_datetime(value: str) -> Optional[bool]:
+    """
+    定型の日時（YYYY-MM-DD HH:MM:SS[.ffffff], YYYY/MM/DD HH:MM:SS, YYYYMMDDHHMMSS）を例外なしで判定
+
+    定型外の値はNoneを返し、strptimeでの判定に委ねる。
+    """
+    if not value.isascii():
+        return None
+
+    length = len(value)
+    if length == 14:
+        digits = value
+    elif length >= 19 and value[10] == ' ' and value[13] == ':' and value[16] == ':' \
+            and value[4] == value[7] and value[4] in '-/':
+        if length > 19:
+            # 小数秒は YYYY-MM-DD 形式のみ、1〜6桁
+            if length > 26 or value[4] != '-' or value[19] != '.' or not value[20:].isdigit():
+                return None
+        digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]
+    else:
+        return None
+
+    if not digits.isdigit():
+        return None
+    ymd, hms = divmod(int(digits), 1000000)
+    return _is_valid_ymd(ymd) and _is_valid_hms(hms)
+
+
+def _match_time(value: str) -> Optional[bool]:
+    """定型の時刻（HH:MM:SS, HH:MM）を例外なしで判定（定型外はNone）"""
+    if not value.isascii():
+        return None
+
+    length = len(value)
+    if length == 8 and value[2] == ':' and value[5] == ':':
+        digits = value[0:2] + value[3:5] + value[6:8]
+    elif length == 5 and value[2] == ':':
+        digits = value[0:2] + value[3:5] + '00'
+    else:
+        return None
+
+    if not digits.isdigit():
+        return None
+    return _is_valid_hms(int(digits))
+
+
+def _int_max_str_digits() -> int:
+    """int() が変換できる文字列の最大の桁数（0は無制限。Python 3.11未満は制限なし）"""
+    get_int_max_str_digits = getattr(sys, 'get_int_max_str_digits', None)
+    return get_int_max_str_digits() if get_int_max_str_digits is not None else 0
+
+
+def _match_integer(value: str, unsigned: bool, min_val: int, max_val: int) -> Optional[Tuple[bool, str]]:
+    """
+    ASCIIの整数（前後の空白・先頭の符号を含む）を例外なしで判定
+
+    境界値より桁数の少ない値は int() で変換せずに範囲内、どの境界値よりも桁数の多い値は
+    範囲外（int() の桁数の上限を超える場合は整数ではない）と判定する。境界値と同じ桁数の値や、
+    ASCII以外の文字（全角数字等）・桁区切りの _ を含む値はNoneを返し、int()での判定に委ねる。
+    """
+    if not value.isascii():
+        return None
+
+    text = value.strip(_INT_WHITESPACE)
+    digits = text[1:] if text[:1] in ('+', '-') else text
+    if not digits.isdigit():
+        if '_' in digits:
+            return None
+        return False, "整数ではありません"
+
+    # int() での判定と同じ順（変換できない値、UNSIGNED型の負の値、範囲外の値）に判定する
+    if len(digits) > _MAX_BOUND_DIGITS:
+        max_str_digits = _int_max_str_digits()
+        if max_str_digits and len(digits) > max_str_digits:
+            # int() は桁数の上限を超える文字列を変換できない
+            return False, "整数ではありません"
+
+    negative = text[0] == '-'
+    if negative and unsigned and digits.strip('0'):
+        return False, "UNSIGNED型に負の値は許可されません"
+    # INTEGER_RANGES の範囲は全て0を含むため、符号の側の境界値より桁数が少なければ範囲内
+    bound = -min_val if negative else max_val
+    if len(digits) < (_BOUND_DIGITS.get(bound) or len(str(bound))):
+        return True, ""
+    if len(digits.lstrip('0')) > _MAX_BOUND_DIGITS:
+        # どの整数型の境界値よりも桁数が多い
+        return False, f"値が範囲外です（{min_val}〜{max_val}）"
+    return None
+
+
+def _decimal_digits_result(int_digits: int, dec_digits: int, precision: int, scale: int) -> Tuple[bool, str]:
+    """整数部・小数部の桁数の精度チェック（例: DECIMAL(10,2)）"""
+    if int_digits + dec_digits > precision:
+        return False, f"全体桁数が{precision}を超えています"
+    if dec_digits > scale:
+        return False, f"小数部が{scale}桁を超えています"
+    return True, ""
+
+
+def _match_decimal(value: str, precision: Optional[int], scale: Optional[int]) -> Optional[Tuple[bool, str]]:
+    """
+    ASCIIの固定小数点数（前後の空白・先頭の符号を含む 123, 1.5, .5, 5. 等）を例外なしで判定
+
+    桁数は str(Decimal(value)) と同じく、整数部の先頭の0を除き（整数部が0のみなら1桁）、
+    小数部は末尾の0も含めて数える。指数表記・Infinity・NaN・桁区切りの _ を含む値や、
+    str(Decimal(value)) が指数表記になる 0.0000001 等はNoneを返し、Decimal()での判定に委ねる。
+    """
+    if not value.isascii():
+        return None
+
+    text = value.strip()
+    body = text[1:] if text[:1] in ('+', '-') else text
+    int_part, _, dec_part = body.partition('.')
+    if not ((int_part.isdigit() or not int_part) and (dec_part.isdigit() or not dec_part)
+            and (int_part or dec_part)):
+        if not body.strip('0123456789.') or body.strip(_DECIMAL_CHARS):
+            return False, "数値ではありません"
+        return None
+
+    if precision is None:
+        return True, ""
+    int_part = int_part.lstrip('0')
+    if not int_part and len(dec_part) - len(dec_part.lstrip('0')) >= 6:
+        return None
+    return _decimal_digits_result(len(int_part) or 1, len(dec_part), precision, scale)
 
 
 class DataTypeValidator:
@@ -20,7 +255,7 @@ class DataTypeValidator:
             (is_valid, error_message) のタプル
         """
         # NULL値の判定（空文字列、None、または"NULL"/"null"文字列）
-        if value == '' or value is None or value.upper() == 'NULL':
+        if value is None or value in NULL_VALUES:
             if nullable:
                 return True, ""
             else:
@@ -31,7 +266,8 @@ class DataTypeValidator:
 
         # 整数型
         if data_type_upper.startswith('INT') or data_type_upper.startswith('BIGINT') or \
-           data_type_upper.startswith('SMALLINT') or data_type_upper.startswith('TINYINT'):
+           data_type_upper.startswith('SMALLINT') or data_type_upper.startswith('TINYINT') or \
+           data_type_upper.startswith('MEDIUMINT'):
             return DataTypeValidator._validate_integer(value, data_type_upper)
 
         # 小数型
@@ -71,132 +307,156 @@ class DataTypeValidator:
 
     @staticmethod
     def _validate_integer(value: str, data_type: str) -> Tuple[bool, str]:
-        try:
-            num = int(value)
-
-            # UNSIGNED チェック
-            if 'UNSIGNED' in data_type and num < 0:
-                return False, "UNSIGNED型に負の値は許可されません"
-
-            # 範囲チェック
-            if data_type.startswith('TINYINT'):
-                min_val, max_val = (-128, 127) if 'UNSIGNED' not in data_type else (0, 255)
-            elif data_type.startswith('SMALLINT'):
-                min_val, max_val = (-32768, 32767) if 'UNSIGNED' not in data_type else (0, 65535)
-            elif data_type.startswith('INT'):
-                min_val, max_val = (-2147483648, 2147483647) if 'UNSIGNED' not in data_type else (0, 4294967295)
-            elif data_type.startswith('BIGINT'):
-                min_val, max_val = (-9223372036854775808, 9223372036854775807) if 'UNSIGNED' not in data_type else (0, 18446744073709551615)
-            else:
+        bounds = DataTypeValidator._integer_bounds(data_type)
+        if bounds is None:
+            try:
+                int(value)
                 return True, ""
+            except ValueError:
+                _count_exception()
+                return False, "整数ではありません"
 
-            if not (min_val <= num <= max_val):
-                return False, f"値が範囲外です（{min_val}〜{max_val}）"
+        return DataTypeValidator._check_integer(value, 'UNSIGNED' in data_type, *bounds)
 
-            return True, ""
-        except ValueError:
-            return False, "整数ではありません"
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _integer_bounds(data_type: str) -> Optional[Tuple[int, int]]:
+        """整数型の範囲 (min_val, max_val) を返す（範囲が定まらない型はNone。データ型ごとにキャッシュする）"""
+        unsigned = 'UNSIGNED' in data_type
+        for prefix in ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'INT', 'BIGINT'):
+            if data_type.startswith(prefix):
+                return INTEGER_RANGES[prefix][1 if unsigned else 0]
+        return None
 
     @staticmethod
-    def _validate_decimal(value: str, data_type: str) -> Tuple[bool, str]:
+    def _check_integer(value: str, unsigned: bool, min_val: int, max_val: int) -> Tuple[bool, str]:
+        # 境界値の桁数以下の数字だけ（負の値は先頭の - のみ）の値（大半の値）はそのまま int() で変換する
+        # 桁数の多い値は数字だけでも _match_integer() で桁数から判定し、多倍長の変換を避ける
+        if len(value) > _MAX_BOUND_DIGITS or not (value.isdecimal() or value[1:].isdecimal() and value[0] == '-'):
+            result = _match_integer(value, unsigned, min_val, max_val)
+            if result is not None:
+                return result
+
         try:
-            dec_value = Decimal(value)
+            num = int(value)
+        except ValueError:
+            _count_exception()
+            return False, "整数ではありません"
 
-            # 精度チェック（例: DECIMAL(10,2)）
-            precision_match = re.search(r'\((\d+),\s*(\d+)\)', data_type)
-            if precision_match:
-                precision = int(precision_match.group(1))
-                scale = int(precision_match.group(2))
+        # UNSIGNED チェック
+        if unsigned and num < 0:
+            return False, "UNSIGNED型に負の値は許可されません"
 
-                # 文字列から整数部と小数部を取得
-                value_str = str(dec_value)
-                if '.' in value_str:
-                    int_part, dec_part = value_str.lstrip('-').split('.')
-                else:
-                    int_part = value_str.lstrip('-')
-                    dec_part = ''
+        # 範囲チェック
+        if not (min_val <= num <= max_val):
+            return False, f"値が範囲外です（{min_val}〜{max_val}）"
 
-                int_digits = len(int_part)
-                dec_digits = len(dec_part)
+        return True, ""
 
-                if int_digits + dec_digits > precision:
-                    return False, f"全体桁数が{precision}を超えています"
-                if dec_digits > scale:
-                    return False, f"小数部が{scale}桁を超えています"
+    @staticmethod
+    def _validate_decimal(value: str, data_type: str) -> Tuple[bool, str]:
+        precision_scale = DataTypeValidator._decimal_precision(data_type)
+        if precision_scale is None:
+            return DataTypeValidator._check_decimal(value, None, None)
+        return DataTypeValidator._check_decimal(value, *precision_scale)
 
-            return True, ""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _decimal_precision(data_type: str) -> Optional[Tuple[int, int]]:
+        """DECIMAL(10,2) 形式から (precision, scale) を返す（指定なしはNone。データ型ごとにキャッシュする）"""
+        precision_match = re.search(r'\((\d+),\s*(\d+)\)', data_type)
+        if not precision_match:
+            return None
+        return int(precision_match.group(1)), int(precision_match.group(2))
+
+    @staticmethod
+    def _check_decimal(value: str, precision: Optional[int], scale: Optional[int]) -> Tuple[bool, str]:
+        result = _match_decimal(value, precision, scale)
+        if result is not None:
+            return result
+
+        try:
+            dec_value = Decimal(value)
         except InvalidOperation:
+            _count_exception()
             return False, "数値ではありません"
 
+        # 精度チェック（例: DECIMAL(10,2)）
+        if precision is not None:
+            # 文字列から整数部と小数部を取得
+            value_str = str(dec_value)
+            if '.' in value_str:
+                int_part, dec_part = value_str.lstrip('-').split('.')
+            else:
+                int_part = value_str.lstrip('-')
+                dec_part = ''
+
+            return _decimal_digits_result(len(int_part), len(dec_part), precision, scale)
+
+        return True, ""
+
     @staticmethod
     def _validate_float(value: str) -> Tuple[bool, str]:
         try:
             float(value)
             return True, ""
         except ValueError:
+            _count_exception()
             return False, "浮動小数点数ではありません"
 
     @staticmethod
     def _validate_string(value: str, data_type: str) -> Tuple[bool, str]:
-        # 長さチェック（例: VARCHAR(50)）
+        return DataTypeValidator._check_string(value, DataTypeValidator._string_length(data_type))
+
+    @staticmethod
+    def _string_length(data_type: str) -> Optional[int]:
+        """VARCHAR(50) 形式から最大長を返す（指定なしはNone）"""
         length_match = re.search(r'\((\d+)\)', data_type)
-        if length_match:
-            max_length = int(length_match.group(1))
-            if len(value) > max_length:
-                return False, f"文字列長が{max_length}を超えています（実際: {len(value)}）"
+        if not length_match:
+            return None
+        return int(length_match.group(1))
+
+    @staticmethod
+    def _check_string(value: str, max_length: Optional[int]) -> Tuple[bool, str]:
+        # 長さチェック（例: VARCHAR(50)）
+        if max_length is not None and len(value) > max_length:
+            return False, f"文字列長が{max_length}を超えています（実際: {len(value)}）"
 
         return True, ""
 
     @staticmethod
     def _validate_date(value: str) -> Tuple[bool, str]:
-        date_formats = ['%Y-%m-%d', '%Y/%m/%d', '%Y%m%d']
-
-        for fmt in date_formats:
-            try:
-                datetime.strptime(value, fmt)
-                return True, ""
-            except ValueError:
-                continue
+        is_valid = _match_date(value)
+        if is_valid is None:
+            is_valid = _strptime_any(value, DATE_FORMATS)
 
+        if is_valid:
+            return True, ""
         return False, "日付形式が正しくありません（YYYY-MM-DD等）"
 
     @staticmethod
     def _validate_datetime(value: str) -> Tuple[bool, str]:
-        datetime_formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d %H:%M:%S.%f',
-            '%Y/%m/%d %H:%M:%S',
-            '%Y%m%d%H%M%S',
-        ]
-
-        for fmt in datetime_formats:
-            try:
-                datetime.strptime(value, fmt)
-                return True, ""
-            except ValueError:
-                continue
+        is_valid = _match_datetime(value)
+        if is_valid is None:
+            is_valid = _strptime_any(value, DATETIME_FORMATS)
 
+        if is_valid:
+            return True, ""
         return False, "日時形式が正しくありません（YYYY-MM-DD HH:MM:SS等）"
 
     @staticmethod
     def _validate_time(value: str) -> Tuple[bool, str]:
-        time_formats = ['%H:%M:%S', '%H:%M']
-
-        for fmt in time_formats:
-            try:
-                datetime.strptime(value, fmt)
-                return True, ""
-            except ValueError:
-                continue
+        is_valid = _match_time(value)
+        if is_valid is None:
+            is_valid = _strptime_any(value, TIME_FORMATS)
 
+        if is_valid:
+            return True, ""
         return False, "時刻形式が正しくありません（HH:MM:SS等）"
 
     @staticmethod
     def _validate_boolean(value: str) -> Tuple[bool, str]:
-        value_lower = value.lower()
-        valid_values = ['true', 'false', '1', '0', 't', 'f', 'yes', 'no', 'y', 'n']
-
-        if value_lower in valid_values:
+        if value.lower() in BOOLEAN_VALUES:
             return True, ""
 
         return False, "ブール値ではありません（true/false, 1/0等）"
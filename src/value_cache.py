@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from .column_validator import (
+    ColumnValidator,
+    DateColumnValidator,
+    DateTimeColumnValidator,
+    DecimalColumnValidator,
+    FloatColumnValidator,
+    IntegerColumnValidator,
+    TimeColumnValidator,
+)
+
+# キャッシュの最大エントリ数（カラムごと）のデフォルト
+DEFAULT_CACHE_SIZE = 4096
+# この割合を下回るヒット率のカラムはキャッシュを無効化する
+DEFAULT_MIN_HIT_RATE = 0.5
+# ヒット率を評価する間隔（参照回数）
+HIT_RATE_WINDOW = 2000
+
+
+@dataclass
+class ColumnCacheStats:
+    column_name: str
+    hits: int = 0
+    misses: int = 0
+    disabled: bool = False
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def merge(self, other: 'ColumnCacheStats'):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.disabled = self.disabled or other.disabled
+
+    def __str__(self):
+        state = "無効化" if self.disabled else "有効"
+        return (f"{self.column_name}: ヒット率 {self.hit_rate:.1%}"
+                f"（ヒット {self.hits}件 / ミス {self.misses}件, {state}）")
+
+
+class CachedColumnValidator:
+    """
+    ColumnValidatorの前段に置く、生の値をキーにした検証結果のLRUキャッシュ
+
+    ステータスコードや日付など同じ値が繰り返し現れるカラムでは検証を省略できる。
+    HIT_RATE_WINDOW 回ごとに直近のヒット率を評価し、min_hit_rate を下回った
+    カラム（IDや自由記述など値の種類が多いもの）ではキャッシュを無効化する。
+    """
+
+    def __init__(self, validator: ColumnValidator, max_size: int = DEFAULT_CACHE_SIZE,
+                 min_hit_rate: float = DEFAULT_MIN_HIT_RATE):
+        self.validator = validator
+        self.name = validator.name
+        self.data_type = validator.data_type
+        self.nullable = validator.nullable
+        self.auto_increment = validator.auto_increment
+        self.max_size = max_size
+        self.min_hit_rate = min_hit_rate
+        self.enabled = True
+
+        self._cache: 'OrderedDict[str, Tuple[bool, str]]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._window_hits = 0
+        self._window_lookups = 0
+
+    def validate(self, value: str) -> Tuple[bool, str]:
+        cache = self._cache
+        result = cache.get(value)
+        if result is not None:
+            cache.move_to_end(value)
+            self._hits += 1
+            self._window_hits += 1
+        else:
+            result = self.validator.validate(value)
+            cache[value] = result
+            if len(cache) > self.max_size:
+                cache.popitem(last=False)
+            self._misses += 1
+
+        self._window_lookups += 1
+        if self._window_lookups >= HIT_RATE_WINDOW:
+            self._evaluate_window()
+        return result
+
+    def _evaluate_window(self):
+        if self._window_hits < self._window_lookups * self.min_hit_rate:
+            # 値の種類が多くキャッシュが効かないカラムは以降キャッシュしない
+            self.enabled = False
+            self._cache.clear()
+            # 以降はラップのオーバーヘッドなしで元のバリデータを直接呼び出す
+            self.validate = self.validator.validate
+        self._window_hits = 0
+        self._window_lookups = 0
+
+    def take_stats(self) -> ColumnCacheStats:
+        """前回の呼び出し以降のヒット・ミス件数を返し、カウンタをリセット"""
+        stats = ColumnCacheStats(self.name, self._hits, self._misses, not self.enabled)
+        self._hits = 0
+        self._misses = 0
+        return stats
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.validator!r})"
+
+
+def unwrap_validator(validator) -> ColumnValidator:
+    """キャッシュやプロファイラでラップされている場合は元のColumnValidatorを返す"""
+    while hasattr(validator, 'validator'):
+        validator = validator.validator
+    return validator
+
+
+# キャッシュの対象とするバリデータ
+# 文字列長やブール値の判定は辞書の参照より軽いため、キャッシュしても速くならない
+_CACHEABLE_VALIDATORS = (
+    IntegerColumnValidator,
+    DecimalColumnValidator,
+    FloatColumnValidator,
+    DateColumnValidator,
+    DateTimeColumnValidator,
+    TimeColumnValidator,
+)
+
+
+def wrap_with_cache(validators: Dict[str, ColumnValidator], max_size: int = DEFAULT_CACHE_SIZE,
+                    min_hit_rate: float = DEFAULT_MIN_HIT_RATE) -> Dict[str, ColumnValidator]:
+    """数値・日付系カラムのバリデータをキャッシュ付きにする"""
+    return {
+        name: CachedColumnValidator(validator, max_size, min_hit_rate)
+        if isinstance(validator, _CACHEABLE_VALIDATORS) else validator
+        for name, validator in validators.items()
+    }
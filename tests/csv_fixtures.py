@@ -0,0 +1,93 @@
+"""読み込み方式・検証方式の違うパスの結果を比較するテストで共通に使うDDLとCSV"""
+import contextlib
+import io
+import os
+
+from src.csv_checker import CSVChecker
+
+DDL = """
+CREATE TABLE items (
+  id INT NOT NULL PRIMARY KEY,
+  name VARCHAR(10) NOT NULL,
+  note VARCHAR(40),
+  amount DECIMAL(6,2),
+  created DATE,
+  flag TINYINT UNSIGNED
+);
+"""
+
+HEADER = 'id,name,note,amount,created,flag'
+
+# 比較の基準にする従来の検証（テキストストリームをcsv.readerで読み込み、1セルずつ検証）
+BASELINE_OPTIONS = {'reader': 'stream', 'engine': 'python'}
+
+# (BOM付きか, エンコーディング) の組み合わせ（BOM付きでutf-8を指定すると先頭のカラム名にBOMが残る。
+# utf-8-sig はバイト単位の読み込みに対応しないため、mmap・並列・パイプライン等はストリームで検証する）
+BOM_CASES = ((False, 'utf-8'), (True, 'utf-8-sig'), (True, 'utf-8'))
+
+
+def fixture_rows(count: int = 400) -> str:
+    """
+    エラーを含むCSVの内容（ヘッダーを含む。改行はCRLF）
+
+    引用符の中の改行・カンマ・二重引用符（改行を含む値のエラーを含む）、フィールド数の足りない行と多い行、
+    型・桁数・日付・範囲・NOT NULLの違反、ASCII以外の文字を一定の間隔で含む。
+    """
+    lines = [HEADER]
+    for i in range(1, count + 1):
+        name = f'n{i}'
+        note = f'note {i}'
+        amount = f'{i % 1000}.{i % 100:02d}'
+        created = f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}'
+        flag = str(i % 2)
+        if i % 7 == 0:
+            note = f'"line1\r\nline2, ""quoted"" {i}"'
+        if i % 9 == 0:
+            note = f'"改行\n{i}"'
+        if i % 43 == 0:
+            # 引用符の中の改行を含む値のエラー
+            note = f'"{"長い備考" * 4}\r\n{"x" * 30} {i}"'
+        if i % 11 == 0:
+            amount = '12345.678'
+        if i % 13 == 0:
+            created = '2023-02-29'
+        if i % 17 == 0:
+            name = 'あいうえおかきくけこさ'
+        if i % 19 == 0:
+            flag = '-1'
+        if i % 23 == 0:
+            name = ''
+        row = [str(i) if i % 29 else f'x{i}', name, note, amount, created, flag]
+        if i % 31 == 0:
+            row = row[:3]
+        if i % 37 == 0:
+            row.append('extra')
+        lines.append(','.join(row))
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def write_files(directory: str, csv_content: str, bom: bool = False, file_name: str = 'items.csv',
+                encoding: str = 'utf-8'):
+    """DDLとCSVを directory に書き込み、(ddl_path, csv_path) を返す"""
+    ddl_path = os.path.join(directory, 'items.sql')
+    csv_path = os.path.join(directory, file_name)
+    with open(ddl_path, 'w', encoding='utf-8') as f:
+        f.write(DDL)
+    data = csv_content.encode(encoding)
+    with open(csv_path, 'wb') as f:
+        f.write((b'\xef\xbb\xbf' if bom else b'') + data)
+    return ddl_path, csv_path
+
+
+def run_checker(ddl_path: str, csv_path: str, **options):
+    """
+    CSVCheckerで検証し、(is_valid, record_count, errors) を返す
+
+    errors は (行番号, カラム名, 値, メッセージ) のタプルのリスト。標準出力への表示は捨てる。
+    """
+    checker = CSVChecker(ddl_path, csv_path, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        is_valid, errors = checker.validate()
+    return is_valid, checker.record_count, [
+        (error.row_number, error.column_name, error.value, error.error_message) for error in errors
+    ]
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.batch_runner import run_batch  # noqa: E402
+from src.ddl_parser import DDLParser  # noqa: E402
+from tests.csv_fixtures import fixture_rows, write_files  # noqa: E402
+
+
+class RunBatchTest(unittest.TestCase):
+    """一括検証の結果を、検証が終わった順に on_result へ渡し、戻り値はファイルの順に並べるか"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_results_in_completion_order(self):
+        # サイズの大きいファイルから順にワーカーに割り当てるため、大きなファイルが最初に投入される
+        csv_files = []
+        for name, count in (('a_items.csv', 20), ('b_items.csv', 20000), ('c_items.csv', 20), ('d_items.csv', 20)):
+            ddl_path, csv_path = write_files(self.directory, fixture_rows(count), file_name=name)
+            csv_files.append(csv_path)
+        # 対応するテーブルがないファイルは検証せずに結果を返す
+        csv_files.append(os.path.join(self.directory, 'unknown.csv'))
+        with open(csv_files[-1], 'w', encoding='utf-8') as f:
+            f.write("id\n1\n")
+        tables = DDLParser(ddl_path).parse_tables()
+        manifest = {csv_path: 'items' for csv_path in csv_files[:-1]}
+
+        for workers in (1, 2):
+            received = []
+            results = run_batch(ddl_path, tables, csv_files, os.path.join(self.directory, f'reports{workers}'),
+                                workers=workers, manifest=manifest, on_result=received.append)
+            with self.subTest(workers=workers):
+                self.assertEqual([result.csv_file_path for result in results], csv_files)
+                self.assertEqual(sorted(id(result) for result in received), sorted(id(result) for result in results))
+                self.assertTrue(all(result.error_count for result in results[:-1]))
+                if workers > 1:
+                    # 後から投入した小さなファイルの結果を、大きなファイルの検証を待たずに受け取る
+                    self.assertEqual(received[-1].csv_file_path, csv_files[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.byte_reader import ByteCsvReader  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでもASCIIだけのチャンクとASCII以外を含むチャンクが混在するようにする
+SMALL_CHUNK_SIZE = 128
+
+# デコードできないバイトを入れるフィールド（14件目のレコードの note。引用符の中の改行と "" の後ろに入れる）
+VALID_FIELD = b'"line1\r\nline2, ""quoted"" 14"'
+INVALID_FIELD = b'"line1\r\nline2, ""quoted""\xff 14"'
+
+
+class ByteReaderTest(unittest.TestCase):
+    """バイト列リーダーがストリームで読み込んだ場合と同じエラーを返し、デコードできないバイトをセル単位で報告するか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch('src.csv_checker.ByteCsvReader', partial(ByteCsvReader, chunk_size=SMALL_CHUNK_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_errors_as_stream(self):
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            for engine in ('python', 'auto'):
+                with self.subTest(bom=bom, encoding=encoding, engine=engine):
+                    self.assertEqual(run_checker(ddl_path, csv_path, encoding=encoding, reader='bytes', engine=engine),
+                                     expected)
+
+    def test_error_limits(self):
+        ddl_path, csv_path = write_files(self.directory.name, fixture_rows())
+        for options in ({'max_errors': 7}, {'fail_fast': True}, {'max_errors_per_column': 3}):
+            with self.subTest(**options):
+                self.assertEqual(run_checker(ddl_path, csv_path, reader='bytes', engine='python', **options),
+                                 run_checker(ddl_path, csv_path, **BASELINE_OPTIONS, **options))
+
+    def test_invalid_bytes(self):
+        for bom in (False, True):
+            # 不正なバイトを置換文字にしたファイルの結果に、そのセルのデコードエラーを加えたものになる
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            with open(csv_path, 'rb') as f:
+                data = f.read()
+            self.assertEqual(data.count(VALID_FIELD), 1)
+            with open(csv_path, 'wb') as f:
+                f.write(data.replace(VALID_FIELD, INVALID_FIELD.replace(b'\xff', '\ufffd'.encode('utf-8'))))
+            _, record_count, errors = run_checker(ddl_path, csv_path, **BASELINE_OPTIONS)
+
+            with open(csv_path, 'wb') as f:
+                f.write(data.replace(VALID_FIELD, INVALID_FIELD))
+            offset = data.index(VALID_FIELD) + INVALID_FIELD.index(b'\xff')
+            decode_error = (15, 'note', INVALID_FIELD[1:-1].decode('utf-8', 'backslashreplace').replace('""', '"'),
+                            f"utf-8としてデコードできないバイト列が含まれています（{offset}バイト目）")
+            # デコードエラーは読み込み時に報告するため、そのレコードの検証のエラーより前になる
+            position = next(i for i, error in enumerate(errors) if error[0] >= decode_error[0])
+            expected = (False, record_count, errors[:position] + [decode_error] + errors[position:])
+            with self.subTest(bom=bom):
+                self.assertEqual(run_checker(ddl_path, csv_path, reader='bytes', engine='python'), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.checkpoint import CheckpointStore  # noqa: E402
+from src.csv_checker import CSVChecker  # noqa: E402
+from src.error_sink import create_error_sink  # noqa: E402
+from src.mmap_reader import MmapCsvReader  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでもチャンクの境界ごとにチェックポイントが保存されるようにする
+SMALL_CHUNK_SIZE = 512
+# 中断するまでに検証するチャンクの数
+CHUNKS_BEFORE_INTERRUPT = 5
+
+
+class CheckpointTest(unittest.TestCase):
+    """中断した検証をチェックポイントから再開した結果が、中断せずに検証した結果と同じか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch('src.csv_checker.MmapCsvReader', partial(MmapCsvReader, chunk_size=SMALL_CHUNK_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def validate(self, ddl_path: str, csv_path: str, report_path: str, **options):
+        """エラーレポートを書き出しながら検証し、(is_valid, record_count, error_count, レポートの内容) を返す"""
+        checker = CSVChecker(ddl_path, csv_path, error_sink=create_error_sink(report_path), **options)
+        is_valid, _ = checker.validate()
+        with open(report_path, 'r', encoding='utf-8') as f:
+            return is_valid, checker.record_count, checker.error_count, f.read()
+
+    def interrupt(self, ddl_path: str, csv_path: str, report_path: str, **options):
+        """CHUNKS_BEFORE_INTERRUPT 個のチャンクを検証したところで KeyboardInterrupt により中断する"""
+        validate_records = CSVChecker._validate_records
+        calls = []
+
+        def interrupted(checker, *args, **kwargs):
+            calls.append(None)
+            if len(calls) > CHUNKS_BEFORE_INTERRUPT:
+                raise KeyboardInterrupt
+            return validate_records(checker, *args, **kwargs)
+
+        with mock.patch.object(CSVChecker, '_validate_records', interrupted), self.assertRaises(KeyboardInterrupt):
+            CSVChecker(ddl_path, csv_path, error_sink=create_error_sink(report_path), **options).validate()
+
+    def test_resume_after_interrupt(self):
+        # utf-8-sig はチェックポイントに対応しない（最初から全件を検証する）ため、BOM付きもutf-8で読み込む
+        for bom in (False, True):
+            encoding = 'utf-8'
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = self.validate(ddl_path, csv_path, self.path('expected.csv'), encoding=encoding,
+                                     **BASELINE_OPTIONS)
+            self.assertGreater(expected[2], 0)
+
+            checkpoint_path = self.path('items.checkpoint.json')
+            for path in (checkpoint_path, self.path('report.csv')):
+                if os.path.exists(path):
+                    os.remove(path)
+            options = {'encoding': encoding, 'engine': 'python'}
+            self.interrupt(ddl_path, csv_path, self.path('report.csv'),
+                           checkpoint=CheckpointStore(checkpoint_path, interval=0), **options)
+            with self.subTest(bom=bom, encoding=encoding):
+                checkpoint = CheckpointStore(checkpoint_path).load()
+                self.assertFalse(checkpoint.complete)
+                self.assertGreater(checkpoint.row_number, 2)
+                self.assertEqual(self.validate(ddl_path, csv_path, self.path('report.csv'), resume=True,
+                                               checkpoint=CheckpointStore(checkpoint_path, interval=0), **options),
+                                 expected)
+
+    def test_incremental_after_append(self):
+        csv_content = fixture_rows()
+        # 引用符の中の改行の直後で分け、書き込み途中のレコードが改行で終わるようにする
+        split_at = csv_content.index('"line1\r\n', len(csv_content) // 2) + len('"line1\r\n')
+        expected = run_checker(*write_files(self.directory.name, csv_content, file_name='full.csv'),
+                               **BASELINE_OPTIONS)
+
+        for options in ({}, {'workers': 2}, {'threads': 2}):
+            ddl_path, csv_path = write_files(self.directory.name, csv_content[:split_at])
+            checkpoint = CheckpointStore(self.path('items.checkpoint.json'), interval=0)
+            if os.path.exists(checkpoint.path):
+                os.remove(checkpoint.path)
+            _, first_count, first_errors = run_checker(ddl_path, csv_path, checkpoint=checkpoint, incremental=True,
+                                                       **options)
+            with open(csv_path, 'ab') as f:
+                f.write(csv_content[split_at:].encode('utf-8'))
+            _, second_count, second_errors = run_checker(ddl_path, csv_path, checkpoint=checkpoint,
+                                                         incremental=True, **options)
+
+            with self.subTest(**options):
+                self.assertEqual(first_count + second_count, expected[1])
+                self.assertEqual(first_errors + second_errors, expected[2])
+                self.assertTrue(checkpoint.load().complete)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import bz2
+import gzip
+import lzma
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, fixture_rows, run_checker, write_files  # noqa: E402
+
+COMPRESSORS = {'.gz': gzip.compress, '.bz2': bz2.compress, '.xz': lzma.compress}
+
+
+class CompressionTest(unittest.TestCase):
+    """圧縮ファイルを展開しながら検証した結果が、非圧縮のファイルの検証と同じか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_same_errors_as_uncompressed(self):
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            with open(csv_path, 'rb') as f:
+                data = f.read()
+            for ext, compress in COMPRESSORS.items():
+                compressed_path = csv_path + ext
+                with open(compressed_path, 'wb') as f:
+                    f.write(compress(data))
+                # mmapを指定しても圧縮ファイルはストリームで読み込む
+                for reader in ('auto', 'mmap'):
+                    with self.subTest(bom=bom, encoding=encoding, ext=ext, reader=reader):
+                        self.assertEqual(run_checker(ddl_path, compressed_path, encoding=encoding, reader=reader),
+                                         expected)
+
+    def test_error_limits(self):
+        ddl_path, csv_path = write_files(self.directory.name, fixture_rows())
+        with open(csv_path, 'rb') as f, open(csv_path + '.gz', 'wb') as gz:
+            gz.write(gzip.compress(f.read()))
+        for options in ({'max_errors': 7}, {'fail_fast': True}, {'max_errors_per_column': 3}):
+            with self.subTest(**options):
+                self.assertEqual(run_checker(ddl_path, csv_path + '.gz', **options),
+                                 run_checker(ddl_path, csv_path, **BASELINE_OPTIONS, **options))
+
+
+if __name__ == '__main__':
+    unittest.main()
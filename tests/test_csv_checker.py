@@ -0,0 +1,81 @@
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.numpy_engine import is_available as numpy_available  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, HEADER, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 並べ替えたCSVの列（DDLにない memo を含む。BOM付きでutf-8を指定した場合も同じ結果になるよう id は先頭のまま）
+REORDERED_HEADER = ['id', 'flag', 'created', 'memo', 'amount', 'note', 'name']
+ENGINES = ('python', 'numpy') if numpy_available() else ('python',)
+
+
+def rewrite_rows(csv_content: str, headers: list) -> str:
+    """
+    フィールド数がヘッダーと一致するレコードだけを、列を headers の順に並べ替えて書き直す
+
+    DDLにない列には note と同じ値（引用符の中の改行を含む）を入れる。
+    """
+    rows = csv.reader(io.StringIO(csv_content, newline=''))
+    original = next(rows)
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\r\n')
+    writer.writerow(headers)
+    for row in rows:
+        if len(row) != len(original):
+            continue
+        fields = dict(zip(original, row))
+        writer.writerow([fields.get(name, fields['note']) for name in headers])
+    return output.getvalue()
+
+
+class ColumnPlanTest(unittest.TestCase):
+    """カラムを列番号で参照する検証が、CSVの列の並び・過不足によらずカラム名で参照した場合と同じ結果になるか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, csv_content: str, file_name: str, bom: bool):
+        return write_files(self.directory.name, csv_content, bom=bom, file_name=file_name)
+
+    def test_reordered_columns(self):
+        csv_content = fixture_rows()
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = self.write(rewrite_rows(csv_content, HEADER.split(',')), 'items.csv', bom)
+            _, reordered_path = self.write(rewrite_rows(csv_content, REORDERED_HEADER), 'reordered.csv', bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            for engine in ENGINES:
+                with self.subTest(bom=bom, encoding=encoding, engine=engine):
+                    self.assertEqual(run_checker(ddl_path, reordered_path, encoding=encoding, engine=engine),
+                                     expected)
+
+    def test_missing_columns(self):
+        headers = HEADER.split(',')
+        ddl_path, csv_path = self.write(rewrite_rows(fixture_rows(), headers), 'items.csv', True)
+        _, _, full_errors = run_checker(ddl_path, csv_path, encoding='utf-8-sig', **BASELINE_OPTIONS)
+
+        # NULL許可の created がない場合はそのカラムのエラーだけがなくなり、
+        # NOT NULLの name がない場合は全ての行で「カラムが存在しません」になる
+        without = [name for name in headers if name not in ('created', 'name')]
+        _, csv_path = self.write(rewrite_rows(fixture_rows(), without), 'missing.csv', True)
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                _, record_count, errors = run_checker(ddl_path, csv_path, encoding='utf-8-sig', engine=engine)
+                self.assertEqual([error for error in errors if error[1] != 'name'],
+                                 [error for error in full_errors if error[1] not in ('created', 'name')])
+                self.assertEqual([error for error in errors if error[1] == 'name'], [
+                    (row, 'name', '', 'カラムが存在しません（NOT NULL制約違反）')
+                    for row in range(2, record_count + 2)
+                ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.ddl_parser import parse_schema  # noqa: E402
+
+
+def column_types(ddl_content: str, table: str = 't'):
+    return [(column.name, column.data_type, column.nullable) for column in parse_schema(ddl_content)[table].columns]
+
+
+class CommentTest(unittest.TestCase):
+
+    def assert_parses_quickly(self, ddl_content: str, expected):
+        start = time.perf_counter()
+        self.assertEqual(column_types(ddl_content), expected)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_line_comment_of_dashes_before_comma(self):
+        # 曖昧な正規表現では - が2個増えるごとに解析時間が2倍になっていた
+        for dashes in (2, 24, 30, 100, 10000):
+            with self.subTest(dashes=dashes):
+                self.assert_parses_quickly(
+                    f"CREATE TABLE t (\n  id int -- {'-' * dashes}\n  , name varchar(10)\n);",
+                    [('id', 'INT', True), ('name', 'VARCHAR(10)', True)],
+                )
+
+    def test_unterminated_line_comment_of_dashes(self):
+        self.assert_parses_quickly(f"CREATE TABLE t (a int {'-' * 100});", [('a', 'INT', True)])
+        self.assert_parses_quickly(f"CREATE TABLE t (a int {'#' * 100});", [('a', 'INT', True)])
+
+    def test_unterminated_block_comments(self):
+        self.assert_parses_quickly(f"CREATE TABLE t (a int {'/*' * 10000}", [('a', 'INT', True)])
+
+    def test_comments_between_and_inside_column_definitions(self):
+        ddl_content = """
+            -- header, with ( and ;
+            CREATE TABLE t (
+              a int/*x*/NOT NULL,  -- trailing, comment (
+              b double -- split
+                precision,
+              c character /* y, */ varying (20) # mysql comment )
+                DEFAULT '--not a comment' COMMENT '/* nor this */',
+              d int -- last
+            );
+        """
+        self.assertEqual(column_types(ddl_content), [
+            ('a', 'INT', False),
+            ('b', 'DOUBLE PRECISION', True),
+            ('c', 'VARCHAR(20)', True),
+            ('d', 'INT', True),
+        ])
+        self.assertEqual(parse_schema(ddl_content)['t'].columns[2].default, "'--not a comment'")
+
+
+class IdentifierTest(unittest.TestCase):
+
+    def test_digit_leading_table_name(self):
+        ddl_content = "CREATE TABLE 2024_sales (id INT PRIMARY KEY, amount DECIMAL(10,2));"
+        tables = parse_schema(ddl_content)
+        self.assertEqual(list(tables), ['2024_sales'])
+        self.assertEqual(column_types(ddl_content, '2024_sales'),
+                         [('id', 'INT', True), ('amount', 'DECIMAL(10,2)', True)])
+        self.assertEqual(tables['2024_sales'].primary_key, ['id'])
+
+    def test_digit_leading_column_names(self):
+        ddl_content = "CREATE TABLE t (1st INT, b INT, 2nd_name VARCHAR(10) NOT NULL, UNIQUE (1st, 2nd_name));"
+        self.assertEqual(column_types(ddl_content),
+                         [('1st', 'INT', True), ('b', 'INT', True), ('2nd_name', 'VARCHAR(10)', False)])
+        self.assertEqual(parse_schema(ddl_content)['t'].unique_keys, [['1st', '2nd_name']])
+
+    def test_unparsable_column_is_skipped(self):
+        self.assertEqual(column_types("CREATE TABLE t (@a INT, b INT, 'c' INT, d INT);"),
+                         [('b', 'INT', True), ('d', 'INT', True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
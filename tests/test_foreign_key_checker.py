@@ -0,0 +1,100 @@
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.batch_runner import run_batch  # noqa: E402
+from src.ddl_parser import DDLParser  # noqa: E402
+
+DDL = """
+CREATE TABLE users (
+  id INT PRIMARY KEY,
+  code VARCHAR(10)
+);
+CREATE TABLE prices (
+  amount DECIMAL(10,2) PRIMARY KEY
+);
+CREATE TABLE orders (
+  order_id INT PRIMARY KEY,
+  user_id INT REFERENCES users (id),
+  user_code VARCHAR(10) REFERENCES users (code),
+  amount DECIMAL(10,2) REFERENCES prices (amount)
+);
+"""
+
+
+class BatchForeignKeyTest(unittest.TestCase):
+    """一括検証（batch.py --check-foreign-keys）の外部キーの照合"""
+
+    def run_batch(self, files: dict, workers: int = 1):
+        """files（ファイル名 -> CSVの内容）を一括検証し、orders.csv の (行番号, カラム名, 値, メッセージ) を返す"""
+        with tempfile.TemporaryDirectory() as directory:
+            ddl_path = os.path.join(directory, 'schema.sql')
+            with open(ddl_path, 'w', encoding='utf-8') as f:
+                f.write(DDL)
+            csv_files = []
+            for name, content in files.items():
+                csv_files.append(os.path.join(directory, name))
+                with open(csv_files[-1], 'w', encoding='utf-8', newline='') as f:
+                    f.write(content)
+            schema = DDLParser(ddl_path).parse_schema()
+            tables = {name: table.columns for name, table in schema.items()}
+            output_dir = os.path.join(directory, 'reports')
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = run_batch(ddl_path, tables, csv_files, output_dir, workers=workers, schema=schema)
+            result = next(result for result in results if result.table_name == 'orders')
+            if result.error_report_path is None or not os.path.exists(result.error_report_path):
+                return []
+            with open(result.error_report_path, encoding='utf-8', newline='') as f:
+                return [tuple(row) for row in csv.reader(f)][1:]
+
+    def test_null_strings_are_not_checked(self):
+        files = {
+            'users.csv': "id,code\n1,a\n",
+            'prices.csv': "amount\n1.00\n",
+            'orders.csv': "order_id,user_id,user_code,amount\n1,NULL,null,NULL\n2,null,,Null\n3,,NULL,\n4,1,a,1\n",
+        }
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(self.run_batch(files, workers), [])
+
+    def test_null_parent_keys_are_not_indexed(self):
+        files = {
+            'users.csv': "id,code\n1,NULL\n2,null\n",
+            'prices.csv': "amount\nNULL\n",
+            'orders.csv': "order_id,user_id,user_code,amount\n1,1,NULL,\n2,2,x,\n",
+        }
+        self.assertEqual(self.run_batch(files), [
+            ('3', 'user_code', 'x', '外部キーの参照先がありません（users.code）'),
+        ])
+
+    def test_numeric_keys_are_compared_by_value(self):
+        files = {
+            'users.csv': "id,code\n2,02\n007,7\n",
+            'prices.csv': "amount\n2.50\n100\n",
+            'orders.csv': (
+                "order_id,user_id,user_code,amount\n"
+                "1,02,02,2.5\n"
+                "2,7,7,1E+2\n"
+                "3,+2,2,02.50\n"
+                "4,3,007,2.51\n"
+            ),
+        }
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(self.run_batch(files, workers), [
+                    ('4', 'user_code', '2', '外部キーの参照先がありません（users.code）'),
+                    ('5', 'user_id', '3', '外部キーの参照先がありません（users.id）'),
+                    ('5', 'user_code', '007', '外部キーの参照先がありません（users.code）'),
+                    ('5', 'amount', '2.51', '外部キーの参照先がありません（prices.amount）'),
+                ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.csv_checker import CSVChecker  # noqa: E402
+from src.key_checker import UNIQUE, DuplicateKeyDetector, KeyConstraint  # noqa: E402
+
+
+def duplicate_rows(constraint: KeyConstraint, headers, rows):
+    """行番号2から順に rows を渡し、重複と判定された (行番号, 値, メッセージ) のリストを返す"""
+    detector = DuplicateKeyDetector([constraint], headers)
+    try:
+        for row_number, row in enumerate(rows, start=2):
+            detector.add(row_number, row)
+        return [(error.row_number, error.value, error.error_message) for error in detector.duplicates()]
+    finally:
+        detector.close()
+
+
+class NullKeyTest(unittest.TestCase):
+
+    def test_null_strings_are_not_duplicates(self):
+        constraint = KeyConstraint(UNIQUE, ['code'], ['VARCHAR(10)'])
+        rows = [['1', 'NULL'], ['2', 'NULL'], ['3', 'null'], ['4', 'Null'], ['5', ''], ['6', '']]
+        self.assertEqual(duplicate_rows(constraint, ['id', 'code'], rows), [])
+
+    def test_composite_key_with_null_string_is_not_checked(self):
+        constraint = KeyConstraint(UNIQUE, ['a', 'b'], ['INT', 'VARCHAR(10)'])
+        rows = [['1', 'NULL'], ['1', 'NULL'], ['1', 'x'], ['1', 'x']]
+        self.assertEqual(duplicate_rows(constraint, ['a', 'b'], rows),
+                         [(5, '1,x', '一意キーが重複しています（行4と同じ値）')])
+
+    def test_null_like_values_are_still_compared(self):
+        constraint = KeyConstraint(UNIQUE, ['code'], ['VARCHAR(10)'])
+        rows = [['NULLS'], ['NULLS'], [' NULL'], [' NULL']]
+        self.assertEqual([row for row, _, _ in duplicate_rows(constraint, ['code'], rows)], [3, 5])
+
+
+class NumericKeyTest(unittest.TestCase):
+
+    def test_integer_keys_are_compared_by_value(self):
+        constraint = KeyConstraint(UNIQUE, ['id'], ['INT'])
+        rows = [['2'], ['02'], ['-0'], ['0'], ['+3'], ['3'], ['x'], ['x']]
+        self.assertEqual(duplicate_rows(constraint, ['id'], rows), [
+            (3, '2', '一意キーが重複しています（行2と同じ値）'),
+            (5, '0', '一意キーが重複しています（行4と同じ値）'),
+            (7, '3', '一意キーが重複しています（行6と同じ値）'),
+            (9, 'x', '一意キーが重複しています（行8と同じ値）'),
+        ])
+
+    def test_decimal_keys_are_compared_by_value(self):
+        constraint = KeyConstraint(UNIQUE, ['price'], ['DECIMAL(10,2)'])
+        rows = [['2.5'], ['02.50'], ['100'], ['1E+2'], ['-0.00'], ['0'], ['2.51']]
+        self.assertEqual([(row, value) for row, value, _ in duplicate_rows(constraint, ['price'], rows)],
+                         [(3, '2.5'), (5, '100'), (7, '0')])
+
+    def test_string_keys_are_compared_as_is(self):
+        for data_types in (['VARCHAR(10)'], None):
+            with self.subTest(data_types=data_types):
+                constraint = KeyConstraint(UNIQUE, ['code'], data_types)
+                self.assertEqual(duplicate_rows(constraint, ['code'], [['2'], ['02']]), [])
+
+
+class CheckKeysTest(unittest.TestCase):
+    """DDLの制約で検証した場合（--check-keys）"""
+
+    def validate(self, ddl_content: str, csv_content: str, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            ddl_path = os.path.join(directory, 'table.sql')
+            csv_path = os.path.join(directory, 'table.csv')
+            with open(ddl_path, 'w', encoding='utf-8') as f:
+                f.write(ddl_content)
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(csv_content)
+            checker = CSVChecker(ddl_path, csv_path, check_keys=True, **options)
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, errors = checker.validate()
+            return [(error.row_number, error.column_name, error.error_message) for error in errors]
+
+    def test_null_and_numeric_keys(self):
+        ddl_content = """
+            CREATE TABLE items (
+              id INT PRIMARY KEY,
+              code VARCHAR(10) UNIQUE,
+              price DECIMAL(10,2),
+              UNIQUE (price)
+            );
+        """
+        csv_content = "id,code,price\n2,NULL,1.5\n02,NULL,NULL\n3,null,01.50\n4,a,null\n"
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(self.validate(ddl_content, csv_content, workers=workers), [
+                    (3, 'id', '主キーが重複しています（行2と同じ値）'),
+                    (4, 'price', '一意キーが重複しています（行2と同じ値）'),
+                ])
+
+
+if __name__ == '__main__':
+    unittest.main()
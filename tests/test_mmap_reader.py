@@ -0,0 +1,61 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.csv_checker import CSVChecker  # noqa: E402
+from src.mmap_reader import MmapCsvReader  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでも複数のチャンクに分けて読み込まれるようにする
+SMALL_CHUNK_SIZE = 512
+
+
+class MmapReaderTest(unittest.TestCase):
+    """mmapリーダーがストリームで読み込んだ場合と同じエラーを返し、索引からレコードを読み直せるか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch('src.csv_checker.MmapCsvReader', partial(MmapCsvReader, chunk_size=SMALL_CHUNK_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_errors_as_stream(self):
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            with self.subTest(bom=bom, encoding=encoding):
+                self.assertEqual(run_checker(ddl_path, csv_path, encoding=encoding, reader='mmap', engine='python'),
+                                 expected)
+
+    def test_error_limits(self):
+        ddl_path, csv_path = write_files(self.directory.name, fixture_rows())
+        for options in ({'max_errors': 7}, {'fail_fast': True}, {'max_errors_per_column': 3}):
+            with self.subTest(**options):
+                self.assertEqual(run_checker(ddl_path, csv_path, reader='mmap', engine='python', **options),
+                                 run_checker(ddl_path, csv_path, **BASELINE_OPTIONS, **options))
+
+    def test_read_records(self):
+        for bom in (False, True):
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                records = list(csv.reader(f))[1:]
+
+            checker = CSVChecker(ddl_path, csv_path, reader='mmap')
+            _, errors = checker.validate()
+            row_numbers = [error.row_number for error in errors] + [2, len(records) + 1]
+            with self.subTest(bom=bom):
+                self.assertEqual(checker.read_records(row_numbers),
+                                 {row_number: records[row_number - 2] for row_number in row_numbers})
+
+
+if __name__ == '__main__':
+    unittest.main()
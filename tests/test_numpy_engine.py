@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.numpy_engine import ColumnarBatchValidator, is_available  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでも複数のブロックに分けて検証されるようにする（最後のブロックは端数になる）
+SMALL_BLOCK_SIZE = 64
+
+
+@unittest.skipUnless(is_available(), "NumPyがインストールされていません")
+class NumpyEngineTest(unittest.TestCase):
+    """numpyエンジンが1セルずつの検証と同じエラーを返すか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch('src.csv_checker.ColumnarBatchValidator',
+                             partial(ColumnarBatchValidator, block_size=SMALL_BLOCK_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_errors_as_python_engine(self):
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            for reader in ('stream', 'mmap'):
+                with self.subTest(bom=bom, encoding=encoding, reader=reader):
+                    self.assertEqual(run_checker(ddl_path, csv_path, encoding=encoding, reader=reader,
+                                                 engine='numpy'), expected)
+
+    def test_error_limits(self):
+        ddl_path, csv_path = write_files(self.directory.name, fixture_rows())
+        for options in ({'max_errors': 7}, {'fail_fast': True}, {'max_errors_per_column': 3}):
+            with self.subTest(**options):
+                self.assertEqual(run_checker(ddl_path, csv_path, engine='numpy', **options),
+                                 run_checker(ddl_path, csv_path, **BASELINE_OPTIONS, **options))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src import parallel  # noqa: E402
+from tests.csv_fixtures import fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでも複数のバイト範囲に分割されるようにする
+SMALL_CHUNK_SIZE = 512
+
+
+class ParallelTest(unittest.TestCase):
+    """並列検証（workers）が1プロセスの検証と同じ行番号・順序でエラーを返すか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch.object(parallel, 'MIN_CHUNK_SIZE', SMALL_CHUNK_SIZE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_same_as_single_process(self, csv_content: str, bom: bool = False, **options):
+        ddl_path, csv_path = write_files(self.directory.name, csv_content, bom=bom)
+        expected = run_checker(ddl_path, csv_path, **options)
+        self.assertTrue(expected[2])
+        for workers in (2, 3):
+            with self.subTest(workers=workers, **options):
+                self.assertEqual(run_checker(ddl_path, csv_path, workers=workers, **options), expected)
+        return csv_path
+
+    def test_quoted_newlines_and_short_rows(self):
+        csv_path = self.assert_same_as_single_process(fixture_rows())
+        # 引用符の中の改行を含むファイルが複数の範囲に分割されていること
+        _, data_start = parallel.read_header(csv_path, 'utf-8')
+        self.assertGreater(len(parallel.split_byte_ranges(csv_path, data_start, 2)), 2)
+
+    def test_bom(self):
+        self.assert_same_as_single_process(fixture_rows(), bom=True, encoding='utf-8-sig')
+        self.assert_same_as_single_process(fixture_rows(), bom=True)
+
+    def test_error_limits(self):
+        csv_content = fixture_rows()
+        for options in ({'max_errors': 1}, {'max_errors': 7}, {'max_errors': 100}, {'fail_fast': True},
+                        {'max_errors_per_column': 3}):
+            self.assert_same_as_single_process(csv_content, **options)
+
+
+if __name__ == '__main__':
+    unittest.main()
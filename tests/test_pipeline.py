@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+from functools import partial
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.pipeline import validate_in_threads  # noqa: E402
+from tests.csv_fixtures import BASELINE_OPTIONS, BOM_CASES, fixture_rows, run_checker, write_files  # noqa: E402
+
+# 小さなファイルでも複数のブロックに分けてスレッドで検証されるようにする
+SMALL_BLOCK_SIZE = 512
+
+
+class PipelineTest(unittest.TestCase):
+    """スレッドのパイプライン検証（threads）が1スレッドの検証と同じ行番号・順序でエラーを返すか"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch('src.csv_checker.validate_in_threads',
+                             partial(validate_in_threads, block_size=SMALL_BLOCK_SIZE))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_errors_as_single_thread(self):
+        for bom, encoding in BOM_CASES:
+            ddl_path, csv_path = write_files(self.directory.name, fixture_rows(), bom=bom)
+            expected = run_checker(ddl_path, csv_path, encoding=encoding, **BASELINE_OPTIONS)
+            self.assertTrue(expected[2])
+            for threads in (2, 3):
+                with self.subTest(bom=bom, encoding=encoding, threads=threads):
+                    self.assertEqual(run_checker(ddl_path, csv_path, encoding=encoding, threads=threads), expected)
+
+    def test_error_limits(self):
+        ddl_path, csv_path = write_files(self.directory.name, fixture_rows())
+        for options in ({'max_errors': 1}, {'max_errors': 7}, {'max_errors': 100}, {'fail_fast': True},
+                        {'max_errors_per_column': 3}):
+            expected = run_checker(ddl_path, csv_path, **BASELINE_OPTIONS, **options)
+            for threads in (2, 3):
+                with self.subTest(threads=threads, **options):
+                    self.assertEqual(run_checker(ddl_path, csv_path, threads=threads, **options), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
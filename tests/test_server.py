@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.server import HttpError, ValidationServer  # noqa: E402
+
+
+class DataPathTest(unittest.TestCase):
+    """path= で指定できるファイルを data_dir の中に限る"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.base = os.path.realpath(directory.name)
+        self.data_dir = os.path.join(self.base, 'data')
+        os.makedirs(os.path.join(self.data_dir, 'sub'))
+        self.inside = os.path.join(self.data_dir, 'sub', 'users.csv')
+        self.outside = os.path.join(self.base, 'secret.csv')
+        for path in (self.inside, self.outside):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("id\n1\n")
+        os.symlink(self.base, os.path.join(self.data_dir, 'link'))
+
+    def server(self, data_dir):
+        return ValidationServer('schema.sql', {}, data_dir=data_dir)
+
+    def assert_status(self, server, path, status):
+        with self.assertRaises(HttpError) as raised:
+            server._resolve_data_path(path)
+        self.assertEqual(raised.exception.status, status)
+
+    def test_inside_data_dir(self):
+        server = self.server(self.data_dir)
+        for path in (self.inside, 'sub/users.csv', os.path.join(self.data_dir, 'sub', '..', 'sub', 'users.csv')):
+            with self.subTest(path=path):
+                self.assertEqual(server._resolve_data_path(path), self.inside)
+
+    def test_outside_data_dir(self):
+        server = self.server(self.data_dir)
+        for path in (self.outside, '../secret.csv', 'sub/../../secret.csv', 'link/secret.csv', '/etc/passwd',
+                     self.data_dir + '-other/users.csv'):
+            with self.subTest(path=path):
+                self.assert_status(server, path, 403)
+
+    def test_missing_file(self):
+        server = self.server(self.data_dir)
+        self.assert_status(server, 'missing.csv', 400)
+        self.assert_status(server, 'sub', 400)
+
+    def test_no_data_dir(self):
+        server = self.server(None)
+        for path in (self.inside, self.outside):
+            with self.subTest(path=path):
+                self.assert_status(server, path, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import contextlib
+import csv
+import io
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.csv_checker import CSVChecker, collect_warnings  # noqa: E402
+from src.ddl_parser import DDLParser  # noqa: E402
+from src.streaming import validate_rows, validate_stream  # noqa: E402
+from tests.csv_fixtures import HEADER, fixture_rows, write_files  # noqa: E402
+
+
+def as_tuples(errors):
+    return [(error.row_number, error.column_name, error.value, error.error_message) for error in errors]
+
+
+class StreamingTest(unittest.TestCase):
+    """ライブラリAPIがファイルの検証と同じエラーを返し、コンソールに何も表示しないか"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.csv_content = fixture_rows()
+        self.ddl_path, self.csv_path = write_files(directory.name, self.csv_content)
+        self.columns = DDLParser(self.ddl_path).parse()
+
+    def validate_quietly(self, validate):
+        """validate() の結果と、標準出力・標準エラー出力に表示された内容を返す"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            result = validate()
+        return result, stdout.getvalue() + stderr.getvalue()
+
+    def test_same_errors_as_file_validation(self):
+        (_, expected), output = self.validate_quietly(CSVChecker(self.ddl_path, self.csv_path).validate)
+        self.assertEqual(output, '')
+        self.assertTrue(expected)
+
+        rows = list(csv.reader(io.StringIO(self.csv_content, newline='')))
+        cases = {
+            'rows': lambda: list(validate_rows(self.columns, rows)),
+            'dicts': lambda: list(validate_rows(self.columns, ({'id': 1, 'name': None},))),
+            'stream': lambda: list(validate_stream(self.columns, io.BytesIO(self.csv_content.encode('utf-8')))),
+        }
+        for name, validate in cases.items():
+            with self.subTest(name):
+                errors, output = self.validate_quietly(validate)
+                self.assertEqual(output, '')
+                if name != 'dicts':
+                    self.assertEqual(as_tuples(errors), as_tuples(expected))
+        self.assertEqual(as_tuples(cases['dicts']()),
+                         [(2, 'name', '', 'NOT NULL制約違反')])
+
+    def test_validate_row(self):
+        checker = CSVChecker.from_columns(self.columns, ['id', 'name', 'flag'])
+        self.assertEqual(as_tuples(checker.validate_row(5, ['1', 'a', '-1'])),
+                         [(5, 'flag', '-1', 'UNSIGNED型に負の値は許可されません')])
+        self.assertEqual(as_tuples(checker.validate_row(6, ['x'])), [
+            (6, '', '', 'フィールド数がヘッダーと一致しません（ヘッダー: 3, 実際: 1）'),
+            (6, 'id', 'x', '整数ではありません'),
+        ])
+        self.assertEqual(checker.error_count, 0)
+
+    def test_messages_go_to_logger(self):
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(f"{HEADER},extra\n1,a,,,,,b\n")
+        checker = CSVChecker(self.ddl_path, self.csv_path)
+        with self.assertLogs('src', logging.INFO) as logs, collect_warnings() as warnings:
+            (is_valid, _), output = self.validate_quietly(checker.validate)
+        self.assertTrue(is_valid)
+        self.assertEqual(output, '')
+        self.assertIn('INFO:src.csv_checker:DDLファイルを解析しました: 6カラム', logs.output)
+        self.assertEqual(warnings, ["警告: CSVに存在するが、DDLに定義されていないカラム: {'extra'}"])
+
+
+if __name__ == '__main__':
+    unittest.main()
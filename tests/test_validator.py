@@ -0,0 +1,219 @@
+import os
+import random
+import sys
+import unittest
+from itertools import product
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.validator import (  # noqa: E402
+    DATE_FORMATS,
+    DATETIME_FORMATS,
+    INTEGER_RANGES,
+    TIME_FORMATS,
+    DataTypeValidator,
+    _match_date,
+    _match_datetime,
+    _match_time,
+    _strptime_any,
+)
+
+SEED = 20240229
+
+# 境界値（年: 0年・うるう年の規則の例外・4桁の上限、月: 0と13、日: 各月の末日の前後）
+YEARS = ['0000', '0001', '0004', '1900', '1999', '2000', '2023', '2024', '2100', '2400', '9999']
+MONTHS = [f'{month:02d}' for month in range(14)]
+DAYS = ['00', '01', '09', '28', '29', '30', '31', '32', '99']
+HOURS = ['00', '09', '23', '24', '99']
+MINUTES_SECONDS = ['00', '59', '60', '61']
+FRACTIONS = ['', '.', '.0', '.5', '.123456', '.1234567', '.12a']
+
+# 前後の空白（strptime は取り除かない）
+WHITESPACE = [' {}', '{} ', '\t{}', '{}\n', '　{}', ' {} ']
+# ASCII以外の数字（strptime の \d と int() は受け付ける）
+DIGIT_TRANSLATIONS = [
+    str.maketrans('0123456789', '０１２３４５６７８９'),  # 全角
+    str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩'),  # アラビア・インド数字
+    str.maketrans('0123456789', '०१२३४५६७८९'),  # デーヴァナーガリー数字
+]
+# ランダムに組み立てる値に使う文字（区切り文字・空白・符号・ASCII以外の数字を含む）
+RANDOM_CHARACTERS = '0123456789' * 4 + '-/:. +T\t' + '０٣'
+
+
+def dates():
+    for year, month, day in product(YEARS, MONTHS, DAYS):
+        yield f'{year}-{month}-{day}'
+        yield f'{year}/{month}/{day}'
+        yield f'{year}{month}{day}'
+
+
+def datetimes():
+    for date in ['2024-02-29', '2023/02/29', '20000229', '1900-02-29', '2024-12-31', '0000-01-01', '9999-12-31']:
+        for hour, minute, second in product(HOURS, MINUTES_SECONDS, MINUTES_SECONDS):
+            time = f'{hour}:{minute}:{second}'
+            if len(date) == 8:
+                yield f'{date}{hour}{minute}{second}'
+                continue
+            for fraction in FRACTIONS:
+                yield f'{date} {time}{fraction}'
+
+
+def times():
+    for hour, minute, second in product(HOURS, MINUTES_SECONDS, MINUTES_SECONDS):
+        yield f'{hour}:{minute}:{second}'
+        yield f'{hour}:{minute}'
+
+
+def irregular(values):
+    """各値の前後に空白を付けた値、数字をASCII以外の数字に置き換えた値、1桁の要素を含む値"""
+    for value in values:
+        for template in WHITESPACE:
+            yield template.format(value)
+        for translation in DIGIT_TRANSLATIONS:
+            yield value.translate(translation)
+        # 先頭の0を取り除いた要素（strptime は1桁の月日・時分秒も受け付ける）
+        yield value.replace('-0', '-').replace('/0', '/').replace(':0', ':').replace(' 0', ' ')
+
+
+def random_values(count: int, rng: random.Random):
+    for _ in range(count):
+        length = rng.choice([5, 7, 8, 9, 10, 11, 14, 19, 20, 21, 26, 27])
+        yield ''.join(rng.choice(RANDOM_CHARACTERS) for _ in range(length))
+
+
+class TemporalFastPathTest(unittest.TestCase):
+    """例外を使わない定型の日付・日時・時刻の判定が、strptime による判定と一致するか"""
+
+    def assert_equivalent(self, values, match, validate, formats, decided=None):
+        """
+        match の結果（Noneは判定を委ねる）と validate の結果が strptime と一致することを確認
+
+        Args:
+            decided: match がNoneを返さず判定すべき値の集合（定型の値）
+        """
+        checked = 0
+        for value in values:
+            expected = _strptime_any(value, formats)
+            fast = match(value)
+            if fast is not None:
+                self.assertEqual(fast, expected, f"fast path: {value!r}")
+            elif decided is not None:
+                self.assertNotIn(value, decided, f"fast path did not decide: {value!r}")
+            self.assertEqual(validate(value)[0], expected, f"validator: {value!r}")
+            checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_dates(self):
+        regular = list(dates())
+        self.assert_equivalent(regular, _match_date, DataTypeValidator._validate_date, DATE_FORMATS, set(regular))
+
+    def test_leap_days(self):
+        for year, expected in (('2024', True), ('2000', True), ('2400', True), ('2023', False), ('1900', False),
+                               ('2100', False)):
+            for value in (f'{year}-02-29', f'{year}/02/29', f'{year}0229'):
+                with self.subTest(value=value):
+                    self.assertEqual(_match_date(value), expected)
+                    self.assertEqual(_strptime_any(value, DATE_FORMATS), expected)
+        for value in ('2024-02-30', '2024/02/30', '20240230', '2024-02-29 24:00:00', '2023-02-29 00:00:00'):
+            with self.subTest(value=value):
+                self.assertFalse(_match_date(value) or _match_datetime(value))
+
+    def test_irregular_dates(self):
+        self.assert_equivalent(irregular(dates()), _match_date, DataTypeValidator._validate_date, DATE_FORMATS)
+
+    def test_datetimes(self):
+        regular = list(datetimes())
+        # 小数秒が1〜6桁の数字、または小数秒なしの値は定型として判定する
+        decided = {value for value in regular if '.' not in value or value.rsplit('.', 1)[1].isdigit()
+                   and len(value) <= 26 and value[4] == '-'}
+        self.assert_equivalent(regular, _match_datetime, DataTypeValidator._validate_datetime,
+                               DATETIME_FORMATS, decided)
+
+    def test_irregular_datetimes(self):
+        self.assert_equivalent(irregular(datetimes()), _match_datetime, DataTypeValidator._validate_datetime,
+                               DATETIME_FORMATS)
+
+    def test_times(self):
+        regular = list(times())
+        self.assert_equivalent(regular, _match_time, DataTypeValidator._validate_time, TIME_FORMATS, set(regular))
+
+    def test_irregular_times(self):
+        self.assert_equivalent(irregular(times()), _match_time, DataTypeValidator._validate_time, TIME_FORMATS)
+
+    def test_random_values(self):
+        rng = random.Random(SEED)
+        values = list(random_values(3000, rng))
+        cases = (
+            (_match_date, DataTypeValidator._validate_date, DATE_FORMATS),
+            (_match_datetime, DataTypeValidator._validate_datetime, DATETIME_FORMATS),
+            (_match_time, DataTypeValidator._validate_time, TIME_FORMATS),
+        )
+        for match, validate, formats in cases:
+            with self.subTest(match=match.__name__):
+                self.assert_equivalent(values, match, validate, formats)
+
+
+def baseline_validate_integer(value: str, data_type: str):
+    """高速判定を追加する前の int() による整数の判定"""
+    try:
+        num = int(value)
+    except ValueError:
+        return False, "整数ではありません"
+    if 'UNSIGNED' in data_type and num < 0:
+        return False, "UNSIGNED型に負の値は許可されません"
+    for prefix in ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'INT', 'BIGINT'):
+        if data_type.startswith(prefix):
+            min_val, max_val = INTEGER_RANGES[prefix][1 if 'UNSIGNED' in data_type else 0]
+            if not (min_val <= num <= max_val):
+                return False, f"値が範囲外です（{min_val}〜{max_val}）"
+            break
+    return True, ""
+
+
+def integer_values():
+    max_str_digits = sys.get_int_max_str_digits() if hasattr(sys, 'get_int_max_str_digits') else 5000
+    for digits in ('0', '1', '127', '128', '255', '256', '2147483648', '4294967296', '9223372036854775808',
+                   '18446744073709551615', '18446744073709551616', '1' * 21, '9' * 25):
+        for zeros in (0, 1, 30, max_str_digits - len(digits), max_str_digits + 1, 5000):
+            number = '0' * zeros + digits
+            for sign in ('', '-', '+'):
+                for template in ('{}', ' {}', '{} ', '\t{}\n'):
+                    yield template.format(sign + number)
+    for length in (20, 21, 22, max_str_digits, max_str_digits + 1, 10000):
+        yield '9' * length
+        yield '-' + '9' * length
+        yield '1' + '0' * (length - 1)
+    yield ' -' + '0' * 4999 + '1'
+    yield '-' + '0' * 5000
+    yield '1_000'
+    yield '１２３'
+    yield '１' * 30
+
+
+class IntegerFastPathTest(unittest.TestCase):
+    """桁数による整数の判定が、int() による判定と同じ結果・メッセージになるか"""
+
+    DATA_TYPES = ['TINYINT', 'TINYINT UNSIGNED', 'SMALLINT', 'INT', 'INT UNSIGNED', 'BIGINT', 'BIGINT UNSIGNED']
+
+    def test_messages_match_int(self):
+        values = list(integer_values())
+        for data_type in self.DATA_TYPES:
+            for value in values:
+                self.assertEqual(DataTypeValidator._validate_integer(value, data_type),
+                                 baseline_validate_integer(value, data_type),
+                                 f"{data_type}: {value[:40]!r} ({len(value)} chars)")
+
+    def test_long_digits_are_not_converted(self):
+        # 境界値より桁数の多いASCIIの数字は int() で変換せずに判定する
+        values = ['9' * 25, '-' + '9' * 25, '1' * 4300, '1' * 5000, ' -' + '0' * 4999 + '1', '-' + '1' * 100]
+        with mock.patch('src.validator.int', create=True, side_effect=AssertionError('int() was called')):
+            for data_type in self.DATA_TYPES:
+                for value in values:
+                    self.assertEqual(DataTypeValidator._validate_integer(value, data_type),
+                                     baseline_validate_integer(value, data_type))
+
+
+if __name__ == '__main__':
+    unittest.main()